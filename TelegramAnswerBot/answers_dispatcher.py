@@ -0,0 +1,181 @@
+import asyncio
+import logging
+import typing
+from telegram import Bot
+from TelegramAnswerBot import data_handlers
+from TelegramAnswerBot.errors import DatabaseUnavailableError
+from TelegramAnswerBot.objects_types import OutboxAnswerRow
+from telegram.error import (
+	BadRequest,
+	Forbidden,
+	RetryAfter,
+	TelegramError
+)
+
+
+class AnswersDispatcher:
+	"""
+    Delivers answers from the 'answers_outbox' table to the users who asked the questions.
+
+    Runs as a background task of the application. Delivery is attempted as a reply to the question message first and as a standalone message with the question quoted if replying is impossible. Transient errors (network problems, timeouts, flood control) are retried with exponential backoff; permanent errors (the bot is blocked, the chat is gone) mark the answer as failed. Delivery is at-least-once: an answer sent right before a crash may be sent again after restart.
+
+    Attributes:
+        db_handler (MySQLDataHandler): An instance of the MySQLDataHandler for database operations.
+        batch_size (int): The maximum number of answers delivered in one pass.
+        max_attempts (int): The number of attempts after which an answer is marked as failed.
+        base_delay (int): The delay in seconds before the first retry. Doubled with every attempt.
+        max_delay (int): The maximum delay in seconds between retries.
+        poll_interval (int): The maximum time in seconds between checks of the outbox.
+        _wake_up (asyncio.Event): Set to deliver new answers without waiting for the poll interval.
+        _task (typing.Optional[asyncio.Task]): The running delivery task.
+    """
+	
+	def __init__(
+			self,
+			db_handler: data_handlers.MySQLDataHandler,
+			batch_size: int = 20,
+			max_attempts: int = 10,
+			base_delay: int = 5,
+			max_delay: int = 3600,
+			poll_interval: int = 60
+	):
+		"""
+        Initializes the AnswersDispatcher.
+
+        Args:
+            db_handler (MySQLDataHandler): The data handler for database operations.
+            batch_size (int): The maximum number of answers delivered in one pass.
+            max_attempts (int): The number of attempts after which an answer is marked as failed.
+            base_delay (int): The delay in seconds before the first retry.
+            max_delay (int): The maximum delay in seconds between retries.
+            poll_interval (int): The maximum time in seconds between checks of the outbox.
+        """
+		self.db_handler = db_handler
+		self.batch_size = batch_size
+		self.max_attempts = max_attempts
+		self.base_delay = base_delay
+		self.max_delay = max_delay
+		self.poll_interval = poll_interval
+		
+		self._wake_up = asyncio.Event()
+		self._task: typing.Optional[asyncio.Task] = None
+	
+	def get_retry_delay(self, attempts: int) -> int:
+		"""
+        Calculates the delay before the next attempt.
+
+        Args:
+            attempts (int): The number of attempts already made, including the failed one.
+
+        Returns:
+            int: The delay in seconds.
+        """
+		return min(self.base_delay * 2 ** (attempts - 1), self.max_delay)
+	
+	def notify(self):
+		"""Wakes the dispatcher up to deliver newly added answers immediately."""
+		self._wake_up.set()
+	
+	async def deliver_answer(self, bot: Bot, answer: OutboxAnswerRow):
+		"""
+        Makes one delivery attempt of an answer and records its result.
+
+        Args:
+            bot (Bot): The bot used to send messages.
+            answer (OutboxAnswerRow): The answer to deliver.
+        """
+		attempts = answer.attempts + 1
+		
+		try:
+			try:
+				if answer.reply_to_message_id is None:
+					raise BadRequest("No message to reply to")
+				
+				await bot.send_message(
+						chat_id=answer.chat_id,
+						reply_to_message_id=answer.reply_to_message_id,
+						text=answer.answer
+				)
+			except BadRequest:
+				await bot.send_message(chat_id=answer.chat_id, text=answer.fallback_answer)
+		except (BadRequest, Forbidden) as error:
+			logging.warning("Answer %d can't be delivered: %s", answer.answer_id, error)
+			await self.db_handler.run(self.db_handler.answers_outbox.mark_answer_failed, answer.answer_id, str(error))
+		except RetryAfter as error:
+			await self.db_handler.run(
+					self.db_handler.answers_outbox.reschedule_answer,
+					answer.answer_id,
+					max(int(error.retry_after), self.base_delay),
+					str(error)
+			)
+		except TelegramError as error:
+			if attempts >= self.max_attempts:
+				logging.warning("Answer %d failed after %d attempts: %s", answer.answer_id, attempts, error)
+				await self.db_handler.run(self.db_handler.answers_outbox.mark_answer_failed, answer.answer_id, str(error))
+			else:
+				await self.db_handler.run(self.db_handler.answers_outbox.reschedule_answer, answer.answer_id, self.get_retry_delay(attempts), str(error))
+		else:
+			await self.db_handler.run(self.db_handler.answers_outbox.mark_answer_delivered, answer.answer_id)
+	
+	async def deliver_pending_answers(self, bot: Bot):
+		"""
+        Delivers all answers that are due.
+
+        Args:
+            bot (Bot): The bot used to send messages.
+        """
+		answers = await self.db_handler.run(self.db_handler.answers_outbox.get_pending_answers, self.batch_size)
+		
+		while answers:
+			for answer in answers:
+				await self.deliver_answer(bot, answer)
+			
+			answers = await self.db_handler.run(self.db_handler.answers_outbox.get_pending_answers, self.batch_size)
+	
+	async def run(self, bot: Bot):
+		"""
+        Delivers answers until cancelled. Sleeps until the next retry is due, the poll interval passes or notify is called.
+
+        Args:
+            bot (Bot): The bot used to send messages.
+        """
+		while True:
+			self._wake_up.clear()
+			
+			try:
+				await self.deliver_pending_answers(bot)
+				seconds_to_next_answer = await self.db_handler.run(self.db_handler.answers_outbox.get_seconds_to_next_answer)
+			except DatabaseUnavailableError:
+				seconds_to_next_answer = None
+			except Exception:
+				logging.exception("Answers delivery failed")
+				seconds_to_next_answer = None
+			
+			timeout = self.poll_interval if seconds_to_next_answer is None else min(max(seconds_to_next_answer, 1), self.poll_interval)
+			
+			try:
+				await asyncio.wait_for(self._wake_up.wait(), timeout)
+			except asyncio.TimeoutError:
+				pass
+	
+	def start(self, bot: Bot):
+		"""
+        Starts the delivery task in the running event loop.
+
+        Args:
+            bot (Bot): The bot used to send messages.
+        """
+		if self._task is None:
+			self._task = asyncio.create_task(self.run(bot))
+	
+	async def stop(self):
+		"""Stops the delivery task. Undelivered answers stay in the outbox until the next start."""
+		if self._task is not None:
+			self._task.cancel()
+			
+			try:
+				await self._task
+			except asyncio.CancelledError:
+				pass
+			
+			self._task = None
\ No newline at end of file
@@ -1,8 +1,11 @@
+import typing
 from TelegramAnswerBot import (
 	functions,
 	objects_types
 )
+from TelegramAnswerBot.errors import DatabaseUnavailableError
 from TelegramAnswerBot.data_handlers.base import DataHandler
+from TelegramAnswerBot.data_handlers.retry import retry_transaction
 
 
 class FAQs_DataHandler(DataHandler):
@@ -143,28 +146,6 @@ class FAQs_DataHandler(DataHandler):
 		cursor.close()
 		connection.close()
 	
-	def create_table(self):
-		"""
-        Creates the 'faq' table if it doesn't exist.
-        """
-		connection, cursor = self.get_attributes()
-		
-		cursor.execute(
-				"""
-            CREATE TABLE IF NOT EXISTS faq (
-                faq_id INTEGER AUTO_INCREMENT,
-                question TEXT NOT NULL,
-                answer TEXT NOT NULL,
-                views_count INTEGER DEFAULT 0,
-                PRIMARY KEY (`faq_id`)
-            )
-            """
-		)
-		connection.commit()
-		
-		cursor.close()
-		connection.close()
-	
 	def delete_faq(self, faq_id: int):
 		"""
         Deletes a specific FAQ from the database. Also attempts to re-sequence faq_id values – This logic is flawed and prone to race conditions. It's generally not advisable to manually manipulate auto-incrementing IDs like this.
@@ -199,7 +180,35 @@ class FAQs_DataHandler(DataHandler):
 		cursor.close()
 		connection.close()
 	
-	def get_faq(self, faq_id: int) -> objects_types.FAQ_Dict:
+	def get_all_faqs(self) -> list[objects_types.FAQ_Row]:
+		"""
+        Retrieves all FAQs, for the snapshot of the degraded mode.
+
+        Returns:
+            list[objects_types.FAQ_Row]: All FAQs, by ID.
+        """
+		connection, cursor = self.get_read_attributes()
+		
+		cursor.execute(
+				f"""
+                SELECT
+                    {functions.get_db_columns(objects_types.FAQ_Row)}
+                FROM
+                    faq
+                ORDER BY
+                    faq_id
+                """
+		)
+		
+		faqs = list(map(objects_types.FAQ_Row._make, cursor.fetchall()))
+		
+		cursor.close()
+		connection.close()
+		
+		return faqs
+	
+	@retry_transaction
+	def get_faq(self, faq_id: int) -> typing.Optional[objects_types.FAQ_Row]:
 		"""
         Retrieves a specific FAQ from the database and increments its view count.
 
@@ -207,14 +216,17 @@ class FAQs_DataHandler(DataHandler):
             faq_id (int): The ID of the FAQ to retrieve.
 
         Returns:
-            objects_types.FAQ_Dict: A dictionary representing the FAQ data. Returns an empty dictionary if no FAQ with the given ID is found.
+            typing.Optional[objects_types.FAQ_Row]: The FAQ data, with the view counted. Returns None if no FAQ with the given ID is found. While the database is unavailable, the FAQ comes from the snapshot and the view isn't counted.
         """
-		connection, cursor = self.get_attributes()
+		try:
+			connection, cursor = self.get_attributes()
+		except DatabaseUnavailableError:
+			return self.degraded_mode.get_faq(faq_id)
 		
 		cursor.execute(
-				"""
+				f"""
                 SELECT
-                    *
+                    {functions.get_db_columns(objects_types.FAQ_Row)}
                 FROM
                     faq
                 WHERE
@@ -225,9 +237,9 @@ class FAQs_DataHandler(DataHandler):
 				(faq_id,)
 		)
 		
-		faq = functions.get_db_line_dict([header[0] for header in cursor.description], cursor.fetchone())
+		faq = cursor.fetchone()
 		
-		if faq:
+		if faq is not None:
 			cursor.execute(
 					"""
                     UPDATE
@@ -242,14 +254,15 @@ class FAQs_DataHandler(DataHandler):
 			)
 			connection.commit()
 		
-			faq["views_count"] += 1
+			faq = objects_types.FAQ_Row._make(faq)
+			faq = faq._replace(views_count=faq.views_count + 1)
 		
 		cursor.close()
 		connection.close()
 		
 		return faq
 	
-	def get_faq_group(self, faq_group_size: int, faq_group: int):
+	def get_faq_group(self, faq_group_size: int, faq_group: int) -> list[objects_types.FAQ_GroupRow]:
 		"""
         Retrieves a group of FAQs. The logic for calculating the offset appears incorrect (multiplies by 9, unclear why).
 
@@ -258,9 +271,12 @@ class FAQs_DataHandler(DataHandler):
             faq_group (int): The group number (starting from 0). The offset is calculated by multiplying this by 9. This calculation needs review.
 
         Returns:
-           pandas.DataFrame: A Pandas DataFrame containing the FAQs in the specified group.
+           list[objects_types.FAQ_GroupRow]: The FAQs in the specified group. Taken from the snapshot while the database is unavailable.
         """
-		connection, cursor = self.get_attributes()
+		try:
+			connection, cursor = self.get_read_attributes()
+		except DatabaseUnavailableError:
+			return self.degraded_mode.get_faq_group(faq_group_size, faq_group)
 		
 		cursor.execute(
 				"""
@@ -275,7 +291,7 @@ class FAQs_DataHandler(DataHandler):
 				(faq_group_size, faq_group * 9,)
 		)
 		
-		faq_group = functions.get_db_data_frame([header[0] for header in cursor.description], cursor.fetchall())
+		faq_group = list(map(objects_types.FAQ_GroupRow._make, cursor.fetchall()))
 		
 		cursor.close()
 		connection.close()
@@ -287,9 +303,12 @@ class FAQs_DataHandler(DataHandler):
         Retrieves the total number of FAQs in the database.
 
         Returns:
-            int: The total count of FAQs.
+            int: The total count of FAQs. Taken from the snapshot while the database is unavailable.
         """
-		connection, cursor = self.get_attributes()
+		try:
+			connection, cursor = self.get_read_attributes()
+		except DatabaseUnavailableError:
+			return self.degraded_mode.get_total_faqs_count()
 		
 		cursor.execute(
 				"""
@@ -1,9 +1,27 @@
+import time
+import typing
+import asyncio
+import logging
+import functools
+import threading
+import contextvars
 import mysql.connector
-from mysql.connector.pooling import MySQLConnectionPool
+import concurrent.futures
+from TelegramAnswerBot.system_paths import SystemPaths
+from TelegramAnswerBot.errors import DatabaseUnavailableError
 from TelegramAnswerBot.objects_types import MySQL_ConfigDict
+from TelegramAnswerBot.data_handlers.pool import ElasticConnectionPool
 from TelegramAnswerBot.data_handlers.FAQs import FAQs_DataHandler
+from TelegramAnswerBot.data_handlers.askers import AskersDataHandler
+from TelegramAnswerBot.data_handlers.outbox import AnswersOutboxDataHandler
 from TelegramAnswerBot.data_handlers.users import UsersDataHandler
 from TelegramAnswerBot.data_handlers.questions import QuestionsDataHandler
+from TelegramAnswerBot.data_handlers.replica import ReplicaRouter
+from TelegramAnswerBot.data_handlers.retry import RetryPolicy
+from TelegramAnswerBot.data_handlers.breaker import CircuitBreaker
+from TelegramAnswerBot.data_handlers.degraded import DegradedMode
+from TelegramAnswerBot.data_handlers.prepared import PreparedStatementsRegistry
+from TelegramAnswerBot.data_handlers.migrations import run_migrations
 
 
 class MySQLDataHandler:
@@ -11,20 +29,265 @@ class MySQLDataHandler:
     Manages database interactions using a MySQL connection pool. Serves as a central point of access for different data handlers (Users, FAQs, Questions).
 
     Attributes:
-        connection_pool (MySQLConnectionPool): The MySQL connection pool.
+        connection_pool (ElasticConnectionPool): The MySQL connection pool.
+        degraded_mode (DegradedMode): The circuit breaker of the primary database and the snapshot and questions queue used while it is open.
+        snapshot_interval (float): The time in seconds between refreshes of the degraded mode snapshot.
+        applied_migrations (typing.Optional[list[Migration]]): The schema migrations applied at startup, empty if the schema was up to date. None until the database is reachable if it wasn't at startup.
+        analytics_pool (ElasticConnectionPool): A separate, small pool for heavy reports (statistics, full question lists), whose SELECT statements have an execution time limit. An admin opening statistics can't take the connections askers need.
+        replica_pool (typing.Optional[ElasticConnectionPool]): The pool of the read replica, if one is configured. Its SELECT statements have the execution time limit of the analytics pool.
+        replica_router (ReplicaRouter): Sends the read-only queries of users without recent writes to the replica. Notified by every commit on the primary.
+        prepared_statements (PreparedStatementsRegistry): The prepared statements of the hot queries on the pooled connections, shared by all handlers. Its counters are logged at shutdown.
+        retry_policy (RetryPolicy): Retries calls that hit a deadlock or a lock wait timeout, shared by all handlers. Its counters are logged at shutdown.
+        askers_data (AskersDataHandler): The handler for users without a role.
         users_data (UsersDataHandler): The handler for user-related data.
         faqs_data (FAQs_DataHandler): The handler for FAQ-related data.
         questions_data (QuestionsDataHandler): The handler for question-related data.
+        answers_outbox (AnswersOutboxDataHandler): The handler for answers waiting for delivery.
+        executor (concurrent.futures.ThreadPoolExecutor): The threads running the database calls of the event loop, one per connection the main pool may open, so a call waiting for a connection or a query never blocks the loop.
+        analytics_executor (concurrent.futures.ThreadPoolExecutor): The threads running the heavy reports, one per connection of the analytics pool. Reports beyond that wait in its queue without holding a thread of the executor, which keeps them a bulkhead apart from interactive calls.
+        _maintenance_thread (typing.Optional[threading.Thread]): The running maintenance thread of the degraded mode.
+        _stop_maintenance (threading.Event): Stops the maintenance thread.
+        _wake_maintenance (threading.Event): Wakes up the maintenance thread before its next run, when the circuit breaker closed or the thread is stopped.
     """
 	
-	def __init__(self, users_data_pool_config: MySQL_ConfigDict):
+	def __init__(
+			self,
+			users_data_pool_config: MySQL_ConfigDict,
+			*,
+			users_cache_size: int = 10000,
+			users_cache_ttl: float = 300,
+			max_pool_size: int = 0,
+			pool_wait_timeout: float = 5,
+			pool_idle_timeout: float = 300,
+			analytics_pool_size: int = 2,
+			analytics_max_execution_time: float = 10,
+			replica_pool_config: typing.Optional[MySQL_ConfigDict] = None,
+			replica_sticky_time: float = 5,
+			pool_ping_interval: float = 60,
+			circuit_breaker_threshold: int = 5,
+			circuit_breaker_reset_timeout: float = 30,
+			snapshot_interval: float = 300
+	):
 		"""
-        Initializes the MySQLDataHandler with a connection pool and creates instances of the individual data handlers.
+        Initializes the MySQLDataHandler with a connection pool, migrates the database schema and creates instances of the individual data handlers. All arguments except the pool configuration are keyword-only, so settings can't be mixed up by their order.
 
         Args:
             users_data_pool_config (MySQL_ConfigDict): Configuration parameters for the MySQL connection pool.
+            users_cache_size (int): The maximum number of user rows cached by users_data.
+            users_cache_ttl (float): The time in seconds a user row stays cached.
+            max_pool_size (int): The number of connections the pool may grow to under load. Values below the configured pool_size disable growth.
+            pool_wait_timeout (float): The time in seconds a call waits for a free connection before failing.
+            pool_idle_timeout (float): The time in seconds after which connections opened under load are closed when idle.
+            analytics_pool_size (int): The number of connections of the analytics pool.
+            analytics_max_execution_time (float): The time in seconds after which the server stops a SELECT statement of the analytics pool. 0 disables the limit.
+            replica_pool_config (typing.Optional[MySQL_ConfigDict]): Configuration parameters for the read replica pool. None sends all queries to the primary.
+            replica_sticky_time (float): The time in seconds a user's reads stay on the primary after the user wrote.
+            pool_ping_interval (float): The time in seconds after which an unused connection is pinged before use, and the interval of the pools' health checks.
+            circuit_breaker_threshold (int): The number of failed connection attempts and lost connections in a row that switches to the degraded mode.
+            circuit_breaker_reset_timeout (float): The time in seconds between attempts to leave the degraded mode.
+            snapshot_interval (float): The time in seconds between refreshes of the degraded mode snapshot.
         """
-		self.connection_pool = mysql.connector.pooling.MySQLConnectionPool(**users_data_pool_config)
-		self.users_data = UsersDataHandler(self.connection_pool)
-		self.faqs_data = FAQs_DataHandler(self.connection_pool)
-		self.questions_data = QuestionsDataHandler(self.connection_pool)
+		self.connection_pool = ElasticConnectionPool(
+				max_pool_size=max_pool_size,
+				wait_timeout=pool_wait_timeout,
+				idle_timeout=pool_idle_timeout,
+				ping_interval=pool_ping_interval,
+				**users_data_pool_config
+		)
+		self.degraded_mode = DegradedMode(
+				CircuitBreaker(circuit_breaker_threshold, circuit_breaker_reset_timeout),
+				SystemPaths.db_snapshot,
+				SystemPaths.questions_queue
+		)
+		self.degraded_mode.circuit_breaker.on_close = self.wake_maintenance
+		self.connection_pool.on_query_result = self.degraded_mode.circuit_breaker.record_result
+		self.snapshot_interval = snapshot_interval
+		
+		try:
+			self.applied_migrations = run_migrations(self.connection_pool)
+		except mysql.connector.Error as error:
+			logging.warning("Database is unavailable at start, running in degraded mode: %s", error)
+			self.applied_migrations = None
+			self.degraded_mode.circuit_breaker.trip()
+		
+		self.analytics_pool = ElasticConnectionPool(
+				**{
+					**users_data_pool_config,
+					"pool_name": f"{users_data_pool_config['pool_name']}_analytics",
+					"pool_size": analytics_pool_size
+				},
+				max_pool_size=analytics_pool_size,
+				wait_timeout=pool_wait_timeout,
+				idle_timeout=pool_idle_timeout,
+				ping_interval=pool_ping_interval,
+				init_command=f"SET SESSION max_execution_time = {int(analytics_max_execution_time * 1000)}"
+		)
+		self.analytics_pool.on_query_result = self.degraded_mode.circuit_breaker.record_result
+		self.replica_pool = ElasticConnectionPool(
+				max_pool_size=max_pool_size,
+				wait_timeout=pool_wait_timeout,
+				idle_timeout=pool_idle_timeout,
+				ping_interval=pool_ping_interval,
+				init_command=f"SET SESSION max_execution_time = {int(analytics_max_execution_time * 1000)}",
+				**replica_pool_config
+		) if replica_pool_config is not None else None
+		self.replica_router = ReplicaRouter(self.replica_pool, replica_sticky_time)
+		self.connection_pool.on_commit = self.replica_router.record_write
+		self.prepared_statements = PreparedStatementsRegistry()
+		self.retry_policy = RetryPolicy()
+		self.askers_data = AskersDataHandler(self.connection_pool, retry_policy=self.retry_policy, degraded_mode=self.degraded_mode, prepared_statements=self.prepared_statements)
+		self.users_data = UsersDataHandler(self.connection_pool, self.analytics_pool, self.replica_router, self.retry_policy, self.degraded_mode, users_cache_size, users_cache_ttl, self.prepared_statements)
+		self.faqs_data = FAQs_DataHandler(self.connection_pool, replica_router=self.replica_router, retry_policy=self.retry_policy, degraded_mode=self.degraded_mode)
+		self.questions_data = QuestionsDataHandler(self.connection_pool, self.analytics_pool, self.replica_router, self.retry_policy, self.degraded_mode)
+		self.answers_outbox = AnswersOutboxDataHandler(self.connection_pool, retry_policy=self.retry_policy, degraded_mode=self.degraded_mode, prepared_statements=self.prepared_statements)
+		self.executor = concurrent.futures.ThreadPoolExecutor(self.connection_pool.max_pool_size, thread_name_prefix="database")
+		self.analytics_executor = concurrent.futures.ThreadPoolExecutor(analytics_pool_size, thread_name_prefix="database_analytics")
+		
+		self._maintenance_thread: typing.Optional[threading.Thread] = None
+		self._stop_maintenance = threading.Event()
+		self._wake_maintenance = threading.Event()
+	
+	def check_database(self):
+		"""
+        Runs a trivial query on the primary database. While the circuit breaker is open, this is its probe: the breaker closes if the server answers.
+        """
+		connection, cursor = self.users_data.get_attributes()
+		
+		try:
+			cursor.execute("SELECT 1")
+			cursor.fetchall()
+		finally:
+			cursor.close()
+			connection.close()
+	
+	def get_pools(self) -> list[ElasticConnectionPool]:
+		"""
+        Returns all connection pools: the main one, the analytics one and the replica one if configured.
+
+        Returns:
+            list[ElasticConnectionPool]: The pools.
+        """
+		return [pool for pool in (self.connection_pool, self.analytics_pool, self.replica_pool) if pool is not None]
+	
+	def recover(self):
+		"""
+        Migrates the schema if the database was unreachable at startup and inserts the questions queued during an outage. Run by the maintenance thread while the circuit breaker is closed. A failed migration opens the breaker again; a failed replay is retried on the next run.
+        """
+		if self.applied_migrations is None:
+			try:
+				self.applied_migrations = run_migrations(self.connection_pool)
+			except mysql.connector.Error as error:
+				logging.warning("Migrating the database schema failed: %s", error)
+				self.degraded_mode.circuit_breaker.trip()
+				return
+		
+		try:
+			self.questions_data.replay_queued_questions()
+		except (DatabaseUnavailableError, mysql.connector.Error) as error:
+			logging.warning("Replaying the queued questions failed: %s", error)
+	
+	def refresh_snapshot(self):
+		"""Reads the FAQs, roles and chats receiving messages into the degraded mode snapshot and saves it."""
+		self.degraded_mode.set_snapshot(
+				self.faqs_data.get_all_faqs(),
+				self.users_data.get_all_roles_abilities(),
+				self.users_data.get_chats_receiving_messages()
+		)
+		self.degraded_mode.save_snapshot()
+	
+	def run_maintenance(self):
+		"""
+        Runs the maintenance thread until stop_health_checks is called. Every reset_timeout seconds of the circuit breaker, and right after the breaker closed, it probes the primary database while the breaker is open, recovers from an outage while it is closed, and refreshes the snapshot every snapshot_interval seconds. Recovery runs here rather than in the thread whose call closed the breaker, so no user's call waits for migrations or the replay.
+        """
+		circuit_breaker = self.degraded_mode.circuit_breaker
+		snapshot_refreshed_at = -self.snapshot_interval
+		
+		while True:
+			self._wake_maintenance.clear()
+			
+			try:
+				if not circuit_breaker.is_closed():
+					self.check_database()
+				
+				if circuit_breaker.is_closed():
+					self.recover()
+				
+				if time.monotonic() - snapshot_refreshed_at >= self.snapshot_interval:
+					self.refresh_snapshot()
+					snapshot_refreshed_at = time.monotonic()
+			except DatabaseUnavailableError:
+				pass
+			except (OSError, mysql.connector.Error) as error:
+				logging.warning("Database maintenance failed: %s", error)
+			
+			self._wake_maintenance.wait(circuit_breaker.reset_timeout)
+			
+			if self._stop_maintenance.is_set():
+				return
+	
+	def shutdown_executors(self):
+		"""Waits for the running database calls and stops the threads of both executors. Called after the last write at shutdown."""
+		self.executor.shutdown()
+		self.analytics_executor.shutdown()
+	
+	def start_health_checks(self):
+		"""Starts the health check threads of all pools and the maintenance thread of the degraded mode."""
+		for pool in self.get_pools():
+			pool.start_health_checks()
+		
+		if self._maintenance_thread is None:
+			self._stop_maintenance.clear()
+			self._maintenance_thread = threading.Thread(target=self.run_maintenance, name="database_maintenance", daemon=True)
+			self._maintenance_thread.start()
+	
+	def stop_health_checks(self):
+		"""Stops the health check threads of all pools and the maintenance thread."""
+		for pool in self.get_pools():
+			pool.stop_health_checks()
+		
+		if self._maintenance_thread is not None:
+			self._stop_maintenance.set()
+			self._wake_maintenance.set()
+			self._maintenance_thread.join()
+			self._maintenance_thread = None
+	
+	def wake_maintenance(self):
+		"""Wakes up the maintenance thread, so it recovers right after the circuit breaker closed."""
+		self._wake_maintenance.set()
+	
+	async def run(self, function: typing.Callable, *args: typing.Any, **kwargs: typing.Any) -> typing.Any:
+		"""
+        Runs a database call in the executor and waits for it without blocking the event loop. The context variables (the current user of the replica router) are copied into the thread.
+
+        Args:
+            function (typing.Callable): The method of a data handler.
+            *args (typing.Any): The positional arguments of the method.
+            **kwargs (typing.Any): The keyword arguments of the method.
+
+        Returns:
+            typing.Any: The result of the method.
+
+        :Usage:
+            role, initialized = await db_handler.run(db_handler.users_data.get_user_role, user_id, username)
+        """
+		return await asyncio.get_running_loop().run_in_executor(
+				self.executor,
+				functools.partial(contextvars.copy_context().run, function, *args, **kwargs)
+		)
+	
+	async def run_analytics(self, function: typing.Callable, *args: typing.Any, **kwargs: typing.Any) -> typing.Any:
+		"""
+        Runs a heavy report in the analytics executor, like run does for other database calls.
+
+        Args:
+            function (typing.Callable): The report method of a data handler, one using the analytics pool.
+            *args (typing.Any): The positional arguments of the method.
+            **kwargs (typing.Any): The keyword arguments of the method.
+
+        Returns:
+            typing.Any: The result of the method.
+        """
+		return await asyncio.get_running_loop().run_in_executor(
+				self.analytics_executor,
+				functools.partial(contextvars.copy_context().run, function, *args, **kwargs)
+		)
\ No newline at end of file
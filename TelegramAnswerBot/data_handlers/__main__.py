@@ -0,0 +1,5 @@
+import sys
+from TelegramAnswerBot.data_handlers.migrations import render_schema_dump
+
+
+sys.stdout.write(render_schema_dump())
\ No newline at end of file
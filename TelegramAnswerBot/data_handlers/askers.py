@@ -0,0 +1,83 @@
+import typing
+from telegram.ext import ContextTypes
+from TelegramAnswerBot.errors import DatabaseUnavailableError
+from TelegramAnswerBot.data_handlers.base import DataHandler
+
+
+class AskersDataHandler(DataHandler):
+	"""
+    Manages users without a role (askers) stored in a lightweight database table named 'askers', keyed by Telegram user ID. Only the chosen language is stored; a row is created when an asker picks a language, so people who just open the bot leave no row at all. The username is kept so that a role can be given to a known asker by username. Staff stay in the small 'users' table.
+    """
+	
+	def get_asker_language(self, user_id: int) -> typing.Optional[str]:
+		"""
+        Retrieves the language of an asker.
+
+        Args:
+            user_id (int): The Telegram ID of the asker.
+
+        Returns:
+            typing.Optional[str]: The asker's language, or None if the asker hasn't chosen one.
+        """
+		connection, cursor = self.execute_prepared(
+				"""
+                SELECT
+                    language
+                FROM
+                    askers
+                WHERE
+                    user_id = %s
+                LIMIT 1
+                """,
+				(user_id,)
+		)
+		askers = cursor.fetchall()
+		
+		connection.close()
+		
+		return askers[0][0] if askers else None
+	
+	def update_language(
+			self,
+			user_id: int,
+			username: typing.Optional[str],
+			language: str,
+			context: ContextTypes.DEFAULT_TYPE
+	):
+		"""
+        Sets an asker's language, creating the asker's row if needed. While the database is unavailable, the language is only kept in user_data.
+
+        Args:
+            user_id (int): The Telegram ID of the asker.
+            username (typing.Optional[str]): The current username of the asker. Lets a role be given to the asker by username.
+            language (str): The chosen language.
+            context (ContextTypes.DEFAULT_TYPE): The Telegram bot context.
+        """
+		context.user_data["language"] = language
+		
+		try:
+			connection, cursor = self.get_attributes()
+			
+			cursor.execute(
+					"""
+                INSERT INTO
+                    askers (
+                        user_id,
+                        username,
+                        language
+                    )
+                VALUES
+                    (%s, %s, %s) AS new
+                ON DUPLICATE KEY UPDATE
+                    username = new.username,
+                    language = new.language
+                """,
+					(user_id, username, language)
+			)
+		except DatabaseUnavailableError:
+			return
+		
+		connection.commit()
+		
+		cursor.close()
+		connection.close()
\ No newline at end of file
@@ -1,17 +1,38 @@
+import typing
 import mysql.connector
-from mysql.connector.cursor import MySQLCursor
-from mysql.connector.pooling import PooledMySQLConnection
+from TelegramAnswerBot.errors import DatabaseUnavailableError
+from TelegramAnswerBot.data_handlers.degraded import DegradedMode
+from TelegramAnswerBot.data_handlers.replica import ReplicaRouter
+from TelegramAnswerBot.data_handlers.prepared import PreparedStatementsRegistry
+from TelegramAnswerBot.data_handlers.retry import (
+	RetryPolicy,
+	attempt_connections
+)
+from TelegramAnswerBot.data_handlers.pool import (
+	ElasticConnectionPool,
+	PooledConnection,
+	is_connection_error
+)
+from mysql.connector.cursor import (
+	MySQLCursor,
+	MySQLCursorPrepared
+)
 
 
 class DataHandler:
 	"""
-    Handles database interactions, specifically for managing a table (although the `create_table` method is currently a placeholder). Uses a connection pool for efficient resource management.
+    Handles database interactions for a group of tables. The tables themselves are created and upgraded by the schema migrations (see data_handlers.migrations). Uses a connection pool for efficient resource management.
 
     Attributes:
-        connection_pool (mysql.connector.pooling.MySQLConnectionPool): The MySQL connection pool used for database interactions.
+        connection_pool (ElasticConnectionPool): The MySQL connection pool used for database interactions.
+        analytics_pool (ElasticConnectionPool): The separate pool for heavy reports, so they can't take the connections of interactive calls.
+        replica_router (typing.Optional[ReplicaRouter]): Sends read-only queries to a replica. None keeps them on the primary.
+        retry_policy (RetryPolicy): Decides which calls of methods decorated with retry_transaction are run again after a deadlock or lock wait timeout, shared by all handlers.
+        degraded_mode (typing.Optional[DegradedMode]): Guards connections to the primary database with a circuit breaker and holds the data served while it is open. None disables the breaker.
+        prepared_statements (PreparedStatementsRegistry): The prepared statements of the hot queries on the pooled connections, shared by all handlers.
 
     :Usage:
-        # Assuming 'pool' is a pre-existing MySQLConnectionPool instance
+        # Assuming 'pool' is a pre-existing ElasticConnectionPool instance
         data_handler = DataHandler(pool)
         connection, cursor = data_handler.get_attributes()
 
@@ -20,34 +41,158 @@ class DataHandler:
         connection.close()
     """
 	
-	def __init__(self, connection_pool: mysql.connector.pooling.MySQLConnectionPool):
+	def __init__(
+			self,
+			connection_pool: ElasticConnectionPool,
+			analytics_pool: typing.Optional[ElasticConnectionPool] = None,
+			replica_router: typing.Optional[ReplicaRouter] = None,
+			retry_policy: typing.Optional[RetryPolicy] = None,
+			degraded_mode: typing.Optional[DegradedMode] = None,
+			prepared_statements: typing.Optional[PreparedStatementsRegistry] = None
+	):
 		"""
-        Initializes the DataHandler with a connection pool and creates the necessary table (if it doesn't exist).
+        Initializes the DataHandler with a connection pool. The schema must be migrated beforehand.
 
         Args:
-            connection_pool (mysql.connector.pooling.MySQLConnectionPool): The connection pool to use for database access.
+            connection_pool (ElasticConnectionPool): The connection pool to use for database access.
+            analytics_pool (typing.Optional[ElasticConnectionPool]): The pool for heavy reports. Defaults to connection_pool.
+            replica_router (typing.Optional[ReplicaRouter]): Sends read-only queries to a replica.
+            retry_policy (typing.Optional[RetryPolicy]): The retry policy of deadlocked calls. Defaults to a policy of this handler only.
+            degraded_mode (typing.Optional[DegradedMode]): The circuit breaker and the data served while it is open.
+            prepared_statements (typing.Optional[PreparedStatementsRegistry]): The prepared statements of the pooled connections. Defaults to a registry of this handler only.
         """
 		self.connection_pool = connection_pool
+		self.analytics_pool = analytics_pool if analytics_pool is not None else connection_pool
+		self.replica_router = replica_router
+		self.retry_policy = retry_policy if retry_policy is not None else RetryPolicy()
+		self.degraded_mode = degraded_mode
+		self.prepared_statements = prepared_statements if prepared_statements is not None else PreparedStatementsRegistry()
+	
+	def execute_prepared(self, query: str, params: tuple = ()) -> tuple[PooledConnection, MySQLCursorPrepared]:
+		"""
+        Executes a query on the primary database through its prepared statement, which is kept open with the pooled connection. Only the connection has to be closed after usage, and the results must be read completely before that, with fetchall.
+
+        Meant for short, hot queries: the statement is parsed once per connection, and later calls send only its ID and the parameters, in one round trip like a plain query (see PreparedStatementsRegistry).
+
+        Args:
+            query (str): The query text, with `%s` placeholders.
+            params (tuple): The parameters of the query.
+
+        Returns:
+            tuple[PooledConnection, MySQLCursorPrepared]: The connection and the cursor holding the result.
+
+        :Usage:
+            connection, cursor = data_handler.execute_prepared("SELECT role FROM users WHERE user_id = %s", (user_id,))
+            rows = cursor.fetchall()
+            connection.close()
+        """
+		connection = self.get_connection()
+		cursor, query = self.prepared_statements.get_cursor(connection, query)
 		
-		self.create_table()
+		try:
+			cursor.execute(query, params)
+		except Exception:
+			connection.close()
+			raise
+		
+		return connection, cursor
 	
-	def create_table(self):
+	def get_analytics_attributes(self) -> tuple[PooledConnection, MySQLCursor]:
 		"""
-        (Placeholder) Intended to create the required database table. Currently does nothing. Needs implementation.
+        Gets a connection and cursor from the analytics pool, for heavy reports. Their SELECT statements are stopped by the server after the pool's execution time limit. Reports only read, so they go to the replica if the replica router allows it. Close both after usage, like with get_attributes.
+
+        Returns:
+            tuple[PooledConnection, MySQLCursor]: A tuple containing the connection and cursor objects.
         """
-		pass
+		connection = self.get_connection(self.get_read_pool() or self.analytics_pool)
+		cursor = connection.cursor()
+		
+		return connection, cursor
 	
-	def get_attributes(self) -> tuple[PooledMySQLConnection, MySQLCursor]:
+	def get_attributes(self) -> tuple[PooledConnection, MySQLCursor]:
 		"""
         Gets a database connection and cursor from the pool. It's crucial to close the cursor and connection after usage to return them to the pool.
 
         Returns:
-            tuple[PooledMySQLConnection, MySQLCursor]: A tuple containing the connection and cursor objects.
+            tuple[PooledConnection, MySQLCursor]: A tuple containing the connection and cursor objects.
 
         :Usage:
             connection, cursor = data_handler.get_attributes()
         """
-		connection = self.connection_pool.get_connection()
+		connection = self.get_connection()
 		cursor = connection.cursor()
 		
 		return connection, cursor
+	
+	def get_connection(self, pool: typing.Optional[ElasticConnectionPool] = None) -> PooledConnection:
+		"""
+        Gets a connection from the pool. Sessions are not reset when connections are returned, so a transaction left open by a read of the previous user is rolled back here; the check is client-side and costs nothing otherwise. Inside a method decorated with retry_transaction, the connection is also recorded for the attempt.
+
+        Connections to the primary database go through the circuit breaker of degraded_mode: while it is open, or if the server can't be reached, DatabaseUnavailableError is raised, which methods with a fallback catch. Other errors, like a PoolError when all connections stayed busy for wait_timeout, are raised as they are and don't count as failures of the breaker, so a load burst doesn't switch a healthy database to the degraded mode. Whether the queries on the connection reach the server is reported to the breaker by the pool. The replica isn't guarded.
+
+        Args:
+            pool (typing.Optional[ElasticConnectionPool]): The pool to take the connection from. Defaults to connection_pool.
+
+        Returns:
+            PooledConnection: The connection.
+
+        Raises:
+            DatabaseUnavailableError: If the primary database is unavailable.
+            PoolError: If no connection became free within the pool's wait_timeout.
+        """
+		pool = pool or self.connection_pool
+		circuit_breaker = self.degraded_mode.circuit_breaker if self.degraded_mode is not None and pool is not self.get_replica_pool() else None
+		
+		if circuit_breaker is None:
+			connection = pool.get_connection()
+		else:
+			circuit_breaker.before_call()
+			
+			try:
+				connection = pool.get_connection()
+			except mysql.connector.Error as error:
+				if not is_connection_error(error):
+					raise
+				
+				circuit_breaker.record_failure()
+				raise DatabaseUnavailableError(str(error)) from error
+		
+		if connection.in_transaction:
+			connection.rollback()
+		
+		connections = attempt_connections.get()
+		
+		if connections is not None:
+			connections.append(connection)
+		
+		return connection
+	
+	def get_read_attributes(self) -> tuple[PooledConnection, MySQLCursor]:
+		"""
+        Gets a connection and cursor for a read-only query: from the replica if the replica router allows it, from the primary otherwise. Close both after usage, like with get_attributes.
+
+        Returns:
+            tuple[PooledConnection, MySQLCursor]: A tuple containing the connection and cursor objects.
+        """
+		connection = self.get_connection(self.get_read_pool())
+		cursor = connection.cursor()
+		
+		return connection, cursor
+	
+	def get_read_pool(self) -> typing.Optional[ElasticConnectionPool]:
+		"""
+        Returns the replica pool if the current read may go to the replica.
+
+        Returns:
+            typing.Optional[ElasticConnectionPool]: The replica pool, or None if the read must go to the primary.
+        """
+		return self.replica_router.get_read_pool() if self.replica_router is not None else None
+	
+	def get_replica_pool(self) -> typing.Optional[ElasticConnectionPool]:
+		"""
+        Returns the pool of the replica, if one is configured.
+
+        Returns:
+            typing.Optional[ElasticConnectionPool]: The replica pool, or None.
+        """
+		return self.replica_router.replica_pool if self.replica_router is not None else None
\ No newline at end of file
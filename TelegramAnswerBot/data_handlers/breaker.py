@@ -0,0 +1,138 @@
+import time
+import typing
+import logging
+import threading
+from TelegramAnswerBot.errors import DatabaseUnavailableError
+
+
+class CircuitBreaker:
+	"""
+    Stops calls to the primary database after repeated failures, so they fail at once instead of each one waiting for the pool.
+
+    Failures are failed connection checkouts and queries that lost the connection; successes are queries the server answered. A checkout alone doesn't count as a success, because a pooled connection is handed out without a round trip.
+
+    States:
+        "closed" - calls go through. failure_threshold failures in a row open the breaker.
+        "open" - calls fail with DatabaseUnavailableError without touching the pool. After reset_timeout seconds the next call is let through as a probe.
+        "half_open" - one probe call is in flight; the others still fail. Its first query closes the breaker if the server answers and opens it again otherwise. A probe that reports nothing within reset_timeout seconds is replaced by the next call.
+
+    Attributes:
+        failure_threshold (int): The number of failures in a row that opens the breaker.
+        reset_timeout (float): The time in seconds the breaker stays open before a probe.
+        on_close (typing.Optional[typing.Callable[[], typing.Any]]): Called after the breaker closed again, by the thread of the successful probe. It must return at once, the recovery itself belongs to another thread.
+        state (str): The current state.
+        failures_count (int): The number of failures in a row.
+        trips_count (int): The number of times the breaker opened.
+        rejected_count (int): The number of calls failed without touching the pool.
+        _opened_at (float): The time the breaker opened or let its last probe through.
+        _lock (threading.Lock): Guards the state; calls come from the threads of the database executor and the maintenance thread.
+    """
+	
+	def __init__(self, failure_threshold: int, reset_timeout: float):
+		"""
+        Initializes the CircuitBreaker.
+
+        Args:
+            failure_threshold (int): The number of failures in a row that opens the breaker.
+            reset_timeout (float): The time in seconds the breaker stays open before a probe.
+        """
+		self.failure_threshold = failure_threshold
+		self.reset_timeout = reset_timeout
+		self.on_close: typing.Optional[typing.Callable[[], typing.Any]] = None
+		
+		self.state = "closed"
+		self.failures_count = 0
+		self.trips_count = 0
+		self.rejected_count = 0
+		
+		self._opened_at = 0.0
+		self._lock = threading.Lock()
+	
+	def before_call(self):
+		"""
+        Lets a call through or fails it.
+
+        Raises:
+            DatabaseUnavailableError: If the breaker is open, or half open with a probe in flight.
+        """
+		with self._lock:
+			if self.state == "closed":
+				return
+			
+			if time.monotonic() - self._opened_at >= self.reset_timeout:
+				self.state = "half_open"
+				self._opened_at = time.monotonic()
+				return
+			
+			self.rejected_count += 1
+		
+		raise DatabaseUnavailableError("the circuit breaker is open")
+	
+	def get_stats(self) -> dict[str, typing.Any]:
+		"""
+        Returns the state and the counters of the breaker.
+
+        Returns:
+            dict[str, typing.Any]: The "state", and the number of "trips" and "rejected" calls.
+        """
+		return {"state": self.state, "trips": self.trips_count, "rejected": self.rejected_count}
+	
+	def is_closed(self) -> bool:
+		"""
+        Checks whether calls go through.
+
+        Returns:
+            bool: True if the breaker is closed.
+        """
+		return self.state == "closed"
+	
+	def record_failure(self):
+		"""Counts a failed call and opens the breaker after failure_threshold failures in a row or a failed probe."""
+		with self._lock:
+			self.failures_count += 1
+			
+			if self.state == "open" or (self.state == "closed" and self.failures_count < self.failure_threshold):
+				return
+			
+			self.state = "open"
+			self._opened_at = time.monotonic()
+			self.trips_count += 1
+		
+		logging.warning("Database circuit breaker opened after %d failed calls", self.failures_count)
+	
+	def record_result(self, succeeded: bool):
+		"""
+        Counts the result of a query, see ElasticConnectionPool.on_query_result.
+
+        Args:
+            succeeded (bool): Whether the server answered.
+        """
+		if succeeded:
+			self.record_success()
+		else:
+			self.record_failure()
+	
+	def record_success(self):
+		"""Counts a successful call and closes the breaker if it wasn't closed."""
+		if self.state == "closed" and self.failures_count == 0:
+			return
+		
+		with self._lock:
+			self.failures_count = 0
+			
+			if self.state == "closed":
+				return
+			
+			self.state = "closed"
+		
+		logging.info("Database circuit breaker closed")
+		
+		if self.on_close is not None:
+			self.on_close()
+	
+	def trip(self):
+		"""Opens the breaker at once, e.g. when the database is unreachable at startup."""
+		with self._lock:
+			self.state = "open"
+			self._opened_at = time.monotonic()
+			self.trips_count += 1
\ No newline at end of file
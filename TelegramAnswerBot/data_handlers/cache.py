@@ -0,0 +1,112 @@
+import time
+import typing
+import threading
+import collections
+
+
+MISSING = object()
+
+
+class LRUCache:
+	"""
+    A bounded least-recently-used cache whose entries expire after a time to live.
+
+    When the cache is full, the least recently used entry is dropped. Expired entries are dropped when they are looked up.
+
+    Attributes:
+        max_size (int): The maximum number of entries.
+        ttl (float): The time in seconds an entry stays valid.
+        hits (int): The number of lookups answered from the cache.
+        misses (int): The number of lookups of missing or expired entries.
+        _entries (collections.OrderedDict[typing.Hashable, tuple[float, typing.Any]]): The expiration times and values of the entries, from the least to the most recently used.
+        _lock (threading.Lock): Guards the entries; the cache is used by the threads of the database executor.
+    """
+	
+	def __init__(self, max_size: int, ttl: float):
+		"""
+        Initializes the LRUCache.
+
+        Args:
+            max_size (int): The maximum number of entries. 0 disables the cache.
+            ttl (float): The time in seconds an entry stays valid.
+        """
+		self.max_size = max_size
+		self.ttl = ttl
+		
+		self.hits = 0
+		self.misses = 0
+		
+		self._entries: collections.OrderedDict[typing.Hashable, tuple[float, typing.Any]] = collections.OrderedDict()
+		self._lock = threading.Lock()
+	
+	def __len__(self) -> int:
+		"""Returns the number of entries, including expired ones not looked up yet."""
+		return len(self._entries)
+	
+	def clear(self):
+		"""Drops all entries."""
+		with self._lock:
+			self._entries.clear()
+	
+	def get(self, key: typing.Hashable, default: typing.Any = None) -> typing.Any:
+		"""
+        Returns the value of a valid entry and marks it as recently used.
+
+        Args:
+            key (typing.Hashable): The key of the entry.
+            default (typing.Any): The value returned on a miss. Pass a sentinel to tell a miss from a stored None.
+
+        Returns:
+            typing.Any: The value, or `default` if the entry is missing or expired.
+        """
+		with self._lock:
+			entry = self._entries.get(key)
+			
+			if entry is None or entry[0] < time.monotonic():
+				if entry is not None:
+					del self._entries[key]
+				
+				self.misses += 1
+				return default
+			
+			self._entries.move_to_end(key)
+			self.hits += 1
+		
+		return entry[1]
+	
+	def get_stats(self) -> dict[str, int]:
+		"""
+        Returns the size and the hit and miss counters of the cache.
+
+        Returns:
+            dict[str, int]: The "size", "hits" and "misses" of the cache.
+        """
+		return {"size": len(self._entries), "hits": self.hits, "misses": self.misses}
+	
+	def pop(self, key: typing.Hashable):
+		"""
+        Drops an entry if it exists.
+
+        Args:
+            key (typing.Hashable): The key of the entry.
+        """
+		with self._lock:
+			self._entries.pop(key, None)
+	
+	def set(self, key: typing.Hashable, value: typing.Any):
+		"""
+        Stores a value, dropping the least recently used entry if the cache is full.
+
+        Args:
+            key (typing.Hashable): The key of the entry.
+            value (typing.Any): The value to store.
+        """
+		if self.max_size <= 0:
+			return
+		
+		with self._lock:
+			self._entries[key] = (time.monotonic() + self.ttl, value)
+			self._entries.move_to_end(key)
+			
+			while len(self._entries) > self.max_size:
+				self._entries.popitem(last=False)
\ No newline at end of file
@@ -0,0 +1,280 @@
+import os
+import json
+import time
+import typing
+import pathlib
+import logging
+import threading
+import dataclasses
+from TelegramAnswerBot import objects_types
+from TelegramAnswerBot.errors import DatabaseUnavailableError
+from TelegramAnswerBot.data_handlers.breaker import CircuitBreaker
+
+
+class DegradedMode:
+	"""
+    Serves what can be served without the primary database while its circuit breaker is open.
+
+    FAQs, role abilities and the chats of staff receiving messages are kept in a last-known-good snapshot. MySQLDataHandler refreshes it while the database works and saves it to snapshot_path, so a bot started during an outage has it too. New questions are appended to the file at questions_queue_path, one JSON object per line, and inserted into 'questions' once the database is back. Replayed questions are moved to a second file first, which is removed only after their insert is committed.
+
+    Attributes:
+        circuit_breaker (CircuitBreaker): The circuit breaker of the primary database.
+        snapshot_path (pathlib.Path): The file of the snapshot.
+        questions_queue_path (pathlib.Path): The file of the questions asked during an outage.
+        replayed_questions_path (pathlib.Path): The file of the questions being replayed.
+        faqs (list[objects_types.FAQ_Row]): The FAQs of the snapshot, by ID.
+        roles_abilities (dict[str, objects_types.RoleAbilities]): The abilities of the snapshot by role name.
+        chats_receiving_messages (list[int]): The chats of the snapshot that are notified about new questions.
+        snapshot_date (typing.Optional[float]): The Unix time the snapshot was taken. None if there is no snapshot.
+        queued_questions_count (int): The number of questions queued since the start.
+        replayed_questions_count (int): The number of queued questions inserted since the start.
+        _queue_lock (threading.Lock): Guards the queue files; questions are queued by the threads of the database executor and replayed by the maintenance thread.
+    """
+	
+	def __init__(self, circuit_breaker: CircuitBreaker, snapshot_path: pathlib.Path, questions_queue_path: pathlib.Path):
+		"""
+        Initializes the DegradedMode and loads the snapshot saved by an earlier run.
+
+        Args:
+            circuit_breaker (CircuitBreaker): The circuit breaker of the primary database.
+            snapshot_path (pathlib.Path): The file of the snapshot.
+            questions_queue_path (pathlib.Path): The file of the questions asked during an outage.
+        """
+		self.circuit_breaker = circuit_breaker
+		self.snapshot_path = snapshot_path
+		self.questions_queue_path = questions_queue_path
+		self.replayed_questions_path = questions_queue_path.with_name(f"{questions_queue_path.name}.replaying")
+		
+		self.faqs: list[objects_types.FAQ_Row] = []
+		self.roles_abilities: dict[str, objects_types.RoleAbilities] = {}
+		self.chats_receiving_messages: list[int] = []
+		self.snapshot_date: typing.Optional[float] = None
+		self.queued_questions_count = 0
+		self.replayed_questions_count = 0
+		
+		self._queue_lock = threading.Lock()
+		
+		self.load_snapshot()
+	
+	def drop_replayed_questions(self, replayed_questions_count: int):
+		"""
+        Removes the questions taken by take_queued_questions after they were inserted.
+
+        Args:
+            replayed_questions_count (int): The number of inserted questions.
+        """
+		with self._queue_lock:
+			self.replayed_questions_path.unlink(missing_ok=True)
+			self.replayed_questions_count += replayed_questions_count
+		
+		logging.info("Replayed %d questions asked while the database was unavailable", replayed_questions_count)
+	
+	def get_faq(self, faq_id: int) -> typing.Optional[objects_types.FAQ_Row]:
+		"""
+        Returns an FAQ of the snapshot. The view isn't counted.
+
+        Args:
+            faq_id (int): The ID of the FAQ.
+
+        Returns:
+            typing.Optional[objects_types.FAQ_Row]: The FAQ, or None if the snapshot has no FAQ with this ID.
+        """
+		return next((faq for faq in self.faqs if faq.faq_id == faq_id), None)
+	
+	def get_faq_group(self, faq_group_size: int, faq_group: int) -> list[objects_types.FAQ_GroupRow]:
+		"""
+        Returns a group of FAQs of the snapshot, with the offset of FAQs_DataHandler.get_faq_group.
+
+        Args:
+            faq_group_size (int): The number of FAQs in the group.
+            faq_group (int): The value get_faq_group multiplies by 9 to get the offset.
+
+        Returns:
+            list[objects_types.FAQ_GroupRow]: The FAQs of the group.
+        """
+		offset = faq_group * 9
+		
+		return [objects_types.FAQ_GroupRow(faq.faq_id, faq.question) for faq in self.faqs[offset:offset + faq_group_size]]
+	
+	def get_role_abilities(self, role_name: str) -> objects_types.RoleAbilities:
+		"""
+        Returns the abilities of a role from the snapshot.
+
+        Args:
+            role_name (str): The name of the role.
+
+        Returns:
+            objects_types.RoleAbilities: The abilities of the role.
+
+        Raises:
+            DatabaseUnavailableError: If the snapshot doesn't have the role.
+        """
+		role_abilities = self.roles_abilities.get(role_name)
+		
+		if role_abilities is None:
+			raise DatabaseUnavailableError(f"no snapshot of the '{role_name}' role")
+		
+		return role_abilities
+	
+	def get_stats(self) -> dict[str, typing.Any]:
+		"""
+        Returns the snapshot size and the queue counters.
+
+        Returns:
+            dict[str, typing.Any]: The number of "faqs" and the age in seconds ("snapshot_age") of the snapshot, and the number of "queued" and "replayed" questions.
+        """
+		return {
+			"faqs": len(self.faqs),
+			"snapshot_age": round(time.time() - self.snapshot_date) if self.snapshot_date is not None else None,
+			"queued": self.queued_questions_count,
+			"replayed": self.replayed_questions_count
+		}
+	
+	def get_total_faqs_count(self) -> int:
+		"""
+        Returns the number of FAQs of the snapshot.
+
+        Returns:
+            int: The number of FAQs.
+        """
+		return len(self.faqs)
+	
+	def load_snapshot(self):
+		"""Loads the snapshot saved by an earlier run, if there is one."""
+		if not self.snapshot_path.exists():
+			return
+		
+		try:
+			with open(self.snapshot_path, "r", encoding="utf-8") as file:
+				snapshot = json.load(file)
+			
+			self.set_snapshot(
+					[objects_types.FAQ_Row(*faq) for faq in snapshot["faqs"]],
+					{role_name: objects_types.RoleAbilities(**abilities) for role_name, abilities in snapshot["roles"].items()},
+					snapshot["chats_receiving_messages"]
+			)
+			self.snapshot_date = snapshot["snapshot_date"]
+		except (OSError, ValueError, KeyError, TypeError) as error:
+			logging.warning("Database snapshot %s can't be loaded: %s", self.snapshot_path, error)
+	
+	def queue_question(
+			self,
+			user_id: int,
+			chat_id: int,
+			message_id: int,
+			username: str,
+			first_name: str,
+			last_name: str,
+			question: str
+	):
+		"""
+        Appends a question to the queue file. The file is flushed to disk before returning, so the question survives a crash.
+
+        Args:
+            user_id (int): The ID of the user who asked the question.
+            chat_id (int): The ID of the chat where the question was asked.
+            message_id (int): The ID of the message containing the question.
+            username (str): The username of the user.
+            first_name (str): The first name of the user.
+            last_name (str): The last name of the user.
+            question (str): The text of the question.
+        """
+		line = json.dumps(
+				{
+					"user_id": user_id,
+					"chat_id": chat_id,
+					"message_id": message_id,
+					"username": username,
+					"first_name": first_name,
+					"last_name": last_name,
+					"question": question,
+					"asked_date": time.time()
+				},
+				ensure_ascii=False
+		)
+		
+		with self._queue_lock:
+			with open(self.questions_queue_path, "a", encoding="utf-8") as file:
+				file.write(line + "\n")
+				file.flush()
+				os.fsync(file.fileno())
+			
+			self.queued_questions_count += 1
+	
+	def save_snapshot(self):
+		"""Writes the snapshot to snapshot_path. The file is replaced at once, so a crash never leaves half of it."""
+		snapshot = {
+			"snapshot_date": self.snapshot_date,
+			"faqs": [list(faq) for faq in self.faqs],
+			"roles": {role_name: dataclasses.asdict(abilities) for role_name, abilities in self.roles_abilities.items()},
+			"chats_receiving_messages": self.chats_receiving_messages
+		}
+		temporary_path = self.snapshot_path.with_name(f"{self.snapshot_path.name}.tmp")
+		
+		with open(temporary_path, "w", encoding="utf-8") as file:
+			json.dump(snapshot, file, ensure_ascii=False)
+		
+		os.replace(temporary_path, self.snapshot_path)
+	
+	def set_snapshot(
+			self,
+			faqs: list[objects_types.FAQ_Row],
+			roles_abilities: dict[str, objects_types.RoleAbilities],
+			chats_receiving_messages: list[int]
+	):
+		"""
+        Replaces the snapshot with data just read from the database.
+
+        Args:
+            faqs (list[objects_types.FAQ_Row]): All FAQs, by ID.
+            roles_abilities (dict[str, objects_types.RoleAbilities]): The abilities of all roles by role name.
+            chats_receiving_messages (list[int]): The chats notified about new questions.
+        """
+		self.faqs = faqs
+		self.roles_abilities = roles_abilities
+		self.chats_receiving_messages = chats_receiving_messages
+		self.snapshot_date = time.time()
+	
+	def take_queued_questions(self) -> list[tuple]:
+		"""
+        Moves the queued questions to the replay file and returns all questions waiting for replay, including those of a replay that failed before. Lines cut off by a crash are skipped.
+
+        Returns:
+            list[tuple]: The questions as (user_id, chat_id, message_id, username, first_name, last_name, question, asked_date) tuples, asked_date as Unix time.
+        """
+		with self._queue_lock:
+			if self.questions_queue_path.exists():
+				with open(self.questions_queue_path, "r", encoding="utf-8") as queue_file, open(self.replayed_questions_path, "a", encoding="utf-8") as replay_file:
+					replay_file.write(queue_file.read())
+				
+				self.questions_queue_path.unlink()
+			
+			if not self.replayed_questions_path.exists():
+				return []
+			
+			with open(self.replayed_questions_path, "r", encoding="utf-8") as file:
+				lines = file.read().splitlines()
+		
+		questions = []
+		
+		for line in lines:
+			try:
+				question = json.loads(line)
+			except ValueError:
+				logging.warning("Skipping a broken line of the questions queue: %r", line)
+				continue
+			
+			questions.append(
+					(
+						question["user_id"],
+						question["chat_id"],
+						question["message_id"],
+						question["username"],
+						question["first_name"],
+						question["last_name"],
+						question["question"],
+						question["asked_date"]
+					)
+			)
+		
+		return questions
\ No newline at end of file
@@ -0,0 +1,423 @@
+import typing
+import textwrap
+from mysql.connector import errorcode
+from mysql.connector.cursor import MySQLCursor
+from mysql.connector.errors import ProgrammingError
+from TelegramAnswerBot.data_handlers.pool import ElasticConnectionPool
+
+
+class Migration(typing.NamedTuple):
+	"""
+    A versioned change of the database schema.
+
+    Attributes:
+        version (int): The number of the migration. Migrations are applied in ascending order and each one only once.
+        description (str): A short description, stored in 'schema_version'.
+        statements (tuple[str, ...]): SQL statements that apply the change. They are also written to the SQL dump, so they must be plain SQL that works on an empty database.
+        upgrade (typing.Optional[typing.Callable[[MySQLCursor], None]]): Called after the statements to bring tables of older layouts up to date. Isn't part of the SQL dump.
+    """
+	
+	version: int
+	description: str
+	statements: tuple[str, ...]
+	upgrade: typing.Optional[typing.Callable[[MySQLCursor], None]] = None
+
+
+SCHEMA_VERSION_TABLE = """
+CREATE TABLE IF NOT EXISTS schema_version (
+	version INTEGER NOT NULL,
+	description VARCHAR(255) NOT NULL,
+	applied_date TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+	PRIMARY KEY (`version`)
+)
+"""
+
+MIGRATIONS_LOCK_NAME = "telegram_answer_bot_migrations"
+MIGRATIONS_LOCK_TIMEOUT = 60
+
+
+def upgrade_legacy_schema(cursor: MySQLCursor):
+	"""
+    Brings tables created before versioned migrations up to date. Tables created by the first migration already have every column, so on them this is a single query.
+
+    Args:
+        cursor (MySQLCursor): A cursor on the primary database.
+    """
+	cursor.execute(
+			"""
+			SELECT
+				TABLE_NAME,
+				COLUMN_NAME
+			FROM
+				information_schema.COLUMNS
+			WHERE
+				TABLE_SCHEMA = DATABASE()
+				AND TABLE_NAME IN ("askers", "users", "questions")
+			"""
+	)
+	columns = {(table_name, column_name) for table_name, column_name in cursor.fetchall()}
+	
+	if ("askers", "username") not in columns:
+		cursor.execute("ALTER TABLE askers ADD COLUMN username VARCHAR(64) DEFAULT NULL AFTER user_id, ADD KEY `askers_username` (`username`)")
+	
+	if ("users", "user_id") not in columns:
+		upgrade_users_to_user_ids(cursor, ("users", "language") in columns)
+	
+	if ("questions", "moderator_id") not in columns:
+		cursor.execute(
+				"""
+				ALTER TABLE questions
+					ADD COLUMN moderator_id BIGINT DEFAULT NULL AFTER status,
+					ADD KEY `questions_moderator_id` (`moderator_id`)
+				"""
+		)
+		cursor.execute(
+				"""
+				UPDATE
+					questions
+				JOIN
+					users
+				ON
+					users.username = questions.moderator_username
+				SET
+					questions.moderator_id = users.user_id
+				WHERE
+					questions.moderator_username IS NOT NULL
+				"""
+		)
+
+
+def upgrade_users_to_user_ids(cursor: MySQLCursor, has_language_column: bool):
+	"""
+    Migrates a 'users' table keyed by username (older versions) to user IDs.
+
+    User IDs are taken from the private chat ID of users receiving messages and from the questions users asked. Staff whose ID can't be found get a pending role, claimed on their next contact with the bot. Users with the "user" role are moved to the 'askers' table.
+
+    Args:
+        cursor (MySQLCursor): A cursor on the primary database.
+        has_language_column (bool): Whether the old table already has the "language" column.
+    """
+	if not has_language_column:
+		cursor.execute("ALTER TABLE users ADD COLUMN language VARCHAR(2) DEFAULT NULL")
+	
+	cursor.execute("ALTER TABLE users ADD COLUMN user_id BIGINT DEFAULT NULL FIRST")
+	cursor.execute("UPDATE users SET user_id = chat_id WHERE chat_id IS NOT NULL")
+	cursor.execute(
+			"""
+			UPDATE
+				users
+			JOIN (
+				SELECT
+					username,
+					MAX(user_id) AS user_id
+				FROM
+					questions
+				WHERE
+					username IS NOT NULL
+				GROUP BY
+					username
+			) AS askers_ids
+			ON
+				askers_ids.username = users.username
+			SET
+				users.user_id = askers_ids.user_id
+			WHERE
+				users.user_id IS NULL
+			"""
+	)
+	cursor.execute(
+			"""
+			INSERT IGNORE INTO
+				askers (
+					user_id,
+					username,
+					language
+				)
+			SELECT
+				user_id,
+				username,
+				language
+			FROM
+				users
+			WHERE
+				role = "user"
+				AND user_id IS NOT NULL
+			"""
+	)
+	cursor.execute(
+			"""
+			INSERT IGNORE INTO
+				pending_roles (
+					username,
+					role
+				)
+			SELECT
+				username,
+				role
+			FROM
+				users
+			WHERE
+				role != "user"
+				AND user_id IS NULL
+			"""
+	)
+	cursor.execute('DELETE FROM users WHERE role = "user" OR user_id IS NULL')
+	cursor.execute(
+			"""
+			DELETE
+				duplicate
+			FROM
+				users AS duplicate
+			JOIN
+				users AS kept
+			ON
+				kept.user_id = duplicate.user_id
+				AND kept.username > duplicate.username
+			"""
+	)
+	cursor.execute(
+			"""
+			ALTER TABLE users
+				MODIFY user_id BIGINT NOT NULL,
+				MODIFY username VARCHAR(64) DEFAULT NULL,
+				DROP PRIMARY KEY,
+				ADD PRIMARY KEY (`user_id`),
+				ADD KEY `users_username` (`username`)
+			"""
+	)
+
+
+MIGRATIONS: list[Migration] = [
+	Migration(
+			version=1,
+			description="Initial schema",
+			statements=(
+				"""
+				CREATE TABLE IF NOT EXISTS roles (
+					role_name VARCHAR(32) NOT NULL,
+					role_level INTEGER NOT NULL,
+					receives_messages TINYINT(1) NOT NULL,
+					able_to_users_handle TINYINT(1) NOT NULL,
+					able_to_users_view TINYINT(1) NOT NULL,
+					able_to_faqs_handle TINYINT(1) NOT NULL,
+					able_to_faqs_view TINYINT(1) NOT NULL,
+					able_to_questions_handle TINYINT(1) NOT NULL,
+					able_to_questions_view TINYINT(1) NOT NULL,
+					able_to_ask TINYINT(1) NOT NULL,
+					able_to_answer TINYINT(1) NOT NULL,
+					PRIMARY KEY (`role_name`)
+				)
+				""",
+				"""
+				INSERT IGNORE INTO roles VALUES
+					('administrator', 2, 1, 1, 1, 1, 1, 1, 1, 0, 1),
+					('developer', 3, 0, 1, 1, 1, 1, 1, 1, 1, 1),
+					('moderator', 1, 1, 0, 1, 0, 1, 0, 1, 0, 1),
+					('user', 0, 0, 0, 0, 0, 1, 0, 0, 1, 0)
+				""",
+				"""
+				CREATE TABLE IF NOT EXISTS askers (
+					user_id BIGINT NOT NULL,
+					username VARCHAR(64) DEFAULT NULL,
+					language VARCHAR(2) DEFAULT NULL,
+					PRIMARY KEY (`user_id`),
+					KEY `askers_username` (`username`)
+				)
+				""",
+				"""
+				CREATE TABLE IF NOT EXISTS users (
+					user_id BIGINT NOT NULL,
+					username VARCHAR(64) DEFAULT NULL,
+					role VARCHAR(32) NOT NULL,
+					chat_id BIGINT DEFAULT NULL,
+					language VARCHAR(2) DEFAULT NULL,
+					user_context_data JSON NOT NULL,
+					PRIMARY KEY (`user_id`),
+					KEY `users_username` (`username`),
+					KEY `users_role` (`role`),
+					CONSTRAINT `users_role` FOREIGN KEY (`role`) REFERENCES `roles` (`role_name`) ON DELETE CASCADE ON UPDATE CASCADE
+				)
+				""",
+				"""
+				CREATE TABLE IF NOT EXISTS pending_roles (
+					username VARCHAR(64) NOT NULL,
+					role VARCHAR(32) NOT NULL,
+					PRIMARY KEY (`username`),
+					KEY `pending_roles_role` (`role`),
+					CONSTRAINT `pending_roles_role` FOREIGN KEY (`role`) REFERENCES `roles` (`role_name`) ON DELETE CASCADE ON UPDATE CASCADE
+				)
+				""",
+				"""
+				CREATE TABLE IF NOT EXISTS questions (
+					question_id INTEGER AUTO_INCREMENT,
+					user_id BIGINT NOT NULL,
+					chat_id BIGINT NOT NULL,
+					message_id BIGINT NOT NULL,
+					username VARCHAR(64),
+					first_name VARCHAR(64),
+					last_name VARCHAR(64),
+					question TEXT NOT NULL,
+					asked_date TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+					answered_date TIMESTAMP DEFAULT NULL,
+					status VARCHAR(32) NOT NULL DEFAULT "unprocessed",
+					moderator_id BIGINT DEFAULT NULL,
+					moderator_username VARCHAR(64),
+					PRIMARY KEY (`question_id`),
+					KEY `questions_moderator_id` (`moderator_id`)
+				)
+				""",
+				"""
+				CREATE TABLE IF NOT EXISTS faq (
+					faq_id INTEGER AUTO_INCREMENT,
+					question TEXT NOT NULL,
+					answer TEXT NOT NULL,
+					views_count INTEGER DEFAULT 0,
+					PRIMARY KEY (`faq_id`)
+				)
+				""",
+				"""
+				CREATE TABLE IF NOT EXISTS answers_outbox (
+					answer_id INTEGER AUTO_INCREMENT,
+					question_id INTEGER NOT NULL,
+					chat_id BIGINT NOT NULL,
+					reply_to_message_id BIGINT,
+					answer TEXT NOT NULL,
+					fallback_answer TEXT NOT NULL,
+					status VARCHAR(32) NOT NULL DEFAULT "pending",
+					attempts INTEGER NOT NULL DEFAULT 0,
+					last_error TEXT,
+					created_date TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+					next_attempt_date TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+					delivered_date TIMESTAMP DEFAULT NULL,
+					PRIMARY KEY (`answer_id`),
+					INDEX `status_next_attempt_date` (`status`, `next_attempt_date`)
+				)
+				"""
+			),
+			upgrade=upgrade_legacy_schema
+	),
+	Migration(
+			version=2,
+			description="Unique questions messages",
+			statements=(
+				"""
+				DELETE
+					duplicate
+				FROM
+					questions AS duplicate
+				JOIN
+					questions AS original
+				ON
+					original.chat_id = duplicate.chat_id
+					AND original.message_id = duplicate.message_id
+					AND original.question_id < duplicate.question_id
+				""",
+				"""
+				ALTER TABLE questions
+					ADD UNIQUE KEY `questions_chat_id_message_id` (`chat_id`, `message_id`)
+				"""
+			)
+	)
+]
+
+
+def get_schema_version(cursor: MySQLCursor) -> int:
+	"""
+    Reads the version of the database schema.
+
+    Args:
+        cursor (MySQLCursor): A cursor on the primary database.
+
+    Returns:
+        int: The version of the last applied migration, 0 for a database without the 'schema_version' table.
+    """
+	try:
+		cursor.execute("SELECT MAX(version) FROM schema_version")
+	except ProgrammingError as error:
+		if error.errno != errorcode.ER_NO_SUCH_TABLE:
+			raise
+		
+		return 0
+	
+	version = cursor.fetchone()[0]
+	
+	return version if version is not None else 0
+
+
+def render_schema_dump() -> str:
+	"""
+    Renders the SQL dump of an empty database with all migrations applied (shell_script/telegram_answer_bot.sql).
+
+    Returns:
+        str: The SQL script.
+    """
+	statements = [SCHEMA_VERSION_TABLE.strip()]
+	
+	for migration in MIGRATIONS:
+		statements.extend(textwrap.dedent(statement).strip() for statement in migration.statements)
+		statements.append(f"INSERT IGNORE INTO schema_version (version, description) VALUES ({migration.version}, '{migration.description}')")
+	
+	return "-- Generated by `python -m TelegramAnswerBot.data_handlers > shell_script/telegram_answer_bot.sql` from TelegramAnswerBot/data_handlers/migrations.py. Don't edit by hand.\n\n" + ";\n\n".join(statements) + ";\n"
+
+
+def run_migrations(connection_pool: ElasticConnectionPool) -> list[Migration]:
+	"""
+    Applies the migrations the database doesn't have yet. A database with the latest schema costs a single SELECT.
+
+    Pending migrations are applied under a named lock, so bots starting at the same time don't apply a migration twice. Each migration is recorded in 'schema_version' right after it is applied; DDL statements commit implicitly in MySQL, so statements are written to be safe to run again if a migration is interrupted. MySQL has no "IF NOT EXISTS" for indexes, so adding an index that already exists is skipped.
+
+    Args:
+        connection_pool (ElasticConnectionPool): The pool of the primary database.
+
+    Returns:
+        list[Migration]: The migrations that were applied.
+
+    Raises:
+        RuntimeError: If the lock can't be taken within MIGRATIONS_LOCK_TIMEOUT seconds.
+    """
+	connection = connection_pool.get_connection()
+	cursor = connection.cursor()
+	applied_migrations = []
+	
+	try:
+		if get_schema_version(cursor) >= MIGRATIONS[-1].version:
+			return applied_migrations
+		
+		cursor.execute("SELECT GET_LOCK(%s, %s)", (MIGRATIONS_LOCK_NAME, MIGRATIONS_LOCK_TIMEOUT))
+		
+		if cursor.fetchone()[0] != 1:
+			raise RuntimeError(f"Database schema is being migrated by another process for more than {MIGRATIONS_LOCK_TIMEOUT} seconds")
+		
+		try:
+			cursor.execute(SCHEMA_VERSION_TABLE)
+			schema_version = get_schema_version(cursor)
+			
+			for migration in MIGRATIONS:
+				if migration.version <= schema_version:
+					continue
+				
+				for statement in migration.statements:
+					try:
+						cursor.execute(statement)
+					except ProgrammingError as error:
+						if error.errno != errorcode.ER_DUP_KEYNAME:
+							raise
+				
+				if migration.upgrade is not None:
+					migration.upgrade(cursor)
+				
+				cursor.execute(
+						"INSERT INTO schema_version (version, description) VALUES (%s, %s)",
+						(migration.version, migration.description)
+				)
+				connection.commit()
+				
+				applied_migrations.append(migration)
+		finally:
+			cursor.execute("SELECT RELEASE_LOCK(%s)", (MIGRATIONS_LOCK_NAME,))
+			cursor.fetchall()
+	finally:
+		cursor.close()
+		connection.close()
+	
+	return applied_migrations
\ No newline at end of file
@@ -0,0 +1,163 @@
+import typing
+from TelegramAnswerBot import (
+	functions,
+	objects_types
+)
+from TelegramAnswerBot.data_handlers.base import DataHandler
+
+
+class AnswersOutboxDataHandler(DataHandler):
+	"""
+    Manages answers waiting for delivery to askers, stored in a database table named 'answers_outbox'. Rows are inserted together with marking the question as answered (see QuestionsDataHandler.mark_question_as_answered) and are delivered by the AnswersDispatcher.
+
+    Statuses of an answer:
+        "pending" - waiting for (another) delivery attempt at next_attempt_date.
+        "delivered" - sent to the asker.
+        "failed" - delivery is impossible (e.g. the bot is blocked) or the attempts are exhausted.
+    """
+	
+	def get_pending_answers(self, limit: int) -> list[objects_types.OutboxAnswerRow]:
+		"""
+        Retrieves pending answers whose next delivery attempt is due, oldest first.
+
+        Args:
+            limit (int): The maximum number of answers to retrieve.
+
+        Returns:
+            list[objects_types.OutboxAnswerRow]: A list of answers to deliver.
+        """
+		connection, cursor = self.execute_prepared(
+				f"""
+                SELECT
+                    {functions.get_db_columns(objects_types.OutboxAnswerRow)}
+                FROM
+                    answers_outbox
+                WHERE
+                    status = "pending"
+                    AND next_attempt_date <= CURRENT_TIMESTAMP
+                ORDER BY
+                    answer_id
+                LIMIT %s
+                """,
+				(limit,)
+		)
+		
+		answers = list(map(objects_types.OutboxAnswerRow._make, cursor.fetchall()))
+		
+		connection.close()
+		
+		return answers
+	
+	def get_seconds_to_next_answer(self) -> typing.Optional[int]:
+		"""
+        Retrieves the number of seconds until the next pending answer is due.
+
+        Returns:
+            typing.Optional[int]: The number of seconds (0 if an answer is already due), None if there are no pending answers.
+        """
+		connection, cursor = self.get_attributes()
+		
+		cursor.execute(
+				"""
+                SELECT
+                    GREATEST(TIMESTAMPDIFF(SECOND, CURRENT_TIMESTAMP, MIN(next_attempt_date)), 0)
+                FROM
+                    answers_outbox
+                WHERE
+                    status = "pending"
+                """
+		)
+		seconds = cursor.fetchone()[0]
+		
+		cursor.close()
+		connection.close()
+		
+		return seconds
+	
+	def mark_answer_delivered(self, answer_id: int):
+		"""
+        Marks an answer as delivered.
+
+        Args:
+            answer_id (int): The ID of the delivered answer.
+        """
+		connection, cursor = self.get_attributes()
+		
+		cursor.execute(
+				"""
+                UPDATE
+                    answers_outbox
+                SET
+                    status = "delivered",
+                    attempts = attempts + 1,
+                    last_error = NULL,
+                    delivered_date = CURRENT_TIMESTAMP
+                WHERE
+                    answer_id = %s
+                LIMIT 1
+                """,
+				(answer_id,)
+		)
+		connection.commit()
+		
+		cursor.close()
+		connection.close()
+	
+	def mark_answer_failed(self, answer_id: int, error: str):
+		"""
+        Marks an answer as undeliverable. It won't be retried.
+
+        Args:
+            answer_id (int): The ID of the answer.
+            error (str): The description of the last delivery error.
+        """
+		connection, cursor = self.get_attributes()
+		
+		cursor.execute(
+				"""
+                UPDATE
+                    answers_outbox
+                SET
+                    status = "failed",
+                    attempts = attempts + 1,
+                    last_error = %s
+                WHERE
+                    answer_id = %s
+                LIMIT 1
+                """,
+				(error, answer_id)
+		)
+		connection.commit()
+		
+		cursor.close()
+		connection.close()
+	
+	def reschedule_answer(self, answer_id: int, delay: int, error: str):
+		"""
+        Schedules another delivery attempt for an answer after a failed one.
+
+        Args:
+            answer_id (int): The ID of the answer.
+            delay (int): The number of seconds to wait before the next attempt.
+            error (str): The description of the delivery error.
+        """
+		connection, cursor = self.get_attributes()
+		
+		cursor.execute(
+				"""
+                UPDATE
+                    answers_outbox
+                SET
+                    attempts = attempts + 1,
+                    last_error = %s,
+                    next_attempt_date = CURRENT_TIMESTAMP + INTERVAL %s SECOND
+                WHERE
+                    answer_id = %s
+                LIMIT 1
+                """,
+				(error, delay, answer_id)
+		)
+		connection.commit()
+		
+		cursor.close()
+		connection.close()
\ No newline at end of file
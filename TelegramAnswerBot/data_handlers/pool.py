@@ -0,0 +1,467 @@
+import math
+import time
+import logging
+import typing
+import threading
+import collections
+import mysql.connector
+from mysql.connector.errors import PoolError
+from mysql.connector.abstracts import MySQLConnectionAbstract
+
+
+WAIT_TIME_BUCKETS = (0.001, 0.005, 0.025, 0.1, 0.5, 2.5, math.inf)
+
+
+def is_connection_error(error: Exception) -> bool:
+	"""
+    Checks whether an error means the server couldn't be reached, as opposed to an error returned by a working server.
+
+    Args:
+        error (Exception): The error.
+
+    Returns:
+        bool: True for client errors (codes 2000-2999), like a lost connection or a refused connect.
+    """
+	return isinstance(error, mysql.connector.Error) and 2000 <= error.errno < 3000
+
+
+class PooledConnection:
+	"""
+    A connection taken from an ElasticConnectionPool. Attributes are those of the wrapped connection, except `close`, which returns the connection to the pool, `commit`, which also notifies the pool's on_commit callback, and `cursor`, which returns a PooledCursor. Commits and the calls of its cursors report to the pool's on_query_result callback whether the server answered.
+
+    Attributes:
+        _cnx_pool (ElasticConnectionPool): The pool the connection belongs to.
+        committed (bool): Whether a transaction was committed through this checkout.
+        checked_at (float): The monotonic time the connection was last known to be alive. Kept when the connection is returned, so a connection that is used all the time is still pinged every ping_interval seconds; setting it to 0 makes the pool ping the connection on its next checkout.
+        _cnx (typing.Optional[MySQLConnectionAbstract]): The wrapped connection. None after the connection was returned.
+    """
+	
+	def __init__(self, pool: "ElasticConnectionPool", cnx: MySQLConnectionAbstract, checked_at: float):
+		"""
+        Initializes the PooledConnection.
+
+        Args:
+            pool (ElasticConnectionPool): The pool the connection belongs to.
+            cnx (MySQLConnectionAbstract): The wrapped connection.
+            checked_at (float): The monotonic time the connection was last known to be alive.
+        """
+		self._cnx_pool = pool
+		self._cnx = cnx
+		self.committed = False
+		self.checked_at = checked_at
+	
+	def __getattr__(self, attr: str) -> typing.Any:
+		"""Returns the attributes of the wrapped connection."""
+		return getattr(self._cnx, attr)
+	
+	def call(self, method: typing.Callable, *args: typing.Any, **kwargs: typing.Any) -> typing.Any:
+		"""
+        Calls a method of the connection or of one of its cursors and reports to the pool's on_query_result callback whether the server answered. Errors returned by the server count as answers. After a connection error the connection is pinged on its next checkout.
+
+        Args:
+            method (typing.Callable): The method.
+            *args (typing.Any): The positional arguments of the method.
+            **kwargs (typing.Any): The keyword arguments of the method.
+
+        Returns:
+            typing.Any: The result of the method.
+        """
+		on_query_result = self._cnx_pool.on_query_result
+		
+		try:
+			result = method(*args, **kwargs)
+		except mysql.connector.Error as error:
+			if is_connection_error(error):
+				self.checked_at = 0
+			
+			if on_query_result is not None:
+				on_query_result(not is_connection_error(error))
+			
+			raise
+		
+		if on_query_result is not None:
+			on_query_result(True)
+		
+		return result
+	
+	def close(self):
+		"""Returns the connection to the pool. Calling it again does nothing."""
+		if self._cnx is not None:
+			cnx, self._cnx = self._cnx, None
+			self._cnx_pool.add_connection(cnx, self.checked_at)
+	
+	def commit(self):
+		"""Commits the current transaction and notifies the pool's on_commit callback."""
+		self.call(self._cnx.commit)
+		self.committed = True
+		
+		if self._cnx_pool.on_commit is not None:
+			self._cnx_pool.on_commit()
+	
+	def cursor(self, *args: typing.Any, **kwargs: typing.Any) -> "PooledCursor":
+		"""
+        Creates a cursor of the wrapped connection.
+
+        Args:
+            *args (typing.Any): The positional arguments of the connection's `cursor`.
+            **kwargs (typing.Any): The keyword arguments of the connection's `cursor`.
+
+        Returns:
+            PooledCursor: The cursor.
+        """
+		return PooledCursor(self, self._cnx.cursor(*args, **kwargs))
+
+
+class PooledCursor:
+	"""
+    A cursor of a PooledConnection. Attributes are those of the wrapped cursor, except the methods talking to the server, which go through PooledConnection.call.
+
+    Attributes:
+        _connection (PooledConnection): The connection the cursor belongs to.
+        _cursor (typing.Any): The wrapped cursor.
+    """
+	
+	def __init__(self, connection: PooledConnection, cursor: typing.Any):
+		"""
+        Initializes the PooledCursor.
+
+        Args:
+            connection (PooledConnection): The connection the cursor belongs to.
+            cursor (typing.Any): The wrapped cursor.
+        """
+		self._connection = connection
+		self._cursor = cursor
+	
+	def __getattr__(self, attr: str) -> typing.Any:
+		"""Returns the attributes of the wrapped cursor."""
+		return getattr(self._cursor, attr)
+	
+	def execute(self, *args: typing.Any, **kwargs: typing.Any) -> typing.Any:
+		"""Executes a query, see PooledConnection.call."""
+		return self._connection.call(self._cursor.execute, *args, **kwargs)
+	
+	def executemany(self, *args: typing.Any, **kwargs: typing.Any) -> typing.Any:
+		"""Executes a query with every set of parameters, see PooledConnection.call."""
+		return self._connection.call(self._cursor.executemany, *args, **kwargs)
+	
+	def fetchall(self) -> list[tuple]:
+		"""Fetches the remaining rows, see PooledConnection.call."""
+		return self._connection.call(self._cursor.fetchall)
+	
+	def fetchmany(self, *args: typing.Any, **kwargs: typing.Any) -> list[tuple]:
+		"""Fetches the next rows, see PooledConnection.call."""
+		return self._connection.call(self._cursor.fetchmany, *args, **kwargs)
+	
+	def fetchone(self) -> typing.Optional[tuple]:
+		"""Fetches the next row, see PooledConnection.call."""
+		return self._connection.call(self._cursor.fetchone)
+
+
+class ElasticConnectionPool:
+	"""
+    A MySQL connection pool that waits for a free connection instead of failing, and grows under load.
+
+    The pool opens pool_size connections at start. When all of them are in use, it opens more, up to max_pool_size, and then queues callers until a connection is returned or wait_timeout runs out. Connections above pool_size that stay idle for idle_timeout seconds are closed again. Sessions are not reset when connections are returned, so prepared statements survive; DataHandler.get_connection rolls back a transaction left open instead.
+
+    Connections are pinged before they are handed out only if they haven't been checked for ping_interval seconds, so a busy connection pays for one round trip per ping_interval. Using a connection doesn't count as a check: a connection broken by a server restart may still be returned without an error. A health check thread pings idle connections every ping_interval seconds, which also keeps them from hitting the server's wait_timeout, and replaces dead ones, so the first calls after a quiet night don't fail or pay for reconnecting.
+
+    Attributes:
+        pool_name (str): The name of the pool, used in logs.
+        pool_size (int): The number of connections kept open.
+        max_pool_size (int): The maximum number of connections.
+        wait_timeout (float): The time in seconds a caller waits for a connection before PoolError is raised.
+        idle_timeout (float): The time in seconds after which an idle connection above pool_size is closed.
+        ping_interval (float): The time in seconds after which an unused connection is pinged before use, and the interval of the health checks.
+        size (int): The number of open connections, including the ones being opened.
+        in_use (int): The number of connections taken from the pool.
+        waiting (int): The number of callers waiting for a connection.
+        peak_in_use (int): The highest number of connections in use at once.
+        timeouts (int): The number of callers that got no connection in time.
+        opened_count (int): The number of connections opened since the start.
+        reaped_count (int): The number of idle connections closed since the start.
+        replaced_count (int): The number of dead connections reconnected or replaced since the start.
+        wait_time_histogram (list[int]): The number of connection requests by wait time, per bucket of WAIT_TIME_BUCKETS.
+        on_commit (typing.Optional[typing.Callable[[], typing.Any]]): Called after every commit on a connection of the pool.
+        on_query_result (typing.Optional[typing.Callable[[bool], typing.Any]]): Called after every query and commit on a connection of the pool, with False if the server couldn't be reached.
+        _cnx_config (dict[str, typing.Any]): The arguments for new connections.
+        _idle (collections.deque[tuple[MySQLConnectionAbstract, float, float]]): The idle connections with the times they were returned and last known to be alive, from the oldest to the newest.
+        _condition (threading.Condition): Guards the pool state and wakes up waiting callers.
+        _health_thread (typing.Optional[threading.Thread]): The running health check thread.
+        _stop_health_checks (threading.Event): Stops the health check thread.
+    """
+	
+	def __init__(
+			self,
+			pool_name: str,
+			pool_size: int,
+			max_pool_size: int,
+			wait_timeout: float,
+			idle_timeout: float,
+			ping_interval: float = 60,
+			**connection_config: typing.Any
+	):
+		"""
+        Initializes the ElasticConnectionPool and opens pool_size connections. If the server can't be reached, the pool starts with fewer connections and the health checks open the rest later.
+
+        Args:
+            pool_name (str): The name of the pool.
+            pool_size (int): The number of connections kept open.
+            max_pool_size (int): The maximum number of connections. Values below pool_size disable growth.
+            wait_timeout (float): The time in seconds a caller waits for a connection.
+            idle_timeout (float): The time in seconds after which an idle connection above pool_size is closed.
+            ping_interval (float): The time in seconds after which an unused connection is pinged before use. 0 pings on every use and disables the health check thread.
+            **connection_config (typing.Any): The arguments for `mysql.connector.connect`.
+        """
+		self.pool_name = pool_name
+		self.pool_size = pool_size
+		self.max_pool_size = max(max_pool_size, pool_size)
+		self.wait_timeout = wait_timeout
+		self.idle_timeout = idle_timeout
+		self.ping_interval = ping_interval
+		
+		self.size = 0
+		self.in_use = 0
+		self.waiting = 0
+		self.peak_in_use = 0
+		self.timeouts = 0
+		self.opened_count = 0
+		self.reaped_count = 0
+		self.replaced_count = 0
+		self.wait_time_histogram = [0] * len(WAIT_TIME_BUCKETS)
+		self.on_commit: typing.Optional[typing.Callable[[], typing.Any]] = None
+		self.on_query_result: typing.Optional[typing.Callable[[bool], typing.Any]] = None
+		
+		self._cnx_config = connection_config
+		self._idle: collections.deque[tuple[MySQLConnectionAbstract, float, float]] = collections.deque()
+		self._condition = threading.Condition()
+		self._health_thread: typing.Optional[threading.Thread] = None
+		self._stop_health_checks = threading.Event()
+		
+		for _ in range(pool_size):
+			try:
+				cnx = self.open_connection()
+			except mysql.connector.Error as error:
+				logging.warning("Failed to open the connections of pool '%s' at start: %s", self.pool_name, error)
+				break
+			
+			self._idle.append((cnx, time.monotonic(), time.monotonic()))
+			self.size += 1
+	
+	def add_connection(self, cnx: MySQLConnectionAbstract, checked_at: float):
+		"""
+        Returns a connection to the pool and wakes up a waiting caller. Called by PooledConnection.close. A query that succeeded doesn't prove the connection survives a server restart, so the time it was last checked is kept instead of being reset.
+
+        Args:
+            cnx (MySQLConnectionAbstract): The returned connection.
+            checked_at (float): The monotonic time the connection was last known to be alive.
+        """
+		with self._condition:
+			self.in_use -= 1
+			self._idle.append((cnx, time.monotonic(), checked_at))
+			self._condition.notify()
+			
+			expired_connections = self.pop_expired_connections()
+		
+		self.close_connections(expired_connections)
+	
+	def check_idle_connections(self):
+		"""
+        Pings the idle connections not checked for ping_interval seconds, reconnects dead ones and opens new connections if the pool fell below pool_size. The connections are taken out of the pool while they are checked.
+        """
+		checked_before = time.monotonic() - self.ping_interval
+		
+		with self._condition:
+			unchecked_connections = [entry for entry in self._idle if entry[2] <= checked_before]
+			
+			for entry in unchecked_connections:
+				self._idle.remove(entry)
+		
+		checked_connections = []
+		dead_connections_count = 0
+		
+		for cnx, idle_since, _ in unchecked_connections:
+			try:
+				if not cnx.is_connected():
+					cnx.reconnect()
+					dead_connections_count += 1
+				
+				checked_connections.append((cnx, idle_since, time.monotonic()))
+			except mysql.connector.Error:
+				logging.warning("Dropping a dead connection of pool '%s'", self.pool_name)
+				self.close_connections([cnx])
+				dead_connections_count += 1
+		
+		with self._condition:
+			self._idle.extendleft(reversed(checked_connections))
+			self.size -= len(unchecked_connections) - len(checked_connections)
+			self.replaced_count += dead_connections_count
+			missing_connections_count = max(self.pool_size - self.size, 0)
+			self.size += missing_connections_count
+			self._condition.notify(len(checked_connections))
+		
+		for _ in range(missing_connections_count):
+			try:
+				cnx = self.open_connection()
+			except mysql.connector.Error:
+				logging.warning("Failed to open a connection of pool '%s'", self.pool_name)
+				
+				with self._condition:
+					self.size -= 1
+				
+				continue
+			
+			with self._condition:
+				self._idle.append((cnx, time.monotonic(), time.monotonic()))
+				self._condition.notify()
+	
+	def close_connections(self, connections: list[MySQLConnectionAbstract]):
+		"""
+        Closes connections that were removed from the pool.
+
+        Args:
+            connections (list[MySQLConnectionAbstract]): The connections to close.
+        """
+		for cnx in connections:
+			try:
+				cnx.close()
+			except mysql.connector.Error:
+				pass
+	
+	def get_connection(self) -> PooledConnection:
+		"""
+        Takes a connection from the pool: an idle one, a new one if the pool may grow, or the first one returned within wait_timeout. A connection that lost its session is reconnected.
+
+        Returns:
+            PooledConnection: The connection. Closing it returns it to the pool.
+
+        Raises:
+            PoolError: If no connection became free within wait_timeout.
+        """
+		started_at = time.monotonic()
+		deadline = started_at + self.wait_timeout
+		cnx = None
+		checked_at = started_at
+		
+		with self._condition:
+			while not self._idle and self.size >= self.max_pool_size:
+				remaining_time = deadline - time.monotonic()
+				
+				if remaining_time <= 0:
+					self.timeouts += 1
+					raise PoolError(f"Failed getting connection from pool '{self.pool_name}' within {self.wait_timeout} seconds")
+				
+				self.waiting += 1
+				
+				try:
+					self._condition.wait(remaining_time)
+				finally:
+					self.waiting -= 1
+			
+			if self._idle:
+				cnx, _, checked_at = self._idle.pop()
+			else:
+				self.size += 1
+			
+			self.in_use += 1
+			self.peak_in_use = max(self.peak_in_use, self.in_use)
+			expired_connections = self.pop_expired_connections()
+			
+			wait_time = time.monotonic() - started_at
+			self.wait_time_histogram[next(index for index, bound in enumerate(WAIT_TIME_BUCKETS) if wait_time <= bound)] += 1
+		
+		self.close_connections(expired_connections)
+		
+		try:
+			if cnx is None:
+				cnx = self.open_connection()
+				checked_at = time.monotonic()
+			elif checked_at <= time.monotonic() - self.ping_interval:
+				if not cnx.is_connected():
+					cnx.reconnect()
+					
+					with self._condition:
+						self.replaced_count += 1
+				
+				checked_at = time.monotonic()
+		except mysql.connector.Error:
+			with self._condition:
+				self.in_use -= 1
+				self.size -= 1
+				self._condition.notify()
+			
+			raise
+		
+		return PooledConnection(self, cnx, checked_at)
+	
+	def get_stats(self) -> dict[str, typing.Any]:
+		"""
+        Returns the utilization metrics of the pool.
+
+        Returns:
+            dict[str, typing.Any]: The "size", "in_use", "waiting", "peak_in_use", "timeouts", "opened" and "reaped" counters, and the "wait_time_histogram" by upper bucket bound in seconds.
+        """
+		with self._condition:
+			return {
+				"size": self.size,
+				"in_use": self.in_use,
+				"waiting": self.waiting,
+				"peak_in_use": self.peak_in_use,
+				"timeouts": self.timeouts,
+				"opened": self.opened_count,
+				"reaped": self.reaped_count,
+				"replaced": self.replaced_count,
+				"wait_time_histogram": dict(zip(map(str, WAIT_TIME_BUCKETS), self.wait_time_histogram))
+			}
+	
+	def open_connection(self) -> MySQLConnectionAbstract:
+		"""
+        Opens a new connection with the pool's configuration.
+
+        Returns:
+            MySQLConnectionAbstract: The connection.
+        """
+		cnx = mysql.connector.connect(**self._cnx_config)
+		
+		with self._condition:
+			self.opened_count += 1
+		
+		return cnx
+	
+	def pop_expired_connections(self) -> list[MySQLConnectionAbstract]:
+		"""
+        Removes the connections above pool_size that have been idle for idle_timeout seconds. Must be called with the condition held; the connections are closed by the caller after releasing it.
+
+        Returns:
+            list[MySQLConnectionAbstract]: The removed connections.
+        """
+		idle_since = time.monotonic() - self.idle_timeout
+		expired_connections = []
+		
+		while self.size > self.pool_size and self._idle and self._idle[0][1] < idle_since:
+			expired_connections.append(self._idle.popleft()[0])
+			self.size -= 1
+			self.reaped_count += 1
+		
+		return expired_connections
+	
+	def run_health_checks(self):
+		"""Checks the idle connections every ping_interval seconds until stop_health_checks is called."""
+		while not self._stop_health_checks.wait(self.ping_interval):
+			try:
+				self.check_idle_connections()
+			except Exception:
+				logging.exception("Health check of pool '%s' failed", self.pool_name)
+	
+	def start_health_checks(self):
+		"""Starts the health check thread. Does nothing if ping_interval is 0."""
+		if self._health_thread is None and self.ping_interval > 0:
+			self._stop_health_checks.clear()
+			self._health_thread = threading.Thread(target=self.run_health_checks, name=f"{self.pool_name}_health_checks", daemon=True)
+			self._health_thread.start()
+	
+	def stop_health_checks(self):
+		"""Stops the health check thread and waits for it to finish."""
+		if self._health_thread is not None:
+			self._stop_health_checks.set()
+			self._health_thread.join()
+			self._health_thread = None
\ No newline at end of file
@@ -0,0 +1,91 @@
+import sys
+import weakref
+import threading
+from TelegramAnswerBot.data_handlers.pool import (
+	PooledConnection,
+	PooledCursor
+)
+
+
+def skip_statement_reset(statement_id: object):
+	"""
+    Replaces the connector's COM_STMT_RESET on connections with statements of a PreparedStatementsRegistry.
+
+    Args:
+        statement_id (object): The statement the connector would reset.
+	"""
+	pass
+
+
+class PreparedStatementsRegistry:
+	"""
+    Keeps the server-side prepared statements of every pooled connection, so a hot query is parsed by MySQL once per connection and later calls only send the statement ID and its parameters.
+
+    Every statement gets its own prepared cursor, which stays open while its connection lives in the pool. Connector cursors only reuse a statement when they are executed with the same string object again, so query texts are interned. Statements of a connection that reconnected are dropped and prepared again, because the server deallocates them with the old session.
+
+    The connector sends COM_STMT_RESET before every execution of a prepared statement, a round trip of its own that would make a reused statement slower than a plain query. The reset only discards long data sent in pieces and server-side cursors; the registry's statements use neither, their results are always read to the end, and executing a statement resets its client-side state anyway. So the reset is turned off on the connections the registry prepares statements on, and an execution costs one round trip, like a plain query.
+
+    Attributes:
+        prepared_count (int): The number of statements prepared since the start.
+        reused_count (int): The number of executions that reused a prepared statement.
+        _connections (weakref.WeakKeyDictionary[typing.Any, tuple[int, dict[str, typing.Any]]]): The session ID and the prepared cursors by query of every connection.
+        _lock (threading.Lock): Guards _connections, so the registry is as thread-safe as the connection pool.
+	"""
+	
+	def __init__(self):
+		"""Initializes the PreparedStatementsRegistry."""
+		self.prepared_count = 0
+		self.reused_count = 0
+		
+		self._connections = weakref.WeakKeyDictionary()
+		self._lock = threading.Lock()
+	
+	def __len__(self) -> int:
+		"""Returns the number of prepared statements on all connections."""
+		with self._lock:
+			return sum(len(cursors) for _, cursors in self._connections.values())
+	
+	def get_cursor(self, connection: PooledConnection, query: str) -> tuple[PooledCursor, str]:
+		"""
+        Returns the prepared cursor of a query on a connection, creating it on the first use.
+
+        The cursor belongs to the registry and must not be closed; its statement is prepared by the first `execute` call. Its results must be read completely before the connection is returned.
+
+        Args:
+            connection (PooledConnection): The connection taken from the pool.
+            query (str): The query text.
+
+        Returns:
+            tuple[PooledCursor, str]: The cursor and the interned query text to execute it with.
+		"""
+		raw_connection = connection._cnx
+		connection_id = connection.connection_id
+		query = sys.intern(query)
+		
+		with self._lock:
+			session = self._connections.get(raw_connection)
+			
+			if session is None or session[0] != connection_id:
+				session = (connection_id, {})
+				self._connections[raw_connection] = session
+				raw_connection.cmd_stmt_reset = skip_statement_reset
+			
+			cursor = session[1].get(query)
+			
+			if cursor is None:
+				cursor = raw_connection.cursor(prepared=True)
+				session[1][query] = cursor
+				self.prepared_count += 1
+			else:
+				self.reused_count += 1
+		
+		return PooledCursor(connection, cursor), query
+	
+	def get_stats(self) -> dict[str, int]:
+		"""
+        Returns the size and the counters of the registry.
+
+        Returns:
+            dict[str, int]: The number of "statements" held, and the "prepared" and "reused" counters.
+		"""
+		return {"statements": len(self), "prepared": self.prepared_count, "reused": self.reused_count}
\ No newline at end of file
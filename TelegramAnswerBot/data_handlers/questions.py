@@ -1,36 +1,55 @@
-import pandas
-import mysql.connector
+import typing
+import datetime
 from TelegramAnswerBot import (
 	functions,
 	objects_types
 )
+from TelegramAnswerBot.errors import DatabaseUnavailableError
 from TelegramAnswerBot.data_handlers.base import DataHandler
+from TelegramAnswerBot.data_handlers.degraded import DegradedMode
+from TelegramAnswerBot.data_handlers.pool import ElasticConnectionPool
+from TelegramAnswerBot.data_handlers.replica import ReplicaRouter
+from TelegramAnswerBot.data_handlers.retry import (
+	RetryPolicy,
+	retry_transaction
+)
 
 
 class QuestionsDataHandler(DataHandler):
 	"""
-    Manages the 'questions' table in the database, inheriting basic functionality from `DataHandler`. This class provides methods for creating the table and adding new questions.
+    Manages the 'questions' table in the database, inheriting basic functionality from `DataHandler`. This class provides methods for adding, reserving and answering questions.
 
     Attributes:
-        connection_pool (mysql.connector.pooling.MySQLConnectionPool): Inherited from DataHandler.
+        connection_pool (ElasticConnectionPool): Inherited from DataHandler.
         time_for_answer (int):Time allowed for answering a question (in seconds, presumably). Currently unused.
 
     :Usage:
-        # Assuming 'pool' is a pre-existing MySQLConnectionPool instance
-        questions_handler = QuestionsDataHandler(pool)
+        # Assuming 'pool' is a pre-existing ElasticConnectionPool instance
+        questions_handler = QuestionsDataHandler(pool, analytics_pool, replica_router)
 
         # Add a question:
         questions_handler.add_question(123, 456, 789, "some_username", "First", "Last", "What's the meaning of life?")
     """
 	
-	def __init__(self, connection_pool: mysql.connector.pooling.MySQLConnectionPool):
+	def __init__(
+			self,
+			connection_pool: ElasticConnectionPool,
+			analytics_pool: ElasticConnectionPool,
+			replica_router: ReplicaRouter,
+			retry_policy: RetryPolicy,
+			degraded_mode: DegradedMode
+	):
 		"""
         Initializes the QuestionsDataHandler, calling the parent class initializer and setting the `time_for_answer`.
 
         Args:
-            connection_pool (mysql.connector.pooling.MySQLConnectionPool):The connection pool for database access.
+            connection_pool (ElasticConnectionPool):The connection pool for database access.
+            analytics_pool (ElasticConnectionPool): The pool for heavy reports.
+            replica_router (ReplicaRouter): Sends read-only queries to a replica.
+            retry_policy (RetryPolicy): The retry policy of deadlocked calls.
+            degraded_mode (DegradedMode): The circuit breaker and the queue of questions asked while it is open.
         """
-		super().__init__(connection_pool)
+		super().__init__(connection_pool, analytics_pool, replica_router, retry_policy, degraded_mode)
 		
 		self.time_for_answer = 120
 	
@@ -43,9 +62,9 @@ class QuestionsDataHandler(DataHandler):
 			first_name: str,
 			last_name: str,
 			question: str
-	):
+	) -> bool:
 		"""
-        Adds a new question to the 'questions' table.
+        Adds a new question to the 'questions' table, unless the message is already stored as a question. While the database is unavailable, the question is queued in a file and inserted once the database is back.
 
         Args:
             user_id (int): The ID of the user who asked the question.
@@ -55,10 +74,102 @@ class QuestionsDataHandler(DataHandler):
             first_name (str): The first name of the user.
             last_name (str): The last name of the user.
             question (str): The text of the question.
+
+        Returns:
+            bool: False if the message is already stored as a question.
         """
-		connection, cursor = self.get_attributes()
+		try:
+			connection, cursor = self.get_attributes()
+			
+			cursor.execute(
+					"""
+            INSERT INTO
+                questions (
+                    user_id,
+                    chat_id,
+                    message_id,
+                    username,
+                    first_name,
+                    last_name,
+                    question
+                )
+            VALUES
+                (%s, %s, %s, %s, %s, %s, %s)
+            ON DUPLICATE KEY UPDATE
+                question_id = question_id
+            """,
+					(
+							user_id,
+							chat_id,
+							message_id,
+							username,
+							first_name,
+							last_name,
+							question
+					)
+			)
+		except DatabaseUnavailableError:
+			self.degraded_mode.queue_question(user_id, chat_id, message_id, username, first_name, last_name, question)
+			return True
+		
+		is_added = cursor.rowcount == 1
+		connection.commit()
+		
+		cursor.close()
+		connection.close()
+		
+		return is_added
+	
+	@retry_transaction
+	def add_questions(self, questions: list[objects_types.NewQuestionRow]) -> list[bool]:
+		"""
+        Adds several questions to the 'questions' table with one multi-row INSERT and one commit. Messages already stored as questions, or repeated in the list, are skipped. While the database is unavailable, the questions are queued in a file and inserted once the database is back.
+
+        Args:
+            questions (list[objects_types.NewQuestionRow]): The questions to add.
+
+        Returns:
+            list[bool]: For every question, False if its message was already stored or repeated earlier in the list.
+        """
+		try:
+			connection, cursor = self.get_attributes()
+		except DatabaseUnavailableError:
+			for question in questions:
+				self.degraded_mode.queue_question(*question)
+			
+			return [True] * len(questions)
 		
 		cursor.execute(
+				f"""
+            SELECT
+                chat_id,
+                message_id
+            FROM
+                questions
+            WHERE
+                (chat_id, message_id) IN ({", ".join(["(%s, %s)" for _ in questions])})
+            """,
+				tuple(value for question in questions for value in (question.chat_id, question.message_id))
+		)
+		
+		stored_messages = set(cursor.fetchall())
+		new_questions = []
+		is_added = []
+		
+		for question in questions:
+			is_added.append((question.chat_id, question.message_id) not in stored_messages)
+			
+			if is_added[-1]:
+				stored_messages.add((question.chat_id, question.message_id))
+				new_questions.append(question)
+		
+		if not new_questions:
+			cursor.close()
+			connection.close()
+			
+			return is_added
+		
+		cursor.executemany(
 				"""
             INSERT INTO
                 questions (
@@ -72,53 +183,50 @@ class QuestionsDataHandler(DataHandler):
                 )
             VALUES
                 (%s, %s, %s, %s, %s, %s, %s)
+            ON DUPLICATE KEY UPDATE
+                question_id = question_id
             """,
-				(
-						user_id,
-						chat_id,
-						message_id,
-						username,
-						first_name,
-						last_name,
-						question
-				)
+				new_questions
 		)
 		connection.commit()
 		
 		cursor.close()
 		connection.close()
+		
+		return is_added
 	
-	def check_question_reservation(self, question_id: int, moderator_username: str) -> objects_types.QuestionDict:
+	def check_question_reservation(self, question_id: int, moderator_id: int) -> typing.Optional[objects_types.QuestionRow]:
 		"""
         Checks if a specific question is reserved by a particular moderator.
 
         Args:
             question_id (int): The ID of the question to check.
-            moderator_username (str): The username of the moderator to check against.
+            moderator_id (int): The Telegram ID of the moderator to check against.
 
         Returns:
-            objects_types.QuestionDict: A dictionary representing the question data if the question is reserved by the specified moderator and its status is "processing". Returns an empty dictionary if no such reservation exists.
+            typing.Optional[objects_types.QuestionRow]: The question if it is reserved by the specified moderator and its status is "processing". Returns None if no such reservation exists.
         """
 		connection, cursor = self.get_attributes()
 		
 		cursor.execute(
-				"""
+				f"""
             SELECT
-                *
+                {functions.get_db_columns(objects_types.QuestionRow)}
             FROM
                 questions
             WHERE
                 question_id = %s
                 AND status = "processing"
-                AND moderator_username = %s
+                AND moderator_id = %s
             LIMIT 1
             """,
-				(question_id, moderator_username)
+				(question_id, moderator_id)
 		)
 		
-		question_reservation = objects_types.QuestionDict(
-				**functions.get_db_line_dict([header[0] for header in cursor.description], cursor.fetchone())
-		)
+		question_reservation = cursor.fetchone()
+		
+		if question_reservation is not None:
+			question_reservation = objects_types.QuestionRow._make(question_reservation)
 		
 		cursor.close()
 		connection.close()
@@ -138,51 +246,9 @@ class QuestionsDataHandler(DataHandler):
 		cursor.close()
 		connection.close()
 	
-	def create_table(self):
-		"""
-        Creates the 'questions' table if it doesn't exist. Also resets the status of any questions marked as 'processing' to 'unprocessed'.
-        """
-		connection, cursor = self.get_attributes()
-		
-		cursor.execute(
-				"""
-            CREATE TABLE IF NOT EXISTS questions (
-                question_id INTEGER AUTO_INCREMENT,
-                user_id BIGINT NOT NULL,
-                chat_id BIGINT NOT NULL,
-                message_id BIGINT NOT NULL,
-                username VARCHAR(64),
-                first_name VARCHAR(64),
-                last_name VARCHAR(64),
-                question TEXT NOT NULL,
-                asked_date TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
-                answered_date TIMESTAMP DEFAULT NULL,
-                status VARCHAR(32) NOT NULL DEFAULT "unprocessed",
-                moderator_username VARCHAR(64),
-                PRIMARY KEY (`question_id`)
-            )
-            """
-		)
-		cursor.execute(
-				"""
-            UPDATE
-                questions
-            SET
-                status = "unprocessed",
-                answered_date = NULL,
-                moderator_username = NULL
-            WHERE
-                status = 'processing'
-            """
-		)
-		connection.commit()
-		
-		cursor.close()
-		connection.close()
-	
 	def free_question_from_moderator(self, question_id: int):
 		"""
-        Releases a question from a moderator's reservation. Sets the `answered_date` to NULL, the `status` to "unprocessed", and clears the `moderator_username`.
+        Releases a question from a moderator's reservation. Sets the `answered_date` to NULL, the `status` to "unprocessed", and clears the `moderator_id` and `moderator_username`.
 
         Args:
             question_id (int): The ID of the question to release.
@@ -196,6 +262,7 @@ class QuestionsDataHandler(DataHandler):
             SET
                 answered_date = NULL,
                 status = "unprocessed",
+                moderator_id = NULL,
                 moderator_username = NULL
             WHERE
                 question_id = %s
@@ -210,17 +277,17 @@ class QuestionsDataHandler(DataHandler):
 	
 	def get_average_answer_time(self) -> float:
 		"""
-        Calculates and returns the average time taken to answer questions (in seconds).
+        Calculates and returns the average time taken to answer questions (in seconds). The average is computed by the database.
 
         Returns:
-            float: The average answer time in seconds. Returns NaN (Not a Number) if no answered questions are found.
+            float: The average answer time in seconds. Returns 0 if no answered questions are found.
         """
-		connection, cursor = self.get_attributes()
+		connection, cursor = self.get_analytics_attributes()
 		
 		cursor.execute(
 				"""
                 SELECT
-                    TIMESTAMPDIFF(SECOND, asked_date, answered_date) AS time_difference
+                    AVG(TIMESTAMPDIFF(SECOND, asked_date, answered_date)) AS average_answer_time
                 FROM
                     questions
                 WHERE
@@ -230,14 +297,14 @@ class QuestionsDataHandler(DataHandler):
                 """
 		)
 		
-		average_answer_time = functions.get_db_data_frame([header[0] for header in cursor.description], cursor.fetchall())["time_difference"].mean()
+		average_answer_time = cursor.fetchone()[0]
 		
 		cursor.close()
 		connection.close()
 		
-		return average_answer_time
+		return float(average_answer_time) if average_answer_time is not None else 0.0
 	
-	def get_first_unanswered_question(self, declined_questions: list[int]) -> objects_types.QuestionDict:
+	def get_first_unanswered_question(self, declined_questions: list[int]) -> typing.Optional[objects_types.QuestionRow]:
 		"""
         Retrieves the first unanswered question from the database, excluding questions specified in `declined_questions`.
 
@@ -245,16 +312,15 @@ class QuestionsDataHandler(DataHandler):
             declined_questions (list[int], optional): A list of question IDs to exclude from the search. Defaults to None.
 
         Returns:
-            objects_types.QuestionDict: A dictionary representing the first unanswered question found. Returns an empty dictionary if no unanswered questions are found. A question is considered unanswered if its status is "unprocessed" or if it's marked as "processing" but the `answered_date` is older than `self.time_for_answer` seconds.
+            typing.Optional[objects_types.QuestionRow]: The first unanswered question found. Returns None if no unanswered questions are found. A question is considered unanswered if its status is "unprocessed" or if it's marked as "processing" but the `answered_date` is older than `self.time_for_answer` seconds.
         """
-		connection = self.connection_pool.get_connection()
-		cursor = connection.cursor()
+		connection, cursor = self.get_attributes()
 		
 		if declined_questions:
 			cursor.execute(
 					f"""
                     SELECT
-                        *
+                        {functions.get_db_columns(objects_types.QuestionRow)}
                     FROM
                         questions
                     WHERE
@@ -275,7 +341,7 @@ class QuestionsDataHandler(DataHandler):
 			cursor.execute(
 					f"""
                     SELECT
-                        *
+                        {functions.get_db_columns(objects_types.QuestionRow)}
                     FROM
                         questions
                     WHERE
@@ -289,23 +355,24 @@ class QuestionsDataHandler(DataHandler):
                     """
 			)
 		
-		first_unanswered_question = objects_types.QuestionDict(
-				**functions.get_db_line_dict([header[0] for header in cursor.description], cursor.fetchone())
-		)
+		first_unanswered_question = cursor.fetchone()
+		
+		if first_unanswered_question is not None:
+			first_unanswered_question = objects_types.QuestionRow._make(first_unanswered_question)
 		
 		cursor.close()
 		connection.close()
 		
 		return first_unanswered_question
 	
-	def get_questions_stats(self) -> objects_types.QuestionStatsDict:
+	def get_questions_stats(self) -> objects_types.QuestionStatsRow:
 		"""
         Retrieves statistics about the questions in the database.
 
         Returns:
-            objects_types.QuestionStatsDict: A dictionary containing the questions statistics.
+            objects_types.QuestionStatsRow: The questions statistics.
         """
-		connection, cursor = self.get_attributes()
+		connection, cursor = self.get_analytics_attributes()
 		
 		cursor.execute(
 				f"""
@@ -350,9 +417,7 @@ class QuestionsDataHandler(DataHandler):
                 """
 		)
 		
-		questions_stats = objects_types.QuestionStatsDict(
-				**functions.get_db_line_dict([header[0] for header in cursor.description], cursor.fetchone())
-		)
+		questions_stats = objects_types.QuestionStatsRow._make(cursor.fetchone())
 		
 		cursor.close()
 		connection.close()
@@ -369,7 +434,7 @@ class QuestionsDataHandler(DataHandler):
         Returns:
             list[str]: A list of strings, where each string is the text of a question.
         """
-		connection, cursor = self.get_attributes()
+		connection, cursor = self.get_analytics_attributes()
 		
 		if number_of_questions is None:
 			cursor.execute(
@@ -427,45 +492,61 @@ class QuestionsDataHandler(DataHandler):
 		
 		return total_questions_count
 	
-	def get_users_statistics(self) -> pandas.DataFrame:
+	def get_users_statistics(self) -> list[objects_types.ModeratorStatisticsRow]:
 		"""
-        Retrieves statistics about moderators and the number of questions they have answered.
+        Retrieves statistics about moderators and the number of questions they have answered. Moderators are counted by ID, so answers given under an older username are counted together; the newest known username is shown. Answers from before the migration to IDs without a known moderator are counted by username.
 
         Returns:
-            pandas.DataFrame: A DataFrame with "moderator_usernames" and "count_questions" they've answered columns.
+            list[objects_types.ModeratorStatisticsRow]: The "moderator_username" and the "count_questions" they've answered of every moderator.
         """
-		connection, cursor = self.get_attributes()
+		connection, cursor = self.get_analytics_attributes()
 		
 		cursor.execute(
 				"""
                 SELECT
-                    moderator_username,
+                    COALESCE(MAX(users.username), MAX(questions.moderator_username)) AS moderator_username,
                     COUNT(*) AS count_questions
                 FROM
                     questions
+                LEFT JOIN
+                    users
+                ON
+                    users.user_id = questions.moderator_id
                 WHERE
-                    moderator_username IS NOT NULL
-                    AND status = "processed"
+                    (questions.moderator_id IS NOT NULL OR questions.moderator_username IS NOT NULL)
+                    AND questions.status = "processed"
                 GROUP BY
-                    moderator_username
+                    COALESCE(CAST(questions.moderator_id AS CHAR), questions.moderator_username)
                 ORDER BY
                     count_questions DESC
                 """
 		)
 		
-		users_statistics = functions.get_db_data_frame([header[0] for header in cursor.description], cursor.fetchall())
+		users_statistics = list(map(objects_types.ModeratorStatisticsRow._make, cursor.fetchall()))
 		
 		cursor.close()
 		connection.close()
 		
 		return users_statistics
 	
-	def mark_question_as_answered(self, question_id: int):
+	@retry_transaction
+	def mark_question_as_answered(
+			self,
+			question_id: int,
+			chat_id: int,
+			reply_to_message_id: typing.Optional[int],
+			answer: str,
+			fallback_answer: str
+	):
 		"""
-        Marks a question as answered by updating its status to "processed" (processed) and setting the `answered_date` to the current timestamp.
+        Marks a question as answered by updating its status to "processed" (processed) and setting the `answered_date` to the current timestamp. The answer is put into the 'answers_outbox' table in the same transaction, so it is delivered even if sending fails or the bot restarts.
 
         Args:
             question_id (int): The ID of the question to mark as answered.
+            chat_id (int): The ID of the chat where the question was asked.
+            reply_to_message_id (typing.Optional[int]): The ID of the question message to reply to.
+            answer (str): The text of the answer.
+            fallback_answer (str): The text sent if replying to the question message is impossible.
         """
 		connection, cursor = self.get_attributes()
 		
@@ -482,17 +563,82 @@ class QuestionsDataHandler(DataHandler):
                 """,
 				(question_id,)
 		)
+		cursor.execute(
+				"""
+                INSERT INTO
+                    answers_outbox (
+                        question_id,
+                        chat_id,
+                        reply_to_message_id,
+                        answer,
+                        fallback_answer
+                    )
+                VALUES
+                    (%s, %s, %s, %s, %s)
+                """,
+				(question_id, chat_id, reply_to_message_id, answer, fallback_answer)
+		)
 		connection.commit()
 		
 		cursor.close()
 		connection.close()
 	
-	def reserve_question_for_moderator(self, moderator_username: str, question_id: int):
+	def replay_queued_questions(self) -> int:
+		"""
+        Inserts the questions queued while the database was unavailable, keeping the time they were asked. All of them are inserted in one transaction, by one multi-row INSERT; if it fails, they stay queued for the next replay. The times are converted to datetimes here, in the bot's local time zone, which is expected to match the server's, so the VALUES clause holds only placeholders, which the connector can always batch. Questions already stored are skipped, so replaying them again after a crash is harmless. Only called by the maintenance thread.
+
+        Returns:
+            int: The number of replayed questions.
+        """
+		questions = self.degraded_mode.take_queued_questions()
+		
+		if not questions:
+			return 0
+		
+		connection, cursor = self.get_attributes()
+		
+		try:
+			cursor.executemany(
+					"""
+            INSERT INTO
+                questions (
+                    user_id,
+                    chat_id,
+                    message_id,
+                    username,
+                    first_name,
+                    last_name,
+                    question,
+                    asked_date
+                )
+            VALUES
+                (%s, %s, %s, %s, %s, %s, %s, %s)
+            ON DUPLICATE KEY UPDATE
+                question_id = question_id
+            """,
+					[(*question[:7], datetime.datetime.fromtimestamp(question[7])) for question in questions]
+			)
+			connection.commit()
+		finally:
+			cursor.close()
+			connection.close()
+		
+		self.degraded_mode.drop_replayed_questions(len(questions))
+		
+		return len(questions)
+	
+	def reserve_question_for_moderator(
+			self,
+			moderator_id: int,
+			moderator_username: typing.Optional[str],
+			question_id: int
+	):
 		"""
-        Reserves a question for a specific moderator. Sets the `answered_date` to the current timestamp (which seems unusual for a reservation), the `status` to "processing", and the `moderator_username`.
+        Reserves a question for a specific moderator. Sets the `answered_date` to the current timestamp (which seems unusual for a reservation), the `status` to "processing", the `moderator_id` and the `moderator_username`.
 
         Args:
-            moderator_username (str): The username of the moderator reserving the question.
+            moderator_id (int): The Telegram ID of the moderator reserving the question.
+            moderator_username (typing.Optional[str]): The username of the moderator at the time of the reservation.
             question_id (int): The ID of the question to reserve.
         """
 		connection, cursor = self.get_attributes()
@@ -504,12 +650,13 @@ class QuestionsDataHandler(DataHandler):
                 SET
                     answered_date = CURRENT_TIMESTAMP,
                     status = "processing",
+                    moderator_id = %s,
                     moderator_username = %s
                 WHERE
                     question_id = %s
                 LIMIT 1
                 """,
-				(moderator_username, question_id)
+				(moderator_id, moderator_username, question_id)
 		)
 		connection.commit()
 		
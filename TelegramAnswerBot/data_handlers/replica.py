@@ -0,0 +1,104 @@
+import time
+import typing
+import threading
+import contextvars
+from telegram import Update
+from telegram.ext import ContextTypes
+from TelegramAnswerBot.data_handlers.pool import ElasticConnectionPool
+
+
+current_user_id: contextvars.ContextVar[typing.Optional[int]] = contextvars.ContextVar("current_user_id", default=None)
+
+
+class ReplicaRouter:
+	"""
+    Sends read-only queries to a replica, except for users who wrote to the primary a moment ago.
+
+    The user an update belongs to is kept in the `current_user_id` context variable, set by track_user for every update. Every commit on the primary records a write of that user; for sticky_time seconds afterwards the user's reads go to the primary, so they see their own changes despite replication lag. Reads outside of updates (background tasks) always use the replica.
+
+    Attributes:
+        replica_pool (typing.Optional[ElasticConnectionPool]): The pool of the replica. None sends all reads to the primary.
+        sticky_time (float): The time in seconds a user's reads stay on the primary after a write.
+        replica_reads (int): The number of reads sent to the replica.
+        primary_reads (int): The number of reads kept on the primary because of a recent write.
+        _last_writes (dict[int, float]): The time of the last write of users with recent writes, from the oldest to the newest.
+        _lock (threading.Lock): Guards _last_writes; reads and commits run in the threads of the database executor.
+    """
+	
+	def __init__(self, replica_pool: typing.Optional[ElasticConnectionPool], sticky_time: float):
+		"""
+        Initializes the ReplicaRouter.
+
+        Args:
+            replica_pool (typing.Optional[ElasticConnectionPool]): The pool of the replica. None sends all reads to the primary.
+            sticky_time (float): The time in seconds a user's reads stay on the primary after a write.
+        """
+		self.replica_pool = replica_pool
+		self.sticky_time = sticky_time
+		
+		self.replica_reads = 0
+		self.primary_reads = 0
+		
+		self._last_writes: dict[int, float] = {}
+		self._lock = threading.Lock()
+	
+	def get_read_pool(self) -> typing.Optional[ElasticConnectionPool]:
+		"""
+        Chooses the pool for a read-only query of the current user.
+
+        Returns:
+            typing.Optional[ElasticConnectionPool]: The replica pool, or None if the read must go to the primary.
+        """
+		if self.replica_pool is None:
+			return None
+		
+		user_id = current_user_id.get()
+		
+		with self._lock:
+			if user_id is not None and self._last_writes.get(user_id, -self.sticky_time) > time.monotonic() - self.sticky_time:
+				self.primary_reads += 1
+				return None
+			
+			self.replica_reads += 1
+		
+		return self.replica_pool
+	
+	def get_stats(self) -> dict[str, int]:
+		"""
+        Returns the routing counters.
+
+        Returns:
+            dict[str, int]: The number of "replica_reads", "primary_reads" and "sticky_users".
+        """
+		return {"replica_reads": self.replica_reads, "primary_reads": self.primary_reads, "sticky_users": len(self._last_writes)}
+	
+	def record_write(self):
+		"""Records a write of the current user and forgets writes older than sticky_time. Called after every commit on the primary."""
+		if self.replica_pool is None:
+			return
+		
+		now = time.monotonic()
+		user_id = current_user_id.get()
+		
+		with self._lock:
+			if user_id is not None:
+				self._last_writes.pop(user_id, None)
+				self._last_writes[user_id] = now
+			
+			while self._last_writes:
+				oldest_user_id, last_write = next(iter(self._last_writes.items()))
+				
+				if last_write > now - self.sticky_time:
+					break
+				
+				del self._last_writes[oldest_user_id]
+	
+	async def track_user(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+		"""
+        Sets the current user for the rest of the update's processing. Registered as a handler for every update before all other handlers.
+
+        Args:
+            update (Update): The Telegram update object.
+            context (ContextTypes.DEFAULT_TYPE): The Telegram context object.
+        """
+		current_user_id.set(update.effective_user.id if update.effective_user is not None else None)
\ No newline at end of file
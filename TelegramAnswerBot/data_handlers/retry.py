@@ -0,0 +1,170 @@
+import time
+import random
+import typing
+import functools
+import contextvars
+import collections
+import mysql.connector
+from mysql.connector import errorcode
+from TelegramAnswerBot.data_handlers.pool import PooledConnection
+
+
+RETRYABLE_ERRORS = {errorcode.ER_LOCK_DEADLOCK: "deadlock", errorcode.ER_LOCK_WAIT_TIMEOUT: "lock_wait_timeout"}
+
+attempt_connections: contextvars.ContextVar[typing.Optional[list[PooledConnection]]] = contextvars.ContextVar("attempt_connections", default=None)
+
+
+class RetryPolicy:
+	"""
+    Decides whether a failed database call is run again, and counts the retries.
+
+    Only deadlocks and lock wait timeouts are retried, and only if the failed attempt committed nothing, so a retry can't apply a write twice. Delays grow exponentially up to max_delay, with full jitter, so calls that deadlocked on each other don't collide again. Database calls run in the threads of the database executor, so a delay holds one of them and its connection; the delays are kept short.
+
+    Attributes:
+        max_attempts (int): The number of attempts of a call, including the first one.
+        base_delay (float): The upper bound of the delay in seconds before the first retry. Doubles with every further retry.
+        max_delay (float): The upper bound of any delay in seconds.
+        retries_by_error (collections.Counter[str]): The number of retries by error name.
+        retries_by_method (collections.Counter[str]): The number of retries by method name.
+        recovered_count (int): The number of calls that succeeded after a retry.
+        exhausted_count (int): The number of calls that failed on their last attempt.
+    """
+	
+	def __init__(self, max_attempts: int = 3, base_delay: float = 0.05, max_delay: float = 0.5):
+		"""
+        Initializes the RetryPolicy.
+
+        Args:
+            max_attempts (int): The number of attempts of a call, including the first one.
+            base_delay (float): The upper bound of the delay in seconds before the first retry.
+            max_delay (float): The upper bound of any delay in seconds.
+        """
+		self.max_attempts = max_attempts
+		self.base_delay = base_delay
+		self.max_delay = max_delay
+		
+		self.retries_by_error: collections.Counter[str] = collections.Counter()
+		self.retries_by_method: collections.Counter[str] = collections.Counter()
+		self.recovered_count = 0
+		self.exhausted_count = 0
+	
+	def get_delay(self, attempt: int) -> float:
+		"""
+        Picks the delay before the next attempt.
+
+        Args:
+            attempt (int): The number of the failed attempt, starting from 1.
+
+        Returns:
+            float: A random delay in seconds between 0 and the attempt's upper bound.
+        """
+		return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+	
+	def get_stats(self) -> dict[str, typing.Any]:
+		"""
+        Returns the retry counters.
+
+        Returns:
+            dict[str, typing.Any]: The "retries" by error and "methods" by method name, and the number of "recovered" and "exhausted" calls.
+        """
+		return {
+			"retries": dict(self.retries_by_error),
+			"methods": dict(self.retries_by_method),
+			"recovered": self.recovered_count,
+			"exhausted": self.exhausted_count
+		}
+	
+	def should_retry(
+			self,
+			error: Exception,
+			attempt: int,
+			connections: list[PooledConnection],
+			method_name: str
+	) -> bool:
+		"""
+        Decides whether a failed call is run again and counts the retry.
+
+        Args:
+            error (Exception): The error of the failed attempt.
+            attempt (int): The number of the failed attempt, starting from 1.
+            connections (list[PooledConnection]): The connections the attempt took.
+            method_name (str): The name of the called method.
+
+        Returns:
+            bool: True if the call should be run again.
+        """
+		if not isinstance(error, mysql.connector.Error) or error.errno not in RETRYABLE_ERRORS:
+			return False
+		
+		if any(connection.committed for connection in connections):
+			return False
+		
+		if attempt >= self.max_attempts:
+			self.exhausted_count += 1
+			return False
+		
+		self.retries_by_error[RETRYABLE_ERRORS[error.errno]] += 1
+		self.retries_by_method[method_name] += 1
+		
+		return True
+
+
+def release_connections(connections: list[PooledConnection]):
+	"""
+    Rolls back and returns the connections a failed attempt left open. A lock wait timeout only rolls back the failed statement, so without the rollback the locks taken before it would be held by an idle connection.
+
+    Args:
+        connections (list[PooledConnection]): The connections taken by the attempt.
+    """
+	for connection in connections:
+		if connection._cnx is None:
+			continue
+		
+		try:
+			connection.rollback()
+		except mysql.connector.Error:
+			pass
+		
+		connection.close()
+
+
+def retry_transaction(method: typing.Callable) -> typing.Callable:
+	"""
+    Runs a DataHandler method again after a deadlock or a lock wait timeout, using the handler's retry_policy.
+
+    Only for methods whose writes are made in one transaction and whose other side effects (caches) come after the commit: the whole method is run again, and a failed attempt must leave nothing behind. Connections taken by a failed attempt are rolled back and returned to the pool.
+
+    Args:
+        method (typing.Callable): The DataHandler method.
+
+    Returns:
+        typing.Callable: The wrapped method.
+    """
+	@functools.wraps(method)
+	def wrapper(self, *args, **kwargs):
+		attempt = 0
+		
+		while True:
+			attempt += 1
+			connections = []
+			token = attempt_connections.set(connections)
+			
+			try:
+				result = method(self, *args, **kwargs)
+			except Exception as error:
+				release_connections(connections)
+				
+				if not self.retry_policy.should_retry(error, attempt, connections, method.__qualname__):
+					raise
+				
+				time.sleep(self.retry_policy.get_delay(attempt))
+				continue
+			finally:
+				attempt_connections.reset(token)
+			
+			if attempt > 1:
+				self.retry_policy.recovered_count += 1
+			
+			return result
+	
+	return wrapper
\ No newline at end of file
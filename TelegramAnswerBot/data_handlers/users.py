@@ -1,27 +1,83 @@
 import json
 import typing
-import pandas
+import itertools
 from telegram.ext import ContextTypes
 from TelegramAnswerBot import (
 	functions,
 	objects_types
 )
+from TelegramAnswerBot.errors import DatabaseUnavailableError
 from TelegramAnswerBot.data_handlers.base import DataHandler
+from TelegramAnswerBot.data_handlers.degraded import DegradedMode
+from TelegramAnswerBot.data_handlers.pool import ElasticConnectionPool
+from TelegramAnswerBot.data_handlers.replica import ReplicaRouter
+from TelegramAnswerBot.data_handlers.prepared import PreparedStatementsRegistry
+from TelegramAnswerBot.data_handlers.retry import (
+	RetryPolicy,
+	retry_transaction
+)
+from TelegramAnswerBot.data_handlers.cache import (
+	LRUCache,
+	MISSING
+)
 
 
 class UsersDataHandler(DataHandler):
 	"""
-    Manages user data stored in a database table named 'users'. Provides methods for adding, updating, and retrieving user information, including their roles and abilities.
+    Manages user data stored in a database table named 'users', keyed by the Telegram user ID. Provides methods for adding, updating, and retrieving user information, including their roles and abilities.
+
+    Roles given to a username whose Telegram ID is still unknown are kept in the 'pending_roles' table and are claimed on the user's first contact with the bot.
+
+    Attributes:
+        connection_pool (ElasticConnectionPool): Inherited from DataHandler.
+        persisted_context_data (dict[int, dict[str, typing.Any]]): The last known stored `user_context_data` of users by user ID. Used to skip writes that change nothing and to send only changed keys.
+        roles_abilities (dict[str, objects_types.RoleAbilities]): The shared abilities objects by role name.
+        profiles_cache (LRUCache): Recently read rows of the 'users' table by user ID. Users without a row are cached as None. Every method changing a user drops the user's entry.
     """
 	
-	def add_user_chat_id(self, username: str, chat_id: int):
+	def __init__(
+			self,
+			connection_pool: ElasticConnectionPool,
+			analytics_pool: ElasticConnectionPool,
+			replica_router: ReplicaRouter,
+			retry_policy: RetryPolicy,
+			degraded_mode: DegradedMode,
+			profiles_cache_size: int,
+			profiles_cache_ttl: float,
+			prepared_statements: typing.Optional[PreparedStatementsRegistry] = None
+	):
 		"""
-        Updates a user's chat ID.
+        Initializes the UsersDataHandler.
 
         Args:
-            username (str): The username of the user to update.
+            connection_pool (ElasticConnectionPool): The connection pool for database access.
+            analytics_pool (ElasticConnectionPool): The pool for heavy reports.
+            replica_router (ReplicaRouter): Sends read-only queries to a replica.
+            retry_policy (RetryPolicy): The retry policy of deadlocked calls.
+            degraded_mode (DegradedMode): The circuit breaker and the data served while it is open.
+            profiles_cache_size (int): The maximum number of cached user rows. 0 disables the cache.
+            profiles_cache_ttl (float): The time in seconds a cached user row stays valid.
+            prepared_statements (typing.Optional[PreparedStatementsRegistry]): The prepared statements of the pooled connections.
+        """
+		super().__init__(connection_pool, analytics_pool, replica_router, retry_policy, degraded_mode, prepared_statements)
+		
+		self.persisted_context_data: dict[int, dict[str, typing.Any]] = {}
+		self.profiles_cache = LRUCache(profiles_cache_size, profiles_cache_ttl)
+		self.roles_abilities: dict[str, objects_types.RoleAbilities] = {}
+	
+	def add_user_chat_id(self, user_id: int, chat_id: int):
+		"""
+        Sets a user's chat ID if it isn't set yet. Nothing is sent to the database if the cached row already has a chat ID.
+
+        Args:
+            user_id (int): The Telegram ID of the user to update.
             chat_id (int): The new chat ID for the user.
         """
+		profile = self.get_user_profile(user_id)
+		
+		if profile is not None and profile.chat_id is not None:
+			return
+		
 		connection, cursor = self.get_attributes()
 		
 		cursor.execute(
@@ -31,22 +87,26 @@ class UsersDataHandler(DataHandler):
                 SET
                     chat_id = %s
                 WHERE
-                    username = %s
+                    user_id = %s
+                    AND chat_id IS NULL
                 LIMIT 1
                 """,
-				(chat_id, username)
+				(chat_id, user_id)
 		)
 		connection.commit()
 		
 		cursor.close()
 		connection.close()
+		
+		self.profiles_cache.pop(user_id)
 	
-	def add_user(self, username: str, role: str):
+	def add_user(self, user_id: int, username: typing.Optional[str], role: str):
 		"""
         Adds a new user to the database.
 
         Args:
-            username (str): The username of the new user.
+            user_id (int): The Telegram ID of the new user.
+            username (typing.Optional[str]): The username of the new user.
             role (str): The role assigned to the user.
         """
 		connection, cursor = self.get_attributes()
@@ -55,118 +115,279 @@ class UsersDataHandler(DataHandler):
 				"""
                 INSERT INTO
                     users (
+                        user_id,
                         username,
                         role,
                         user_context_data
                     )
                 VALUES
-                    (%s, %s, %s)
+                    (%s, %s, %s, %s)
                 """,
-				(username, role, "{}")
+				(user_id, username, role, "{}")
 		)
 		connection.commit()
 		
 		cursor.close()
 		connection.close()
+		
+		self.persisted_context_data[user_id] = {}
+		self.profiles_cache.pop(user_id)
 	
 	def change_user_role(self, username: str, role: str):
 		"""
-        Adds a new user to the database.
+        Gives a role to a user. See change_users_role.
 
         Args:
-            username (str): The username of the new user.
+            username (str): The username of the user.
             role (str): The role assigned to the user.
+        """
+		self.change_users_role([username], role)
+	
+	def change_users_role(self, usernames: list[str], role: str):
+		"""
+        Gives a role to several users in one transaction.
+
+        Staff get their role replaced and known askers get a staff row in a single upsert. The remaining usernames get a pending role in a second statement, which is claimed when the user contacts the bot. The user IDs behind the usernames aren't known here, so the whole profiles cache is cleared.
+
+        Args:
+            usernames (list[str]): The usernames of the users.
+            role (str): The role assigned to the users.
+        """
+		if not usernames:
+			return
+		
+		connection, cursor = self.get_attributes()
+		
+		usernames_placeholders = ", ".join("%s" for _ in usernames)
+		
+		cursor.execute(
+				f"""
+                INSERT INTO
+                    users (
+                        user_id,
+                        username,
+                        role,
+                        language,
+                        user_context_data
+                    )
+                SELECT
+                    candidates.user_id,
+                    candidates.username,
+                    %s,
+                    candidates.language,
+                    "{{}}"
+                FROM (
+                    SELECT
+                        user_id,
+                        username,
+                        language
+                    FROM
+                        users
+                    WHERE
+                        username IN ({usernames_placeholders})
+                    UNION ALL
+                    SELECT
+                        user_id,
+                        username,
+                        language
+                    FROM
+                        askers
+                    WHERE
+                        username IN ({usernames_placeholders})
+                ) AS candidates
+                ON DUPLICATE KEY UPDATE
+                    role = %s
+                """,
+				(role, *usernames, *usernames, role)
+		)
+		cursor.execute(
+				f"""
+                INSERT INTO
+                    pending_roles (
+                        username,
+                        role
+                    )
+                SELECT
+                    names.username,
+                    %s
+                FROM (
+                    VALUES {", ".join("ROW(%s)" for _ in usernames)}
+                ) AS names (username)
+                WHERE
+                    NOT EXISTS (
+                        SELECT 1
+                        FROM users
+                        WHERE users.username = names.username
+                    )
+                ON DUPLICATE KEY UPDATE
+                    role = %s
+                """,
+				(role, *usernames, role)
+		)
+		connection.commit()
+		
+		cursor.close()
+		connection.close()
+		
+		self.profiles_cache.clear()
+	
+	@retry_transaction
+	def claim_pending_role(self, user_id: int, username: str) -> typing.Optional[objects_types.UserRow]:
+		"""
+        Gives a user the role that is pending for the user's username. The language the user chose as an asker is kept.
+
+        Args:
+            user_id (int): The Telegram ID of the user.
+            username (str): The current username of the user.
+
+        Returns:
+            typing.Optional[objects_types.UserRow]: The new row of the user, with `user_context_data` as a JSON string. Returns None if no role is pending.
         """
 		connection, cursor = self.get_attributes()
 		
 		cursor.execute(
 				"""
                 SELECT
-                    *
+                    role
                 FROM
-                    users
+                    pending_roles
                 WHERE
                     username = %s
+                LIMIT 1
+                FOR UPDATE
                 """,
 				(username,)
 		)
+		pending_role = cursor.fetchone()
 		
-		user = cursor.fetchone()
-		
-		if user[0]:
+		if pending_role is not None:
 			cursor.execute(
 					"""
-                    UPDATE
-                        users
-                    SET
-                        role = %s
+                    INSERT INTO
+                        users (
+                            user_id,
+                            username,
+                            role,
+                            language,
+                            user_context_data
+                        )
+                    VALUES
+                        (%s, %s, %s, (SELECT language FROM askers WHERE user_id = %s), %s)
+                    """,
+					(user_id, username, pending_role[0], user_id, "{}")
+			)
+			cursor.execute(
+					"""
+                    DELETE FROM pending_roles
                     WHERE
                         username = %s
                     LIMIT 1
                     """,
-					(username, role)
+					(username,)
 			)
-			connection.commit()
-		else:
-			self.add_user(username, role)
+		
+		connection.commit()
 		
 		cursor.close()
 		connection.close()
+		
+		if pending_role is None:
+			return None
+		
+		self.persisted_context_data[user_id] = {}
+		self.profiles_cache.pop(user_id)
+		
+		return self.load_user_profile(user_id)
 	
-	def create_table(self):
+	def forget_context_data(self, user_id: int):
 		"""
-        Creates the 'faq' table if it doesn't exist.
+        Forgets the last stored context data of a user whose user_data was dropped from memory. It is read again with the user's data on the next update, and until then a write sends all keys.
+
+        Args:
+            user_id (int): The Telegram ID of the user.
         """
-		connection, cursor = self.get_attributes()
+		self.persisted_context_data.pop(user_id, None)
+	
+	def get_all_roles_abilities(self) -> dict[str, objects_types.RoleAbilities]:
+		"""
+        Retrieves the abilities of all roles, for the snapshot of the degraded mode.
+
+        Returns:
+            dict[str, objects_types.RoleAbilities]: The abilities by role name.
+        """
+		connection, cursor = self.get_read_attributes()
 		
 		cursor.execute(
 				"""
-				CREATE TABLE IF NOT EXISTS roles (
-					role_name VARCHAR(32) NOT NULL,
-					role_level INTEGER NOT NULL,
-					receives_messages TINYINT(1) NOT NULL,
-					able_to_users_handle TINYINT(1) NOT NULL,
-					able_to_users_view TINYINT(1) NOT NULL,
-					able_to_faqs_handle TINYINT(1) NOT NULL,
-					able_to_faqs_view TINYINT(1) NOT NULL,
-					able_to_questions_handle TINYINT(1) NOT NULL,
-					able_to_questions_view TINYINT(1) NOT NULL,
-					able_to_ask TINYINT(1) NOT NULL,
-					able_to_answer TINYINT(1) NOT NULL,
-					PRIMARY KEY (`role_name`)
-				)
-				"""
+                SELECT
+                    role_name,
+                    receives_messages,
+                    able_to_users_handle,
+                    able_to_users_view,
+                    able_to_faqs_handle,
+                    able_to_faqs_view,
+                    able_to_questions_handle,
+                    able_to_questions_view,
+                    able_to_ask,
+                    able_to_answer
+                FROM
+                    roles
+                """
 		)
-		connection.commit()
+		
+		roles_abilities = {row[0]: objects_types.RoleAbilities(*(value == 1 for value in row[1:])) for row in cursor.fetchall()}
+		
+		cursor.close()
+		connection.close()
+		
+		return roles_abilities
+	
+	def get_chats_receiving_messages(self) -> list[int]:
+		"""
+        Retrieves the chat IDs of users receiving messages without changing anything, for the snapshot of the degraded mode.
+
+        Returns:
+            list[int]: A list of chat IDs.
+        """
+		connection, cursor = self.get_read_attributes()
 		
 		cursor.execute(
 				"""
-				CREATE TABLE IF NOT EXISTS users (
-					username VARCHAR(64) NOT NULL,
-					role VARCHAR(32) NOT NULL,
-					chat_id BIGINT DEFAULT NULL,
-					user_context_data JSON NOT NULL,
-					PRIMARY KEY (`username`),
-					KEY `users_role` (`role`),
-					CONSTRAINT `users_role` FOREIGN KEY (`role`) REFERENCES `roles` (`role_name`) ON DELETE CASCADE ON UPDATE CASCADE
-				)
-				"""
+                SELECT
+                    chat_id
+                FROM
+                    users
+                WHERE
+                    chat_id IS NOT NULL
+                """
 		)
 		
+		chats_receiving_messages = [row[0] for row in cursor.fetchall()]
+		
 		cursor.close()
 		connection.close()
+		
+		return chats_receiving_messages
 	
-	def get_role_abilities(self, role_name: str) -> objects_types.RoleAbilitiesDict:
+	def get_role_abilities(self, role_name: str) -> objects_types.RoleAbilities:
 		"""
-        Retrieves the abilities associated with a specific role.
+        Retrieves the abilities associated with a specific role. Each role is read from the database once; the same immutable object is returned for all users with that role.
 
         Args:
             role_name (str): The name of the role.
 
         Returns:
-            objects_types.RoleAbilitiesDict: A dictionary where keys are ability names (e.g., "receives_messages", "able_to_users_handle") and values are booleans indicating whether the role has that ability.
+            objects_types.RoleAbilities: The abilities of the role (e.g., "receives_messages", "able_to_users_handle") as boolean attributes. Taken from the snapshot while the database is unavailable.
         """
-		connection, cursor = self.get_attributes()
+		role_abilities = self.roles_abilities.get(role_name)
+		
+		if role_abilities is not None:
+			return role_abilities
+		
+		try:
+			connection, cursor = self.get_attributes()
+		except DatabaseUnavailableError:
+			return self.degraded_mode.get_role_abilities(role_name)
 		
 		cursor.execute(
 				f"""
@@ -189,14 +410,13 @@ class UsersDataHandler(DataHandler):
 				(role_name,)
 		)
 		
-		role_abilities = functions.get_db_line_dict(
-				[header[0] for header in cursor.description],
-				[value == 1 for value in cursor.fetchone()]
-		)
+		role_abilities = objects_types.RoleAbilities(*(value == 1 for value in cursor.fetchone()))
 		
 		cursor.close()
 		connection.close()
 		
+		self.roles_abilities[role_name] = role_abilities
+		
 		return role_abilities
 	
 	def get_roles_by_priority(self, start_role: str, sign: str) -> list[str]:
@@ -236,53 +456,54 @@ class UsersDataHandler(DataHandler):
 		
 		return roles_by_priority
 	
-	def get_user_chat_id(self, username: str) -> typing.Optional[int]:
+	def get_user_chat_id(self, user_id: int) -> typing.Optional[int]:
 		"""
-        Retrieves the chat ID associated with a specific username.
+        Retrieves the chat ID associated with a specific user.
 
         Args:
-            username (str): The username of the user.
+            user_id (int): The Telegram ID of the user.
 
         Returns:
             typing.Optional[int]: The user's chat ID, or None if no chat ID is found for the user.
         """
-		connection, cursor = self.get_attributes()
+		profile = self.get_user_profile(user_id)
 		
-		cursor.execute(
-				"""
-                SELECT
-                    chat_id
-                FROM
-                    users
-                WHERE
-                    username = %s
-                LIMIT 1
-                """,
-				(username,)
-		)
-		chat_id = cursor.fetchone()
+		return profile.chat_id if profile is not None else None
+	
+	def get_user_data(self, user_id: int) -> typing.Optional[objects_types.UserRow]:
+		"""
+        Retrieves all data for a specific user.
+
+        Args:
+            user_id (int): The Telegram ID of the user.
+
+        Returns:
+            typing.Optional[objects_types.UserRow]: The user's data. The `user_context_data` field is parsed as a JSON object. Returns None if the user is not found.
+        """
+		user_data = self.get_user_profile(user_id)
 		
-		cursor.close()
-		connection.close()
+		if user_data is not None:
+			user_data = user_data._replace(user_context_data=json.loads(user_data.user_context_data))
+			self.persisted_context_data[user_id] = json.loads(json.dumps(user_data.user_context_data))
 		
-		return chat_id[0] if chat_id else None
+		return user_data
 	
-	def get_user_data(self, username: str) -> objects_types.UserDataDict:
+	def get_user_data_by_username(self, username: str) -> typing.Optional[objects_types.UserRow]:
 		"""
-        Retrieves all data for a specific user.
+        Retrieves all data for a user found by username. A pending role is returned as a user without ID and chat ID.
 
         Args:
             username (str): The username of the user.
 
         Returns:
-            objects_types.UserDataDict: A dictionary containing the user's data. The `user_context_data` field is parsed as a JSON object. Returns an empty dictionary if the user is not found.
+            typing.Optional[objects_types.UserRow]: The user's data. Returns None if the user has neither a role nor a pending role.
         """
 		connection, cursor = self.get_attributes()
 		
 		cursor.execute(
-				"""
+				f"""
                 SELECT
-                    *
+                    {functions.get_db_columns(objects_types.UserRow)}
                 FROM
                     users
                 WHERE
@@ -292,88 +513,135 @@ class UsersDataHandler(DataHandler):
 				(username,)
 		)
 		
-		user_data = functions.get_db_line_dict([header[0] for header in cursor.description], cursor.fetchone())
-		user_data["user_context_data"] = json.loads(user_data["user_context_data"])
+		user_data = cursor.fetchone()
+		
+		if user_data is not None:
+			user_data = objects_types.UserRow._make(user_data)
+			user_data = user_data._replace(user_context_data=json.loads(user_data.user_context_data))
+		else:
+			cursor.execute(
+					"""
+                    SELECT
+                        role
+                    FROM
+                        pending_roles
+                    WHERE
+                        username = %s
+                    LIMIT 1
+                    """,
+					(username,)
+			)
+			pending_role = cursor.fetchone()
+			
+			if pending_role is not None:
+				user_data = objects_types.UserRow(
+						user_id=None,
+						username=username,
+						role=pending_role[0],
+						language=None,
+						chat_id=None,
+						user_context_data={}
+				)
 		
 		cursor.close()
 		connection.close()
 		
 		return user_data
 	
-	def get_user_language(self, username: str) -> str | None:
+	def get_user_language(self, user_id: int) -> str | None:
 		"""
         Retrieves the language of a specific user.
 
         Args:
-            username (str): The username of the user.
+            user_id (int): The Telegram ID of the user.
 
         Returns:
             str | None: The user's language. Returns None if the user is not found or doesn't have a language assigned.
         """
-		connection, cursor = self.get_attributes()
+		profile = self.get_user_profile(user_id)
 		
-		cursor.execute(
-				"""
-                SELECT
-                    language
-                FROM
-                    users
-                WHERE
-                    username = %s
-                LIMIT 1
-                """,
-				(username,)
-		)
-		language = cursor.fetchone()
+		return profile.language if profile is not None else None
+	
+	def get_user_profile(self, user_id: int) -> typing.Optional[objects_types.UserRow]:
+		"""
+        Retrieves the row of a user from the profiles cache, loading it from the database on a miss.
+
+        Args:
+            user_id (int): The Telegram ID of the user.
+
+        Returns:
+            typing.Optional[objects_types.UserRow]: The user's row, with `user_context_data` as stored JSON text. Returns None if the user is not found.
+        """
+		profile = self.profiles_cache.get(user_id, MISSING)
 		
-		cursor.close()
-		connection.close()
+		if profile is MISSING:
+			profile = self.load_user_profile(user_id)
 		
-		return language[0] if language else None
+		return profile
 	
-	def get_user_role(self, username: str) -> tuple[str, bool]:
+	def get_user_role(self, user_id: int, username: typing.Optional[str]) -> tuple[str, bool]:
 		"""
-        Retrieves the role of a specific user.
+        Retrieves the role of a specific user. Keeps the stored username up to date and claims a role that is pending for the user's username.
+
+        Pending roles are only looked up when the user isn't in the profiles cache; assigning roles clears the cache, so a new pending role is still found.
 
         Args:
-            username (str): The username of the user.
+            user_id (int): The Telegram ID of the user.
+            username (typing.Optional[str]): The current username of the user.
 
         Returns:
-            tuple[str, bool]: The user's role. Returns "user" if the user is not found or doesn't have a role assigned.
+            tuple[str, bool]: The user's role and whether the user has a row in the 'users' table. Returns ("user", False) if the user doesn't have a role assigned.
         """
-		connection, cursor = self.get_attributes()
-		
-		cursor.execute(
-				"""
-                SELECT
-                    role
-                FROM
-                    users
-                WHERE
-                    username = %s
-                LIMIT 1
-                """,
-				(username,)
-		)
-		role = cursor.fetchone()
+		profile = self.profiles_cache.get(user_id, MISSING)
 		
-		cursor.close()
-		connection.close()
+		if profile is MISSING:
+			profile = self.load_user_profile(user_id)
+			
+			if profile is None and username is not None:
+				profile = self.claim_pending_role(user_id, username)
 		
-		return (role[0], True) if role else ("user", False)
+		if profile is not None and profile.username != username:
+			connection, cursor = self.get_attributes()
+			
+			cursor.execute(
+					"""
+                    UPDATE
+                        users
+                    SET
+                        username = %s
+                    WHERE
+                        user_id = %s
+                    LIMIT 1
+                    """,
+					(username, user_id)
+			)
+			connection.commit()
+			
+			cursor.close()
+			connection.close()
+			
+			profile = profile._replace(username=username)
+			self.profiles_cache.set(user_id, profile)
+		
+		return (profile.role, True) if profile is not None else ("user", False)
 	
+	@retry_transaction
 	def get_users_chats_receiving_messages(self) -> list[int]:
 		"""
         Retrieves a list of chat IDs for users who have a chat ID set (presumably indicating they should receive messages) and resets their `user_context_data`.
 
         Returns:
-            list[int]: A list of chat IDs.
+            list[int]: A list of chat IDs. Taken from the snapshot, without the reset, while the database is unavailable.
         """
-		connection, cursor = self.get_attributes()
+		try:
+			connection, cursor = self.get_attributes()
+		except DatabaseUnavailableError:
+			return list(self.degraded_mode.chats_receiving_messages)
 		
 		cursor.execute(
 				"""
                 SELECT
+                    user_id,
                     chat_id
                 FROM
                     users
@@ -383,7 +651,8 @@ class UsersDataHandler(DataHandler):
                 """
 		)
 		
-		users_chats_receiving_messages = [row[0] for row in cursor.fetchall()]
+		users_receiving_messages = cursor.fetchall()
+		users_chats_receiving_messages = [row[1] for row in users_receiving_messages]
 		
 		cursor.execute(
 				"""
@@ -400,52 +669,130 @@ class UsersDataHandler(DataHandler):
 		cursor.close()
 		connection.close()
 		
+		for user_id, _ in users_receiving_messages:
+			self.persisted_context_data[user_id] = {}
+			self.profiles_cache.pop(user_id)
+		
 		return users_chats_receiving_messages
 	
-	def get_users_data(self) -> pandas.DataFrame:
+	def get_users_data(self) -> list[objects_types.UserRoleRow]:
 		"""
-        Retrieves data for all users, including their roles and role levels.
+        Retrieves data for all users with a role, including pending roles, and their role levels.
 
         Returns:
-           pandas.DataFrame: A Pandas DataFrame containing user data.
+           list[objects_types.UserRoleRow]: The "username", "role" and "role_level" of users.
         """
-		connection, cursor = self.get_attributes()
+		connection, cursor = self.get_analytics_attributes()
 		
 		cursor.execute(
 				"""
                 SELECT
-                    *
+                    users.username,
+                    users.role,
+                    roles.role_level
                 FROM
                     users
                 JOIN
                     roles
                 ON
                     users.role = roles.role_name
+                UNION ALL
+                SELECT
+                    pending_roles.username,
+                    pending_roles.role,
+                    roles.role_level
+                FROM
+                    pending_roles
+                JOIN
+                    roles
+                ON
+                    pending_roles.role = roles.role_name
                 ORDER BY
-                    roles.role_level DESC,
-                    users.username ASC
+                    role_level DESC,
+                    username ASC
                 """
 		)
 		
-		users_data = functions.get_db_data_frame([header[0] for header in cursor.description], cursor.fetchall())
+		users_data = list(map(objects_types.UserRoleRow._make, cursor.fetchall()))
 		
 		cursor.close()
 		connection.close()
 		
 		return users_data
 	
+	def load_user_profile(self, user_id: int) -> typing.Optional[objects_types.UserRow]:
+		"""
+        Loads the row of a user from the database and puts it into the profiles cache. Users without a row are cached too, as None.
+
+        Args:
+            user_id (int): The Telegram ID of the user.
+
+        Returns:
+            typing.Optional[objects_types.UserRow]: The user's row, with `user_context_data` as stored JSON text. Returns None if the user is not found.
+        """
+		connection, cursor = self.execute_prepared(
+				f"""
+                SELECT
+                    {functions.get_db_columns(objects_types.UserRow)}
+                FROM
+                    users
+                WHERE
+                    user_id = %s
+                LIMIT 1
+                """,
+				(user_id,)
+		)
+		
+		profile = next(iter(cursor.fetchall()), None)
+		
+		connection.close()
+		
+		if profile is not None:
+			profile = objects_types.UserRow._make(profile)
+			
+			# The binary protocol of prepared statements returns JSON columns as bytes
+			if isinstance(profile.user_context_data, bytes):
+				profile = profile._replace(user_context_data=profile.user_context_data.decode())
+		
+		self.profiles_cache.set(user_id, profile)
+		
+		return profile
+	
+	@retry_transaction
 	def remove_user(self, username: str):
 		"""
-        Removes a user from the database.
+        Removes the role of a user, including a pending one.
 
         Args:
             username (str): The username of the user to remove.
         """
 		connection, cursor = self.get_attributes()
 		
+		cursor.execute(
+				"""
+                SELECT
+                    user_id
+                FROM
+                    users
+                WHERE
+                    username = %s
+                FOR UPDATE
+                """,
+				(username,)
+		)
+		users_ids = [row[0] for row in cursor.fetchall()]
+		
 		cursor.execute(
 				"""
                 DELETE FROM users
+                WHERE
+                    username = %s
+                """,
+				(username,)
+		)
+		cursor.execute(
+				"""
+                DELETE FROM pending_roles
                 WHERE
                     username = %s
                 LIMIT 1
@@ -456,14 +803,18 @@ class UsersDataHandler(DataHandler):
 		
 		cursor.close()
 		connection.close()
+		
+		for user_id in users_ids:
+			self.persisted_context_data.pop(user_id, None)
+			self.profiles_cache.pop(user_id)
 	
-	def update_language(self, username: str, language: str, context: ContextTypes.DEFAULT_TYPE):
+	def update_language(self, user_id: int, language: str, context: ContextTypes.DEFAULT_TYPE):
 		"""
-        Updates a user's last recorded state, message ID, and context data in the database.
+        Updates a user's language in the database and in the context data.
 
         Args:
-            username (str): The username of the user to update.
-            language (str): The user's last state.
+            user_id (int): The Telegram ID of the user to update.
+            language (str): The user's new language.
             context (ContextTypes.DEFAULT_TYPE): The Telegram bot context.
         """
 		connection, cursor = self.get_attributes()
@@ -477,58 +828,75 @@ class UsersDataHandler(DataHandler):
                 SET
                     language = %s
                 WHERE
-                    username = %s
+                    user_id = %s
                 LIMIT 1
                 """,
-				(language, username)
+				(language, user_id)
 		)
 		connection.commit()
 		
 		cursor.close()
 		connection.close()
+		
+		self.profiles_cache.pop(user_id)
 	
-	def update_last_state(
-			self,
-			username: str,
-			last_state: str,
-			last_message_id: typing.Optional[int],
-			context: ContextTypes.DEFAULT_TYPE
-	):
+	def update_users_context_data(self, users_context_data: list[tuple[int, dict[str, typing.Any]]]):
 		"""
-        Updates a user's last recorded state, message ID, and context data in the database.
+        Writes the context data of several users in one transaction.
+
+        Every user's data is compared with the last stored version: users without changes are skipped, and for the rest only the changed keys are sent through `JSON_SET`. Users with the same set of changed keys are written in one batch.
 
         Args:
-            username (str): The username of the user to update.
-            last_state (str): The user's last state.
-            last_message_id (typing.Optional[int]): The ID of the last message.
-            context (ContextTypes.DEFAULT_TYPE): The Telegram bot context.
+            users_context_data (list[tuple[int, dict[str, typing.Any]]]): Pairs of a user ID and the user's context data to store.
         """
+		changed_users: dict[tuple[str, ...], list[tuple[int, dict[str, typing.Any]]]] = {}
+		
+		for user_id, context_data in users_context_data:
+			context_data = json.loads(json.dumps(context_data))
+			persisted_context_data = self.persisted_context_data.get(user_id)
+			
+			changed_keys = tuple(
+					sorted(
+							key
+							for key, value in context_data.items()
+							if persisted_context_data is None or key not in persisted_context_data or persisted_context_data[key] != value
+					)
+			)
+			
+			if changed_keys:
+				changed_users.setdefault(changed_keys, []).append((user_id, context_data))
+		
+		if not changed_users:
+			return
+		
 		connection, cursor = self.get_attributes()
 		
-		context.user_data["current_state"] = (last_state, last_message_id)
+		for changed_keys, users in changed_users.items():
+			cursor.executemany(
+					f"""
+                    UPDATE
+                        users
+                    SET
+                        user_context_data = JSON_SET(user_context_data, {", ".join("%s, CAST(%s AS JSON)" for _ in changed_keys)})
+                    WHERE
+                        user_id = %s
+                    LIMIT 1
+                    """,
+					[
+						(
+								*itertools.chain.from_iterable((f"$.{key}", json.dumps(context_data[key])) for key in changed_keys),
+								user_id
+						)
+						for user_id, context_data in users
+					]
+			)
 		
-		cursor.execute(
-				"""
-                UPDATE
-                    users
-                SET
-                    user_context_data = %s
-                WHERE
-                    username = %s
-                LIMIT 1
-                """,
-				(
-						json.dumps(
-								{
-									"current_state": context.user_data["current_state"],
-									"temp": context.user_data.get("temp", {}),
-									"processing": context.user_data.get("processing", False)
-								}
-						),
-						username
-				)
-		)
 		connection.commit()
 		
 		cursor.close()
 		connection.close()
+		
+		for users in changed_users.values():
+			for user_id, context_data in users:
+				self.persisted_context_data.setdefault(user_id, {}).update(context_data)
+				self.profiles_cache.pop(user_id)
\ No newline at end of file
@@ -1,3 +1,8 @@
 class LocalizationError(Exception):
 	def __init__(self, language: str, localization_item: str):
 		super().__init__(f"{localization_item} has no localization in {language.upper()}")
+
+
+class DatabaseUnavailableError(Exception):
+	def __init__(self, reason: str):
+		super().__init__(f"Database is unavailable: {reason}")
\ No newline at end of file
@@ -1,8 +1,9 @@
 import os
+import re
 import json
 import typing
-import pandas
 import pathlib
+import functools
 from dotenv import load_dotenv
 from telegram.ext import ContextTypes
 from telegram.error import BadRequest
@@ -66,7 +67,67 @@ def read_mysql_writeable_config() -> objects_types.Writeable_MySQL_ConfigDict:
 			port=data["port"],
 			user=data["user"],
 			pool_name=data["pool_name"],
-			pool_size=data["pool_size"]
+			pool_size=data["pool_size"],
+			replica_host=data.get("replica_host", ""),
+			replica_port=data.get("replica_port", 0)
+	)
+
+
+def get_default_bot_config() -> objects_types.Writeable_Bot_ConfigDict:
+	"""
+    Returns the default configuration for receiving updates.
+
+    Returns:
+        objects_types.Writeable_Bot_ConfigDict: A dictionary containing the default bot configuration.
+    """
+	return objects_types.Writeable_Bot_ConfigDict(
+			mode="polling",
+			max_queue_size=1000,
+			max_concurrent_updates=256,
+			persistence_update_interval=10,
+			bot_api_base_url="",
+			webhook_listen="127.0.0.1",
+			webhook_port=8443,
+			webhook_path="telegram",
+			webhook_url="",
+			webhook_max_connections=40,
+			users_cache_size=10000,
+			users_cache_ttl=300,
+			user_data_idle_timeout=3600,
+			max_resident_users=100000,
+			user_data_eviction_interval=60,
+			max_pool_size=0,
+			pool_wait_timeout=5,
+			pool_idle_timeout=300,
+			analytics_pool_size=2,
+			analytics_max_execution_time=10,
+			replica_sticky_time=5,
+			pool_ping_interval=60,
+			circuit_breaker_threshold=5,
+			circuit_breaker_reset_timeout=30,
+			snapshot_interval=300,
+			questions_batch_size=50,
+			questions_batch_delay=0.01,
+			update_deduplication_ttl=600,
+			user_questions_per_minute=2,
+			user_questions_burst=5,
+			global_questions_per_second=20,
+			global_questions_burst=200,
+			persist_rate_limits=False
+	)
+
+
+def read_bot_writeable_config() -> objects_types.Writeable_Bot_ConfigDict:
+	"""
+    Reads the writable bot configuration from a JSON file. Missing keys are filled with default values.
+
+    Returns:
+        objects_types.Writeable_Bot_ConfigDict: A dictionary containing the bot configuration.
+    """
+	data = read_json_file(SystemPaths.bot_config)
+	
+	return objects_types.Writeable_Bot_ConfigDict(
+			**{key: data.get(key, value) for key, value in get_default_bot_config().items()}
 	)
 
 
@@ -82,6 +143,8 @@ def read_settings() -> objects_types.SettingsDict:
 	
 	return objects_types.SettingsDict(
 			telegram_token=os.getenv("TELEGRAM_BOT_TOKEN"),
+			webhook_secret_token=os.getenv("TELEGRAM_WEBHOOK_SECRET") or None,
+			bot_config=read_bot_writeable_config(),
 			MySQL_config=objects_types.MySQL_ConfigDict(
 					database=data["database"],
 					host=data["host"],
@@ -90,7 +153,16 @@ def read_settings() -> objects_types.SettingsDict:
 					password=os.getenv("MySQL_PASSWORD"),
 					pool_name=data["pool_name"],
 					pool_size=data["pool_size"]
-			)
+			),
+			MySQL_replica_config=objects_types.MySQL_ConfigDict(
+					database=data["database"],
+					host=data["replica_host"],
+					port=data["replica_port"] or data["port"],
+					user=data["user"],
+					password=os.getenv("MySQL_PASSWORD"),
+					pool_name=f"{data['pool_name']}_replica",
+					pool_size=data["pool_size"]
+			) if data["replica_host"] else None
 	)
 
 
@@ -477,6 +549,19 @@ def preprocess_username(username: str) -> str:
 	return username
 
 
+def preprocess_usernames(text: str) -> list[str]:
+	"""
+    Splits a text into usernames separated by spaces, commas or new lines and preprocesses each of them. Repeated usernames are kept once.
+
+    Args:
+        text (str): The text with usernames.
+
+    Returns:
+        list[str]: The preprocessed usernames in the order of the text.
+    """
+	return list(dict.fromkeys(preprocess_username(username) for username in re.split(r"[\s,]+", text) if username.strip("@")))
+
+
 def get_language(context: ContextTypes.DEFAULT_TYPE) -> typing.Optional[objects_types.language_type]:
 	"""
     Retrieves the user's preferred language from the context.
@@ -498,51 +583,43 @@ def get_language(context: ContextTypes.DEFAULT_TYPE) -> typing.Optional[objects_
 	return None
 
 
-def get_db_line_dict(headers: list[str], row: typing.Optional[typing.Union[list, tuple]]) -> dict:
+@functools.cache
+def get_db_columns(record_type: type) -> str:
 	"""
-    Creates a dictionary from a database row and its corresponding headers.
+    Returns the column list for a SELECT that fills a record type. Selecting the columns explicitly fixes their order, so rows can be turned into records by position with `record_type._make(row)`.
 
     Args:
-        headers (list[str]): A list of column headers.
-        row (typing.Optional[typing.Union[list, tuple]]): A tuple or list representing a database row, or None if no row is found.
+        record_type (type): A typing.NamedTuple record class (e.g., objects_types.QuestionRow) whose fields are named after the columns.
 
     Returns:
-        dict: A dictionary where keys are headers and values are the corresponding row values. Returns an empty dictionary if the input is invalid or if the row is None.
+        str: The comma-separated column names.
     """
-	if isinstance(headers, list) and isinstance(row, (list, tuple)):
-		return {header: value for header, value in zip(headers, row)}
-	
-	return {}
+	return ", ".join(record_type._fields)
 
 
-def get_db_data_frame(headers: list[str], rows: list[tuple]) -> pandas.DataFrame:
+def get_current_state(context: ContextTypes.DEFAULT_TYPE) -> tuple[str, typing.Optional[int]]:
 	"""
-    Creates a Pandas DataFrame from a list of database rows and headers.
+    Retrieves the current state from the user's context data.
 
     Args:
-        headers (list[str]): A list of column headers.
-        rows (list[tuple]): A list of tuples, where each tuple represents a row in the database.
+        context (ContextTypes.DEFAULT_TYPE): The Telegram bot context.
 
     Returns:
-        pandas.DataFrame: A DataFrame created from the provided data. Returns an empty DataFrame if the input is invalid.
+        tuple[str, typing.Optional[int]]: A tuple containing the current state (a string) and the message ID (an integer or None). Defaults to ("", None) if no state is found.
     """
-	if isinstance(headers, list) and isinstance(rows, (list, tuple)):
-		return pandas.DataFrame(rows, columns=headers)
-	
-	return pandas.DataFrame()
+	return context.user_data.get("current_state", ("", None))
 
 
-def get_current_state(context: ContextTypes.DEFAULT_TYPE) -> tuple[str, typing.Optional[int]]:
+def set_current_state(context: ContextTypes.DEFAULT_TYPE, state: str, message_id: typing.Optional[int]):
 	"""
-    Retrieves the current state from the user's context data.
+    Sets the current state in the user's context data. The state is written to the database by the persistence in the background.
 
     Args:
         context (ContextTypes.DEFAULT_TYPE): The Telegram bot context.
-
-    Returns:
-        tuple[str, typing.Optional[int]]: A tuple containing the current state (a string) and the message ID (an integer or None). Defaults to ("", None) if no state is found.
+        state (str): The new state of the user.
+        message_id (typing.Optional[int]): The ID of the bot message the state belongs to.
     """
-	return context.user_data.get("current_state", ("", None))
+	context.user_data["current_state"] = (state, message_id)
 
 
 def format_time(time_: float) -> str:
@@ -625,22 +702,37 @@ def build_hidden_files() -> list[pathlib.Path]:
 	"""
     Builds and returns a list of hidden configuration files.
 
-    This function creates the necessary hidden configuration files for the application if they don't already exist, initializing them with default values.
+    This function creates the necessary hidden configuration files for the application if they don't already exist, initializing them with default values. The bot config is created too, but isn't returned: every key of it has a default, so the bot can start with it right away.
 
     Returns:
-        list[pathlib.Path]: A list of pathlib.Path objects representing the created hidden files.
+        list[pathlib.Path]: A list of pathlib.Path objects representing the created hidden files that must be filled in before the start.
     """
 	hidden_files_built = []
 	
 	if not SystemPaths.mysql_config.is_file():
 		write_json_file(
 				SystemPaths.mysql_config,
-				objects_types.Writeable_MySQL_ConfigDict(database="", host="", port=0, user="", pool_name="", pool_size=0)
+				objects_types.Writeable_MySQL_ConfigDict(
+						database="",
+						host="",
+						port=0,
+						user="",
+						pool_name="",
+						pool_size=0,
+						replica_host="",
+						replica_port=0
+				)
 		)
 		hidden_files_built.append(SystemPaths.mysql_config)
 	
+	if not SystemPaths.bot_config.is_file():
+		write_json_file(SystemPaths.bot_config, get_default_bot_config())
+	
 	if not SystemPaths.env.is_file():
-		write_env_file(SystemPaths.env, {"TELEGRAM_BOT_TOKEN": "", "MySQL_PASSWORD": ""})
+		write_env_file(
+				SystemPaths.env,
+				{"TELEGRAM_BOT_TOKEN": "", "MySQL_PASSWORD": "", "TELEGRAM_WEBHOOK_SECRET": ""}
+		)
 		hidden_files_built.append(SystemPaths.env)
 	
 	return hidden_files_built
@@ -1,5 +1,6 @@
 import typing
 import datetime
+import dataclasses
 from telegram import Update
 from telegram.ext import ContextTypes
 
@@ -14,7 +15,9 @@ class Writeable_MySQL_ConfigDict(typing.TypedDict):
         port (int): The port number of the MySQL server.
         user (str): The database username.
         pool_name (str): The name of the connection pool.
-        pool_size (int): The maximum number of connections in the pool.
+        pool_size (int): The number of connections kept open in the pool.
+        replica_host (str): The hostname or IP address of a read replica. Empty sends all queries to the primary.
+        replica_port (int): The port number of the read replica. 0 uses the primary's port.
     """
 	database: str
 	host: str
@@ -22,24 +25,102 @@ class Writeable_MySQL_ConfigDict(typing.TypedDict):
 	user: str
 	pool_name: str
 	pool_size: int
+	replica_host: str
+	replica_port: int
 
 
-class UserDataDict(typing.TypedDict):
+class Writeable_Bot_ConfigDict(typing.TypedDict):
 	"""
-    Represents the data structure for a user.
+    Configuration parameters for the way the bot receives updates.
 
     Attributes:
+        mode (typing.Literal["polling", "webhook"]): The way updates are received: long polling or an embedded webhook server.
+        max_queue_size (int): The maximum number of received updates waiting to be processed. When the queue is full, the intake waits for free space.
+        max_concurrent_updates (int): The maximum number of updates processed at the same time. Updates of one user are always processed in order.
+        persistence_update_interval (float): The time in seconds between batched writes of users' conversation state to the database.
+        bot_api_base_url (str): Base URL of the Bot API server (e.g. a local fake Bot API for testing). Empty string means the official server.
+        webhook_listen (str): The address the embedded webhook server listens on.
+        webhook_port (int): The port the embedded webhook server listens on.
+        webhook_path (str): The URL path the embedded webhook server accepts updates on.
+        webhook_url (str): The public URL Telegram sends updates to (usually the address of the reverse proxy).
+        webhook_max_connections (int): The maximum number of simultaneous connections Telegram opens to the webhook.
+        users_cache_size (int): The maximum number of users whose rows are cached in memory. 0 disables the cache.
+        users_cache_ttl (float): The time in seconds a cached user row stays valid.
+        user_data_idle_timeout (float): The time in seconds without updates after which a user's in-memory data is evicted.
+        max_resident_users (int): The maximum number of users whose data is kept in memory.
+        user_data_eviction_interval (float): The time in seconds between checks for idle users.
+        max_pool_size (int): The number of database connections the pool may grow to under load. Values below the MySQL pool_size disable growth.
+        pool_wait_timeout (float): The time in seconds a database call waits for a free connection before failing.
+        pool_idle_timeout (float): The time in seconds after which connections opened under load are closed when idle.
+        analytics_pool_size (int): The number of database connections reserved for heavy reports.
+        analytics_max_execution_time (float): The time in seconds after which the database stops a report query. 0 disables the limit.
+        replica_sticky_time (float): The time in seconds a user's reads stay on the primary database after the user wrote.
+        pool_ping_interval (float): The time in seconds after which an unused database connection is pinged before use, and the interval of the background connection health checks.
+        circuit_breaker_threshold (int): The number of failed database connection attempts and lost connections in a row that switches the bot to the degraded mode.
+        circuit_breaker_reset_timeout (float): The time in seconds between attempts to reach the database in the degraded mode.
+        snapshot_interval (float): The time in seconds between refreshes of the snapshot served in the degraded mode.
+        questions_batch_size (int): The maximum number of new questions inserted in one transaction.
+        questions_batch_delay (float): The maximum time in seconds a new question waits for others to be inserted with.
+        update_deduplication_ttl (float): The time in seconds the IDs of received updates are remembered to drop redelivered updates.
+        user_questions_per_minute (float): The number of questions a user can ask per minute in the long run.
+        user_questions_burst (int): The number of questions a user can ask at once.
+        global_questions_per_second (float): The number of questions all users together can ask per second in the long run.
+        global_questions_burst (int): The number of questions all users together can ask at once.
+        persist_rate_limits (bool): Whether the rate limits are saved at shutdown and loaded at start.
+    """
+	mode: typing.Literal["polling", "webhook"]
+	max_queue_size: int
+	max_concurrent_updates: int
+	persistence_update_interval: float
+	bot_api_base_url: str
+	webhook_listen: str
+	webhook_port: int
+	webhook_path: str
+	webhook_url: str
+	webhook_max_connections: int
+	users_cache_size: int
+	users_cache_ttl: float
+	user_data_idle_timeout: float
+	max_resident_users: int
+	user_data_eviction_interval: float
+	max_pool_size: int
+	pool_wait_timeout: float
+	pool_idle_timeout: float
+	analytics_pool_size: int
+	analytics_max_execution_time: float
+	replica_sticky_time: float
+	pool_ping_interval: float
+	circuit_breaker_threshold: int
+	circuit_breaker_reset_timeout: float
+	snapshot_interval: float
+	questions_batch_size: int
+	questions_batch_delay: float
+	update_deduplication_ttl: float
+	user_questions_per_minute: float
+	user_questions_burst: int
+	global_questions_per_second: float
+	global_questions_burst: int
+	persist_rate_limits: bool
+
+
+class UserRow(typing.NamedTuple):
+	"""
+    Represents the data structure for a user. Built straight from a row of the 'users' table; the field order is the column order of the query.
+
+    Attributes:
+        user_id (typing.Optional[int]): The Telegram ID of the user. None for a role pending for a username.
         username (str): The username of the user.
         role (str): The role assigned to the user.
         language (str): language the user speaks.
         chat_id (int): The user's chat ID.
-        user_context_data (dict):A dictionary containing user-specific context data.
+        user_context_data (typing.Union[dict, str]): A dictionary containing user-specific context data, or its JSON string as stored in the database.
     """
+	user_id: typing.Optional[int]
 	username: str
 	role: str
 	language: str
 	chat_id: int
-	user_context_data: dict
+	user_context_data: typing.Union[dict, str]
 
 
 class MySQL_ConfigDict(typing.TypedDict):
@@ -53,7 +134,7 @@ class MySQL_ConfigDict(typing.TypedDict):
         user (str): The database username.
         password (str): The database password.
         pool_name (str): The name of the connection pool.
-        pool_size (int): The maximum number of connections in the pool.
+        pool_size (int): The number of connections kept open in the pool.
     """
 	database: str
 	host: str
@@ -70,16 +151,25 @@ class SettingsDict(typing.TypedDict):
 
     Attributes:
         telegram_token (str): The Telegram Bot API token.
+        webhook_secret_token (typing.Optional[str]): The secret token Telegram sends with every webhook request.
+        bot_config (Writeable_Bot_ConfigDict): Configuration for receiving updates.
         MySQL_config (MySQL_ConfigDict): Configuration for the MySQL.
+        MySQL_replica_config (typing.Optional[MySQL_ConfigDict]): Configuration for the MySQL read replica. None if no replica is configured.
     """
 	telegram_token: str
+	webhook_secret_token: typing.Optional[str]
+	bot_config: Writeable_Bot_ConfigDict
 	MySQL_config: MySQL_ConfigDict
+	MySQL_replica_config: typing.Optional[MySQL_ConfigDict]
 
 
-class RoleAbilitiesDict(typing.TypedDict):
+@dataclasses.dataclass(frozen=True, slots=True)
+class RoleAbilities:
 	"""
     Represents the abilities associated with a role.
 
+    There is one immutable instance per role, shared by all users with that role; copying returns the same instance, so user_data copies made for persistence don't duplicate it either.
+
     Attributes:
         receives_messages (bool): Whether the role can receive messages.
         able_to_users_handle (bool): Whether the role can manage users.
@@ -100,9 +190,15 @@ class RoleAbilitiesDict(typing.TypedDict):
 	able_to_questions_view: bool
 	able_to_ask: bool
 	able_to_answer: bool
+	
+	def __copy__(self) -> "RoleAbilities":
+		return self
+	
+	def __deepcopy__(self, memo: dict) -> "RoleAbilities":
+		return self
 
 
-class QuestionStatsDict(typing.TypedDict):
+class QuestionStatsRow(typing.NamedTuple):
 	"""
     Represents statistics about questions.
 
@@ -118,9 +214,9 @@ class QuestionStatsDict(typing.TypedDict):
 	answered_questions: int
 
 
-class QuestionDict(typing.TypedDict):
+class QuestionRow(typing.NamedTuple):
 	"""
-    Represents a single question.
+    Represents a single question. Built straight from a row of the 'questions' table; the field order is the column order of the query.
 
     Attributes:
         question_id (int): The unique ID of the question.
@@ -134,6 +230,7 @@ class QuestionDict(typing.TypedDict):
         asked_date (datetime.datetime): The date and time when the question was asked.
         answered_date (typing.Union[datetime.datetime, None]): The date and time when the question was answered (if applicable).
         status (str): The current status of the question (e.g., "unprocessed", "processing", "processed").
+        moderator_id (typing.Union[int, None]): The Telegram ID of the moderator handling the question (if applicable).
         moderator_username (typing.Union[str, None]): The username of the moderator handling the question (if applicable).
     """
 	question_id: int
@@ -147,9 +244,92 @@ class QuestionDict(typing.TypedDict):
 	asked_date: datetime.datetime
 	answered_date: typing.Union[datetime.datetime, None]
 	status: str
+	moderator_id: typing.Union[int, None]
 	moderator_username: typing.Union[str, None]
 
 
+class NewQuestionRow(typing.NamedTuple):
+	"""
+    Represents a question that is not inserted yet. The field order is the column order of the INSERT statement.
+
+    Attributes:
+        user_id (int): The ID of the user who asked the question.
+        chat_id (int): The ID of the chat where the question was asked.
+        message_id (int): The ID of the message containing the question.
+        username (str): The username of the user who asked the question.
+        first_name (str): The first name of the user.
+        last_name (str): The last name of the user.
+        question (str): The text of the question.
+    """
+	user_id: int
+	chat_id: int
+	message_id: int
+	username: str
+	first_name: str
+	last_name: str
+	question: str
+
+
+class OutboxAnswerRow(typing.NamedTuple):
+	"""
+    Represents an answer waiting for delivery to the user who asked the question.
+
+    Attributes:
+        answer_id (int): The unique ID of the answer in the outbox.
+        question_id (int): The ID of the answered question.
+        chat_id (int): The ID of the chat where the question was asked.
+        reply_to_message_id (typing.Union[int, None]): The ID of the question message to reply to.
+        answer (str): The text of the answer sent as a reply to the question message.
+        fallback_answer (str): The text sent when replying is impossible (e.g. the question message was deleted). Contains both the question and the answer.
+        attempts (int): The number of delivery attempts already made.
+    """
+	answer_id: int
+	question_id: int
+	chat_id: int
+	reply_to_message_id: typing.Union[int, None]
+	answer: str
+	fallback_answer: str
+	attempts: int
+
+
+class FAQ_GroupRow(typing.NamedTuple):
+	"""
+    Represents an FAQ in a page of the FAQ list.
+
+    Attributes:
+        faq_id (int): The unique ID of the FAQ.
+        question (str): The text of the FAQ question.
+    """
+	faq_id: int
+	question: str
+
+
+class UserRoleRow(typing.NamedTuple):
+	"""
+    Represents a user with a role in the list of users.
+
+    Attributes:
+        username (str): The username of the user.
+        role (str): The role assigned to the user.
+        role_level (int): The level of the role.
+    """
+	username: str
+	role: str
+	role_level: int
+
+
+class ModeratorStatisticsRow(typing.NamedTuple):
+	"""
+    Represents the number of questions answered by a moderator.
+
+    Attributes:
+        moderator_username (str): The username of the moderator.
+        count_questions (int): The number of questions the moderator has answered.
+    """
+	moderator_username: str
+	count_questions: int
+
+
 class UsersViewLocalSingleDict(typing.TypedDict):
 	"""
     Defines localized strings for user view functionalities in a single language.
@@ -870,11 +1050,13 @@ class OthersLocalSingleDict(typing.TypedDict):
         above_zero_needed_warning (str): Warning message indicating that a number greater than zero is required.
         decline_button (str): Text for the decline button.
         back_button (str): Text for the back button.
+        slow_down_warning (str): Warning message when the user asks questions too often.
     """
 	integer_needed_warning: str
 	above_zero_needed_warning: str
 	decline_button: str
 	back_button: str
+	slow_down_warning: str
 
 
 class OthersLocalDict(typing.TypedDict):
@@ -1001,7 +1183,7 @@ class LocalizationsDict(typing.TypedDict):
 	users: UsersLocalDict
 
 
-class FAQ_Dict(typing.TypedDict):
+class FAQ_Row(typing.NamedTuple):
 	"""
     Represents a Frequently Asked Question (FAQ).
 
@@ -1021,5 +1203,12 @@ start_panel_type = typing.Callable[
 	[Update, ContextTypes.DEFAULT_TYPE],
 	typing.Coroutine[typing.Any, typing.Any, None]
 ]
-get_user_context_type = typing.Callable[[Update, ContextTypes.DEFAULT_TYPE], None]
+get_user_context_type = typing.Callable[
+	[Update, ContextTypes.DEFAULT_TYPE],
+	typing.Coroutine[typing.Any, typing.Any, None]
+]
+update_handler_type = typing.Callable[
+	[Update, ContextTypes.DEFAULT_TYPE],
+	typing.Coroutine[typing.Any, typing.Any, None]
+]
 language_type = typing.Literal["ru", "en", "de", "fr", "es", "it", "pt", "zh"]
@@ -0,0 +1,170 @@
+import asyncio
+import logging
+import typing
+from TelegramAnswerBot import data_handlers
+from telegram.ext import (
+	BasePersistence,
+	PersistenceInput
+)
+
+
+class MySQLPersistence(BasePersistence[dict, dict, dict]):
+	"""
+    Write-behind persistence of user_data in the `users.user_context_data` column.
+
+    The application hands over the user_data of every user touched since the last run each update_interval seconds and at shutdown. Handed over data is only marked as dirty; all dirty users are then written in one batch and one transaction, so handlers no longer pay an UPDATE and a COMMIT per click.
+
+    Only the conversation keys (see persisted_keys) are stored; role, abilities and language are loaded from their own tables. The data is not preloaded at startup: get_user_context restores it from the database on the first update of a user. Users without a role have no row to store it in and are skipped.
+
+    Attributes:
+        persisted_keys (dict[str, typing.Any]): The user_data keys that are stored, with their default values.
+        db_handler (MySQLDataHandler): An instance of the MySQLDataHandler for database operations.
+        _dirty_users_data (dict[int, dict]): The user_data of users waiting to be written, by user ID.
+        _write_scheduled (bool): Whether a write of the dirty users is already scheduled.
+        _write_lock (asyncio.Lock): Keeps one write running at a time, so an older batch can't be committed after a newer one of the same user.
+        _write_tasks (set[asyncio.Task]): The running scheduled writes.
+    """
+	persisted_keys = {"current_state": ("", None), "temp": {}, "processing": False}
+	
+	def __init__(self, db_handler: data_handlers.MySQLDataHandler, update_interval: float):
+		"""
+        Initializes the MySQLPersistence.
+
+        Args:
+            db_handler (MySQLDataHandler): The data handler for database operations.
+            update_interval (float): The time in seconds between the writes of the dirty users.
+        """
+		super().__init__(
+				store_data=PersistenceInput(bot_data=False, chat_data=False, user_data=True, callback_data=False),
+				update_interval=update_interval
+		)
+		
+		self.db_handler = db_handler
+		
+		self._dirty_users_data: dict[int, dict] = {}
+		self._write_scheduled = False
+		self._write_lock = asyncio.Lock()
+		self._write_tasks: set[asyncio.Task] = set()
+	
+	async def get_user_data(self) -> dict[int, dict]:
+		"""
+        Returns no preloaded data; user data is restored lazily by get_user_context.
+
+        Returns:
+            dict[int, dict]: An empty dictionary.
+        """
+		return {}
+	
+	async def update_user_data(self, user_id: int, data: dict):
+		"""
+        Marks the user as dirty. The write happens right after the application hands over all touched users.
+
+        Args:
+            user_id (int): The ID of the user.
+            data (dict): A copy of the user's user_data.
+        """
+		self._dirty_users_data[user_id] = data
+		
+		if not self._write_scheduled:
+			self._write_scheduled = True
+			
+			write_task = asyncio.create_task(self.write_dirty_users_data())
+			self._write_tasks.add(write_task)
+			write_task.add_done_callback(self._write_tasks.discard)
+	
+	async def write_dirty_users_data(self) -> bool:
+		"""
+        Writes the context data of all dirty users in one batch, in a thread of the database executor. On failure the users stay dirty and are written on the next run.
+
+        Returns:
+            bool: True if all dirty users are written, False if the write failed.
+        """
+		async with self._write_lock:
+			self._write_scheduled = False
+			dirty_users_data, self._dirty_users_data = self._dirty_users_data, {}
+			
+			users_context_data = [
+				(user_id, {key: data.get(key, default) for key, default in self.persisted_keys.items()})
+				for user_id, data in dirty_users_data.items()
+				if data.get("role", "user") != "user"
+			]
+			
+			if not users_context_data:
+				return True
+			
+			try:
+				await self.db_handler.run(self.db_handler.users_data.update_users_context_data, users_context_data)
+			except Exception:
+				logging.exception("Writing users context data failed")
+				
+				self._dirty_users_data = dirty_users_data | self._dirty_users_data
+				return False
+			
+			return True
+	
+	async def refresh_user_data(self, user_id: int, user_data: dict):
+		"""
+        Does nothing; the in-memory user_data is always the newest.
+
+        Args:
+            user_id (int): The ID of the user.
+            user_data (dict): The user's user_data.
+        """
+		pass
+	
+	async def drop_user_data(self, user_id: int):
+		"""
+        Forgets the copy of the user's stored context data kept to skip unchanged writes, so evicted users don't stay in memory through it. user_data is only dropped from memory when the user is idle (see UserDataEvictor); the stored data and a pending write are kept so the user's state is restored on the next update.
+
+        Args:
+            user_id (int): The ID of the user.
+        """
+		self.db_handler.users_data.forget_context_data(user_id)
+	
+	async def flush(self):
+		"""Writes all dirty users. Called by the application at shutdown."""
+		await self.write_dirty_users_data()
+	
+	async def get_chat_data(self) -> dict[int, dict]:
+		"""Chat data is not persisted."""
+		return {}
+	
+	async def update_chat_data(self, chat_id: int, data: dict):
+		"""Chat data is not persisted."""
+		pass
+	
+	async def refresh_chat_data(self, chat_id: int, chat_data: dict):
+		"""Chat data is not persisted."""
+		pass
+	
+	async def drop_chat_data(self, chat_id: int):
+		"""Chat data is not persisted."""
+		pass
+	
+	async def get_bot_data(self) -> dict:
+		"""Bot data is not persisted."""
+		return {}
+	
+	async def update_bot_data(self, data: dict):
+		"""Bot data is not persisted."""
+		pass
+	
+	async def refresh_bot_data(self, bot_data: dict):
+		"""Bot data is not persisted."""
+		pass
+	
+	async def get_callback_data(self) -> typing.Optional[typing.Any]:
+		"""Callback data is not persisted."""
+		return None
+	
+	async def update_callback_data(self, data: typing.Any):
+		"""Callback data is not persisted."""
+		pass
+	
+	async def get_conversations(self, name: str) -> dict:
+		"""Conversations are not persisted."""
+		return {}
+	
+	async def update_conversation(self, name: str, key: tuple[typing.Union[int, str], ...], new_state: typing.Optional[object]):
+		"""Conversations are not persisted."""
+		pass
\ No newline at end of file
@@ -0,0 +1,146 @@
+import asyncio
+import typing
+from TelegramAnswerBot import data_handlers
+from TelegramAnswerBot.objects_types import NewQuestionRow
+
+
+class QuestionsBuffer:
+	"""
+    Collects the questions asked at the same time and inserts them with one multi-row INSERT and one commit (group commit), so a burst of questions costs a few transactions instead of one per question.
+
+    A question waits at most max_delay seconds, or until max_batch_size questions are collected. Batches are inserted in the threads of the database executor, so the next batch is collected while the previous one is written. The handler that asked it awaits add_question until its batch is committed, so every user is confirmed only after the question is stored, and a failed batch raises its error in every waiting handler. Messages already stored as questions are skipped by the database handler, and add_question tells their handlers so.
+
+    Attributes:
+        db_handler (MySQLDataHandler): An instance of the MySQLDataHandler for database operations.
+        max_batch_size (int): The maximum number of questions inserted at once. 1 inserts every question immediately.
+        max_delay (float): The maximum time in seconds a question waits for others.
+        batches_count (int): The number of inserted batches.
+        questions_count (int): The number of inserted questions.
+        largest_batch_size (int): The number of questions of the largest batch.
+        _pending (list[tuple[NewQuestionRow, asyncio.Future]]): The collected questions and the futures their handlers await.
+        _flush_handle (typing.Optional[asyncio.TimerHandle]): The scheduled insert of the collected questions.
+        _insert_tasks (set[asyncio.Task]): The running inserts of batches.
+    """
+	
+	def __init__(self, db_handler: data_handlers.MySQLDataHandler, max_batch_size: int = 50, max_delay: float = 0.01):
+		"""
+        Initializes the QuestionsBuffer.
+
+        Args:
+            db_handler (MySQLDataHandler): The data handler for database operations.
+            max_batch_size (int): The maximum number of questions inserted at once.
+            max_delay (float): The maximum time in seconds a question waits for others.
+        """
+		self.db_handler = db_handler
+		self.max_batch_size = max_batch_size
+		self.max_delay = max_delay
+		
+		self.batches_count = 0
+		self.questions_count = 0
+		self.largest_batch_size = 0
+		
+		self._pending: list[tuple[NewQuestionRow, asyncio.Future]] = []
+		self._flush_handle: typing.Optional[asyncio.TimerHandle] = None
+		self._insert_tasks: set[asyncio.Task] = set()
+	
+	def flush(self):
+		"""Closes the batch of the collected questions and starts inserting it."""
+		if self._flush_handle is not None:
+			self._flush_handle.cancel()
+			self._flush_handle = None
+		
+		pending, self._pending = self._pending, []
+		
+		if not pending:
+			return
+		
+		insert_task = asyncio.create_task(self.insert_batch(pending))
+		self._insert_tasks.add(insert_task)
+		insert_task.add_done_callback(self._insert_tasks.discard)
+	
+	def get_stats(self) -> dict[str, typing.Any]:
+		"""
+        Returns the batching counters.
+
+        Returns:
+            dict[str, typing.Any]: The number of "batches" and "questions" inserted, the "average_batch_size" and the "largest_batch_size".
+        """
+		return {
+			"batches": self.batches_count,
+			"questions": self.questions_count,
+			"average_batch_size": round(self.questions_count / self.batches_count, 2) if self.batches_count else 0,
+			"largest_batch_size": self.largest_batch_size
+		}
+	
+	async def add_question(
+			self,
+			user_id: int,
+			chat_id: int,
+			message_id: int,
+			username: str,
+			first_name: str,
+			last_name: str,
+			question: str
+	) -> bool:
+		"""
+        Adds a question to the next batch and waits until the batch is committed.
+
+        Args:
+            user_id (int): The ID of the user who asked the question.
+            chat_id (int): The ID of the chat where the question was asked.
+            message_id (int): The ID of the message containing the question.
+            username (str): The username of the user.
+            first_name (str): The first name of the user.
+            last_name (str): The last name of the user.
+            question (str): The text of the question.
+
+        Returns:
+            bool: False if the message is already stored as a question.
+        """
+		loop = asyncio.get_running_loop()
+		future = loop.create_future()
+		
+		self._pending.append(
+				(
+						NewQuestionRow(user_id, chat_id, message_id, username, first_name, last_name, question),
+						future
+				)
+		)
+		
+		if len(self._pending) >= self.max_batch_size:
+			self.flush()
+		elif self._flush_handle is None:
+			self._flush_handle = loop.call_later(self.max_delay, self.flush)
+		
+		return await future
+	
+	async def insert_batch(self, pending: list[tuple[NewQuestionRow, asyncio.Future]]):
+		"""
+        Inserts a batch of questions and wakes up the handlers waiting for them.
+
+        Args:
+            pending (list[tuple[NewQuestionRow, asyncio.Future]]): The questions of the batch and the futures their handlers await.
+        """
+		try:
+			added_questions = await self.db_handler.run(self.db_handler.questions_data.add_questions, [question for question, _ in pending])
+		except Exception as error:
+			for _, future in pending:
+				if not future.done():
+					future.set_exception(error)
+			
+			return
+		
+		self.batches_count += 1
+		self.questions_count += len(pending)
+		self.largest_batch_size = max(self.largest_batch_size, len(pending))
+		
+		for (_, future), is_added in zip(pending, added_questions):
+			if not future.done():
+				future.set_result(is_added)
+	
+	async def stop(self):
+		"""Inserts the questions still collected and waits for the running inserts, so none are lost at shutdown."""
+		self.flush()
+		
+		if self._insert_tasks:
+			await asyncio.wait(self._insert_tasks)
\ No newline at end of file
@@ -0,0 +1,232 @@
+import os
+import json
+import time
+import typing
+import logging
+import pathlib
+
+
+class RateLimiter:
+	"""
+    Limits how often questions can be asked, with a token bucket per user and one global bucket.
+
+    A user's bucket holds up to user_burst tokens and gets user_rate tokens per second; every question takes one token from the user's and from the global bucket. A user whose bucket is empty is refused without touching the global bucket, so a single user flooding the bot can't use up the global limit for everyone else. The global bucket caps the questions the database and staff get from all users together.
+
+    Buckets are kept in memory; full buckets are forgotten, because they are the same as new ones. Users refused by the global bucket who have no bucket of their own are remembered in _warned_globally until the global bucket has a token again, so they are warned once as well. If state_path is set, the buckets are saved there at shutdown and loaded at the next start, so a restart doesn't reset the limits.
+
+    Attributes:
+        user_rate (float): The tokens a user's bucket gets per second.
+        user_burst (float): The capacity of a user's bucket.
+        global_rate (float): The tokens the global bucket gets per second.
+        global_burst (float): The capacity of the global bucket.
+        state_path (typing.Optional[pathlib.Path]): The file the buckets are saved to. None keeps them in memory only.
+        limited_users_count (int): The number of questions refused by users' buckets. Checks with is_limited aren't counted.
+        limited_globally_count (int): The number of questions refused by the global bucket. Checks with is_limited aren't counted.
+        _global_bucket (list[float]): The tokens of the global bucket and the Unix time they were counted.
+        _user_buckets (dict[int, list]): The tokens, the Unix time they were counted and whether the user was warned, of users with recent questions, from the least to the most recently active.
+        _warned_globally (dict[int, float]): The Unix time users without a bucket were warned about the global limit.
+    """
+	
+	def __init__(
+			self,
+			user_rate: float,
+			user_burst: float,
+			global_rate: float,
+			global_burst: float,
+			state_path: typing.Optional[pathlib.Path] = None
+	):
+		"""
+        Initializes the RateLimiter and loads the buckets saved by an earlier run.
+
+        Args:
+            user_rate (float): The tokens a user's bucket gets per second.
+            user_burst (float): The capacity of a user's bucket.
+            global_rate (float): The tokens the global bucket gets per second.
+            global_burst (float): The capacity of the global bucket.
+            state_path (typing.Optional[pathlib.Path]): The file the buckets are saved to. None keeps them in memory only.
+        """
+		self.user_rate = user_rate
+		self.user_burst = user_burst
+		self.global_rate = global_rate
+		self.global_burst = global_burst
+		self.state_path = state_path
+		
+		self.limited_users_count = 0
+		self.limited_globally_count = 0
+		
+		self._global_bucket = [global_burst, time.time()]
+		self._user_buckets: dict[int, list] = {}
+		self._warned_globally: dict[int, float] = {}
+		
+		self.load_state()
+	
+	def acquire(self, user_id: int) -> bool:
+		"""
+        Takes a token for a question of a user.
+
+        Args:
+            user_id (int): The ID of the user.
+
+        Returns:
+            bool: False if the user or all users together ask too often.
+        """
+		refusal = self.get_refusal(user_id)
+		
+		if refusal == "user":
+			self.limited_users_count += 1
+			return False
+		
+		if refusal == "global":
+			self.limited_globally_count += 1
+			return False
+		
+		self._warned_globally.pop(user_id, None)
+		user_bucket = self._user_buckets.pop(user_id, None) or [self.user_burst, time.time(), False]
+		user_bucket[0] -= 1
+		user_bucket[2] = False
+		self._user_buckets[user_id] = user_bucket
+		self._global_bucket[0] -= 1
+		
+		return True
+	
+	def forget_full_buckets(self, now: float):
+		"""
+        Forgets the buckets of users that refilled completely, starting from the least recently active, and the global warnings once the global bucket has a token again.
+
+        Args:
+            now (float): The current Unix time.
+        """
+		while self._user_buckets:
+			user_id, user_bucket = next(iter(self._user_buckets.items()))
+			
+			if self.get_tokens(user_bucket, self.user_rate, self.user_burst, now) < self.user_burst:
+				break
+			
+			del self._user_buckets[user_id]
+		
+		if self._warned_globally and self.get_tokens(self._global_bucket, self.global_rate, self.global_burst, now) >= 1:
+			self._warned_globally.clear()
+	
+	def get_refusal(self, user_id: int) -> typing.Optional[str]:
+		"""
+        Checks which bucket would refuse a question of a user.
+
+        Args:
+            user_id (int): The ID of the user.
+
+        Returns:
+            typing.Optional[str]: "user" if the user's bucket is empty, "global" if the global bucket is empty, None if the question would be let through.
+        """
+		now = time.time()
+		self.forget_full_buckets(now)
+		
+		user_bucket = self._user_buckets.get(user_id)
+		
+		if user_bucket is not None and self.get_tokens(user_bucket, self.user_rate, self.user_burst, now) < 1:
+			return "user"
+		
+		if self.get_tokens(self._global_bucket, self.global_rate, self.global_burst, now) < 1:
+			return "global"
+		
+		return None
+	
+	def get_stats(self) -> dict[str, int]:
+		"""
+        Returns the limiting counters.
+
+        Returns:
+            dict[str, int]: The number of questions refused by users' buckets ("limited_users") and by the global bucket ("limited_globally"), and the number of "tracked_users".
+        """
+		return {
+			"limited_users": self.limited_users_count,
+			"limited_globally": self.limited_globally_count,
+			"tracked_users": len(self._user_buckets)
+		}
+	
+	@staticmethod
+	def get_tokens(bucket: list, rate: float, burst: float, now: float) -> float:
+		"""
+        Refills a bucket for the time passed since its tokens were counted.
+
+        Args:
+            bucket (list): The bucket; its tokens and their time are updated.
+            rate (float): The tokens the bucket gets per second.
+            burst (float): The capacity of the bucket.
+            now (float): The current Unix time.
+
+        Returns:
+            float: The tokens in the bucket.
+        """
+		bucket[0] = min(burst, bucket[0] + max(now - bucket[1], 0) * rate)
+		bucket[1] = now
+		
+		return bucket[0]
+	
+	def is_limited(self, user_id: int) -> bool:
+		"""
+        Checks whether a question of a user would be refused, without taking a token and without counting the refusal.
+
+        Args:
+            user_id (int): The ID of the user.
+
+        Returns:
+            bool: True if the user or all users together ask too often.
+        """
+		return self.get_refusal(user_id) is not None
+	
+	def load_state(self):
+		"""Loads the buckets saved by an earlier run, if state_path is set and the file exists."""
+		if self.state_path is None or not self.state_path.exists():
+			return
+		
+		try:
+			with open(self.state_path, "r", encoding="utf-8") as file:
+				state = json.load(file)
+			
+			self._global_bucket = [float(state["global"][0]), float(state["global"][1])]
+			self._user_buckets = {
+				int(user_id): [float(tokens), float(counted_at), bool(is_warned)]
+				for user_id, (tokens, counted_at, is_warned) in sorted(state["users"].items(), key=lambda item: item[1][1])
+			}
+		except (OSError, ValueError, KeyError, TypeError) as error:
+			logging.warning("Rate limits %s can't be loaded: %s", self.state_path, error)
+	
+	def save_state(self):
+		"""Writes the buckets to state_path, if it is set. The file is replaced at once, so a crash never leaves half of it."""
+		if self.state_path is None:
+			return
+		
+		self.forget_full_buckets(time.time())
+		
+		temporary_path = self.state_path.with_name(f"{self.state_path.name}.tmp")
+		
+		with open(temporary_path, "w", encoding="utf-8") as file:
+			json.dump({"global": self._global_bucket, "users": self._user_buckets}, file)
+		
+		os.replace(temporary_path, self.state_path)
+	
+	def should_warn(self, user_id: int) -> bool:
+		"""
+        Checks whether a refused user should be warned. Users are warned once until they can ask again, so a flood of messages isn't answered with a flood of warnings.
+
+        Args:
+            user_id (int): The ID of the user.
+
+        Returns:
+            bool: True for the first refusal since the user's last question.
+        """
+		user_bucket = self._user_buckets.get(user_id)
+		
+		if user_bucket is None:
+			if user_id in self._warned_globally:
+				return False
+			
+			self._warned_globally[user_id] = time.time()
+			return True
+		
+		if user_bucket[2]:
+			return False
+		
+		user_bucket[2] = True
+		
+		return True
\ No newline at end of file
@@ -13,11 +13,19 @@ class SystemPaths:
     Attributes:
         bin_folder (Path): Path to the 'bin' directory.
         mysql_config (Path): Path to the 'mysql_config.json' file within the 'bin' directory.
+        bot_config (Path): Path to the 'bot_config.json' file within the 'bin' directory.
         doc_folder (Path): Path to the folder of docs.
         localizations (Path): Path to the file with localization.
+        db_snapshot (Path): Path to the last-known-good database snapshot served while the database is unavailable.
+        questions_queue (Path): Path to the queue of questions asked while the database is unavailable.
+        rate_limits (Path): Path to the rate limits saved at shutdown.
     """
 	bin_folder = pathlib.Path("bin")
 	mysql_config = bin_folder / "mysql_config.json"
+	bot_config = bin_folder / "bot_config.json"
 	env = bin_folder / ".env"
 	doc_folder = bin_folder / "doc"
 	localizations = bin_folder / "localizations.json"
+	db_snapshot = bin_folder / "db_snapshot.json"
+	questions_queue = bin_folder / "questions_queue.jsonl"
+	rate_limits = bin_folder / "rate_limits.json"
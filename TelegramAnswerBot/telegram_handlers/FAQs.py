@@ -5,7 +5,6 @@ from TelegramAnswerBot import (
 	functions
 )
 from telegram.ext import (
-	CallbackQueryHandler,
 	ContextTypes
 )
 from telegram import (
@@ -20,7 +19,8 @@ from TelegramAnswerBot.objects_types import (
 	FaqViewLocalDict,
 	OthersLocalDict,
 	get_user_context_type,
-	start_panel_type
+	start_panel_type,
+	update_handler_type
 )
 
 
@@ -130,7 +130,7 @@ class FAQs_message:
             update (Update): The Telegram update object.
             context (ContextTypes.DEFAULT_TYPE): The Telegram bot context.
         """
-		self.get_user_context(update, context)
+		await self.get_user_context(update, context)
 		language = functions.get_language(context)
 		
 		if language is None:
@@ -140,7 +140,7 @@ class FAQs_message:
 		faq_question_answer = update.message.text
 		new_faq_id = context.user_data["temp"]["new_faq_id"]
 		
-		self.db_handler.faqs_data.change_fag_answer(new_faq_id, faq_question_answer)
+		await self.db_handler.run(self.db_handler.faqs_data.change_fag_answer, new_faq_id, faq_question_answer)
 		
 		await context.bot.send_message(
 				chat_id=update.effective_chat.id,
@@ -149,11 +149,10 @@ class FAQs_message:
 		
 		context.user_data["temp"] = {}
 		context.user_data.pop("processing")
-		self.db_handler.users_data.update_last_state(
-				update.effective_user.username,
+		functions.set_current_state(
+				context,
 				StateFlags.input_faq_answer,
-				None,
-				context
+				None
 		)
 	
 	async def input_faq_id_to_delete(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -164,7 +163,7 @@ class FAQs_message:
             update (Update): The Telegram update object.
             context (ContextTypes.DEFAULT_TYPE): The Telegram bot context.
         """
-		self.get_user_context(update, context)
+		await self.get_user_context(update, context)
 		language = functions.get_language(context)
 		
 		if language is None:
@@ -179,13 +178,13 @@ class FAQs_message:
 					text=self.others_local[language]["integer_needed_warning"]
 			)
 		else:
-			if not self.db_handler.faqs_data.check_faq_exists(faq_id):
+			if not await self.db_handler.run(self.db_handler.faqs_data.check_faq_exists, faq_id):
 				await context.bot.send_message(
 						chat_id=update.effective_chat.id,
 						text=self.faq_local[language]["no_faq_with_id_warning"].format(id=faq_id)
 				)
 			else:
-				self.db_handler.faqs_data.delete_faq(faq_id)
+				await self.db_handler.run(self.db_handler.faqs_data.delete_faq, faq_id)
 		
 				await context.bot.send_message(
 						chat_id=update.effective_chat.id,
@@ -193,11 +192,10 @@ class FAQs_message:
 				)
 		finally:
 			context.user_data.pop("processing")
-			self.db_handler.users_data.update_last_state(
-					update.effective_user.username,
+			functions.set_current_state(
+					context,
 					StateFlags.input_faq_id_to_delete,
-					None,
-					context
+					None
 			)
 	
 	async def input_faq_id_to_edit(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -208,7 +206,7 @@ class FAQs_message:
             update (Update): The Telegram update object.
             context (ContextTypes.DEFAULT_TYPE): The Telegram bot context.
         """
-		self.get_user_context(update, context)
+		await self.get_user_context(update, context)
 		language = functions.get_language(context)
 		
 		if language is None:
@@ -224,25 +222,23 @@ class FAQs_message:
 			)
 		
 			context.user_data.pop("processing")
-			self.db_handler.users_data.update_last_state(
-					update.effective_user.username,
+			functions.set_current_state(
+					context,
 					StateFlags.input_faq_id_to_edit,
-					None,
-					context
+					None
 			)
 		else:
-			if not self.db_handler.faqs_data.check_faq_exists(faq_id):
+			if not await self.db_handler.run(self.db_handler.faqs_data.check_faq_exists, faq_id):
 				await context.bot.send_message(
 						chat_id=update.effective_chat.id,
 						text=self.faq_local[language]["no_faq_with_id_warning"].format(id=faq_id)
 				)
 		
 				context.user_data.pop("processing")
-				self.db_handler.users_data.update_last_state(
-						update.effective_user.username,
+				functions.set_current_state(
+						context,
 						StateFlags.input_faq_id_to_edit,
-						None,
-						context
+						None
 				)
 			else:
 				context.user_data["temp"]["faq_edit_id"] = faq_id
@@ -268,11 +264,10 @@ class FAQs_message:
 						text=self.others_local[language]["faq_instance_choice_suggestion"],
 						reply_markup=reply_markup
 				)
-				self.db_handler.users_data.update_last_state(
-						update.effective_user.username,
+				functions.set_current_state(
+						context,
 						StateFlags.input_faq_id_to_edit,
-						message.message_id,
-						context
+						message.message_id
 				)
 	
 	async def input_faq_instance_to_edit(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -283,7 +278,7 @@ class FAQs_message:
             update (Update): The Telegram update object.
             context (ContextTypes.DEFAULT_TYPE): The Telegram bot context.
         """
-		self.get_user_context(update, context)
+		await self.get_user_context(update, context)
 		language = functions.get_language(context)
 		
 		if language is None:
@@ -295,9 +290,9 @@ class FAQs_message:
 		faq_instance_text = update.message.text
 		
 		if faq_edit_instance == "answer":
-			self.db_handler.faqs_data.change_fag_answer(faq_edit_id, faq_instance_text)
+			await self.db_handler.run(self.db_handler.faqs_data.change_fag_answer, faq_edit_id, faq_instance_text)
 		elif faq_edit_instance == "question":
-			self.db_handler.faqs_data.change_fag_question(faq_edit_id, faq_instance_text)
+			await self.db_handler.run(self.db_handler.faqs_data.change_fag_question, faq_edit_id, faq_instance_text)
 		else:
 			raise ValueError(f"Unknown faq_edit_instance: {faq_edit_instance}")
 		
@@ -308,11 +303,10 @@ class FAQs_message:
 		
 		context.user_data["temp"] = {}
 		context.user_data.pop("processing")
-		self.db_handler.users_data.update_last_state(
-				update.effective_user.username,
+		functions.set_current_state(
+				context,
 				StateFlags.input_faq_instance_to_edit,
-				None,
-				context
+				None
 		)
 	
 	async def input_faq_text(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -323,7 +317,7 @@ class FAQs_message:
             update (Update): The Telegram update object.
             context (ContextTypes.DEFAULT_TYPE): The Telegram bot context.
         """
-		self.get_user_context(update, context)
+		await self.get_user_context(update, context)
 		language = functions.get_language(context)
 		
 		if language is None:
@@ -331,7 +325,7 @@ class FAQs_message:
 			return
 		
 		faq_question_text = update.message.text
-		new_faq_id = self.db_handler.faqs_data.add_faq(faq_question_text, "")
+		new_faq_id = await self.db_handler.run(self.db_handler.faqs_data.add_faq, faq_question_text, "")
 		
 		await context.bot.send_message(
 				chat_id=update.effective_chat.id,
@@ -339,12 +333,27 @@ class FAQs_message:
 		)
 		
 		context.user_data["temp"]["new_faq_id"] = new_faq_id
-		self.db_handler.users_data.update_last_state(
-				update.effective_user.username,
+		functions.set_current_state(
+				context,
 				StateFlags.input_faq_text,
-				None,
-				context
+				None
 		)
+	
+	def get_message_routes(self) -> dict[str, update_handler_type]:
+		"""
+        Returns the text message routes for FAQ management, keyed by the state the user is in.
+
+        Returns:
+            dict[str, update_handler_type]: A dictionary mapping states to their message handlers.
+        """
+		return {
+			StateFlags.add_faq: self.input_faq_text,
+			StateFlags.input_faq_text: self.input_faq_answer,
+			StateFlags.remove_faq: self.input_faq_id_to_delete,
+			StateFlags.edit_faq: self.input_faq_id_to_edit,
+			StateFlags.edit_faq_text: self.input_faq_instance_to_edit,
+			StateFlags.edit_faq_answer: self.input_faq_instance_to_edit
+		}
 
 
 class FAQs_handle:
@@ -393,7 +402,7 @@ class FAQs_handle:
             update (Update): The Telegram update object.
             context (ContextTypes.DEFAULT_TYPE): The Telegram bot context.
         """
-		self.get_user_context(update, context)
+		await self.get_user_context(update, context)
 		language = functions.get_language(context)
 		
 		if language is None:
@@ -405,7 +414,7 @@ class FAQs_handle:
 			await self.start_panel(update, context)
 			return
 		
-		if not context.user_data["abilities"]["able_to_faqs_handle"]:
+		if not context.user_data["abilities"].able_to_faqs_handle:
 			await functions.warning_rights_error(
 					self.faq_local[language]["cant_clear_faq_warning"],
 					self.start_panel,
@@ -414,15 +423,14 @@ class FAQs_handle:
 			)
 			return
 		
-		self.db_handler.faqs_data.clear_faqs()
+		await self.db_handler.run(self.db_handler.faqs_data.clear_faqs)
 		
 		await update.effective_message.edit_text(text=self.faq_local[language]["faq_cleared_notification"])
 		
-		self.db_handler.users_data.update_last_state(
-				update.effective_user.username,
+		functions.set_current_state(
+				context,
 				StateFlags.clear_faq_confirmation,
-				None,
-				context
+				None
 		)
 		
 		await self.start_panel(update, context)
@@ -435,7 +443,7 @@ class FAQs_handle:
             update (Update): The Telegram update object.
             context (ContextTypes.DEFAULT_TYPE): The Telegram bot context.
         """
-		self.get_user_context(update, context)
+		await self.get_user_context(update, context)
 		language = functions.get_language(context)
 		
 		if language is None:
@@ -447,7 +455,7 @@ class FAQs_handle:
 			await self.start_panel(update, context)
 			return
 		
-		if not context.user_data["abilities"]["able_to_faqs_handle"]:
+		if not context.user_data["abilities"].able_to_faqs_handle:
 			await functions.warning_rights_error(
 					self.faq_local[language]["cant_clear_faq_warning"],
 					self.start_panel,
@@ -477,11 +485,10 @@ class FAQs_handle:
 				reply_markup=reply_markup
 		)
 		
-		self.db_handler.users_data.update_last_state(
-				update.effective_user.username,
+		functions.set_current_state(
+				context,
 				StateFlags.clear_faq_request,
-				message.message_id,
-				context
+				message.message_id
 		)
 		context.user_data["processing"] = True
 	
@@ -493,7 +500,7 @@ class FAQs_handle:
             update (Update): The Telegram update object.
             context (ContextTypes.DEFAULT_TYPE): The Telegram bot context.
         """
-		self.get_user_context(update, context)
+		await self.get_user_context(update, context)
 		language = functions.get_language(context)
 		
 		if language is None:
@@ -505,7 +512,7 @@ class FAQs_handle:
 			await self.start_panel(update, context)
 			return
 		
-		if not context.user_data["abilities"]["able_to_faqs_handle"]:
+		if not context.user_data["abilities"].able_to_faqs_handle:
 			await functions.warning_rights_error(
 					self.faq_local[language]["cant_faq_edit_warning"],
 					self.start_panel,
@@ -516,11 +523,10 @@ class FAQs_handle:
 		
 		await update.effective_message.edit_text(text=self.faq_local[language]["input_faq_new_answer_suggestion"])
 		
-		self.db_handler.users_data.update_last_state(
-				update.effective_user.username,
+		functions.set_current_state(
+				context,
 				StateFlags.edit_faq_answer,
-				None,
-				context
+				None
 		)
 		context.user_data["temp"]["faq_edit_instance"] = "answer"
 		context.user_data["processing"] = True
@@ -533,7 +539,7 @@ class FAQs_handle:
             update (Update): The Telegram update object.
             context (ContextTypes.DEFAULT_TYPE): The Telegram bot context.
         """
-		self.get_user_context(update, context)
+		await self.get_user_context(update, context)
 		language = functions.get_language(context)
 		
 		if language is None:
@@ -545,7 +551,7 @@ class FAQs_handle:
 			await self.start_panel(update, context)
 			return
 		
-		if not context.user_data["abilities"]["able_to_faqs_handle"]:
+		if not context.user_data["abilities"].able_to_faqs_handle:
 			await functions.warning_rights_error(
 					self.faq_local[language]["cant_faq_edit_warning"],
 					self.start_panel,
@@ -556,11 +562,10 @@ class FAQs_handle:
 		
 		await update.effective_message.edit_text(text=self.faq_local[language]["input_faq_new_question_suggestion"])
 		
-		self.db_handler.users_data.update_last_state(
-				update.effective_user.username,
+		functions.set_current_state(
+				context,
 				StateFlags.edit_faq_text,
-				None,
-				context
+				None
 		)
 		context.user_data["temp"]["faq_edit_instance"] = "question"
 		context.user_data["processing"] = True
@@ -573,7 +578,7 @@ class FAQs_handle:
             update (Update): The Telegram update object.
             context (ContextTypes.DEFAULT_TYPE): The Telegram bot context.
         """
-		self.get_user_context(update, context)
+		await self.get_user_context(update, context)
 		language = functions.get_language(context)
 		
 		if language is None:
@@ -585,7 +590,7 @@ class FAQs_handle:
 			await self.start_panel(update, context)
 			return
 		
-		if not context.user_data["abilities"]["able_to_faqs_handle"]:
+		if not context.user_data["abilities"].able_to_faqs_handle:
 			await functions.warning_rights_error(
 					self.faq_local[language]["cant_faq_edit_warning"],
 					self.start_panel,
@@ -610,11 +615,10 @@ class FAQs_handle:
 				reply_markup=reply_markup
 		)
 		
-		self.db_handler.users_data.update_last_state(
-				update.effective_user.username,
+		functions.set_current_state(
+				context,
 				StateFlags.edit_faq,
-				message.message_id,
-				context
+				message.message_id
 		)
 		context.user_data["processing"] = True
 	
@@ -626,7 +630,7 @@ class FAQs_handle:
             update (Update): The Telegram update object.
             context (ContextTypes.DEFAULT_TYPE): The Telegram bot context.
         """
-		self.get_user_context(update, context)
+		await self.get_user_context(update, context)
 		language = functions.get_language(context)
 		
 		if language is None:
@@ -638,7 +642,7 @@ class FAQs_handle:
 			await self.start_panel(update, context)
 			return
 		
-		if not context.user_data["abilities"]["able_to_faqs_handle"]:
+		if not context.user_data["abilities"].able_to_faqs_handle:
 			await functions.warning_rights_error(
 					self.faq_local[language]["cant_faq_delete_warning"],
 					self.start_panel,
@@ -663,11 +667,10 @@ class FAQs_handle:
 				reply_markup=reply_markup
 		)
 		
-		self.db_handler.users_data.update_last_state(
-				update.effective_user.username,
+		functions.set_current_state(
+				context,
 				StateFlags.remove_faq,
-				message.message_id,
-				context
+				message.message_id
 		)
 		context.user_data["processing"] = True
 	
@@ -679,7 +682,7 @@ class FAQs_handle:
             update (Update): The Telegram update object.
             context (ContextTypes.DEFAULT_TYPE): The Telegram bot context.
         """
-		self.get_user_context(update, context)
+		await self.get_user_context(update, context)
 		language = functions.get_language(context)
 		
 		if language is None:
@@ -691,7 +694,7 @@ class FAQs_handle:
 			await self.start_panel(update, context)
 			return
 		
-		if not context.user_data["abilities"]["able_to_faqs_handle"]:
+		if not context.user_data["abilities"].able_to_faqs_handle:
 			await functions.warning_rights_error(
 					self.faq_local[language]["cant_create_faq_warning"],
 					self.start_panel,
@@ -716,11 +719,10 @@ class FAQs_handle:
 				reply_markup=reply_markup
 		)
 		
-		self.db_handler.users_data.update_last_state(
-				update.effective_user.username,
+		functions.set_current_state(
+				context,
 				StateFlags.add_faq,
-				message.message_id,
-				context
+				message.message_id
 		)
 		context.user_data["processing"] = True
 	
@@ -732,7 +734,7 @@ class FAQs_handle:
             update (Update): The Telegram update object.
             context (ContextTypes.DEFAULT_TYPE): The Telegram bot context.
         """
-		self.get_user_context(update, context)
+		await self.get_user_context(update, context)
 		language = functions.get_language(context)
 		
 		if language is None:
@@ -750,7 +752,7 @@ class FAQs_handle:
 			await self.start_panel(update, context)
 			return
 		
-		if not context.user_data["abilities"]["able_to_faqs_handle"]:
+		if not context.user_data["abilities"].able_to_faqs_handle:
 			await functions.warning_rights_error(
 					self.others_local[language]["cant_handle_faq_warning"],
 					self.start_panel,
@@ -798,37 +800,30 @@ class FAQs_handle:
 				reply_markup=reply_markup
 		)
 		
-		self.db_handler.users_data.update_last_state(
-				update.effective_user.username,
+		functions.set_current_state(
+				context,
 				StateFlags.handle_faq,
-				message.message_id,
-				context
+				message.message_id
 		)
 		context.user_data["processing"] = True
 	
-	def get_callback_query_handlers(self) -> list[CallbackQueryHandler]:
+	def get_callback_query_routes(self) -> dict[str, update_handler_type]:
 		"""
-        Returns a list of callback query handlers for FAQ management actions.
+        Returns the callback query routes for FAQ management actions.
 
         Returns:
-             list[CallbackQueryHandler]: A list of CallbackQueryHandler objects.
+            dict[str, update_handler_type]: A dictionary mapping callback data flags to their handlers.
         """
-		return list(
-				sorted(
-						[
-							CallbackQueryHandler(self.handle_faq, pattern=StateFlags.handle_faq),
-							CallbackQueryHandler(self.add_faq, pattern=StateFlags.add_faq),
-							CallbackQueryHandler(self.remove_faq, pattern=StateFlags.remove_faq),
-							CallbackQueryHandler(self.edit_faq, pattern=StateFlags.edit_faq),
-							CallbackQueryHandler(self.edit_faq_text, pattern=StateFlags.edit_faq_text),
-							CallbackQueryHandler(self.edit_faq_answer, pattern=StateFlags.edit_faq_answer),
-							CallbackQueryHandler(self.clear_faq_request, pattern=StateFlags.clear_faq_request),
-							CallbackQueryHandler(self.clear_faq_confirmation, pattern=StateFlags.clear_faq_confirmation)
-						],
-						key=lambda x: len(x.pattern.pattern),
-						reverse=True
-				)
-		)
+		return {
+			StateFlags.handle_faq: self.handle_faq,
+			StateFlags.add_faq: self.add_faq,
+			StateFlags.remove_faq: self.remove_faq,
+			StateFlags.edit_faq: self.edit_faq,
+			StateFlags.edit_faq_text: self.edit_faq_text,
+			StateFlags.edit_faq_answer: self.edit_faq_answer,
+			StateFlags.clear_faq_request: self.clear_faq_request,
+			StateFlags.clear_faq_confirmation: self.clear_faq_confirmation
+		}
 
 
 class FAQs_view:
@@ -879,7 +874,7 @@ class FAQs_view:
             update (Update): The Telegram update object.
             context (ContextTypes.DEFAULT_TYPE): The Telegram context object.
         """
-		self.get_user_context(update, context)
+		await self.get_user_context(update, context)
 		language = functions.get_language(context)
 		
 		if language is None:
@@ -892,21 +887,21 @@ class FAQs_view:
 			return
 		
 		if context.user_data["temp"].get("faq_group", None) is None:
-			total_faqs_count = self.db_handler.faqs_data.get_total_faqs_count()
+			total_faqs_count = await self.db_handler.run(self.db_handler.faqs_data.get_total_faqs_count)
 		
 			context.user_data["temp"]["faq_group"] = 0
 			context.user_data["temp"]["faq_groups"] = total_faqs_count // 9 + (1 if total_faqs_count % 9 > 0 else 0)
 		
-		faqs_group_data = self.db_handler.faqs_data.get_faq_group(9, context.user_data["temp"]["faq_group"] * 9)
+		faqs_group_data = await self.db_handler.run(self.db_handler.faqs_data.get_faq_group, 9, context.user_data["temp"]["faq_group"] * 9)
 		
 		keyboard = [
 			[
 				InlineKeyboardButton(
-						f"{row['faq_id']}. {row['question']}",
-						callback_data=f"{StateFlags.view_fag_answer}_id{row['faq_id']}"
+						f"{row.faq_id}. {row.question}",
+						callback_data=f"{StateFlags.view_fag_answer}_id{row.faq_id}"
 				)
 			]
-			for index, row in faqs_group_data.iterrows()
+			for row in faqs_group_data
 		]
 		keyboard.append(
 				[
@@ -925,11 +920,10 @@ class FAQs_view:
 				reply_markup=reply_markup
 		)
 		
-		self.db_handler.users_data.update_last_state(
-				update.effective_user.username,
+		functions.set_current_state(
+				context,
 				StateFlags.view_fags_group,
-				message.message_id,
-				context
+				message.message_id
 		)
 	
 	async def next_faqs_group(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -940,7 +934,7 @@ class FAQs_view:
             update (Update): The Telegram update object.
             context (ContextTypes.DEFAULT_TYPE): The Telegram context object.
         """
-		self.get_user_context(update, context)
+		await self.get_user_context(update, context)
 		language = functions.get_language(context)
 		
 		if language is None:
@@ -957,7 +951,7 @@ class FAQs_view:
 			return
 		
 		if context.user_data["temp"].get("faq_group", None) is None:
-			total_faqs_count = self.db_handler.faqs_data.get_total_faqs_count()
+			total_faqs_count = await self.db_handler.run(self.db_handler.faqs_data.get_total_faqs_count)
 		
 			context.user_data["temp"]["faq_group"] = 0
 			context.user_data["temp"]["faq_groups"] = total_faqs_count // 9 + (1 if total_faqs_count % 9 > 0 else 0)
@@ -968,11 +962,10 @@ class FAQs_view:
 			context.user_data["temp"]["faq_group"] = (context.user_data["temp"]["faq_group"] + 1) % context.user_data["temp"]["faq_groups"]
 		except ZeroDivisionError:
 			context.user_data["temp"]["faq_group"] = 0
-		self.db_handler.users_data.update_last_state(
-				update.effective_user.username,
+		functions.set_current_state(
+				context,
 				StateFlags.next_fags_group,
-				update.effective_message.message_id,
-				context
+				update.effective_message.message_id
 		)
 		
 		if start_faq_group != context.user_data["temp"]["faq_group"]:
@@ -986,7 +979,7 @@ class FAQs_view:
             update (Update): The Telegram update object.
             context (ContextTypes.DEFAULT_TYPE): The Telegram context object.
         """
-		self.get_user_context(update, context)
+		await self.get_user_context(update, context)
 		language = functions.get_language(context)
 		
 		if language is None:
@@ -1003,7 +996,7 @@ class FAQs_view:
 			return
 		
 		if context.user_data["temp"].get("faq_group", None) is None:
-			total_faqs_count = self.db_handler.faqs_data.get_total_faqs_count()
+			total_faqs_count = await self.db_handler.run(self.db_handler.faqs_data.get_total_faqs_count)
 		
 			try:
 				context.user_data["temp"]["faq_group"] = (context.user_data["temp"]["faq_group"] + 1) % context.user_data["temp"]["faq_groups"]
@@ -1018,11 +1011,10 @@ class FAQs_view:
 		else:
 			context.user_data["temp"]["faq_group"] = context.user_data["temp"]["faq_groups"] - 1
 		
-		self.db_handler.users_data.update_last_state(
-				update.effective_user.username,
+		functions.set_current_state(
+				context,
 				StateFlags.previous_fags_group,
-				update.effective_message.message_id,
-				context
+				update.effective_message.message_id
 		)
 		
 		if start_faqs_group != context.user_data["temp"]["faq_group"]:
@@ -1036,7 +1028,7 @@ class FAQs_view:
             update (Update): The Telegram update object.
             context (ContextTypes.DEFAULT_TYPE): The Telegram context object.
         """
-		self.get_user_context(update, context)
+		await self.get_user_context(update, context)
 		language = functions.get_language(context)
 		
 		if language is None:
@@ -1053,47 +1045,37 @@ class FAQs_view:
 			return
 		
 		faq_id = int(re.search(r"_id(\d+)\Z", update.callback_query.data).group(1))
-		faq_line = self.db_handler.faqs_data.get_faq(faq_id)
+		faq_line = await self.db_handler.run(self.db_handler.faqs_data.get_faq, faq_id)
 		
 		await update.effective_message.edit_text(
 				text=self.faq_local[language]["faq_view"].format(
-						question=faq_line['question'],
-						answer=faq_line['answer'],
-						views_count=faq_line['views_count']
+						question=faq_line.question,
+						answer=faq_line.answer,
+						views_count=faq_line.views_count
 				)
 		)
 		
-		self.db_handler.users_data.update_last_state(
-				update.effective_user.username,
+		functions.set_current_state(
+				context,
 				StateFlags.view_fag_answer,
-				None,
-				context
+				None
 		)
 		
 		await self.start_panel(update, context)
 	
-	def get_callback_query_handlers(self) -> list[CallbackQueryHandler]:
+	def get_callback_query_routes(self) -> dict[str, update_handler_type]:
 		"""
-        Returns a list of CallbackQueryHandlers for FAQs interaction.
+        Returns the callback query routes for FAQs interaction.
 
         Returns:
-            list[CallbackQueryHandler]: A list of CallbackQueryHandler objects.
+            dict[str, update_handler_type]: A dictionary mapping callback data flags to their handlers.
         """
-		return list(
-				sorted(
-						[
-							CallbackQueryHandler(callback=self.view_faqs_group, pattern=StateFlags.view_fags_group),
-							CallbackQueryHandler(callback=self.view_faq_answer, pattern=StateFlags.view_fag_answer),
-							CallbackQueryHandler(
-									callback=self.previous_faqs_group,
-									pattern=StateFlags.previous_fags_group
-							),
-							CallbackQueryHandler(callback=self.next_faqs_group, pattern=StateFlags.next_fags_group)
-						],
-						key=lambda x: len(x.pattern.pattern),
-						reverse=True
-				)
-		)
+		return {
+			StateFlags.view_fags_group: self.view_faqs_group,
+			StateFlags.view_fag_answer: self.view_faq_answer,
+			StateFlags.previous_fags_group: self.previous_faqs_group,
+			StateFlags.next_fags_group: self.next_faqs_group
+		}
 
 
 class FAQs_controls:
@@ -1110,7 +1092,7 @@ class FAQs_controls:
 
     :Usage:
         faq_controls = FAQs_controls(start_panel_function, get_user_context_function, db_handler_instance)
-        handlers = faq_controls.get_callback_query_handlers() # Retrieve all FAQ related handlers
+        routes = faq_controls.get_callback_query_routes() # Retrieve all FAQ related routes
     """
 	
 	def __init__(
@@ -1155,21 +1137,22 @@ class FAQs_controls:
 				others_local
 		)
 	
-	def get_callback_query_handlers(self) -> list[CallbackQueryHandler]:
+	def get_callback_query_routes(self) -> dict[str, update_handler_type]:
 		"""
-        Retrieves all callback query handlers related to FAQs.
+        Retrieves all callback query routes related to FAQs.
 
-        Combines handlers from FAQs_view and FAQs_handle, sorting them by pattern length
-        in descending order to prioritize more specific handlers.
+        Combines routes from the view and handle components.
 
         Returns:
-            list[CallbackQueryHandler]: A list of combined and sorted CallbackQueryHandler objects.
+            dict[str, update_handler_type]: A dictionary mapping callback data flags to their handlers.
         """
-		return list(
-				sorted(
-						self.view.get_callback_query_handlers() +
-						self.handle.get_callback_query_handlers(),
-						key=lambda x: len(x.pattern.pattern),
-						reverse=True
-				)
-		)
+		return self.view.get_callback_query_routes() | self.handle.get_callback_query_routes()
+	
+	def get_message_routes(self) -> dict[str, update_handler_type]:
+		"""
+        Retrieves all text message routes related to FAQs.
+
+        Returns:
+            dict[str, update_handler_type]: A dictionary mapping states to their message handlers.
+        """
+		return self.message.get_message_routes()
@@ -2,5 +2,6 @@ from TelegramAnswerBot.telegram_handlers import (
 	FAQs,
 	main,
 	questions,
+	routing,
 	users
 )
@@ -2,12 +2,14 @@ import re
 from dataclasses import dataclass
 from telegram.error import BadRequest
 from telegram.constants import ParseMode
+from TelegramAnswerBot.answers_dispatcher import AnswersDispatcher
+from TelegramAnswerBot.questions_buffer import QuestionsBuffer
+from TelegramAnswerBot.rate_limiter import RateLimiter
 from TelegramAnswerBot import (
 	data_handlers,
 	functions
 )
 from telegram.ext import (
-	CallbackQueryHandler,
 	ContextTypes
 )
 from telegram import (
@@ -22,7 +24,8 @@ from TelegramAnswerBot.objects_types import (
 	MainMessageLocalDict,
 	OthersLocalDict,
 	get_user_context_type,
-	start_panel_type
+	start_panel_type,
+	update_handler_type
 )
 
 
@@ -82,6 +85,10 @@ class Main_message:
         get_user_context (get_user_context_type): Function to retrieve user context.
         db_handler (MySQLDataHandler): An instance of the MySQLDataHandler for database interaction.
         main_local (MainMessageLocalDict): Localized strings specific to main message operations.
+        others_local (OthersLocalDict): Localized strings for general application use.
+        answers_dispatcher (AnswersDispatcher): The dispatcher delivering answers from the outbox.
+        questions_buffer (QuestionsBuffer): The buffer inserting new questions in batches.
+        rate_limiter (RateLimiter): Limits how often questions can be asked.
     """
 	
 	def __init__(
@@ -89,7 +96,11 @@ class Main_message:
 			start_panel: start_panel_type,
 			get_user_context: get_user_context_type,
 			db_handler: data_handlers.MySQLDataHandler,
-			main_local: MainMessageLocalDict
+			main_local: MainMessageLocalDict,
+			others_local: OthersLocalDict,
+			answers_dispatcher: AnswersDispatcher,
+			questions_buffer: QuestionsBuffer,
+			rate_limiter: RateLimiter
 	):
 		"""
         Initializes the Main_message class.
@@ -99,48 +110,49 @@ class Main_message:
             get_user_context (get_user_context_type): Function to retrieve user context.
             db_handler (MySQLDataHandler): The data handler for database operations.
             main_local (MainMessageLocalDict): Localized strings for main message operations.
+            others_local (OthersLocalDict): Localized strings for general application use.
+            answers_dispatcher (AnswersDispatcher): The dispatcher delivering answers from the outbox.
+            questions_buffer (QuestionsBuffer): The buffer inserting new questions in batches.
+            rate_limiter (RateLimiter): Limits how often questions can be asked.
         """
 		self.start_panel = start_panel
 		self.get_user_context = get_user_context
 		self.db_handler = db_handler
 		self.main_local = main_local
+		self.others_local = others_local
+		self.answers_dispatcher = answers_dispatcher
+		self.questions_buffer = questions_buffer
+		self.rate_limiter = rate_limiter
 	
 	async def input_answer(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
 		"""
         Processes a user's answer to a question.
 
-        Sends the answer to the user who asked the question and updates the question's status in the database. Handles potential errors like failed message delivery.
+        Updates the question's status in the database and puts the answer into the outbox in the same transaction. The answer is delivered to the user who asked the question by the AnswersDispatcher, so the moderator is confirmed right away and the answer survives Telegram errors and restarts.
 
         Args:
             update (Update): The Telegram update object.
             context (ContextTypes.DEFAULT_TYPE): The Telegram context object.
         """
-		self.get_user_context(update, context)
+		await self.get_user_context(update, context)
 		language = functions.get_language(context)
 		
 		if language is None:
 			await self.start_panel(update, context)
 			return
 		
-		reserved_question = self.db_handler.questions_data.check_question_reservation(context.user_data["temp"]["question_id"], update.effective_user.username)
-		
-		if reserved_question:
-			try:
-				await context.bot.send_message(
-						chat_id=int(reserved_question["chat_id"]),
-						reply_to_message_id=int(reserved_question["message_id"]),
-						text=update.message.text
-				)
-			except BadRequest:
-				try:
-					await context.bot.send_message(
-							chat_id=int(reserved_question["chat_id"]),
-							text=self.main_local[language]["answer_notification"].format(question=reserved_question['question'], answer=update.message.text)
-					)
-				except BadRequest:
-					pass
+		reserved_question = await self.db_handler.run(self.db_handler.questions_data.check_question_reservation, context.user_data["temp"]["question_id"], update.effective_user.id)
 		
-			self.db_handler.questions_data.mark_question_as_answered(context.user_data["temp"]["question_id"])
+		if reserved_question is not None:
+			await self.db_handler.run(
+					self.db_handler.questions_data.mark_question_as_answered,
+					context.user_data["temp"]["question_id"],
+					int(reserved_question.chat_id),
+					int(reserved_question.message_id),
+					update.message.text,
+					self.main_local[language]["answer_notification"].format(question=reserved_question.question, answer=update.message.text)
+			)
+			self.answers_dispatcher.notify()
 		
 			await context.bot.send_message(
 					chat_id=update.effective_chat.id,
@@ -154,28 +166,39 @@ class Main_message:
 		
 		context.user_data["temp"] = {}
 		context.user_data.pop("processing")
-		self.db_handler.users_data.update_last_state(update.effective_user.username, StateFlags.input_answer, None, context)
+		functions.set_current_state(context, StateFlags.input_answer, None)
 	
 	async def input_question(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
 		"""
         Processes a user's question.
 
-        Saves the question to the database and notifies all relevant users.
+        Saves the question to the database and notifies all relevant users. Questions asked at the same time are saved together by the questions buffer; the user is confirmed once the question's batch is committed. A message that is already stored as a question (a redelivered update) is confirmed again, but staff aren't notified twice.
+
+        A user asking too often is warned once and stays in the asking state, so the question can be sent again later; nothing is written to the database.
 
         Args:
             update (Update): The Telegram update object.
             context (ContextTypes.DEFAULT_TYPE): The Telegram context object.
         """
-		self.get_user_context(update, context)
+		await self.get_user_context(update, context)
 		language = functions.get_language(context)
 		
 		if language is None:
 			await self.start_panel(update, context)
 			return
 		
+		if not self.rate_limiter.acquire(update.effective_user.id):
+			if self.rate_limiter.should_warn(update.effective_user.id):
+				await context.bot.send_message(
+						chat_id=update.effective_chat.id,
+						text=self.others_local[language]["slow_down_warning"]
+				)
+			
+			return
+		
 		question = update.message.text
 		
-		self.db_handler.questions_data.add_question(
+		is_added = await self.questions_buffer.add_question(
 				context.user_data["temp"]["user_id"],
 				context.user_data["temp"]["chat_id"],
 				update.message.message_id,
@@ -185,14 +208,15 @@ class Main_message:
 				question
 		)
 		
-		for user_chat_receiving_messages in self.db_handler.users_data.get_users_chats_receiving_messages():
-			try:
-				await context.bot.send_message(
-						chat_id=user_chat_receiving_messages,
-						text=self.main_local[language]["new_question_notification"]
-				)
-			except BadRequest:
-				pass
+		if is_added:
+			for user_chat_receiving_messages in await self.db_handler.run(self.db_handler.users_data.get_users_chats_receiving_messages):
+				try:
+					await context.bot.send_message(
+							chat_id=user_chat_receiving_messages,
+							text=self.main_local[language]["new_question_notification"]
+					)
+				except BadRequest:
+					pass
 		
 		await context.bot.send_message(
 				chat_id=update.effective_chat.id,
@@ -201,12 +225,23 @@ class Main_message:
 		
 		context.user_data["temp"] = {}
 		context.user_data.pop("processing")
-		self.db_handler.users_data.update_last_state(
-				update.effective_user.username,
+		functions.set_current_state(
+				context,
 				StateFlags.input_question,
-				None,
-				context
+				None
 		)
+	
+	def get_message_routes(self) -> dict[str, update_handler_type]:
+		"""
+        Returns the text message routes for asking and answering questions, keyed by the state the user is in.
+
+        Returns:
+            dict[str, update_handler_type]: A dictionary mapping states to their message handlers.
+        """
+		return {
+			StateFlags.ask_question: self.input_question,
+			StateFlags.reply_to_question: self.input_answer
+		}
 
 
 class Main_handle:
@@ -225,6 +260,7 @@ class Main_handle:
         main_local (MainHandleLocalDict): Localized strings specific to main handle operations.
         others_local (OthersLocalDict): Localized strings for general application use.
         languages_dict (LanguagesDict): Dictionary containing available languages and their codes.
+        rate_limiter (RateLimiter): Limits how often questions can be asked.
     """
 	
 	def __init__(
@@ -234,7 +270,8 @@ class Main_handle:
 			db_handler: data_handlers.MySQLDataHandler,
 			main_local: MainHandleLocalDict,
 			others_local: OthersLocalDict,
-			languages_dict: LanguagesDict
+			languages_dict: LanguagesDict,
+			rate_limiter: RateLimiter
 	):
 		"""
         Initializes the Main_handle class.
@@ -246,6 +283,7 @@ class Main_handle:
             main_local (MainHandleLocalDict): Localized strings for main handle operations.
             others_local (OthersLocalDict): Localized strings for general application use.
             languages_dict (LanguagesDict): Dictionary containing available languages and their codes.
+            rate_limiter (RateLimiter): Limits how often questions can be asked.
         """
 		self.start_panel = start_panel
 		self.get_user_context = get_user_context
@@ -253,16 +291,17 @@ class Main_handle:
 		self.main_local = main_local
 		self.others_local = others_local
 		self.languages_dict = languages_dict
+		self.rate_limiter = rate_limiter
 	
 	async def ask_question(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
 		"""
-        Initiates the process of asking a question.
+        Initiates the process of asking a question. A user asking too often is warned and returned to the start panel instead.
 
         Args:
             update (Update): The Telegram update object.
             context (ContextTypes.DEFAULT_TYPE): The Telegram context object.
         """
-		self.get_user_context(update, context)
+		await self.get_user_context(update, context)
 		language = functions.get_language(context)
 		
 		if language is None:
@@ -274,7 +313,7 @@ class Main_handle:
 			await self.start_panel(update, context)
 			return
 		
-		if not context.user_data["abilities"]["able_to_ask"]:
+		if not context.user_data["abilities"].able_to_ask:
 			await functions.warning_rights_error(
 					self.main_local[language]["cant_ask_question_warning"],
 					self.start_panel,
@@ -283,6 +322,15 @@ class Main_handle:
 			)
 			return
 		
+		if self.rate_limiter.is_limited(update.effective_user.id):
+			await functions.warning_rights_error(
+					self.others_local[language]["slow_down_warning"],
+					self.start_panel,
+					update,
+					context
+			)
+			return
+		
 		user_id = update.effective_user.id
 		chat_id = update.effective_chat.id
 		username = update.effective_user.username
@@ -312,11 +360,10 @@ class Main_handle:
 			"first_name": first_name,
 			"last_name": last_name
 		}
-		self.db_handler.users_data.update_last_state(
-				update.effective_user.username,
+		functions.set_current_state(
+				context,
 				StateFlags.ask_question,
-				message.message_id,
-				context
+				message.message_id
 		)
 		context.user_data["processing"] = True
 	
@@ -328,7 +375,7 @@ class Main_handle:
             update (Update): The Telegram update object.
             context (ContextTypes.DEFAULT_TYPE): The Telegram context object.
         """
-		self.get_user_context(update, context)
+		await self.get_user_context(update, context)
 		language = functions.get_language(context)
 		
 		if language is None:
@@ -340,7 +387,7 @@ class Main_handle:
 			await self.start_panel(update, context)
 			return
 		
-		if not context.user_data["abilities"]["able_to_answer"]:
+		if not context.user_data["abilities"].able_to_answer:
 			await functions.warning_rights_error(
 					self.main_local[language]["cant_answer_question_warning"],
 					self.start_panel,
@@ -352,13 +399,18 @@ class Main_handle:
 		if context.user_data["temp"].get("declined_questions", None) is None:
 			context.user_data["temp"]["declined_questions"] = []
 		
-		unanswered_question = self.db_handler.questions_data.get_first_unanswered_question(context.user_data["temp"]["declined_questions"])
+		unanswered_question = await self.db_handler.run(self.db_handler.questions_data.get_first_unanswered_question, context.user_data["temp"]["declined_questions"])
 		
-		if unanswered_question:
-			question_id = unanswered_question["question_id"]
-			question_text = unanswered_question["question"]
+		if unanswered_question is not None:
+			question_id = unanswered_question.question_id
+			question_text = unanswered_question.question
 		
-			self.db_handler.questions_data.reserve_question_for_moderator(update.effective_user.username, question_id)
+			await self.db_handler.run(
+					self.db_handler.questions_data.reserve_question_for_moderator,
+					update.effective_user.id,
+					update.effective_user.username,
+					question_id
+			)
 		
 			keyboard = [
 				[
@@ -387,22 +439,20 @@ class Main_handle:
 					reply_markup=reply_markup
 			)
 		
-			context.user_data["temp"]["question_id"] = unanswered_question["question_id"]
-			self.db_handler.users_data.update_last_state(
-					update.effective_user.username,
+			context.user_data["temp"]["question_id"] = unanswered_question.question_id
+			functions.set_current_state(
+					context,
 					StateFlags.answer_question,
-					message.message_id,
-					context
+					message.message_id
 			)
 			context.user_data["processing"] = True
 		else:
 			await update.effective_message.edit_text(text=self.main_local[language]["no_questions_warning"])
 		
-			self.db_handler.users_data.update_last_state(
-					update.effective_user.username,
+			functions.set_current_state(
+					context,
 					StateFlags.answer_question,
-					None,
-					context
+					None
 			)
 		
 			await self.start_panel(update, context)
@@ -415,7 +465,7 @@ class Main_handle:
             update (Update): The Telegram update object.
             context (ContextTypes.DEFAULT_TYPE): The Telegram context object.
         """
-		self.get_user_context(update, context)
+		await self.get_user_context(update, context)
 		language = functions.get_language(context)
 		
 		if language is None:
@@ -427,7 +477,7 @@ class Main_handle:
 			await self.start_panel(update, context)
 			return
 		
-		if not context.user_data["abilities"]["able_to_answer"]:
+		if not context.user_data["abilities"].able_to_answer:
 			await functions.warning_rights_error(
 					self.main_local[language]["cant_answer_question_warning"],
 					self.start_panel,
@@ -441,14 +491,13 @@ class Main_handle:
 		else:
 			context.user_data["temp"]["declined_questions"].append(context.user_data["temp"]["question_id"])
 		
-		self.db_handler.questions_data.free_question_from_moderator(context.user_data["temp"]["question_id"])
+		await self.db_handler.run(self.db_handler.questions_data.free_question_from_moderator, context.user_data["temp"]["question_id"])
 		
 		context.user_data["processing"] = True
-		self.db_handler.users_data.update_last_state(
-				update.effective_user.username,
+		functions.set_current_state(
+				context,
 				StateFlags.decline_question,
-				update.effective_message.message_id,
-				context
+				update.effective_message.message_id
 		)
 		
 		await self.answer_question(update, context)
@@ -461,7 +510,7 @@ class Main_handle:
             update (Update): The Telegram update object.
             context (ContextTypes.DEFAULT_TYPE): The Telegram context object.
         """
-		self.get_user_context(update, context)
+		await self.get_user_context(update, context)
 		language = functions.get_language(context)
 		
 		if language is None:
@@ -473,7 +522,7 @@ class Main_handle:
 			await self.start_panel(update, context)
 			return
 		
-		if not context.user_data["abilities"]["able_to_answer"]:
+		if not context.user_data["abilities"].able_to_answer:
 			await functions.warning_rights_error(
 					self.main_local[language]["cant_answer_question_warning"],
 					self.start_panel,
@@ -494,11 +543,10 @@ class Main_handle:
 				reply_markup=reply_markup
 		)
 		
-		self.db_handler.users_data.update_last_state(
-				update.effective_user.username,
+		functions.set_current_state(
+				context,
 				StateFlags.reply_to_question,
-				None,
-				context
+				None
 		)
 		context.user_data["processing"] = True
 	
@@ -510,7 +558,7 @@ class Main_handle:
             update (Update): The Telegram update object.
             context (ContextTypes.DEFAULT_TYPE): The Telegram context object.
         """
-		self.get_user_context(update, context)
+		await self.get_user_context(update, context)
 		current_state = functions.get_current_state(context)
 		
 		if (
@@ -572,11 +620,10 @@ class Main_handle:
 		else:
 			message = await update.effective_user.send_message("🇷🇺🇺🇸🇩🇪", reply_markup=reply_markup)
 		
-		self.db_handler.users_data.update_last_state(
-				update.effective_user.username,
+		functions.set_current_state(
+				context,
 				StateFlags.view_languages_group,
-				message.message_id,
-				context
+				message.message_id
 		)
 	
 	async def next_languages_group(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -587,7 +634,7 @@ class Main_handle:
             update (Update): The Telegram update object.
             context (ContextTypes.DEFAULT_TYPE): The Telegram context object.
         """
-		self.get_user_context(update, context)
+		await self.get_user_context(update, context)
 		current_state = functions.get_current_state(context)
 		
 		if (
@@ -613,11 +660,10 @@ class Main_handle:
 			context.user_data["temp"]["languages_group"] = (context.user_data["temp"]["languages_group"] + 1) % context.user_data["temp"]["languages_groups"]
 		except ZeroDivisionError:
 			context.user_data["temp"]["languages_group"] = 0
-		self.db_handler.users_data.update_last_state(
-				update.effective_user.username,
+		functions.set_current_state(
+				context,
 				StateFlags.next_languages_group,
-				update.effective_message.message_id,
-				context
+				update.effective_message.message_id
 		)
 		
 		if start_languages_group != context.user_data["temp"]["languages_group"]:
@@ -631,7 +677,7 @@ class Main_handle:
             update (Update): The Telegram update object.
             context (ContextTypes.DEFAULT_TYPE): The Telegram context object.
         """
-		self.get_user_context(update, context)
+		await self.get_user_context(update, context)
 		current_state = functions.get_current_state(context)
 		
 		if (
@@ -661,11 +707,10 @@ class Main_handle:
 		else:
 			context.user_data["temp"]["languages_group"] = context.user_data["temp"]["languages_groups"] - 1
 		
-		self.db_handler.users_data.update_last_state(
-				update.effective_user.username,
+		functions.set_current_state(
+				context,
 				StateFlags.previous_languages_group,
-				update.effective_message.message_id,
-				context
+				update.effective_message.message_id
 		)
 		
 		if start_languages_group != context.user_data["temp"]["languages_group"]:
@@ -698,48 +743,42 @@ class Main_handle:
 		
 		language_literal = re.search(r"set_language_(\w+?)\Z", update.callback_query.data).group(1)
 		
-		self.db_handler.users_data.update_language(update.effective_user.username, language_literal, context)
-		self.db_handler.users_data.update_last_state(
-				update.effective_user.username,
+		if context.user_data.get("role", "user") == "user":
+			await self.db_handler.run(
+					self.db_handler.askers_data.update_language,
+					update.effective_user.id,
+					update.effective_user.username,
+					language_literal,
+					context
+			)
+		else:
+			await self.db_handler.run(self.db_handler.users_data.update_language, update.effective_user.id, language_literal, context)
+		
+		functions.set_current_state(
+				context,
 				StateFlags.view_languages_group,
-				context.user_data.get("current_state", (None, None))[1],
-				context
+				context.user_data.get("current_state", (None, None))[1]
 		)
 		
 		await self.start_panel(update, context)
 	
-	def get_callback_query_handlers(self) -> list[CallbackQueryHandler]:
+	def get_callback_query_routes(self) -> dict[str, update_handler_type]:
 		"""
-        Returns a list of CallbackQueryHandlers for main bot interactions.
+        Returns the callback query routes for main bot interactions.
 
         Returns:
-            list[CallbackQueryHandler]: A list of CallbackQueryHandler objects.
+            dict[str, update_handler_type]: A dictionary mapping callback data flags to their handlers.
         """
-		return list(
-				sorted(
-						[
-							CallbackQueryHandler(callback=self.set_language, pattern=StateFlags.set_language),
-							CallbackQueryHandler(
-									callback=self.view_languages_group,
-									pattern=StateFlags.view_languages_group
-							),
-							CallbackQueryHandler(
-									callback=self.previous_languages_group,
-									pattern=StateFlags.previous_languages_group
-							),
-							CallbackQueryHandler(
-									callback=self.next_languages_group,
-									pattern=StateFlags.next_languages_group
-							),
-							CallbackQueryHandler(callback=self.answer_question, pattern=StateFlags.answer_question),
-							CallbackQueryHandler(callback=self.reply_to_question, pattern=StateFlags.reply_to_question),
-							CallbackQueryHandler(callback=self.decline_question, pattern=StateFlags.decline_question),
-							CallbackQueryHandler(callback=self.ask_question, pattern=StateFlags.ask_question)
-						],
-						key=lambda x: len(x.pattern.pattern),
-						reverse=True
-				)
-		)
+		return {
+			StateFlags.set_language: self.set_language,
+			StateFlags.view_languages_group: self.view_languages_group,
+			StateFlags.previous_languages_group: self.previous_languages_group,
+			StateFlags.next_languages_group: self.next_languages_group,
+			StateFlags.answer_question: self.answer_question,
+			StateFlags.reply_to_question: self.reply_to_question,
+			StateFlags.decline_question: self.decline_question,
+			StateFlags.ask_question: self.ask_question
+		}
 
 
 class Main_view:
@@ -792,7 +831,7 @@ class Main_view:
             update (Update): The Telegram update object.
             context (ContextTypes.DEFAULT_TYPE): The Telegram context object.
         """
-		self.get_user_context(update, context)
+		await self.get_user_context(update, context)
 		language = functions.get_language(context)
 		
 		if language is None:
@@ -809,26 +848,20 @@ class Main_view:
 			except BadRequest:
 				pass
 		
-		self.db_handler.users_data.update_last_state(update.effective_user.username, StateFlags.view_doc, None, context)
+		functions.set_current_state(context, StateFlags.view_doc, None)
 		
 		await self.start_panel(update, context)
 	
-	def get_callback_query_handlers(self) -> list[CallbackQueryHandler]:
+	def get_callback_query_routes(self) -> dict[str, update_handler_type]:
 		"""
-        Returns a list of CallbackQueryHandlers for documentation viewing.
+        Returns the callback query routes for documentation viewing.
 
         Returns:
-            list[CallbackQueryHandler]: A list of CallbackQueryHandler objects.
+            dict[str, update_handler_type]: A dictionary mapping callback data flags to their handlers.
         """
-		return list(
-				sorted(
-						[
-							CallbackQueryHandler(callback=self.view_doc, pattern=StateFlags.view_doc)
-						],
-						key=lambda x: len(x.pattern.pattern),
-						reverse=True
-				)
-		)
+		return {
+			StateFlags.view_doc: self.view_doc
+		}
 
 
 class Main_controls:
@@ -847,7 +880,7 @@ class Main_controls:
 
     :Usage:
         main_controls = Main_controls(start_panel_function, get_user_context_function, db_handler_instance, documentation_list)
-        handlers = main_controls.get_callback_query_handlers() # Get all combined handlers.
+        routes = main_controls.get_callback_query_routes() # Get all combined routes.
     """
 	
 	def __init__(
@@ -858,7 +891,10 @@ class Main_controls:
 			main_local: MainLocalDict,
 			others_local: OthersLocalDict,
 			languages_dict: LanguagesDict,
-			doc: dict[str, list[str]]
+			doc: dict[str, list[str]],
+			answers_dispatcher: AnswersDispatcher,
+			questions_buffer: QuestionsBuffer,
+			rate_limiter: RateLimiter
 	):
 		"""
         Initializes the Main_controls class. Combines main functionality view, handling, and messaging components.
@@ -871,6 +907,9 @@ class Main_controls:
             others_local (OthersLocalDict): Localized strings for general application use.
             languages_dict (LanguagesDict): Dictionary of available languages.
             doc (dict[str, list[str]]): Dictionary with documentations in few languages.
+            answers_dispatcher (AnswersDispatcher): The dispatcher delivering answers from the outbox.
+            questions_buffer (QuestionsBuffer): The buffer inserting new questions in batches.
+            rate_limiter (RateLimiter): Limits how often questions can be asked.
         """
 		self.view = Main_view(start_panel, get_user_context, db_handler, doc)
 		
@@ -880,26 +919,37 @@ class Main_controls:
 				db_handler,
 				main_local["handle"],
 				others_local,
-				languages_dict
+				languages_dict,
+				rate_limiter
 		)
 		
-		self.message = Main_message(start_panel, get_user_context, db_handler, main_local["message"])
+		self.message = Main_message(
+				start_panel,
+				get_user_context,
+				db_handler,
+				main_local["message"],
+				others_local,
+				answers_dispatcher,
+				questions_buffer,
+				rate_limiter
+		)
 	
-	def get_callback_query_handlers(self) -> list[CallbackQueryHandler]:
+	def get_callback_query_routes(self) -> dict[str, update_handler_type]:
 		"""
-        Returns a combined list of callback query handlers.
+        Retrieves all callback query routes related to main bot functionalities.
 
-        Merges handlers from the view and handle components, sorting them by pattern length to
-        ensure correct precedence.
+        Combines routes from the view and handle components.
 
         Returns:
-            list[CallbackQueryHandler]: A sorted list of CallbackQueryHandler instances.
+            dict[str, update_handler_type]: A dictionary mapping callback data flags to their handlers.
         """
-		return list(
-				sorted(
-						self.view.get_callback_query_handlers() +
-						self.handle.get_callback_query_handlers(),
-						key=lambda x: len(x.pattern.pattern),
-						reverse=True
-				)
-		)
+		return self.view.get_callback_query_routes() | self.handle.get_callback_query_routes()
+	
+	def get_message_routes(self) -> dict[str, update_handler_type]:
+		"""
+        Retrieves all text message routes related to main bot functionalities.
+
+        Returns:
+            dict[str, update_handler_type]: A dictionary mapping states to their message handlers.
+        """
+		return self.message.get_message_routes()
@@ -1,6 +1,5 @@
 from dataclasses import dataclass
 from telegram.ext import (
-	CallbackQueryHandler,
 	ContextTypes
 )
 from TelegramAnswerBot import (
@@ -15,7 +14,8 @@ from telegram import (
 )
 from TelegramAnswerBot.objects_types import (
 	get_user_context_type,
-	start_panel_type
+	start_panel_type,
+	update_handler_type
 )
 
 
@@ -101,7 +101,7 @@ class Question_message:
             update (Update): The Telegram update object.
             context (ContextTypes.DEFAULT_TYPE): The Telegram context object.
         """
-		self.get_user_context(update, context)
+		await self.get_user_context(update, context)
 		language = functions.get_language(context)
 		
 		if language is None:
@@ -116,12 +116,12 @@ class Question_message:
 					text=self.others_local[language]["integer_needed_warning"]
 			)
 		else:
-			total_questions = self.db_handler.questions_data.get_total_questions_count()
+			total_questions = await self.db_handler.run(self.db_handler.questions_data.get_total_questions_count)
 			if number_of_questions > total_questions:
-				questions = self.db_handler.questions_data.get_questions_text_list()
+				questions = await self.db_handler.run_analytics(self.db_handler.questions_data.get_questions_text_list)
 				questions_to_view = "\n\n".join(f"{i + 1}: {questions[i]}" for i in range(len(questions))) + self.question_local[language]["questions_count_output"].format(questions_count=len(questions))
 			elif number_of_questions > 0:
-				questions = self.db_handler.questions_data.get_questions_text_list(number_of_questions)
+				questions = await self.db_handler.run_analytics(self.db_handler.questions_data.get_questions_text_list, number_of_questions)
 				questions_to_view = "\n\n".join(f"{i + 1}: {questions[i]}" for i in range(len(questions)))
 			else:
 				questions_to_view = self.others_local[language]["above_zero_needed_warning"]
@@ -129,12 +129,22 @@ class Question_message:
 			await context.bot.send_message(chat_id=update.effective_chat.id, text=questions_to_view)
 		finally:
 			context.user_data.pop("processing")
-			self.db_handler.users_data.update_last_state(
-					update.effective_user.username,
+			functions.set_current_state(
+					context,
 					StateFlags.input_number_of_questions_to_view,
-					None,
-					context
+					None
 			)
+	
+	def get_message_routes(self) -> dict[str, update_handler_type]:
+		"""
+        Returns the text message routes for question viewing, keyed by the state the user is in.
+
+        Returns:
+            dict[str, update_handler_type]: A dictionary mapping states to their message handlers.
+        """
+		return {
+			StateFlags.view_questions_list: self.input_number_of_questions_to_view
+		}
 
 
 class Questions_handle:
@@ -184,7 +194,7 @@ class Questions_handle:
             update (Update): The Telegram update object.
             context (ContextTypes.DEFAULT_TYPE): The Telegram context object.
         """
-		self.get_user_context(update, context)
+		await self.get_user_context(update, context)
 		language = functions.get_language(context)
 		
 		if language is None:
@@ -196,7 +206,7 @@ class Questions_handle:
 			await self.start_panel(update, context)
 			return
 		
-		if not context.user_data["abilities"]["able_to_questions_handle"]:
+		if not context.user_data["abilities"].able_to_questions_handle:
 			await functions.warning_rights_error(
 					self.question_local[language]["cant_clear_questions_warning"],
 					self.start_panel,
@@ -205,15 +215,14 @@ class Questions_handle:
 			)
 			return
 		
-		self.db_handler.questions_data.clear_questions_data()
+		await self.db_handler.run(self.db_handler.questions_data.clear_questions_data)
 		
 		await update.effective_message.edit_text(text=self.question_local[language]["questions_cleared_notification"])
 		
-		self.db_handler.users_data.update_last_state(
-				update.effective_user.username,
+		functions.set_current_state(
+				context,
 				StateFlags.clear_questions_confirm,
-				None,
-				context
+				None
 		)
 		
 		await self.start_panel(update, context)
@@ -226,7 +235,7 @@ class Questions_handle:
             update (Update): The Telegram update object.
             context (ContextTypes.DEFAULT_TYPE): The Telegram context object.
         """
-		self.get_user_context(update, context)
+		await self.get_user_context(update, context)
 		language = functions.get_language(context)
 		
 		if language is None:
@@ -238,7 +247,7 @@ class Questions_handle:
 			await self.start_panel(update, context)
 			return
 		
-		if not context.user_data["abilities"]["able_to_questions_handle"]:
+		if not context.user_data["abilities"].able_to_questions_handle:
 			await functions.warning_rights_error(
 					self.question_local[language]["cant_clear_questions_warning"],
 					self.start_panel,
@@ -268,11 +277,10 @@ class Questions_handle:
 				reply_markup=reply_markup
 		)
 		
-		self.db_handler.users_data.update_last_state(
-				update.effective_user.username,
+		functions.set_current_state(
+				context,
 				StateFlags.clear_questions_request,
-				message.message_id,
-				context
+				message.message_id
 		)
 		context.user_data["processing"] = True
 	
@@ -284,7 +292,7 @@ class Questions_handle:
             update (Update): The Telegram update object.
             context (ContextTypes.DEFAULT_TYPE): The Telegram context object.
         """
-		self.get_user_context(update, context)
+		await self.get_user_context(update, context)
 		language = functions.get_language(context)
 		
 		if language is None:
@@ -296,7 +304,7 @@ class Questions_handle:
 			await self.start_panel(update, context)
 			return
 		
-		if not context.user_data["abilities"]["able_to_questions_handle"]:
+		if not context.user_data["abilities"].able_to_questions_handle:
 			await functions.warning_rights_error(
 					self.question_local[language]["cant_handle_questions_warning"],
 					self.start_panel,
@@ -327,38 +335,25 @@ class Questions_handle:
 				reply_markup=reply_markup
 		)
 		
-		self.db_handler.users_data.update_last_state(
-				update.effective_user.username,
+		functions.set_current_state(
+				context,
 				StateFlags.handle_questions,
-				message.message_id,
-				context
+				message.message_id
 		)
 		context.user_data["processing"] = True
 	
-	def get_callback_query_handlers(self) -> list[CallbackQueryHandler]:
+	def get_callback_query_routes(self) -> dict[str, update_handler_type]:
 		"""
-        Returns a list of CallbackQueryHandlers for question management interactions.
+        Returns the callback query routes for question management interactions.
 
         Returns:
-            list[CallbackQueryHandler]: A list of CallbackQueryHandler objects.
+            dict[str, update_handler_type]: A dictionary mapping callback data flags to their handlers.
         """
-		return list(
-				sorted(
-						[
-							CallbackQueryHandler(callback=self.handle_questions, pattern=StateFlags.handle_questions),
-							CallbackQueryHandler(
-									callback=self.clear_questions_request,
-									pattern=StateFlags.clear_questions_request
-							),
-							CallbackQueryHandler(
-									callback=self.clear_questions_confirm,
-									pattern=StateFlags.clear_questions_confirm
-							)
-						],
-						key=lambda x: len(x.pattern.pattern),
-						reverse=True
-				)
-		)
+		return {
+			StateFlags.handle_questions: self.handle_questions,
+			StateFlags.clear_questions_request: self.clear_questions_request,
+			StateFlags.clear_questions_confirm: self.clear_questions_confirm
+		}
 
 
 class Questions_view:
@@ -410,7 +405,7 @@ class Questions_view:
             update (Update): The Telegram update object.
             context (ContextTypes.DEFAULT_TYPE): The Telegram context object.
         """
-		self.get_user_context(update, context)
+		await self.get_user_context(update, context)
 		language = functions.get_language(context)
 		
 		if language is None:
@@ -422,7 +417,7 @@ class Questions_view:
 			await self.start_panel(update, context)
 			return
 		
-		if not context.user_data["abilities"]["able_to_questions_view"]:
+		if not context.user_data["abilities"].able_to_questions_view:
 			await functions.warning_rights_error(
 					self.question_local[language]["cant_view_questions_list_warning"],
 					self.start_panel,
@@ -447,11 +442,10 @@ class Questions_view:
 				reply_markup=reply_markup
 		)
 		
-		self.db_handler.users_data.update_last_state(
-				update.effective_user.username,
+		functions.set_current_state(
+				context,
 				StateFlags.view_questions_list,
-				message.message_id,
-				context
+				message.message_id
 		)
 		context.user_data["processing"] = True
 	
@@ -463,7 +457,7 @@ class Questions_view:
             update (Update): The Telegram update object.
             context (ContextTypes.DEFAULT_TYPE): The Telegram context object.
         """
-		self.get_user_context(update, context)
+		await self.get_user_context(update, context)
 		language = functions.get_language(context)
 		
 		if language is None:
@@ -475,7 +469,7 @@ class Questions_view:
 			await self.start_panel(update, context)
 			return
 		
-		if not context.user_data["abilities"]["able_to_questions_view"]:
+		if not context.user_data["abilities"].able_to_questions_view:
 			await functions.warning_rights_error(
 					self.question_local[language]["cant_view_questions_statistics_warning"],
 					self.start_panel,
@@ -484,33 +478,33 @@ class Questions_view:
 			)
 			return
 		
-		questions_stats = self.db_handler.questions_data.get_questions_stats()
+		questions_stats = await self.db_handler.run_analytics(self.db_handler.questions_data.get_questions_stats)
 		
 		percent_unanswered = (
-				questions_stats["unanswered_questions"] /
-				questions_stats["total_questions"]
-		) * 100 if questions_stats["total_questions"] else 0
+				questions_stats.unanswered_questions /
+				questions_stats.total_questions
+		) * 100 if questions_stats.total_questions else 0
 		percent_processing = (
-				questions_stats["processing_questions"] /
-				questions_stats["total_questions"]
-		) * 100 if questions_stats["total_questions"] else 0
-		percent_answered = (questions_stats["answered_questions"] / questions_stats["total_questions"]) * 100 if questions_stats["total_questions"] else 0
+				questions_stats.processing_questions /
+				questions_stats.total_questions
+		) * 100 if questions_stats.total_questions else 0
+		percent_answered = (questions_stats.answered_questions / questions_stats.total_questions) * 100 if questions_stats.total_questions else 0
 		
-		average_answer_time = self.db_handler.questions_data.get_average_answer_time()
+		average_answer_time = await self.db_handler.run_analytics(self.db_handler.questions_data.get_average_answer_time)
 		average_answer_time = functions.format_time(average_answer_time)
 		
 		stats_text = "\n".join(
 				[
-					self.question_local[language]["total_questions_count_output"].format(number=questions_stats['total_questions']),
+					self.question_local[language]["total_questions_count_output"].format(number=questions_stats.total_questions),
 					self.question_local[language]["unprocessed_questions_count_output"].format(
-							number=questions_stats['unanswered_questions'],
+							number=questions_stats.unanswered_questions,
 							percent=percent_unanswered
 					),
 					self.question_local[language]["processing_questions_count_output"].format(
-							number=questions_stats['processing_questions'],
+							number=questions_stats.processing_questions,
 							percent=percent_processing
 					),
-					self.question_local[language]["processed_questions_count_output"].format(number=questions_stats['answered_questions'], percent=percent_answered),
+					self.question_local[language]["processed_questions_count_output"].format(number=questions_stats.answered_questions, percent=percent_answered),
 					self.question_local[language]["average_answer_time_output"].format(time=average_answer_time)
 				]
 		)
@@ -522,11 +516,10 @@ class Questions_view:
 				context=context
 		)
 		
-		self.db_handler.users_data.update_last_state(
-				update.effective_user.username,
+		functions.set_current_state(
+				context,
 				StateFlags.view_questions_statistics,
-				None,
-				context
+				None
 		)
 		
 		await self.start_panel(update, context)
@@ -539,7 +532,7 @@ class Questions_view:
             update (Update): The Telegram update object.
             context (ContextTypes.DEFAULT_TYPE): The Telegram context object.
         """
-		self.get_user_context(update, context)
+		await self.get_user_context(update, context)
 		language = functions.get_language(context)
 		
 		if language is None:
@@ -555,7 +548,7 @@ class Questions_view:
 			await self.start_panel(update, context)
 			return
 		
-		if not context.user_data["abilities"]["able_to_questions_view"]:
+		if not context.user_data["abilities"].able_to_questions_view:
 			await functions.warning_rights_error(
 					self.question_local[language]["cant_view_questions_warning"],
 					self.start_panel,
@@ -591,38 +584,25 @@ class Questions_view:
 				reply_markup=reply_markup
 		)
 		
-		self.db_handler.users_data.update_last_state(
-				update.effective_user.username,
+		functions.set_current_state(
+				context,
 				StateFlags.view_questions,
-				message.message_id,
-				context
+				message.message_id
 		)
 		context.user_data["processing"] = True
 	
-	def get_callback_query_handlers(self) -> list[CallbackQueryHandler]:
+	def get_callback_query_routes(self) -> dict[str, update_handler_type]:
 		"""
-        Returns a list of CallbackQueryHandlers for question viewing interactions.
+        Returns the callback query routes for question viewing interactions.
 
         Returns:
-            list[CallbackQueryHandler]: A list of CallbackQueryHandler objects.
+            dict[str, update_handler_type]: A dictionary mapping callback data flags to their handlers.
         """
-		return list(
-				sorted(
-						[
-							CallbackQueryHandler(callback=self.view_questions, pattern=StateFlags.view_questions),
-							CallbackQueryHandler(
-									callback=self.view_questions_statistics,
-									pattern=StateFlags.view_questions_statistics
-							),
-							CallbackQueryHandler(
-									callback=self.view_questions_list,
-									pattern=StateFlags.view_questions_list
-							)
-						],
-						key=lambda x: len(x.pattern.pattern),
-						reverse=True
-				)
-		)
+		return {
+			StateFlags.view_questions: self.view_questions,
+			StateFlags.view_questions_statistics: self.view_questions_statistics,
+			StateFlags.view_questions_list: self.view_questions_list
+		}
 
 
 class Questions_controls:
@@ -682,21 +662,22 @@ class Questions_controls:
 				others_local
 		)
 	
-	def get_callback_query_handlers(self) -> list[CallbackQueryHandler]:
+	def get_callback_query_routes(self) -> dict[str, update_handler_type]:
 		"""
-        Retrieves all callback query handlers related to question management.
+        Retrieves all callback query routes related to questions.
 
-        Combines handlers from Questions_view and Questions_handle, sorting them by pattern
-        length in descending order to prioritize more specific handlers.
+        Combines routes from the view and handle components.
 
         Returns:
-            list[CallbackQueryHandler]: A list of combined and sorted CallbackQueryHandler objects.
+            dict[str, update_handler_type]: A dictionary mapping callback data flags to their handlers.
         """
-		return list(
-				sorted(
-						self.view.get_callback_query_handlers() +
-						self.handle.get_callback_query_handlers(),
-						key=lambda x: len(x.pattern.pattern),
-						reverse=True
-				)
-		)
+		return self.view.get_callback_query_routes() | self.handle.get_callback_query_routes()
+	
+	def get_message_routes(self) -> dict[str, update_handler_type]:
+		"""
+        Retrieves all text message routes related to questions.
+
+        Returns:
+            dict[str, update_handler_type]: A dictionary mapping states to their message handlers.
+        """
+		return self.message.get_message_routes()
@@ -0,0 +1,77 @@
+import typing
+from telegram import Update
+from telegram.ext import ContextTypes
+from TelegramAnswerBot.objects_types import update_handler_type
+
+
+class Router:
+	"""
+    Dispatches callback queries and text messages to their handlers by dictionary lookup.
+
+    Callback data is either a bare StateFlags value (e.g. "view_doc") or a StateFlags value followed by "_" and an argument (e.g. "set_language_en", "view_fag_answer_id12", "chose_user_to_add_role_*admin*"). The flag is found by trying the whole data first and then cutting it at the last "_" until a route matches, so the routing cost does not grow with the number of routes.
+
+    Attributes:
+        callback_query_routes (dict[str, update_handler_type]): Handlers of callback queries by StateFlags value.
+        message_routes (dict[str, update_handler_type]): Handlers of text messages by the current state of the user.
+    """
+	
+	def __init__(
+			self,
+			callback_query_routes: dict[str, update_handler_type],
+			message_routes: dict[str, update_handler_type]
+	):
+		"""
+        Initializes the Router.
+
+        Args:
+            callback_query_routes (dict[str, update_handler_type]): Handlers of callback queries by StateFlags value.
+            message_routes (dict[str, update_handler_type]): Handlers of text messages by the current state of the user.
+        """
+		self.callback_query_routes = callback_query_routes
+		self.message_routes = message_routes
+	
+	def get_callback_query_route(self, data: typing.Optional[str]) -> typing.Optional[update_handler_type]:
+		"""
+        Finds the handler for callback data.
+
+        Args:
+            data (typing.Optional[str]): The callback data of the query.
+
+        Returns:
+            typing.Optional[update_handler_type]: The handler, None if no route matches.
+        """
+		if not data:
+			return None
+		
+		handler = self.callback_query_routes.get(data)
+		
+		while handler is None and "_" in data:
+			data = data.rpartition("_")[0]
+			handler = self.callback_query_routes.get(data)
+		
+		return handler
+	
+	def get_message_route(self, state: typing.Optional[str]) -> typing.Optional[update_handler_type]:
+		"""
+        Finds the handler for a text message sent in the given state.
+
+        Args:
+            state (typing.Optional[str]): The current state of the user.
+
+        Returns:
+            typing.Optional[update_handler_type]: The handler, None if messages are not expected in this state.
+        """
+		return self.message_routes.get(state)
+	
+	async def route_callback_query(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+		"""
+        Dispatches a callback query to its handler. Queries without a route are ignored.
+
+        Args:
+            update (Update): The Telegram update object.
+            context (ContextTypes.DEFAULT_TYPE): The Telegram context object.
+        """
+		handler = self.get_callback_query_route(update.callback_query.data)
+		
+		if handler is not None:
+			await handler(update, context)
\ No newline at end of file
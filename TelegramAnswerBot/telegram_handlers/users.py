@@ -5,7 +5,6 @@ from TelegramAnswerBot import (
 	functions
 )
 from telegram.ext import (
-	CallbackQueryHandler,
 	ContextTypes
 )
 from telegram import (
@@ -21,7 +20,8 @@ from TelegramAnswerBot.objects_types import (
 	UsersMessageLocalDict,
 	UsersViewLocalDict,
 	get_user_context_type,
-	start_panel_type
+	start_panel_type,
+	update_handler_type
 )
 
 
@@ -105,36 +105,35 @@ class Users_messages:
 	
 	async def input_username_to_add_role(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
 		"""
-        Processes a message containing a username to add a role to.
+        Processes a message containing one or several usernames to add a role to. All users get the role in one transaction.
 
         Args:
             update (Update): The Telegram update object.
             context (ContextTypes.DEFAULT_TYPE): The Telegram context object.
         """
-		self.get_user_context(update, context)
+		await self.get_user_context(update, context)
 		language = functions.get_language(context)
 		
 		if language is None:
 			await self.start_panel(update, context)
 			return
 		
-		username = functions.preprocess_username(update.message.text)
+		usernames = functions.preprocess_usernames(update.message.text)
 		
-		self.db_handler.users_data.change_user_role(username, context.user_data["temp"]["role_to_set"])
+		await self.db_handler.run(self.db_handler.users_data.change_users_role, usernames, context.user_data["temp"]["role_to_set"])
 		await context.bot.send_message(
 				chat_id=update.effective_chat.id,
 				text=self.users_local[language]["user_role_added_confirmation"].format(
-						username=username,
+						username=", @".join(usernames),
 						role=self.roles_local[language][context.user_data["temp"]["role_to_set"]]
 				)
 		)
 		
 		context.user_data.pop("processing")
-		self.db_handler.users_data.update_last_state(
-				update.effective_user.username,
+		functions.set_current_state(
+				context,
 				StateFlags.handle_new_moderator_username_message,
-				None,
-				context
+				None
 		)
 	
 	async def input_username_to_remove_role(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -145,7 +144,7 @@ class Users_messages:
             update (Update): The Telegram update object.
             context (ContextTypes.DEFAULT_TYPE): The Telegram context object.
         """
-		self.get_user_context(update, context)
+		await self.get_user_context(update, context)
 		language = functions.get_language(context)
 		
 		if language is None:
@@ -154,26 +153,26 @@ class Users_messages:
 		
 		username = functions.preprocess_username(update.message.text)
 		
-		accepted_roles = self.db_handler.users_data.get_roles_by_priority(context.user_data["role"], "<")
-		user_data = self.db_handler.users_data.get_user_data(username)
+		accepted_roles = await self.db_handler.run(self.db_handler.users_data.get_roles_by_priority, context.user_data["role"], "<")
+		user_data = await self.db_handler.run(self.db_handler.users_data.get_user_data_by_username, username)
 		
-		if user_data:
-			if user_data["role"] not in accepted_roles:
+		if user_data is not None:
+			if user_data.role not in accepted_roles:
 				await context.bot.send_message(
 						chat_id=update.effective_chat.id,
 						text=self.users_local[language]["cant_remove_role_from_user_warning"].format(username=username)
 				)
 			else:
-				self.db_handler.users_data.remove_user(username)
+				await self.db_handler.run(self.db_handler.users_data.remove_user, username)
 		
 				await context.bot.send_message(
 						chat_id=update.effective_chat.id,
 						text=self.users_local[language]["user_role_removed_confirmation"].format(username=username)
 				)
 		
-				if user_data["chat_id"] is not None:
+				if user_data.chat_id is not None:
 					await context.bot.send_message(
-							chat_id=int(user_data["chat_id"]),
+							chat_id=int(user_data.chat_id),
 							text=self.users_local[language]["you_lose_role_notification"]
 					)
 		else:
@@ -183,12 +182,23 @@ class Users_messages:
 			)
 		
 		context.user_data.pop("processing")
-		self.db_handler.users_data.update_last_state(
-				update.effective_user.username,
+		functions.set_current_state(
+				context,
 				StateFlags.handle_moderator_username_to_delete_message,
-				None,
-				context
+				None
 		)
+	
+	def get_message_routes(self) -> dict[str, update_handler_type]:
+		"""
+        Returns the text message routes for user management, keyed by the state the user is in.
+
+        Returns:
+            dict[str, update_handler_type]: A dictionary mapping states to their message handlers.
+        """
+		return {
+			StateFlags.chose_user_to_add_role: self.input_username_to_add_role,
+			StateFlags.remove_user_role: self.input_username_to_remove_role
+		}
 
 
 class Users_handle:
@@ -245,7 +255,7 @@ class Users_handle:
             update (Update): The Telegram update object.
             context (ContextTypes.DEFAULT_TYPE): The Telegram context object.
         """
-		self.get_user_context(update, context)
+		await self.get_user_context(update, context)
 		language = functions.get_language(context)
 		
 		if language is None:
@@ -257,7 +267,7 @@ class Users_handle:
 			await self.start_panel(update, context)
 			return
 		
-		if not context.user_data["abilities"]["able_to_users_handle"]:
+		if not context.user_data["abilities"].able_to_users_handle:
 			await functions.warning_rights_error(
 					self.users_local[language]["cant_remove_role_from_user_warning"],
 					self.start_panel,
@@ -282,11 +292,10 @@ class Users_handle:
 				reply_markup=reply_markup
 		)
 		
-		self.db_handler.users_data.update_last_state(
-				update.effective_user.username,
+		functions.set_current_state(
+				context,
 				StateFlags.remove_user_role,
-				message.message_id,
-				context
+				message.message_id
 		)
 		context.user_data["processing"] = True
 	
@@ -300,7 +309,7 @@ class Users_handle:
             update (Update): The Telegram update object.
             context (ContextTypes.DEFAULT_TYPE): The Telegram context object.
         """
-		self.get_user_context(update, context)
+		await self.get_user_context(update, context)
 		language = functions.get_language(context)
 		
 		if language is None:
@@ -312,7 +321,7 @@ class Users_handle:
 			await self.start_panel(update, context)
 			return
 		
-		if not context.user_data["abilities"]["able_to_users_handle"]:
+		if not context.user_data["abilities"].able_to_users_handle:
 			await functions.warning_rights_error(
 					self.users_local[language]["cant_add_role_to_user_warning"],
 					self.start_panel,
@@ -323,11 +332,10 @@ class Users_handle:
 		
 		message = await update.effective_message.edit_text(text=self.users_local[language]["input_user_to_add_role_suggestion"])
 		
-		self.db_handler.users_data.update_last_state(
-				update.effective_user.username,
+		functions.set_current_state(
+				context,
 				StateFlags.chose_user_to_add_role,
-				message.message_id,
-				context
+				message.message_id
 		)
 		context.user_data["processing"] = True
 		context.user_data["temp"]["role_to_set"] = re.search(r"_\*(\w+)\*\Z", update.callback_query.data).group(1)
@@ -342,7 +350,7 @@ class Users_handle:
             update (Update): The Telegram update object.
             context (ContextTypes.DEFAULT_TYPE): The Telegram context object.
         """
-		self.get_user_context(update, context)
+		await self.get_user_context(update, context)
 		language = functions.get_language(context)
 		
 		if language is None:
@@ -354,7 +362,7 @@ class Users_handle:
 			await self.start_panel(update, context)
 			return
 		
-		if not context.user_data["abilities"]["able_to_users_handle"]:
+		if not context.user_data["abilities"].able_to_users_handle:
 			await functions.warning_rights_error(
 					self.users_local[language]["cant_add_role_to_user_warning"],
 					self.start_panel,
@@ -363,7 +371,7 @@ class Users_handle:
 			)
 			return
 		
-		accepted_roles = self.db_handler.users_data.get_roles_by_priority(context.user_data["role"], "<")
+		accepted_roles = await self.db_handler.run(self.db_handler.users_data.get_roles_by_priority, context.user_data["role"], "<")
 		
 		keyboard = [
 			[
@@ -389,11 +397,10 @@ class Users_handle:
 				reply_markup=reply_markup
 		)
 		
-		self.db_handler.users_data.update_last_state(
-				update.effective_user.username,
+		functions.set_current_state(
+				context,
 				StateFlags.add_user_role,
-				message.message_id,
-				context
+				message.message_id
 		)
 		context.user_data["processing"] = True
 	
@@ -407,7 +414,7 @@ class Users_handle:
             update (Update): The Telegram update object.
             context (ContextTypes.DEFAULT_TYPE): The Telegram context object.
         """
-		self.get_user_context(update, context)
+		await self.get_user_context(update, context)
 		language = functions.get_language(context)
 		
 		if language is None:
@@ -419,7 +426,7 @@ class Users_handle:
 			await self.start_panel(update, context)
 			return
 		
-		if not context.user_data["abilities"]["able_to_users_handle"]:
+		if not context.user_data["abilities"].able_to_users_handle:
 			await functions.warning_rights_error(
 					self.users_local[language]["cant_handle_users_warning"],
 					self.start_panel,
@@ -455,36 +462,26 @@ class Users_handle:
 				reply_markup=reply_markup
 		)
 		
-		self.db_handler.users_data.update_last_state(
-				update.effective_user.username,
+		functions.set_current_state(
+				context,
 				StateFlags.handle_users,
-				message.message_id,
-				context
+				message.message_id
 		)
 		context.user_data["processing"] = True
 	
-	def get_callback_query_handlers(self) -> list[CallbackQueryHandler]:
+	def get_callback_query_routes(self) -> dict[str, update_handler_type]:
 		"""
-        Returns a list of CallbackQueryHandlers for user management interactions.
+        Returns the callback query routes for user management interactions.
 
         Returns:
-            list[CallbackQueryHandler]: A list of CallbackQueryHandler objects.
+            dict[str, update_handler_type]: A dictionary mapping callback data flags to their handlers.
         """
-		return list(
-				sorted(
-						[
-							CallbackQueryHandler(callback=self.handle_users, pattern=StateFlags.handle_users),
-							CallbackQueryHandler(callback=self.add_user_role, pattern=StateFlags.add_user_role),
-							CallbackQueryHandler(
-									callback=self.chose_user_to_add_role,
-									pattern=StateFlags.chose_user_to_add_role
-							),
-							CallbackQueryHandler(callback=self.remove_user_role, pattern=StateFlags.remove_user_role)
-						],
-						key=lambda x: len(x.pattern.pattern),
-						reverse=True
-				)
-		)
+		return {
+			StateFlags.handle_users: self.handle_users,
+			StateFlags.add_user_role: self.add_user_role,
+			StateFlags.chose_user_to_add_role: self.chose_user_to_add_role,
+			StateFlags.remove_user_role: self.remove_user_role
+		}
 
 
 class Users_view:
@@ -539,7 +536,7 @@ class Users_view:
             update (Update): The Telegram update object.
             context (ContextTypes.DEFAULT_TYPE): The Telegram context object.
         """
-		self.get_user_context(update, context)
+		await self.get_user_context(update, context)
 		language = functions.get_language(context)
 		
 		if language is None:
@@ -551,7 +548,7 @@ class Users_view:
 			await self.start_panel(update, context)
 			return
 		
-		if not context.user_data["abilities"]["able_to_users_view"]:
+		if not context.user_data["abilities"].able_to_users_view:
 			await functions.warning_rights_error(
 					self.users_local[language]["cant_view_users_list_warning"],
 					self.start_panel,
@@ -563,18 +560,17 @@ class Users_view:
 		await functions.edit_message(
 				message_to_edit=current_state[1],
 				text="\n".join(
-						f"@{row['username']} - {self.roles_local[language][row['role']]}"
-						for index, row in self.db_handler.users_data.get_users_data().iterrows()
+						f"@{row.username} - {self.roles_local[language][row.role]}"
+						for row in await self.db_handler.run_analytics(self.db_handler.users_data.get_users_data)
 				),
 				update=update,
 				context=context
 		)
 		
-		self.db_handler.users_data.update_last_state(
-				update.effective_user.username,
+		functions.set_current_state(
+				context,
 				StateFlags.view_users_list,
-				None,
-				context
+				None
 		)
 		context.user_data.pop("processing")
 		
@@ -588,7 +584,7 @@ class Users_view:
             update (Update): The Telegram update object.
             context (ContextTypes.DEFAULT_TYPE): The Telegram context object.
         """
-		self.get_user_context(update, context)
+		await self.get_user_context(update, context)
 		language = functions.get_language(context)
 		
 		if language is None:
@@ -600,7 +596,7 @@ class Users_view:
 			await self.start_panel(update, context)
 			return
 		
-		if not context.user_data["abilities"]["able_to_users_view"]:
+		if not context.user_data["abilities"].able_to_users_view:
 			await functions.warning_rights_error(
 					self.users_local[language]["cant_view_users_statistics_warning"],
 					self.start_panel,
@@ -609,23 +605,22 @@ class Users_view:
 			)
 			return
 		
-		moderators_statistics = self.db_handler.questions_data.get_users_statistics()
+		moderators_statistics = await self.db_handler.run_analytics(self.db_handler.questions_data.get_users_statistics)
 		
 		await functions.edit_message(
 				message_to_edit=current_state[1],
 				text="\n".join(
-						f"@{row["moderator_username"]}: {row["count_questions"]}"
-						for username, row in moderators_statistics.iterrows()
+						f"@{row.moderator_username}: {row.count_questions}"
+						for row in moderators_statistics
 				),
 				update=update,
 				context=context
 		)
 		
-		self.db_handler.users_data.update_last_state(
-				update.effective_user.username,
+		functions.set_current_state(
+				context,
 				StateFlags.view_users_statistics,
-				None,
-				context
+				None
 		)
 		context.user_data.pop("processing")
 		
@@ -639,7 +634,7 @@ class Users_view:
             update (Update): The Telegram update object.
             context (ContextTypes.DEFAULT_TYPE): The Telegram context object.
         """
-		self.get_user_context(update, context)
+		await self.get_user_context(update, context)
 		language = functions.get_language(context)
 		
 		if language is None:
@@ -651,7 +646,7 @@ class Users_view:
 			await self.start_panel(update, context)
 			return
 		
-		if not context.user_data["abilities"]["able_to_users_view"]:
+		if not context.user_data["abilities"].able_to_users_view:
 			await functions.warning_rights_error(
 					self.users_local[language]["cant_view_users"],
 					self.start_panel,
@@ -687,35 +682,25 @@ class Users_view:
 				reply_markup=reply_markup
 		)
 		
-		self.db_handler.users_data.update_last_state(
-				update.effective_user.username,
+		functions.set_current_state(
+				context,
 				StateFlags.view_users,
-				message.message_id,
-				context
+				message.message_id
 		)
 		context.user_data["processing"] = True
 	
-	def get_callback_query_handlers(self) -> list[CallbackQueryHandler]:
+	def get_callback_query_routes(self) -> dict[str, update_handler_type]:
 		"""
-        Returns a list of CallbackQueryHandlers for user viewing interactions.
+        Returns the callback query routes for user viewing interactions.
 
         Returns:
-            list[CallbackQueryHandler]: A list of CallbackQueryHandler objects.
+            dict[str, update_handler_type]: A dictionary mapping callback data flags to their handlers.
         """
-		return list(
-				sorted(
-						[
-							CallbackQueryHandler(callback=self.view_users, pattern=StateFlags.view_users),
-							CallbackQueryHandler(
-									callback=self.view_users_statistics,
-									pattern=StateFlags.view_users_statistics
-							),
-							CallbackQueryHandler(callback=self.view_users_list, pattern=StateFlags.view_users_list)
-						],
-						key=lambda x: len(x.pattern.pattern),
-						reverse=True
-				)
-		)
+		return {
+			StateFlags.view_users: self.view_users,
+			StateFlags.view_users_statistics: self.view_users_statistics,
+			StateFlags.view_users_list: self.view_users_list
+		}
 
 
 class Users_controls:
@@ -779,21 +764,22 @@ class Users_controls:
 				roles_local
 		)
 	
-	def get_callback_query_handlers(self) -> list[CallbackQueryHandler]:
+	def get_callback_query_routes(self) -> dict[str, update_handler_type]:
 		"""
-        Retrieves all callback query handlers related to user management.
+        Retrieves all callback query routes related to users.
 
-        Combines handlers from Users_view and Users_handle, sorting them by pattern length
-        in descending order to prioritize more specific handlers.
+        Combines routes from the view and handle components.
 
         Returns:
-            list[CallbackQueryHandler]: A list of combined and sorted CallbackQueryHandler objects.
+            dict[str, update_handler_type]: A dictionary mapping callback data flags to their handlers.
         """
-		return list(
-				sorted(
-						self.view.get_callback_query_handlers() +
-						self.handle.get_callback_query_handlers(),
-						key=lambda x: len(x.pattern.pattern),
-						reverse=True
-				)
-		)
+		return self.view.get_callback_query_routes() | self.handle.get_callback_query_routes()
+	
+	def get_message_routes(self) -> dict[str, update_handler_type]:
+		"""
+        Retrieves all text message routes related to users.
+
+        Returns:
+            dict[str, update_handler_type]: A dictionary mapping states to their message handlers.
+        """
+		return self.message.get_message_routes()
@@ -0,0 +1,83 @@
+import time
+from telegram import Update
+from telegram.ext import (
+	ApplicationHandlerStop,
+	ContextTypes
+)
+
+
+class UpdateDeduplicator:
+	"""
+    Drops updates that were already received, so a redelivered update (a webhook retried by Telegram, updates fetched again after a polling error) isn't handled twice.
+
+    The IDs of updates are remembered for ttl seconds. The set is kept in memory, so it doesn't survive restarts; questions from updates redelivered after a restart are caught by the unique (chat_id, message_id) key of the 'questions' table.
+
+    Attributes:
+        ttl (float): The time in seconds an update ID is remembered.
+        duplicates_count (int): The number of dropped updates.
+        _seen_updates (dict[int, float]): The time each remembered update was received, from the oldest to the newest.
+    """
+	
+	def __init__(self, ttl: float):
+		"""
+        Initializes the UpdateDeduplicator.
+
+        Args:
+            ttl (float): The time in seconds an update ID is remembered.
+        """
+		self.ttl = ttl
+		
+		self.duplicates_count = 0
+		
+		self._seen_updates: dict[int, float] = {}
+	
+	def get_stats(self) -> dict[str, int]:
+		"""
+        Returns the de-duplication counters.
+
+        Returns:
+            dict[str, int]: The number of "duplicates" dropped and of "remembered_updates".
+        """
+		return {"duplicates": self.duplicates_count, "remembered_updates": len(self._seen_updates)}
+	
+	def is_duplicate(self, update_id: int) -> bool:
+		"""
+        Checks whether an update was already received and remembers it otherwise. Forgets updates older than ttl.
+
+        Args:
+            update_id (int): The ID of the update.
+
+        Returns:
+            bool: True if the update was received in the last ttl seconds.
+        """
+		now = time.monotonic()
+		
+		while self._seen_updates:
+			oldest_update_id, received_at = next(iter(self._seen_updates.items()))
+			
+			if received_at > now - self.ttl:
+				break
+			
+			del self._seen_updates[oldest_update_id]
+		
+		if update_id in self._seen_updates:
+			self.duplicates_count += 1
+			return True
+		
+		self._seen_updates[update_id] = now
+		
+		return False
+	
+	async def check_update(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+		"""
+        Stops the processing of an update that was already received. Registered as a handler for every update before all other handlers.
+
+        Args:
+            update (Update): The Telegram update object.
+            context (ContextTypes.DEFAULT_TYPE): The Telegram context object.
+
+        Raises:
+            ApplicationHandlerStop: If the update is a duplicate.
+        """
+		if self.is_duplicate(update.update_id):
+			raise ApplicationHandlerStop
\ No newline at end of file
@@ -0,0 +1,110 @@
+import asyncio
+import typing
+from telegram import Update
+from telegram.ext import BaseUpdateProcessor
+
+
+class PerUserUpdateProcessor(BaseUpdateProcessor):
+	"""
+    Processes updates concurrently while keeping the updates of a single user strictly ordered.
+
+    Updates from different users are handled in parallel (up to max_concurrent_updates at once), so one user's slow DB or Bot API call no longer delays everyone else. Updates from the same user wait on a per-user lock, so transitions of "current_state", "temp" and "processing" in user_data are never interleaved.
+
+    The per-user lock is taken before a slot of max_concurrent_updates: an update waiting for an earlier update of its user holds no slot, so a user flooding the bot occupies one slot at most and can't stall the other users.
+
+    Attributes:
+        _user_locks (dict[int, asyncio.Lock]): Locks of users that currently have updates in progress.
+        _user_waiters (dict[int, int]): Number of updates holding or waiting for each user's lock.
+    """
+	
+	def __init__(self, max_concurrent_updates: int):
+		"""
+        Initializes the PerUserUpdateProcessor.
+
+        Args:
+            max_concurrent_updates (int): The maximum number of updates processed at the same time.
+        """
+		super().__init__(max_concurrent_updates)
+		
+		self._user_locks: dict[int, asyncio.Lock] = {}
+		self._user_waiters: dict[int, int] = {}
+	
+	@staticmethod
+	def get_update_key(update: object) -> typing.Optional[int]:
+		"""
+        Returns the key that updates are serialized by.
+
+        Args:
+            update (object): The update to process.
+
+        Returns:
+            typing.Optional[int]: The user ID (or chat ID if the update has no user), None if the update can run without ordering.
+        """
+		if not isinstance(update, Update):
+			return None
+		
+		if update.effective_user is not None:
+			return update.effective_user.id
+		
+		if update.effective_chat is not None:
+			return update.effective_chat.id
+		
+		return None
+	
+	async def do_process_update(self, update: object, coroutine: typing.Awaitable[typing.Any]):
+		"""
+        Processes the update. Called by process_update with the user's lock and a slot of max_concurrent_updates held.
+
+        Args:
+            update (object): The update to process.
+            coroutine (typing.Awaitable[typing.Any]): The coroutine that processes the update.
+        """
+		await coroutine
+	
+	def is_user_busy(self, user_id: int) -> bool:
+		"""
+        Checks whether updates of a user are being processed or waiting.
+
+        Args:
+            user_id (int): The ID of the user.
+
+        Returns:
+            bool: True if the user has updates in progress.
+        """
+		return user_id in self._user_waiters
+	
+	async def initialize(self):
+		"""Initializes the processor. Nothing to set up."""
+		pass
+	
+	async def process_update(self, update: object, coroutine: typing.Awaitable[typing.Any]):
+		"""
+        Waits until all earlier updates of the same user are finished, then processes the update in a slot of max_concurrent_updates.
+
+        Args:
+            update (object): The update to process.
+            coroutine (typing.Awaitable[typing.Any]): The coroutine that processes the update.
+        """
+		key = self.get_update_key(update)
+		
+		if key is None:
+			await super().process_update(update, coroutine)
+			return
+		
+		lock = self._user_locks.setdefault(key, asyncio.Lock())
+		self._user_waiters[key] = self._user_waiters.get(key, 0) + 1
+		
+		try:
+			async with lock:
+				await super().process_update(update, coroutine)
+		finally:
+			self._user_waiters[key] -= 1
+			
+			if self._user_waiters[key] == 0:
+				del self._user_waiters[key]
+				del self._user_locks[key]
+	
+	async def shutdown(self):
+		"""Shuts down the processor and forgets all user locks."""
+		self._user_locks.clear()
+		self._user_waiters.clear()
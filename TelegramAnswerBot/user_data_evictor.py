@@ -0,0 +1,153 @@
+import time
+import typing
+import asyncio
+import logging
+import collections
+from telegram import Update
+from telegram.ext import (
+	Application,
+	ContextTypes
+)
+
+
+class UserDataEvictor:
+	"""
+    Drops the in-memory user_data of idle users, so memory doesn't grow with every user who ever wrote to the bot.
+
+    The user_data of a user is evicted after idle_timeout seconds without updates, or earlier when more than max_resident_users users are in memory (the least recently active first). Before eviction the state is handed to the persistence and written, so staff continue where they left off: get_user_context restores role, language and conversation state from the database on their next update. Askers have no stored state and start from the main menu.
+
+    Users with updates in progress are never evicted.
+
+    Attributes:
+        idle_timeout (float): The time in seconds without updates after which a user's user_data is evicted.
+        max_resident_users (int): The maximum number of users whose user_data is kept in memory.
+        check_interval (float): The time in seconds between eviction passes.
+        evicted_users_count (int): The number of evictions since the start.
+        _last_activity (collections.OrderedDict[int, float]): The time of the last update of each resident user, from the least to the most recently active.
+        _task (typing.Optional[asyncio.Task]): The running eviction task.
+    """
+	
+	def __init__(self, idle_timeout: float, max_resident_users: int, check_interval: float):
+		"""
+        Initializes the UserDataEvictor.
+
+        Args:
+            idle_timeout (float): The time in seconds without updates after which a user's user_data is evicted.
+            max_resident_users (int): The maximum number of users whose user_data is kept in memory.
+            check_interval (float): The time in seconds between eviction passes.
+        """
+		self.idle_timeout = idle_timeout
+		self.max_resident_users = max_resident_users
+		self.check_interval = check_interval
+		
+		self.evicted_users_count = 0
+		
+		self._last_activity: collections.OrderedDict[int, float] = collections.OrderedDict()
+		self._task: typing.Optional[asyncio.Task] = None
+	
+	def get_users_to_evict(self, application: Application) -> list[int]:
+		"""
+        Selects the users to evict: idle users and the least recently active users above the limit.
+
+        Args:
+            application (Application): The application holding the user_data.
+
+        Returns:
+            list[int]: The IDs of the users to evict.
+        """
+		is_user_busy = getattr(application.update_processor, "is_user_busy", lambda user_id: False)
+		idle_since = time.monotonic() - self.idle_timeout
+		excess_users_count = len(self._last_activity) - self.max_resident_users
+		
+		users_to_evict = []
+		
+		for user_id, last_activity in self._last_activity.items():
+			if last_activity >= idle_since and len(users_to_evict) >= excess_users_count:
+				break
+			
+			if not is_user_busy(user_id):
+				users_to_evict.append(user_id)
+		
+		return users_to_evict
+	
+	async def evict_idle_users(self, application: Application):
+		"""
+        Writes the state of the users to evict in one batch and drops their user_data. If the write fails, nobody is evicted and the next pass tries again. Users who got an update while the state was written stay resident.
+
+        Args:
+            application (Application): The application holding the user_data.
+        """
+		if not application.running:
+			return
+		
+		users_to_evict = self.get_users_to_evict(application)
+		
+		if not users_to_evict:
+			return
+		
+		if application.persistence is not None:
+			last_activity = {user_id: self._last_activity[user_id] for user_id in users_to_evict}
+			
+			for user_id in users_to_evict:
+				if user_id in application.user_data:
+					await application.persistence.update_user_data(user_id, application.user_data[user_id])
+			
+			if not await application.persistence.write_dirty_users_data():
+				return
+			
+			users_to_evict = [user_id for user_id in users_to_evict if self._last_activity.get(user_id) == last_activity[user_id]]
+		
+		for user_id in users_to_evict:
+			application.drop_user_data(user_id)
+			del self._last_activity[user_id]
+		
+		self.evicted_users_count += len(users_to_evict)
+	
+	async def run(self, application: Application):
+		"""
+        Runs eviction passes until cancelled.
+
+        Args:
+            application (Application): The application holding the user_data.
+        """
+		while True:
+			await asyncio.sleep(self.check_interval)
+			
+			try:
+				await self.evict_idle_users(application)
+			except Exception:
+				logging.exception("Evicting idle users failed")
+	
+	def start(self, application: Application):
+		"""
+        Starts the eviction task in the running event loop.
+
+        Args:
+            application (Application): The application holding the user_data.
+        """
+		if self._task is None:
+			self._task = asyncio.create_task(self.run(application))
+	
+	async def stop(self):
+		"""Stops the eviction task."""
+		if self._task is not None:
+			self._task.cancel()
+			
+			try:
+				await self._task
+			except asyncio.CancelledError:
+				pass
+			
+			self._task = None
+	
+	async def track_activity(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+		"""
+        Records the activity of the user of an update. Registered as a handler for every update before all other handlers.
+
+        Args:
+            update (Update): The Telegram update object.
+            context (ContextTypes.DEFAULT_TYPE): The Telegram context object.
+        """
+		if update.effective_user is not None:
+			self._last_activity[update.effective_user.id] = time.monotonic()
+			self._last_activity.move_to_end(update.effective_user.id)
\ No newline at end of file
@@ -0,0 +1,209 @@
+import time
+import typing
+import argparse
+import statistics
+from TelegramAnswerBot import (
+	data_handlers,
+	functions
+)
+
+
+def create_arguments_parser(description: str) -> argparse.ArgumentParser:
+	"""
+    Creates a parser of command line arguments with the arguments shared by all benchmarks.
+
+    Args:
+        description (str): The description of the benchmark.
+
+    Returns:
+        argparse.ArgumentParser: The parser with the "--database" argument.
+	"""
+	parser = argparse.ArgumentParser(description=description)
+	parser.add_argument(
+			"--database",
+			help="The database to run against instead of the one in bin/mysql_config.json. Benchmarks write to it, so use a throwaway one."
+	)
+	
+	return parser
+
+
+def create_db_handler(database: typing.Optional[str] = None) -> data_handlers.MySQLDataHandler:
+	"""
+    Creates a MySQLDataHandler for the primary database from the files in the bin folder, the same way the bot does. The replica isn't used, so every query reaches the configured server.
+
+    Args:
+        database (typing.Optional[str]): The database to use instead of the configured one.
+
+    Returns:
+        data_handlers.MySQLDataHandler: The data handler. Its executors and pools are not shut down by it.
+	"""
+	settings = functions.read_settings()
+	bot_config = settings["bot_config"]
+	mysql_config = settings["MySQL_config"]
+	
+	if database is not None:
+		mysql_config["database"] = database
+	
+	return data_handlers.MySQLDataHandler(
+			mysql_config,
+			users_cache_size=bot_config["users_cache_size"],
+			users_cache_ttl=bot_config["users_cache_ttl"],
+			max_pool_size=bot_config["max_pool_size"],
+			pool_wait_timeout=bot_config["pool_wait_timeout"],
+			pool_idle_timeout=bot_config["pool_idle_timeout"],
+			analytics_pool_size=bot_config["analytics_pool_size"],
+			analytics_max_execution_time=bot_config["analytics_max_execution_time"],
+			replica_sticky_time=bot_config["replica_sticky_time"],
+			pool_ping_interval=bot_config["pool_ping_interval"],
+			circuit_breaker_threshold=bot_config["circuit_breaker_threshold"],
+			circuit_breaker_reset_timeout=bot_config["circuit_breaker_reset_timeout"],
+			snapshot_interval=bot_config["snapshot_interval"]
+	)
+
+
+def get_timings_summary(timings: list[float]) -> dict[str, float]:
+	"""
+    Summarizes the durations of repeated calls.
+
+    Args:
+        timings (list[float]): The durations in seconds.
+
+    Returns:
+        dict[str, float]: The "median_ms" and "p95_ms" durations in milliseconds and the "calls_per_second".
+	"""
+	sorted_timings = sorted(timings)
+	
+	return {
+		"median_ms": round(statistics.median(sorted_timings) * 1000, 3),
+		"p95_ms": round(sorted_timings[min(len(sorted_timings) - 1, int(len(sorted_timings) * 0.95))] * 1000, 3),
+		"calls_per_second": round(len(sorted_timings) / sum(sorted_timings), 1) if sum(sorted_timings) else 0
+	}
+
+
+def measure_calls(function: typing.Callable[[], typing.Any], repeat: int) -> list[float]:
+	"""
+    Calls a function repeatedly and measures every call.
+
+    Args:
+        function (typing.Callable[[], typing.Any]): The function to call.
+        repeat (int): The number of calls.
+
+    Returns:
+        list[float]: The duration of every call in seconds.
+	"""
+	timings = []
+	
+	for _ in range(repeat):
+		started_at = time.perf_counter()
+		function()
+		timings.append(time.perf_counter() - started_at)
+	
+	return timings
+
+
+def print_results(title: str, results: dict[str, typing.Any]):
+	"""
+    Prints the results of a benchmark, one value per line.
+
+    Args:
+        title (str): The name of the measured case.
+        results (dict[str, typing.Any]): The measured values by name.
+	"""
+	print(title)
+	
+	for name, value in results.items():
+		print(f"    {name}: {value}")
+
+
+def seed_questions(db_handler: data_handlers.MySQLDataHandler, chat_id: int, questions_count: int, moderator_ids: list[int]):
+	"""
+    Inserts synthetic questions answered by moderators, 10000 per statement, replacing earlier ones with the same messages.
+
+    Args:
+        db_handler (data_handlers.MySQLDataHandler): The data handler of the database.
+        chat_id (int): The chat of the questions; their message IDs start at 1.
+        questions_count (int): The number of questions.
+        moderator_ids (list[int]): The IDs of the moderators who answered the questions, taken in turn.
+	"""
+	connection, cursor = db_handler.users_data.get_attributes()
+	
+	try:
+		for batch_start in range(1, questions_count + 1, 10000):
+			cursor.executemany(
+					"""
+                    REPLACE INTO
+                        questions (
+                            user_id,
+                            chat_id,
+                            message_id,
+                            username,
+                            first_name,
+                            last_name,
+                            question,
+                            asked_date,
+                            answered_date,
+                            status,
+                            moderator_id
+                        )
+                    VALUES
+                        (%s, %s, %s, %s, %s, %s, %s, NOW() - INTERVAL %s SECOND, NOW(), "processed", %s)
+					""",
+					[
+						(
+								chat_id,
+								chat_id,
+								message_id,
+								f"benchmark_{chat_id}",
+								"Benchmark",
+								"Asker",
+								f"Benchmark question {message_id}",
+								message_id % 3600,
+								moderator_ids[message_id % len(moderator_ids)]
+						)
+						for message_id in range(batch_start, min(batch_start + 10000, questions_count + 1))
+					]
+			)
+			connection.commit()
+	finally:
+		cursor.close()
+		connection.close()
+
+
+def seed_users(db_handler: data_handlers.MySQLDataHandler, first_user_id: int, users_count: int, role: str, user_context_data: str = "{}"):
+	"""
+    Inserts synthetic users with a role, 10000 per statement, replacing earlier ones with the same IDs.
+
+    Args:
+        db_handler (data_handlers.MySQLDataHandler): The data handler of the database.
+        first_user_id (int): The ID of the first user; the others follow it.
+        users_count (int): The number of users.
+        role (str): The role of the users.
+        user_context_data (str): The stored context data of every user, as JSON.
+	"""
+	connection, cursor = db_handler.users_data.get_attributes()
+	
+	try:
+		for batch_start in range(first_user_id, first_user_id + users_count, 10000):
+			cursor.executemany(
+					"""
+                    REPLACE INTO
+                        users (
+                            user_id,
+                            username,
+                            role,
+                            user_context_data
+                        )
+                    VALUES
+                        (%s, %s, %s, %s)
+					""",
+					[
+						(user_id, f"benchmark_{user_id}", role, user_context_data)
+						for user_id in range(batch_start, min(batch_start + 10000, first_user_id + users_count))
+					]
+			)
+			connection.commit()
+	finally:
+		cursor.close()
+		connection.close()
+	
+	db_handler.users_data.profiles_cache.clear()
\ No newline at end of file
@@ -0,0 +1,89 @@
+import random
+from benchmarks.common import (
+	create_arguments_parser,
+	create_db_handler,
+	get_timings_summary,
+	measure_calls,
+	print_results,
+	seed_users
+)
+from TelegramAnswerBot import (
+	data_handlers,
+	functions,
+	objects_types
+)
+
+PROFILE_QUERY = f"""
+                SELECT
+                    {functions.get_db_columns(objects_types.UserRow)}
+                FROM
+                    users
+                WHERE
+                    user_id = %s
+                LIMIT 1
+                """
+
+
+def load_profile_plain(db_handler: data_handlers.MySQLDataHandler, user_id: int):
+	"""
+    Reads a user's row with a plain cursor, sending the query text every time.
+
+    Args:
+        db_handler (data_handlers.MySQLDataHandler): The data handler of the database.
+        user_id (int): The Telegram ID of the user.
+	"""
+	connection, cursor = db_handler.users_data.get_attributes()
+	
+	cursor.execute(PROFILE_QUERY, (user_id,))
+	cursor.fetchall()
+	
+	cursor.close()
+	connection.close()
+
+
+def load_profile_prepared(db_handler: data_handlers.MySQLDataHandler, user_id: int):
+	"""
+    Reads a user's row through the prepared statement of the connection, like UsersDataHandler.load_user_profile.
+
+    Args:
+        db_handler (data_handlers.MySQLDataHandler): The data handler of the database.
+        user_id (int): The Telegram ID of the user.
+	"""
+	connection, cursor = db_handler.users_data.execute_prepared(PROFILE_QUERY, (user_id,))
+	
+	cursor.fetchall()
+	
+	connection.close()
+
+
+def main():
+	"""
+    Measures the profile lookup of a random user with a plain cursor and with a reused prepared statement, against the configured MySQL server.
+	"""
+	parser = create_arguments_parser("Measures the profile lookup with plain cursors and with reused prepared statements.")
+	parser.add_argument("--users", type=int, default=100000, help="The number of synthetic users to look up.")
+	parser.add_argument("--calls", type=int, default=20000, help="The number of lookups of every variant.")
+	parser.add_argument("--first-user-id", type=int, default=10 ** 12, help="The ID of the first synthetic user.")
+	arguments = parser.parse_args()
+	
+	db_handler = create_db_handler(arguments.database)
+	
+	try:
+		seed_users(db_handler, arguments.first_user_id, arguments.users, "user")
+		
+		for title, load_profile in (("Plain cursor", load_profile_plain), ("Prepared statement", load_profile_prepared)):
+			load_profile(db_handler, arguments.first_user_id)
+			
+			timings = measure_calls(
+					lambda: load_profile(db_handler, arguments.first_user_id + random.randrange(arguments.users)),
+					arguments.calls
+			)
+			print_results(title, get_timings_summary(timings))
+		
+		print_results("Prepared statements", db_handler.prepared_statements.get_stats())
+	finally:
+		db_handler.shutdown_executors()
+
+
+if __name__ == "__main__":
+	main()
\ No newline at end of file
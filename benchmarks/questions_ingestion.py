@@ -0,0 +1,175 @@
+import time
+import typing
+import asyncio
+import itertools
+from benchmarks.common import (
+	create_arguments_parser,
+	create_db_handler,
+	print_results
+)
+from TelegramAnswerBot import data_handlers
+from TelegramAnswerBot.questions_buffer import QuestionsBuffer
+
+
+async def ask_questions(
+		add_question: typing.Callable[..., typing.Awaitable[bool]],
+		chat_id: int,
+		message_ids: typing.Iterator[int],
+		deadline: float
+) -> int:
+	"""
+    Asks questions one after another until the deadline, like a user who waits for every confirmation.
+
+    Args:
+        add_question (typing.Callable[..., typing.Awaitable[bool]]): The function storing a question.
+        chat_id (int): The chat of the questions.
+        message_ids (typing.Iterator[int]): The message IDs of the questions, shared by all askers.
+        deadline (float): The time of time.perf_counter after which no more questions are asked.
+
+    Returns:
+        int: The number of stored questions.
+	"""
+	questions_count = 0
+	
+	while time.perf_counter() < deadline:
+		message_id = next(message_ids)
+		questions_count += await add_question(
+				chat_id,
+				chat_id,
+				message_id,
+				f"benchmark_{chat_id}",
+				"Benchmark",
+				"Asker",
+				f"Benchmark question {message_id}"
+		)
+	
+	return questions_count
+
+
+def delete_questions(db_handler: data_handlers.MySQLDataHandler, chat_id: int):
+	"""
+    Deletes the questions of a chat, so earlier runs don't make messages look stored already.
+
+    Args:
+        db_handler (data_handlers.MySQLDataHandler): The data handler of the database.
+        chat_id (int): The chat of the questions.
+	"""
+	connection, cursor = db_handler.questions_data.get_attributes()
+	
+	try:
+		cursor.execute(
+				"""
+                DELETE FROM
+                    questions
+                WHERE
+                    chat_id = %s
+				""",
+				(chat_id,)
+		)
+		connection.commit()
+	finally:
+		cursor.close()
+		connection.close()
+
+
+async def measure_ingestion(
+		add_question: typing.Callable[..., typing.Awaitable[bool]],
+		askers_count: int,
+		duration: float,
+		chat_id: int,
+		message_ids: typing.Iterator[int]
+) -> dict[str, float]:
+	"""
+    Lets many askers ask questions at the same time for a while.
+
+    Args:
+        add_question (typing.Callable[..., typing.Awaitable[bool]]): The function storing a question.
+        askers_count (int): The number of askers.
+        duration (float): The time in seconds the askers ask questions.
+        chat_id (int): The chat of the questions.
+        message_ids (typing.Iterator[int]): The message IDs of the questions.
+
+    Returns:
+        dict[str, float]: The number of stored "questions" and the "inserts_per_second".
+	"""
+	started_at = time.perf_counter()
+	questions_counts = await asyncio.gather(
+			*(ask_questions(add_question, chat_id, message_ids, started_at + duration) for _ in range(askers_count))
+	)
+	elapsed = time.perf_counter() - started_at
+	
+	return {"questions": sum(questions_counts), "inserts_per_second": round(sum(questions_counts) / elapsed, 1)}
+
+
+async def run_benchmark(
+		db_handler: data_handlers.MySQLDataHandler,
+		askers_count: int,
+		duration: float,
+		chat_id: int,
+		max_batch_size: int,
+		max_delay: float
+):
+	"""
+    Measures the inserts per second with one INSERT and commit per question and with the QuestionsBuffer.
+
+    Args:
+        db_handler (data_handlers.MySQLDataHandler): The data handler of the database.
+        askers_count (int): The number of askers.
+        duration (float): The time in seconds of every measurement.
+        chat_id (int): The chat of the questions.
+        max_batch_size (int): The maximum number of questions inserted at once by the QuestionsBuffer.
+        max_delay (float): The maximum time in seconds a question waits for others in the QuestionsBuffer.
+	"""
+	message_ids = itertools.count(1)
+	
+	async def add_question(*args: typing.Any) -> bool:
+		return await db_handler.run(db_handler.questions_data.add_question, *args)
+	
+	print_results(
+			f"{askers_count} askers, one transaction per question",
+			await measure_ingestion(add_question, askers_count, duration, chat_id, message_ids)
+	)
+	
+	questions_buffer = QuestionsBuffer(db_handler, max_batch_size, max_delay)
+	results = await measure_ingestion(questions_buffer.add_question, askers_count, duration, chat_id, message_ids)
+	await questions_buffer.stop()
+	
+	print_results(
+			f"{askers_count} askers, QuestionsBuffer with max_batch_size={max_batch_size}, max_delay={max_delay}",
+			results | questions_buffer.get_stats()
+	)
+
+
+def main():
+	"""
+    Measures the sustained inserts per second of questions with and without group commits, against the configured MySQL server.
+	"""
+	parser = create_arguments_parser("Measures the inserts per second of questions with and without the QuestionsBuffer.")
+	parser.add_argument("--askers", type=int, default=500, help="The number of users asking questions at the same time.")
+	parser.add_argument("--duration", type=float, default=10, help="The time in seconds of every measurement.")
+	parser.add_argument("--batch-size", type=int, default=50, help="The maximum number of questions inserted at once by the QuestionsBuffer.")
+	parser.add_argument("--batch-delay", type=float, default=0.01, help="The maximum time in seconds a question waits for others in the QuestionsBuffer.")
+	parser.add_argument("--chat-id", type=int, default=-10 ** 12 - 1, help="The chat of the synthetic questions; its questions are deleted before and after the run.")
+	arguments = parser.parse_args()
+	
+	db_handler = create_db_handler(arguments.database)
+	
+	try:
+		delete_questions(db_handler, arguments.chat_id)
+		asyncio.run(
+				run_benchmark(
+						db_handler,
+						arguments.askers,
+						arguments.duration,
+						arguments.chat_id,
+						arguments.batch_size,
+						arguments.batch_delay
+				)
+		)
+		delete_questions(db_handler, arguments.chat_id)
+	finally:
+		db_handler.shutdown_executors()
+
+
+if __name__ == "__main__":
+	main()
\ No newline at end of file
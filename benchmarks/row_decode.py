@@ -0,0 +1,144 @@
+import time
+import typing
+import tracemalloc
+import mysql.connector
+from benchmarks.common import (
+	create_arguments_parser,
+	create_db_handler,
+	get_timings_summary,
+	measure_calls,
+	print_results,
+	seed_questions
+)
+from TelegramAnswerBot import (
+	data_handlers,
+	functions,
+	objects_types
+)
+
+
+def decode_dicts(headers: list[str], rows: list[tuple]) -> list[dict]:
+	"""
+    Decodes rows as they were decoded before the records: the headers and values are zipped into a dict, which is splatted into a TypedDict.
+
+    Args:
+        headers (list[str]): The column names.
+        rows (list[tuple]): The rows of the cursor.
+
+    Returns:
+        list[dict]: A dict for every row.
+	"""
+	return [dict(**{header: value for header, value in zip(headers, row)}) for row in rows]
+
+
+def decode_records(rows: list[tuple]) -> list[objects_types.QuestionRow]:
+	"""
+    Decodes rows into records straight from the cursor tuples, as the data handlers do.
+
+    Args:
+        rows (list[tuple]): The rows of the cursor.
+
+    Returns:
+        list[objects_types.QuestionRow]: A record for every row.
+	"""
+	return list(map(objects_types.QuestionRow._make, rows))
+
+
+def fetch_rows(db_handler: data_handlers.MySQLDataHandler, rows_count: int) -> tuple[list[str], list[tuple], float]:
+	"""
+    Reads questions with the columns of QuestionRow.
+
+    Args:
+        db_handler (data_handlers.MySQLDataHandler): The data handler of the database.
+        rows_count (int): The number of questions to read.
+
+    Returns:
+        tuple[list[str], list[tuple], float]: The column names, the rows and the time in seconds the query and the fetch took.
+	"""
+	connection, cursor = db_handler.questions_data.get_attributes()
+	
+	try:
+		started_at = time.perf_counter()
+		cursor.execute(
+				f"""
+                SELECT
+                    {functions.get_db_columns(objects_types.QuestionRow)}
+                FROM
+                    questions
+                LIMIT %s
+				""",
+				(rows_count,)
+		)
+		rows = cursor.fetchall()
+		elapsed = time.perf_counter() - started_at
+		
+		return [column[0] for column in cursor.description], rows, elapsed
+	finally:
+		cursor.close()
+		connection.close()
+
+
+def measure_memory(decode: typing.Callable[[], list]) -> int:
+	"""
+    Measures the memory held by the result of a decode. The values are shared with the fetched rows, so only the dicts or records are counted.
+
+    Args:
+        decode (typing.Callable[[], list]): The function decoding the rows.
+
+    Returns:
+        int: The memory in bytes allocated for the decoded rows.
+	"""
+	tracemalloc.start()
+	
+	decoded_rows = decode()
+	memory = tracemalloc.get_traced_memory()[0]
+	
+	tracemalloc.stop()
+	del decoded_rows
+	
+	return memory
+
+
+def main():
+	"""
+    Measures the time and the memory of decoding a large result set into dicts and into records, after reading it from the configured MySQL server.
+	"""
+	parser = create_arguments_parser("Measures the cost of decoding rows into dicts and into records.")
+	parser.add_argument("--rows", type=int, default=100000, help="The number of rows of the result set.")
+	parser.add_argument("--repeat", type=int, default=10, help="The number of decodes of the result set.")
+	parser.add_argument("--chat-id", type=int, default=-10 ** 12, help="The chat of the synthetic questions.")
+	arguments = parser.parse_args()
+	
+	db_handler = create_db_handler(arguments.database)
+	
+	try:
+		seed_questions(db_handler, arguments.chat_id, arguments.rows, [arguments.chat_id])
+		headers, rows, fetch_time = fetch_rows(db_handler, arguments.rows)
+	finally:
+		db_handler.shutdown_executors()
+	
+	print_results(
+			f"reading {len(rows)} rows",
+			{"seconds": round(fetch_time, 3), "c_extension_available": mysql.connector.HAVE_CEXT}
+	)
+	
+	decoders = {
+		"dicts": lambda: decode_dicts(headers, rows),
+		"records": lambda: decode_records(rows)
+	}
+	
+	for name, decode in decoders.items():
+		timings = measure_calls(decode, arguments.repeat)
+		
+		print_results(
+				f"decoding {len(rows)} rows into {name}",
+				{
+					**get_timings_summary(timings),
+					"nanoseconds_per_row": round(min(timings) / len(rows) * 10 ** 9),
+					"megabytes": round(measure_memory(decode) / 2 ** 20, 1)
+				}
+		)
+
+
+if __name__ == "__main__":
+	main()
\ No newline at end of file
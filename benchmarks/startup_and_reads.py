@@ -0,0 +1,143 @@
+import sys
+import time
+import typing
+import subprocess
+import importlib.util
+from benchmarks.common import (
+	create_arguments_parser,
+	create_db_handler,
+	get_timings_summary,
+	measure_calls,
+	print_results,
+	seed_questions,
+	seed_users
+)
+from TelegramAnswerBot import data_handlers
+
+
+def get_rows(result: typing.Any) -> list[tuple]:
+	"""
+    Returns the result of a read as rows; a single value becomes one row.
+
+    Args:
+        result (typing.Any): The result of the read.
+
+    Returns:
+        list[tuple]: The rows.
+	"""
+	return result if isinstance(result, list) else [(result,)]
+
+
+def iterate_rows(result: typing.Any) -> int:
+	"""
+    Reads every value of every row, as the handlers do with the records.
+
+    Args:
+        result (typing.Any): The result of the read.
+
+    Returns:
+        int: The number of values.
+	"""
+	return sum(len(tuple(row)) for row in get_rows(result))
+
+
+def iterate_rows_with_pandas(result: typing.Any) -> int:
+	"""
+    Builds a DataFrame of the rows and reads every value through iterrows, as the handlers did before pandas was dropped.
+
+    Args:
+        result (typing.Any): The result of the read.
+
+    Returns:
+        int: The number of values.
+	"""
+	import pandas
+	
+	rows = get_rows(result)
+	data_frame = pandas.DataFrame(rows, columns=getattr(rows[0], "_fields", None) if rows else None)
+	
+	return sum(len(tuple(row)) for _, row in data_frame.iterrows())
+
+
+def measure_startup(module: str, runs: int) -> list[float]:
+	"""
+    Measures the time a new interpreter takes to import a module.
+
+    Args:
+        module (str): The module to import.
+        runs (int): The number of interpreters to start.
+
+    Returns:
+        list[float]: The duration of every start in seconds.
+	"""
+	timings = []
+	
+	for _ in range(runs):
+		started_at = time.perf_counter()
+		subprocess.run([sys.executable, "-c", f"import {module}"], check=True)
+		timings.append(time.perf_counter() - started_at)
+	
+	return timings
+
+
+def seed_data(db_handler: data_handlers.MySQLDataHandler, first_user_id: int, moderators_count: int, questions_count: int):
+	"""
+    Inserts the FAQs, moderators and answered questions the reads return.
+
+    Args:
+        db_handler (data_handlers.MySQLDataHandler): The data handler of the database.
+        first_user_id (int): The ID of the first synthetic moderator.
+        moderators_count (int): The number of moderators.
+        questions_count (int): The number of answered questions.
+	"""
+	for faq_number in range(db_handler.faqs_data.get_total_faqs_count(), 9):
+		db_handler.faqs_data.add_faq(f"Benchmark question {faq_number}", f"Benchmark answer {faq_number}")
+	
+	seed_users(db_handler, first_user_id, moderators_count, "moderator")
+	seed_questions(db_handler, first_user_id - 1, questions_count, list(range(first_user_id, first_user_id + moderators_count)))
+
+
+def main():
+	"""
+    Measures the startup time of the bot and of importing pandas, and the cost of the reads that used to build DataFrames, with records and with a DataFrame built from them, against the configured MySQL server.
+	"""
+	parser = create_arguments_parser("Measures the startup time and the per-call cost of reads with and without pandas.")
+	parser.add_argument("--startup-runs", type=int, default=5, help="The number of interpreters started to measure the startup time.")
+	parser.add_argument("--repeat", type=int, default=200, help="The number of calls of every read.")
+	parser.add_argument("--moderators", type=int, default=100, help="The number of synthetic moderators.")
+	parser.add_argument("--questions", type=int, default=10000, help="The number of synthetic answered questions.")
+	parser.add_argument("--first-user-id", type=int, default=10 ** 12, help="The ID of the first synthetic moderator.")
+	arguments = parser.parse_args()
+	
+	is_pandas_installed = importlib.util.find_spec("pandas") is not None
+	
+	print_results("startup: import main", get_timings_summary(measure_startup("main", arguments.startup_runs)))
+	
+	if is_pandas_installed:
+		print_results("startup: import pandas", get_timings_summary(measure_startup("pandas", arguments.startup_runs)))
+	else:
+		print("pandas isn't installed; its import time and the DataFrame reads are skipped")
+	
+	db_handler = create_db_handler(arguments.database)
+	
+	try:
+		seed_data(db_handler, arguments.first_user_id, arguments.moderators, arguments.questions)
+		
+		reads = {
+			"get_faq_group": lambda: db_handler.faqs_data.get_faq_group(9, 0),
+			"get_users_data": db_handler.users_data.get_users_data,
+			"get_users_statistics": db_handler.questions_data.get_users_statistics,
+			"get_average_answer_time": db_handler.questions_data.get_average_answer_time
+		}
+		
+		for name, read in reads.items():
+			print_results(f"{name}: records", get_timings_summary(measure_calls(lambda: iterate_rows(read()), arguments.repeat)))
+			
+			if is_pandas_installed:
+				print_results(f"{name}: DataFrame", get_timings_summary(measure_calls(lambda: iterate_rows_with_pandas(read()), arguments.repeat)))
+	finally:
+		db_handler.shutdown_executors()
+
+
+if __name__ == "__main__":
+	main()
\ No newline at end of file
@@ -0,0 +1,127 @@
+import time
+import asyncio
+from telegram import (
+	CallbackQuery,
+	Update,
+	User
+)
+from benchmarks.common import (
+	create_arguments_parser,
+	create_db_handler,
+	print_results
+)
+from TelegramAnswerBot import data_handlers
+from TelegramAnswerBot.update_processor import PerUserUpdateProcessor
+
+
+async def handle_update(db_handler: data_handlers.MySQLDataHandler, update: Update, api_latency: float, handled_updates: list[tuple[int, int]]):
+	"""
+    Handles a synthetic update the way a click on the FAQ list is handled: looks up the user's role and language, reads a page of FAQs and waits for a Bot API call.
+
+    Args:
+        db_handler (data_handlers.MySQLDataHandler): The data handler of the database.
+        update (Update): The update.
+        api_latency (float): The time in seconds the simulated Bot API call takes.
+        handled_updates (list[tuple[int, int]]): The user ID and the update ID of every handled update, in the order they were handled.
+	"""
+	user = update.effective_user
+	
+	await db_handler.run(db_handler.users_data.get_user_role, user.id, user.username)
+	await db_handler.run(db_handler.askers_data.get_asker_language, user.id)
+	await db_handler.run(db_handler.faqs_data.get_faq_group, 9, 0)
+	await asyncio.sleep(api_latency)
+	
+	handled_updates.append((user.id, update.update_id))
+
+
+async def process_stream(
+		db_handler: data_handlers.MySQLDataHandler,
+		max_concurrent_updates: int,
+		updates: list[Update],
+		api_latency: float
+) -> dict[str, float]:
+	"""
+    Processes a stream of updates through the PerUserUpdateProcessor, the way the application does, and checks that every user's updates were handled in order.
+
+    Args:
+        db_handler (data_handlers.MySQLDataHandler): The data handler of the database.
+        max_concurrent_updates (int): The maximum number of updates processed at the same time. 1 processes them one after another, like the application without concurrent updates.
+        updates (list[Update]): The updates in the order they arrive.
+        api_latency (float): The time in seconds the simulated Bot API call takes.
+
+    Returns:
+        dict[str, float]: The "seconds" the stream took and the "updates_per_second".
+	"""
+	update_processor = PerUserUpdateProcessor(max_concurrent_updates)
+	handled_updates: list[tuple[int, int]] = []
+	db_handler.users_data.profiles_cache.clear()
+	
+	started_at = time.perf_counter()
+	await asyncio.gather(
+			*(
+				update_processor.process_update(update, handle_update(db_handler, update, api_latency, handled_updates))
+				for update in updates
+			)
+	)
+	elapsed = time.perf_counter() - started_at
+	
+	last_update_ids: dict[int, int] = {}
+	
+	for user_id, update_id in handled_updates:
+		if update_id < last_update_ids.get(user_id, -1):
+			raise AssertionError(f"Updates of user {user_id} were handled out of order")
+		
+		last_update_ids[user_id] = update_id
+	
+	return {"seconds": round(elapsed, 3), "updates_per_second": round(len(updates) / elapsed, 1)}
+
+
+def create_updates(users_count: int, updates_per_user: int) -> list[Update]:
+	"""
+    Creates a stream of FAQ list clicks in which the users' updates are interleaved.
+
+    Args:
+        users_count (int): The number of users.
+        updates_per_user (int): The number of updates of every user.
+
+    Returns:
+        list[Update]: The updates in the order they arrive.
+	"""
+	users = [User(user_id, f"Benchmark {user_id}", False, username=f"benchmark_{user_id}") for user_id in range(1, users_count + 1)]
+	
+	return [
+		Update(
+				round_index * users_count + user_index,
+				callback_query=CallbackQuery(str(round_index * users_count + user_index), user, "benchmark", data="view_faqs")
+		)
+		for round_index in range(updates_per_user)
+		for user_index, user in enumerate(users)
+	]
+
+
+def main():
+	"""
+    Measures the update throughput with sequential processing and with concurrent processing ordered per user, against the configured MySQL server.
+	"""
+	parser = create_arguments_parser("Measures the update throughput with and without concurrent processing.")
+	parser.add_argument("--users", type=int, default=1000, help="The number of users sending updates.")
+	parser.add_argument("--updates-per-user", type=int, default=5, help="The number of updates of every user.")
+	parser.add_argument("--concurrency", type=int, default=256, help="The maximum number of updates processed at the same time.")
+	parser.add_argument("--api-latency", type=float, default=0.05, help="The time in seconds a simulated Bot API call takes.")
+	arguments = parser.parse_args()
+	
+	db_handler = create_db_handler(arguments.database)
+	updates = create_updates(arguments.users, arguments.updates_per_user)
+	
+	try:
+		for max_concurrent_updates in (1, arguments.concurrency):
+			print_results(
+					f"max_concurrent_updates={max_concurrent_updates}, {len(updates)} updates of {arguments.users} users",
+					asyncio.run(process_stream(db_handler, max_concurrent_updates, updates, arguments.api_latency))
+			)
+	finally:
+		db_handler.shutdown_executors()
+
+
+if __name__ == "__main__":
+	main()
\ No newline at end of file
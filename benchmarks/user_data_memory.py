@@ -0,0 +1,183 @@
+import gc
+import time
+import types
+import asyncio
+import datetime
+import tracemalloc
+from main import AnswerBot
+from telegram import (
+	Chat,
+	Message,
+	Update,
+	User
+)
+from benchmarks.common import (
+	create_arguments_parser,
+	create_db_handler,
+	get_timings_summary,
+	print_results,
+	seed_users
+)
+from TelegramAnswerBot import data_handlers
+from TelegramAnswerBot.persistence import MySQLPersistence
+from TelegramAnswerBot.user_data_evictor import UserDataEvictor
+
+
+def create_update(user_id: int) -> Update:
+	"""
+    Creates a synthetic text message of a user in the private chat with the bot.
+
+    Args:
+        user_id (int): The ID of the user.
+
+    Returns:
+        Update: The update.
+	"""
+	user = User(user_id, f"Benchmark {user_id}", False, username=f"benchmark_{user_id}")
+	
+	return Update(
+			user_id,
+			message=Message(user_id, datetime.datetime.now(), Chat(user_id, Chat.PRIVATE), from_user=user, text="benchmark")
+	)
+
+
+def get_traced_memory() -> int:
+	"""
+    Collects garbage and returns the memory allocated since tracing started.
+
+    Returns:
+        int: The allocated memory in bytes.
+	"""
+	gc.collect()
+	
+	return tracemalloc.get_traced_memory()[0]
+
+
+async def rehydrate_users(db_handler: data_handlers.MySQLDataHandler, user_ids: list[int]) -> list[float]:
+	"""
+    Restores the user_data of evicted users through get_user_context, as on their next update.
+
+    Args:
+        db_handler (data_handlers.MySQLDataHandler): The data handler of the database.
+        user_ids (list[int]): The IDs of the users.
+
+    Returns:
+        list[float]: The duration of every restore in seconds.
+	"""
+	answer_bot = types.SimpleNamespace(db_handler=db_handler)
+	timings = []
+	
+	for user_id in user_ids:
+		context = types.SimpleNamespace(user_data={})
+		
+		started_at = time.perf_counter()
+		await AnswerBot.get_user_context(answer_bot, create_update(user_id), context)
+		timings.append(time.perf_counter() - started_at)
+		
+		if context.user_data.get("current_state") is None:
+			raise AssertionError(f"The state of user {user_id} wasn't restored")
+	
+	return timings
+
+
+async def run_benchmark(db_handler: data_handlers.MySQLDataHandler, first_user_id: int, users_count: int, max_resident_users: int, rehydrated_users_count: int):
+	"""
+    Fills the user_data of users_count users as get_user_context does, evicts all but max_resident_users of them and restores some of the evicted ones, printing the memory and the time of every step.
+
+    Args:
+        db_handler (data_handlers.MySQLDataHandler): The data handler of the database.
+        first_user_id (int): The ID of the first synthetic user.
+        users_count (int): The number of users with user_data in memory before eviction.
+        max_resident_users (int): The number of users kept in memory by the evictor.
+        rehydrated_users_count (int): The number of evicted users restored afterwards.
+	"""
+	abilities = await db_handler.run(db_handler.users_data.get_role_abilities, "moderator")
+	user_data: dict[int, dict] = {}
+	dropped_user_ids: list[int] = []
+	
+	def drop_user_data(user_id: int):
+		user_data.pop(user_id)
+		dropped_user_ids.append(user_id)
+	
+	user_data_evictor = UserDataEvictor(float("inf"), max_resident_users, 60)
+	application = types.SimpleNamespace(
+			running=True,
+			user_data=user_data,
+			update_processor=None,
+			persistence=MySQLPersistence(db_handler, 60),
+			drop_user_data=drop_user_data
+	)
+	
+	tracemalloc.start()
+	empty_memory = get_traced_memory()
+	
+	for user_id in range(first_user_id, first_user_id + users_count):
+		user_data[user_id] = {
+			"role": "moderator",
+			"abilities": abilities,
+			"language": "en",
+			"current_state": ("view_question", user_id),
+			"temp": {"question_id": user_id},
+			"processing": False
+		}
+		user_data_evictor._last_activity[user_id] = time.monotonic()
+	
+	resident_memory = get_traced_memory() - empty_memory
+	print_results(
+			f"{users_count} resident users",
+			{"megabytes": round(resident_memory / 2 ** 20, 1), "bytes_per_user": round(resident_memory / users_count)}
+	)
+	
+	started_at = time.perf_counter()
+	await user_data_evictor.evict_idle_users(application)
+	eviction_time = time.perf_counter() - started_at
+	
+	# The application hands the dropped users to the persistence on its next update of the persistence.
+	for user_id in dropped_user_ids:
+		await application.persistence.drop_user_data(user_id)
+	
+	evicted_memory = get_traced_memory() - empty_memory
+	tracemalloc.stop()
+	print_results(
+			f"after evicting down to {max_resident_users} users",
+			{
+				"megabytes": round(evicted_memory / 2 ** 20, 1),
+				"evicted_users": user_data_evictor.evicted_users_count,
+				"eviction_seconds": round(eviction_time, 3)
+			}
+	)
+	
+	print_results(
+			f"restoring {rehydrated_users_count} evicted users",
+			get_timings_summary(await rehydrate_users(db_handler, list(range(first_user_id, first_user_id + rehydrated_users_count))))
+	)
+
+
+def main():
+	"""
+    Measures the memory of resident user_data with 1M synthetic users, the memory left after eviction and the cost of restoring evicted users from the configured MySQL server.
+	"""
+	parser = create_arguments_parser("Measures the memory of user_data before and after evicting idle users, and the cost of restoring them.")
+	parser.add_argument("--users", type=int, default=1000000, help="The number of synthetic users.")
+	parser.add_argument("--resident", type=int, default=100000, help="The number of users kept in memory after eviction.")
+	parser.add_argument("--rehydrated", type=int, default=1000, help="The number of evicted users restored from the database.")
+	parser.add_argument("--first-user-id", type=int, default=10 ** 12, help="The ID of the first synthetic user.")
+	arguments = parser.parse_args()
+	
+	db_handler = create_db_handler(arguments.database)
+	
+	try:
+		seed_users(
+				db_handler,
+				arguments.first_user_id,
+				arguments.users,
+				"moderator",
+				'{"current_state": ["", null], "temp": {}, "processing": false}'
+		)
+		asyncio.run(run_benchmark(db_handler, arguments.first_user_id, arguments.users, arguments.resident, arguments.rehydrated))
+	finally:
+		db_handler.shutdown_executors()
+
+
+if __name__ == "__main__":
+	main()
\ No newline at end of file
@@ -1,5 +1,7 @@
+import asyncio
 import logging
 from TelegramAnswerBot.functions import build_hidden_files
+from TelegramAnswerBot.errors import DatabaseUnavailableError
 from telegram import (
 	InlineKeyboardButton,
 	InlineKeyboardMarkup,
@@ -8,14 +10,25 @@ from telegram import (
 from TelegramAnswerBot import (
 	data_handlers,
 	functions,
+	objects_types,
 	telegram_handlers
 )
+from TelegramAnswerBot.update_processor import PerUserUpdateProcessor
+from TelegramAnswerBot.answers_dispatcher import AnswersDispatcher
+from TelegramAnswerBot.questions_buffer import QuestionsBuffer
+from TelegramAnswerBot.rate_limiter import RateLimiter
+from TelegramAnswerBot.system_paths import SystemPaths
+from TelegramAnswerBot.persistence import MySQLPersistence
+from TelegramAnswerBot.user_data_evictor import UserDataEvictor
+from TelegramAnswerBot.update_deduplicator import UpdateDeduplicator
 from telegram.ext import (
+	Application,
 	ApplicationBuilder,
 	CallbackQueryHandler,
 	CommandHandler,
 	ContextTypes,
 	MessageHandler,
+	TypeHandler,
 	filters
 )
 
@@ -32,10 +45,16 @@ class AnswerBot:
         settings (dict): settings for database and Telegram API.
         doc (list[str]): Documentation content to be displayed to users.
         db_handler (MySQLDataHandler): Instance for database operations.
+        answers_dispatcher (AnswersDispatcher): Delivers answers from the outbox to the users who asked the questions.
+        questions_buffer (QuestionsBuffer): Inserts the questions asked at the same time in one transaction.
+        rate_limiter (RateLimiter): Limits how often every user and all users together can ask questions.
+        user_data_evictor (UserDataEvictor): Drops the in-memory data of idle users.
+        update_deduplicator (UpdateDeduplicator): Drops updates that were already received.
         users_controls (Users_controls): Controls user management features.
         questions_controls (Questions_controls): Controls question management features.
         FAQs_controls (FAQs_controls): Controls FAQ management features.
         main_controls (Main_controls): Controls main bot functionalities (asking/answering questions and viewing documentation).
+        router (Router): Dispatches callback queries and text messages to the handlers of all features.
     """
 	
 	def __init__(self):
@@ -44,7 +63,41 @@ class AnswerBot:
 		self.doc = functions.read_doc()
 		self.localizations = functions.read_localizations()
 		
-		self.db_handler = data_handlers.MySQLDataHandler(self.settings["MySQL_config"])
+		self.db_handler = data_handlers.MySQLDataHandler(
+				self.settings["MySQL_config"],
+				users_cache_size=self.settings["bot_config"]["users_cache_size"],
+				users_cache_ttl=self.settings["bot_config"]["users_cache_ttl"],
+				max_pool_size=self.settings["bot_config"]["max_pool_size"],
+				pool_wait_timeout=self.settings["bot_config"]["pool_wait_timeout"],
+				pool_idle_timeout=self.settings["bot_config"]["pool_idle_timeout"],
+				analytics_pool_size=self.settings["bot_config"]["analytics_pool_size"],
+				analytics_max_execution_time=self.settings["bot_config"]["analytics_max_execution_time"],
+				replica_pool_config=self.settings["MySQL_replica_config"],
+				replica_sticky_time=self.settings["bot_config"]["replica_sticky_time"],
+				pool_ping_interval=self.settings["bot_config"]["pool_ping_interval"],
+				circuit_breaker_threshold=self.settings["bot_config"]["circuit_breaker_threshold"],
+				circuit_breaker_reset_timeout=self.settings["bot_config"]["circuit_breaker_reset_timeout"],
+				snapshot_interval=self.settings["bot_config"]["snapshot_interval"]
+		)
+		self.answers_dispatcher = AnswersDispatcher(self.db_handler)
+		self.questions_buffer = QuestionsBuffer(
+				self.db_handler,
+				self.settings["bot_config"]["questions_batch_size"],
+				self.settings["bot_config"]["questions_batch_delay"]
+		)
+		self.rate_limiter = RateLimiter(
+				self.settings["bot_config"]["user_questions_per_minute"] / 60,
+				self.settings["bot_config"]["user_questions_burst"],
+				self.settings["bot_config"]["global_questions_per_second"],
+				self.settings["bot_config"]["global_questions_burst"],
+				SystemPaths.rate_limits if self.settings["bot_config"]["persist_rate_limits"] else None
+		)
+		self.user_data_evictor = UserDataEvictor(
+				self.settings["bot_config"]["user_data_idle_timeout"],
+				self.settings["bot_config"]["max_resident_users"],
+				self.settings["bot_config"]["user_data_eviction_interval"]
+		)
+		self.update_deduplicator = UpdateDeduplicator(self.settings["bot_config"]["update_deduplication_ttl"])
 		
 		self.users_controls = telegram_handlers.users.Users_controls(
 				self.start,
@@ -78,16 +131,23 @@ class AnswerBot:
 				self.localizations["main"],
 				self.localizations["others"],
 				self.localizations["languages"],
-				self.doc
+				self.doc,
+				self.answers_dispatcher,
+				self.questions_buffer,
+				self.rate_limiter
 		)
+		
+		self.router = telegram_handlers.routing.Router(self.get_callback_query_routes(), self.get_message_routes())
 	
-	def get_user_context(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+	async def get_user_context(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
 		"""
         Retrieves and sets user context data, including role and abilities.
 
         This function fetches user role and abilities from the database and updates the context with this information.
         It also handles loading additional user-specific data if the user has a role other than "user".
+        Users without a role only get their language loaded from the 'askers' table; nothing is written for them.
         This includes handling the addition of chat_id to the database.
+        While the database is unavailable, users whose role isn't known yet get the abilities of askers from the snapshot; the role isn't stored, so it is looked up again on their next update.
 
         Args:
              update (Update): The Telegram update object.
@@ -96,20 +156,26 @@ class AnswerBot:
 		if not context.user_data.get("role", False):
 			user = update.effective_user
 		
-			context.user_data["role"], initialized = self.db_handler.users_data.get_user_role(user.username)
-			context.user_data["abilities"] = self.db_handler.users_data.get_role_abilities(context.user_data["role"])
+			try:
+				role, initialized = await self.db_handler.run(self.db_handler.users_data.get_user_role, user.id, user.username)
+			except DatabaseUnavailableError:
+				context.user_data["abilities"] = await self.db_handler.run(self.db_handler.users_data.get_role_abilities, "user")
+				context.user_data.setdefault("language", None)
+				return
+		
+			context.user_data["role"] = role
+			context.user_data["abilities"] = await self.db_handler.run(self.db_handler.users_data.get_role_abilities, context.user_data["role"])
 		
 			if initialized:
-				context.user_data["language"] = self.db_handler.users_data.get_user_language(user.username)
+				context.user_data["language"] = await self.db_handler.run(self.db_handler.users_data.get_user_language, user.id)
 		
-				for key, value in self.db_handler.users_data.get_user_data(user.username)["user_context_data"].items():
+				for key, value in (await self.db_handler.run(self.db_handler.users_data.get_user_data, user.id)).user_context_data.items():
 					context.user_data[key] = value
 			else:
-				self.db_handler.users_data.add_user(user.username, context.user_data["role"])
+				context.user_data["language"] = await self.db_handler.run(self.db_handler.askers_data.get_asker_language, user.id)
 		
-			if context.user_data["abilities"]["receives_messages"]:
-				if self.db_handler.users_data.get_user_chat_id(user.username) is None:
-					self.db_handler.users_data.add_user_chat_id(user.username, update.effective_chat.id)
+			if context.user_data["abilities"].receives_messages:
+				await self.db_handler.run(self.db_handler.users_data.add_user_chat_id, user.id, update.effective_chat.id)
 	
 	async def start(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
 		"""
@@ -119,23 +185,22 @@ class AnswerBot:
             update (Update): The Telegram update object.
             context (ContextTypes.DEFAULT_TYPE): The Telegram context object.
         """
-		self.get_user_context(update, context)
+		await self.get_user_context(update, context)
 		language = functions.get_language(context)
 		context.user_data["temp"] = {}
 		
 		if language is None:
-			self.db_handler.users_data.update_last_state(
-					update.effective_user.username,
+			functions.set_current_state(
+					context,
 					"needed_language",
-					context.user_data.get("current_state", (None, None))[1],
-					context
+					context.user_data.get("current_state", (None, None))[1]
 			)
 			await self.main_controls.handle.view_languages_group(update, context)
 			return
 		
 		keyboard = []
 		
-		if context.user_data["abilities"]["able_to_faqs_handle"]:
+		if context.user_data["abilities"].able_to_faqs_handle:
 			keyboard.append(
 					[
 						InlineKeyboardButton(
@@ -145,7 +210,7 @@ class AnswerBot:
 					]
 			)
 		
-		if context.user_data["abilities"]["able_to_faqs_view"]:
+		if context.user_data["abilities"].able_to_faqs_view:
 			keyboard.append(
 					[
 						InlineKeyboardButton(
@@ -155,7 +220,7 @@ class AnswerBot:
 					]
 			)
 		
-		if context.user_data["abilities"]["able_to_questions_handle"]:
+		if context.user_data["abilities"].able_to_questions_handle:
 			keyboard.append(
 					[
 						InlineKeyboardButton(
@@ -165,7 +230,7 @@ class AnswerBot:
 					]
 			)
 		
-		if context.user_data["abilities"]["able_to_questions_view"]:
+		if context.user_data["abilities"].able_to_questions_view:
 			keyboard.append(
 					[
 						InlineKeyboardButton(
@@ -175,7 +240,7 @@ class AnswerBot:
 					]
 			)
 		
-		if context.user_data["abilities"]["able_to_users_handle"]:
+		if context.user_data["abilities"].able_to_users_handle:
 			keyboard.append(
 					[
 						InlineKeyboardButton(
@@ -185,7 +250,7 @@ class AnswerBot:
 					]
 			)
 		
-		if context.user_data["abilities"]["able_to_users_view"]:
+		if context.user_data["abilities"].able_to_users_view:
 			keyboard.append(
 					[
 						InlineKeyboardButton(
@@ -195,7 +260,7 @@ class AnswerBot:
 					]
 			)
 		
-		if context.user_data["abilities"]["able_to_ask"]:
+		if context.user_data["abilities"].able_to_ask:
 			keyboard.append(
 					[
 						InlineKeyboardButton(
@@ -205,7 +270,7 @@ class AnswerBot:
 					]
 			)
 		
-		if context.user_data["abilities"]["able_to_answer"]:
+		if context.user_data["abilities"].able_to_answer:
 			keyboard.append(
 					[
 						InlineKeyboardButton(
@@ -235,77 +300,158 @@ class AnswerBot:
 				reply_markup=reply_markup
 		)
 		
-		self.db_handler.users_data.update_last_state(update.effective_user.username, "start", message.message_id, context)
+		functions.set_current_state(context, "start", message.message_id)
 	
 	async def handle_message(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
 		"""
         Handles incoming text messages from users.
 
-        Delegates message handling to the appropriate control class based on the current state.
+        Delegates message handling to the handler routed by the current state.
 
         Args:
             update (Update): The Telegram update object.
             context (ContextTypes.DEFAULT_TYPE): The Telegram context object.
         """
-		self.get_user_context(update, context)
-		current_state = functions.get_current_state(context)
-		
-		if current_state[0] == telegram_handlers.main.StateFlags.ask_question:
-			await self.main_controls.message.input_question(update, context)
-		elif current_state[0] == telegram_handlers.main.StateFlags.reply_to_question:
-			await self.main_controls.message.input_answer(update, context)
-		elif current_state[0] == telegram_handlers.questions.StateFlags.view_questions_list:
-			await self.questions_controls.message.input_number_of_questions_to_view(update, context)
-		elif current_state[0] == telegram_handlers.users.StateFlags.chose_user_to_add_role:
-			await self.users_controls.message.input_username_to_add_role(update, context)
-		elif current_state[0] == telegram_handlers.users.StateFlags.remove_user_role:
-			await self.users_controls.message.input_username_to_remove_role(update, context)
-		elif current_state[0] == telegram_handlers.FAQs.StateFlags.add_faq:
-			await self.FAQs_controls.message.input_faq_text(update, context)
-		elif current_state[0] == telegram_handlers.FAQs.StateFlags.input_faq_text:
-			await self.FAQs_controls.message.input_faq_answer(update, context)
-		elif current_state[0] == telegram_handlers.FAQs.StateFlags.remove_faq:
-			await self.FAQs_controls.message.input_faq_id_to_delete(update, context)
-		elif current_state[0] == telegram_handlers.FAQs.StateFlags.edit_faq:
-			await self.FAQs_controls.message.input_faq_id_to_edit(update, context)
-		elif current_state[0] in [
-			telegram_handlers.FAQs.StateFlags.edit_faq_text,
-			telegram_handlers.FAQs.StateFlags.edit_faq_answer
-		]:
-			await self.FAQs_controls.message.input_faq_instance_to_edit(update, context)
+		await self.get_user_context(update, context)
+		handler = self.router.get_message_route(functions.get_current_state(context)[0])
+		
+		if handler is not None:
+			await handler(update, context)
 		
 		if not context.user_data.get("processing", False):
 			await self.start(update, context)
 	
-	def get_callback_query_handlers(self) -> list[CallbackQueryHandler]:
+	async def handle_error(self, update: object, context: ContextTypes.DEFAULT_TYPE):
 		"""
-        Returns a combined list of all callback query handlers.
+        Logs errors raised while handling updates. An unavailable database is logged as one line, since every update needing it fails the same way until it is back.
+
+        Args:
+            update (object): The update that caused the error, if any.
+            context (ContextTypes.DEFAULT_TYPE): The Telegram context object holding the error.
+        """
+		if isinstance(context.error, DatabaseUnavailableError):
+			logging.warning("Update not handled: %s", context.error)
+		else:
+			logging.error("Update handling failed", exc_info=context.error)
+	
+	def get_callback_query_routes(self) -> dict[str, objects_types.update_handler_type]:
+		"""
+        Returns a combined dictionary of all callback query routes.
 
         Returns:
-            list[CallbackQueryHandler]: A list of CallbackQueryHandler instances for all features.
+            dict[str, objects_types.update_handler_type]: A dictionary mapping callback data flags to their handlers for all features.
         """
-		return list(
-				sorted(
-						self.main_controls.get_callback_query_handlers() +
-						self.users_controls.get_callback_query_handlers() +
-						self.questions_controls.get_callback_query_handlers() +
-						self.FAQs_controls.get_callback_query_handlers() +
-						[CallbackQueryHandler(self.start, pattern="start")],
-						key=lambda x: len(x.pattern.pattern),
-						reverse=True
-				)
+		return (
+				self.main_controls.get_callback_query_routes() |
+				self.users_controls.get_callback_query_routes() |
+				self.questions_controls.get_callback_query_routes() |
+				self.FAQs_controls.get_callback_query_routes() |
+				{"start": self.start}
 		)
 	
+	def get_message_routes(self) -> dict[str, objects_types.update_handler_type]:
+		"""
+        Returns a combined dictionary of all text message routes.
+
+        Returns:
+            dict[str, objects_types.update_handler_type]: A dictionary mapping states to their message handlers for all features.
+        """
+		return (
+				self.main_controls.get_message_routes() |
+				self.users_controls.get_message_routes() |
+				self.questions_controls.get_message_routes() |
+				self.FAQs_controls.get_message_routes()
+		)
+	
+	async def post_init(self, application: Application):
+		"""
+        Starts background tasks once the application is initialized.
+
+        Args:
+            application (Application): The initialized application.
+        """
+		self.db_handler.start_health_checks()
+		self.answers_dispatcher.start(application.bot)
+		self.user_data_evictor.start(application)
+	
+	async def post_stop(self, application: Application):
+		"""
+        Stops background tasks once the application is stopped and logs the users cache statistics.
+
+        Args:
+            application (Application): The stopped application.
+        """
+		await self.answers_dispatcher.stop()
+		await self.questions_buffer.stop()
+		self.rate_limiter.save_state()
+		await self.user_data_evictor.stop()
+		self.db_handler.stop_health_checks()
+		
+		logging.info("Users cache: %s", self.db_handler.users_data.profiles_cache.get_stats())
+		logging.info("Rate limits: %s", self.rate_limiter.get_stats())
+		logging.info("Duplicate updates: %s", self.update_deduplicator.get_stats())
+		logging.info("Questions buffer: %s", self.questions_buffer.get_stats())
+		logging.info("Prepared statements: %s", self.db_handler.prepared_statements.get_stats())
+		logging.info("Database retries: %s", self.db_handler.retry_policy.get_stats())
+		logging.info("Connection pool: %s", self.db_handler.connection_pool.get_stats())
+		logging.info("Circuit breaker: %s", self.db_handler.degraded_mode.circuit_breaker.get_stats())
+		logging.info("Degraded mode: %s", self.db_handler.degraded_mode.get_stats())
+		logging.info("Analytics connection pool: %s", self.db_handler.analytics_pool.get_stats())
+		
+		if self.db_handler.replica_pool is not None:
+			logging.info("Replica connection pool: %s", self.db_handler.replica_pool.get_stats())
+			logging.info("Replica routing: %s", self.db_handler.replica_router.get_stats())
+	
+	async def post_shutdown(self, application: Application):
+		"""
+        Stops the database executors once the application is shut down, after the persistence wrote the last user data.
+
+        Args:
+            application (Application): The shut down application.
+        """
+		self.db_handler.shutdown_executors()
+	
 	def run(self):
-		"""Starts the bot's main loop."""
-		application = ApplicationBuilder().token(self.settings["telegram_token"]).build()
-		application.add_handler(CommandHandler("start", self.start))
+		"""
+        Starts the bot's main loop.
+
+        Updates are received either by long polling or by a webhook, depending on the "mode" in the bot config. In both modes incoming updates are put into a bounded queue, so a burst of updates is backpressured instead of growing memory without limit. Updates of different users are processed concurrently, updates of one user in order. Conversation state is written to the database in the background, and the in-memory state of idle users is evicted.
+        """
+		bot_config = self.settings["bot_config"]
 		
-		for handler in self.get_callback_query_handlers():
-			application.add_handler(handler)
+		application_builder = ApplicationBuilder().token(self.settings["telegram_token"])
+		application_builder = application_builder.update_queue(asyncio.Queue(maxsize=bot_config["max_queue_size"]))
+		application_builder = application_builder.concurrent_updates(PerUserUpdateProcessor(bot_config["max_concurrent_updates"]))
+		application_builder = application_builder.persistence(MySQLPersistence(self.db_handler, bot_config["persistence_update_interval"]))
+		application_builder = application_builder.post_init(self.post_init).post_stop(self.post_stop).post_shutdown(self.post_shutdown)
 		
+		if bot_config["bot_api_base_url"]:
+			bot_api_base_url = bot_config["bot_api_base_url"].rstrip("/")
+			
+			application_builder = application_builder.base_url(f"{bot_api_base_url}/bot").base_file_url(f"{bot_api_base_url}/file/bot")
+		
+		application = application_builder.build()
+		application.add_handler(TypeHandler(Update, self.update_deduplicator.check_update), group=-3)
+		application.add_handler(TypeHandler(Update, self.db_handler.replica_router.track_user), group=-2)
+		application.add_handler(TypeHandler(Update, self.user_data_evictor.track_activity), group=-1)
+		application.add_handler(CommandHandler("start", self.start))
+		
+		application.add_handler(CallbackQueryHandler(self.router.route_callback_query))
 		application.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, self.handle_message))
-		application.run_polling()
+		application.add_error_handler(self.handle_error)
+		
+		if bot_config["mode"] == "webhook":
+			application.run_webhook(
+					listen=bot_config["webhook_listen"],
+					port=bot_config["webhook_port"],
+					url_path=bot_config["webhook_path"],
+					webhook_url=bot_config["webhook_url"] or None,
+					secret_token=self.settings["webhook_secret_token"],
+					max_connections=bot_config["webhook_max_connections"],
+					allowed_updates=Update.ALL_TYPES
+			)
+		else:
+			application.run_polling(allowed_updates=Update.ALL_TYPES)
 
 
 logging.basicConfig(
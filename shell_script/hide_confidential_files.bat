@@ -6,4 +6,9 @@ git rm --cached bin/mysql_config.json || (
   exit /b 1
 )
 
+git rm --cached bin/bot_config.json || (
+  echo Error removing bin/bot_config.json
+  exit /b 1
+)
+
 echo Files removed successfully.
\ No newline at end of file
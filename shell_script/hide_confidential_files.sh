@@ -7,4 +7,9 @@ git rm --cached bin/mysql_config.json || {
   exit 1
 }
 
+git rm --cached bin/bot_config.json || {
+  echo "Error removing bin/bot_config.json"
+  exit 1
+}
+
 echo "Files removed successfully."
\ No newline at end of file
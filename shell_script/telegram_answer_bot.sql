@@ -1,146 +1,119 @@
--- MySQL dump 10.13  Distrib 9.1.0, for Win64 (x86_64)
---
--- Host: localhost    Database: telegram_answer_bot
--- ------------------------------------------------------
--- Server version	9.1.0
-
-/*!40101 SET @OLD_CHARACTER_SET_CLIENT=@@CHARACTER_SET_CLIENT */;
-/*!40101 SET @OLD_CHARACTER_SET_RESULTS=@@CHARACTER_SET_RESULTS */;
-/*!40101 SET @OLD_COLLATION_CONNECTION=@@COLLATION_CONNECTION */;
-/*!50503 SET NAMES utf8mb4 */;
-/*!40103 SET @OLD_TIME_ZONE=@@TIME_ZONE */;
-/*!40103 SET TIME_ZONE='+00:00' */;
-/*!40014 SET @OLD_UNIQUE_CHECKS=@@UNIQUE_CHECKS, UNIQUE_CHECKS=0 */;
-/*!40014 SET @OLD_FOREIGN_KEY_CHECKS=@@FOREIGN_KEY_CHECKS, FOREIGN_KEY_CHECKS=0 */;
-/*!40101 SET @OLD_SQL_MODE=@@SQL_MODE, SQL_MODE='NO_AUTO_VALUE_ON_ZERO' */;
-/*!40111 SET @OLD_SQL_NOTES=@@SQL_NOTES, SQL_NOTES=0 */;
-
---
--- Table structure for table `roles`
---
-
-DROP TABLE IF EXISTS `roles`;
-/*!40101 SET @saved_cs_client     = @@character_set_client */;
-/*!50503 SET character_set_client = utf8mb4 */;
-CREATE TABLE `roles` (
-  `role_name` varchar(32) NOT NULL,
-  `role_level` int NOT NULL,
-  `receives_messages` tinyint(1) NOT NULL DEFAULT '0',
-  `able_to_users_handle` tinyint(1) NOT NULL DEFAULT '0',
-  `able_to_users_view` tinyint(1) NOT NULL DEFAULT '0',
-  `able_to_faqs_handle` tinyint(1) NOT NULL DEFAULT '0',
-  `able_to_faqs_view` tinyint(1) NOT NULL DEFAULT '0',
-  `able_to_questions_handle` tinyint(1) NOT NULL DEFAULT '0',
-  `able_to_questions_view` tinyint(1) NOT NULL DEFAULT '0',
-  `able_to_ask` tinyint(1) NOT NULL DEFAULT '0',
-  `able_to_answer` tinyint(1) NOT NULL DEFAULT '0',
-  PRIMARY KEY (`role_name`)
-) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
-/*!40101 SET character_set_client = @saved_cs_client */;
-
---
--- Dumping data for table `roles`
---
-
-LOCK TABLES `roles` WRITE;
-/*!40000 ALTER TABLE `roles` DISABLE KEYS */;
-INSERT INTO `roles` VALUES ('administrator',2,1,1,1,1,1,1,1,0,1),('developer',3,0,1,1,1,1,1,1,1,1),('moderator',1,1,0,1,0,1,0,1,0,1),('user',0,0,0,0,0,1,0,0,1,0);
-/*!40000 ALTER TABLE `roles` ENABLE KEYS */;
-UNLOCK TABLES;
-/*!40103 SET TIME_ZONE=@OLD_TIME_ZONE */;
-
-/*!40101 SET SQL_MODE=@OLD_SQL_MODE */;
-/*!40014 SET FOREIGN_KEY_CHECKS=@OLD_FOREIGN_KEY_CHECKS */;
-/*!40014 SET UNIQUE_CHECKS=@OLD_UNIQUE_CHECKS */;
-/*!40101 SET CHARACTER_SET_CLIENT=@OLD_CHARACTER_SET_CLIENT */;
-/*!40101 SET CHARACTER_SET_RESULTS=@OLD_CHARACTER_SET_RESULTS */;
-/*!40101 SET COLLATION_CONNECTION=@OLD_COLLATION_CONNECTION */;
-/*!40111 SET SQL_NOTES=@OLD_SQL_NOTES */;
-
--- Dump completed on 2025-01-13 14:19:29
--- MySQL dump 10.13  Distrib 9.1.0, for Win64 (x86_64)
---
--- Host: localhost    Database: telegram_answer_bot
--- ------------------------------------------------------
--- Server version	9.1.0
-
-/*!40101 SET @OLD_CHARACTER_SET_CLIENT=@@CHARACTER_SET_CLIENT */;
-/*!40101 SET @OLD_CHARACTER_SET_RESULTS=@@CHARACTER_SET_RESULTS */;
-/*!40101 SET @OLD_COLLATION_CONNECTION=@@COLLATION_CONNECTION */;
-/*!50503 SET NAMES utf8mb4 */;
-/*!40103 SET @OLD_TIME_ZONE=@@TIME_ZONE */;
-/*!40103 SET TIME_ZONE='+00:00' */;
-/*!40014 SET @OLD_UNIQUE_CHECKS=@@UNIQUE_CHECKS, UNIQUE_CHECKS=0 */;
-/*!40014 SET @OLD_FOREIGN_KEY_CHECKS=@@FOREIGN_KEY_CHECKS, FOREIGN_KEY_CHECKS=0 */;
-/*!40101 SET @OLD_SQL_MODE=@@SQL_MODE, SQL_MODE='NO_AUTO_VALUE_ON_ZERO' */;
-/*!40111 SET @OLD_SQL_NOTES=@@SQL_NOTES, SQL_NOTES=0 */;
-
---
--- Table structure for table `questions`
---
-
-DROP TABLE IF EXISTS `questions`;
-/*!40101 SET @saved_cs_client     = @@character_set_client */;
-/*!50503 SET character_set_client = utf8mb4 */;
-CREATE TABLE `questions` (
-  `question_id` int NOT NULL AUTO_INCREMENT,
-  `user_id` bigint NOT NULL,
-  `chat_id` bigint NOT NULL,
-  `message_id` bigint NOT NULL,
-  `username` varchar(64) DEFAULT NULL,
-  `first_name` varchar(64) DEFAULT NULL,
-  `last_name` varchar(64) DEFAULT NULL,
-  `question` text NOT NULL,
-  `asked_date` timestamp NOT NULL DEFAULT CURRENT_TIMESTAMP,
-  `answered_date` timestamp NULL DEFAULT NULL,
-  `status` varchar(32) NOT NULL DEFAULT 'Не обработан',
-  `moderator_username` varchar(64) DEFAULT NULL,
-  PRIMARY KEY (`question_id`)
-) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
-/*!40101 SET character_set_client = @saved_cs_client */;
-
---
--- Table structure for table `users`
---
-
-DROP TABLE IF EXISTS `users`;
-/*!40101 SET @saved_cs_client     = @@character_set_client */;
-/*!50503 SET character_set_client = utf8mb4 */;
-CREATE TABLE `users` (
-  `username` varchar(64) NOT NULL,
-  `role` varchar(32) NOT NULL,
-  `language` varchar(3) DEFAULT NULL,
-  `chat_id` bigint DEFAULT NULL,
-  `user_context_data` json NOT NULL,
-  PRIMARY KEY (`username`),
-  KEY `users_role` (`role`),
-  CONSTRAINT `users_role` FOREIGN KEY (`role`) REFERENCES `roles` (`role_name`) ON DELETE CASCADE ON UPDATE CASCADE
-) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
-/*!40101 SET character_set_client = @saved_cs_client */;
-
---
--- Table structure for table `faq`
---
-
-DROP TABLE IF EXISTS `faq`;
-/*!40101 SET @saved_cs_client     = @@character_set_client */;
-/*!50503 SET character_set_client = utf8mb4 */;
-CREATE TABLE `faq` (
-  `faq_id` int NOT NULL AUTO_INCREMENT,
-  `question` text NOT NULL,
-  `answer` text NOT NULL,
-  `views_count` int NOT NULL DEFAULT '0',
-  PRIMARY KEY (`faq_id`)
-) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
-/*!40101 SET character_set_client = @saved_cs_client */;
-/*!40103 SET TIME_ZONE=@OLD_TIME_ZONE */;
-
-/*!40101 SET SQL_MODE=@OLD_SQL_MODE */;
-/*!40014 SET FOREIGN_KEY_CHECKS=@OLD_FOREIGN_KEY_CHECKS */;
-/*!40014 SET UNIQUE_CHECKS=@OLD_UNIQUE_CHECKS */;
-/*!40101 SET CHARACTER_SET_CLIENT=@OLD_CHARACTER_SET_CLIENT */;
-/*!40101 SET CHARACTER_SET_RESULTS=@OLD_CHARACTER_SET_RESULTS */;
-/*!40101 SET COLLATION_CONNECTION=@OLD_COLLATION_CONNECTION */;
-/*!40111 SET SQL_NOTES=@OLD_SQL_NOTES */;
-
--- Dump completed on 2025-01-13 14:19:29
+-- Generated by `python -m TelegramAnswerBot.data_handlers > shell_script/telegram_answer_bot.sql` from TelegramAnswerBot/data_handlers/migrations.py. Don't edit by hand.
+
+CREATE TABLE IF NOT EXISTS schema_version (
+	version INTEGER NOT NULL,
+	description VARCHAR(255) NOT NULL,
+	applied_date TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+	PRIMARY KEY (`version`)
+);
+
+CREATE TABLE IF NOT EXISTS roles (
+	role_name VARCHAR(32) NOT NULL,
+	role_level INTEGER NOT NULL,
+	receives_messages TINYINT(1) NOT NULL,
+	able_to_users_handle TINYINT(1) NOT NULL,
+	able_to_users_view TINYINT(1) NOT NULL,
+	able_to_faqs_handle TINYINT(1) NOT NULL,
+	able_to_faqs_view TINYINT(1) NOT NULL,
+	able_to_questions_handle TINYINT(1) NOT NULL,
+	able_to_questions_view TINYINT(1) NOT NULL,
+	able_to_ask TINYINT(1) NOT NULL,
+	able_to_answer TINYINT(1) NOT NULL,
+	PRIMARY KEY (`role_name`)
+);
+
+INSERT IGNORE INTO roles VALUES
+	('administrator', 2, 1, 1, 1, 1, 1, 1, 1, 0, 1),
+	('developer', 3, 0, 1, 1, 1, 1, 1, 1, 1, 1),
+	('moderator', 1, 1, 0, 1, 0, 1, 0, 1, 0, 1),
+	('user', 0, 0, 0, 0, 0, 1, 0, 0, 1, 0);
+
+CREATE TABLE IF NOT EXISTS askers (
+	user_id BIGINT NOT NULL,
+	username VARCHAR(64) DEFAULT NULL,
+	language VARCHAR(2) DEFAULT NULL,
+	PRIMARY KEY (`user_id`),
+	KEY `askers_username` (`username`)
+);
+
+CREATE TABLE IF NOT EXISTS users (
+	user_id BIGINT NOT NULL,
+	username VARCHAR(64) DEFAULT NULL,
+	role VARCHAR(32) NOT NULL,
+	chat_id BIGINT DEFAULT NULL,
+	language VARCHAR(2) DEFAULT NULL,
+	user_context_data JSON NOT NULL,
+	PRIMARY KEY (`user_id`),
+	KEY `users_username` (`username`),
+	KEY `users_role` (`role`),
+	CONSTRAINT `users_role` FOREIGN KEY (`role`) REFERENCES `roles` (`role_name`) ON DELETE CASCADE ON UPDATE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS pending_roles (
+	username VARCHAR(64) NOT NULL,
+	role VARCHAR(32) NOT NULL,
+	PRIMARY KEY (`username`),
+	KEY `pending_roles_role` (`role`),
+	CONSTRAINT `pending_roles_role` FOREIGN KEY (`role`) REFERENCES `roles` (`role_name`) ON DELETE CASCADE ON UPDATE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS questions (
+	question_id INTEGER AUTO_INCREMENT,
+	user_id BIGINT NOT NULL,
+	chat_id BIGINT NOT NULL,
+	message_id BIGINT NOT NULL,
+	username VARCHAR(64),
+	first_name VARCHAR(64),
+	last_name VARCHAR(64),
+	question TEXT NOT NULL,
+	asked_date TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+	answered_date TIMESTAMP DEFAULT NULL,
+	status VARCHAR(32) NOT NULL DEFAULT "unprocessed",
+	moderator_id BIGINT DEFAULT NULL,
+	moderator_username VARCHAR(64),
+	PRIMARY KEY (`question_id`),
+	KEY `questions_moderator_id` (`moderator_id`)
+);
+
+CREATE TABLE IF NOT EXISTS faq (
+	faq_id INTEGER AUTO_INCREMENT,
+	question TEXT NOT NULL,
+	answer TEXT NOT NULL,
+	views_count INTEGER DEFAULT 0,
+	PRIMARY KEY (`faq_id`)
+);
+
+CREATE TABLE IF NOT EXISTS answers_outbox (
+	answer_id INTEGER AUTO_INCREMENT,
+	question_id INTEGER NOT NULL,
+	chat_id BIGINT NOT NULL,
+	reply_to_message_id BIGINT,
+	answer TEXT NOT NULL,
+	fallback_answer TEXT NOT NULL,
+	status VARCHAR(32) NOT NULL DEFAULT "pending",
+	attempts INTEGER NOT NULL DEFAULT 0,
+	last_error TEXT,
+	created_date TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+	next_attempt_date TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+	delivered_date TIMESTAMP DEFAULT NULL,
+	PRIMARY KEY (`answer_id`),
+	INDEX `status_next_attempt_date` (`status`, `next_attempt_date`)
+);
+
+INSERT IGNORE INTO schema_version (version, description) VALUES (1, 'Initial schema');
+
+DELETE
+	duplicate
+FROM
+	questions AS duplicate
+JOIN
+	questions AS original
+ON
+	original.chat_id = duplicate.chat_id
+	AND original.message_id = duplicate.message_id
+	AND original.question_id < duplicate.question_id;
+
+ALTER TABLE questions
+	ADD UNIQUE KEY `questions_chat_id_message_id` (`chat_id`, `message_id`);
+
+INSERT IGNORE INTO schema_version (version, description) VALUES (2, 'Unique questions messages');
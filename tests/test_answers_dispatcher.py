@@ -0,0 +1,98 @@
+import asyncio
+from telegram.error import (
+	BadRequest,
+	Forbidden,
+	NetworkError
+)
+from TelegramAnswerBot.objects_types import OutboxAnswerRow
+from TelegramAnswerBot.answers_dispatcher import AnswersDispatcher
+
+
+class FakeOutbox:
+	"""Records the results of deliveries and hands out the pending answers once."""
+	
+	def __init__(self, answers: list[OutboxAnswerRow]):
+		self.answers = answers
+		self.delivered = []
+		self.failed = []
+		self.rescheduled = []
+	
+	def get_pending_answers(self, limit: int) -> list[OutboxAnswerRow]:
+		answers, self.answers = self.answers[:limit], self.answers[limit:]
+		return answers
+	
+	def mark_answer_delivered(self, answer_id: int):
+		self.delivered.append(answer_id)
+	
+	def mark_answer_failed(self, answer_id: int, error: str):
+		self.failed.append(answer_id)
+	
+	def reschedule_answer(self, answer_id: int, delay: int, error: str):
+		self.rescheduled.append((answer_id, delay))
+
+
+class FakeDataHandler:
+	def __init__(self, answers: list[OutboxAnswerRow]):
+		self.answers_outbox = FakeOutbox(answers)
+	
+	async def run(self, function, *args):
+		return await asyncio.to_thread(function, *args)
+
+
+class FakeBot:
+	"""Raises the error set for a chat on every message sent to it."""
+	
+	def __init__(self, errors: dict[int, Exception]):
+		self.errors = errors
+		self.sent = []
+	
+	async def send_message(self, chat_id: int, text: str, reply_to_message_id: int = None):
+		if chat_id in self.errors:
+			raise self.errors[chat_id]
+		
+		self.sent.append((chat_id, text))
+
+
+def make_answer(answer_id: int, chat_id: int, attempts: int = 0) -> OutboxAnswerRow:
+	return OutboxAnswerRow(answer_id, answer_id, chat_id, None, "answer", "fallback answer", attempts)
+
+
+def test_blocked_chat_is_marked_failed_and_later_answers_are_delivered():
+	db_handler = FakeDataHandler([make_answer(1, 10), make_answer(2, 20)])
+	bot = FakeBot({10: Forbidden("Forbidden: bot was blocked by the user")})
+	
+	asyncio.run(AnswersDispatcher(db_handler).deliver_pending_answers(bot))
+	
+	assert db_handler.answers_outbox.failed == [1]
+	assert db_handler.answers_outbox.delivered == [2]
+	assert bot.sent == [(20, "fallback answer")]
+
+
+def test_bad_request_on_fallback_is_marked_failed():
+	db_handler = FakeDataHandler([make_answer(1, 10)])
+	bot = FakeBot({10: BadRequest("Chat not found")})
+	
+	asyncio.run(AnswersDispatcher(db_handler).deliver_pending_answers(bot))
+	
+	assert db_handler.answers_outbox.failed == [1]
+	assert db_handler.answers_outbox.delivered == []
+
+
+def test_transient_error_is_rescheduled_with_backoff():
+	db_handler = FakeDataHandler([make_answer(1, 10, attempts=2)])
+	bot = FakeBot({10: NetworkError("Timed out")})
+	
+	asyncio.run(AnswersDispatcher(db_handler, base_delay=5).deliver_pending_answers(bot))
+	
+	assert db_handler.answers_outbox.rescheduled == [(1, 20)]
+	assert db_handler.answers_outbox.failed == []
+
+
+def test_transient_error_is_marked_failed_after_max_attempts():
+	db_handler = FakeDataHandler([make_answer(1, 10, attempts=9), make_answer(2, 20)])
+	bot = FakeBot({10: NetworkError("Timed out")})
+	
+	asyncio.run(AnswersDispatcher(db_handler, max_attempts=10).deliver_pending_answers(bot))
+	
+	assert db_handler.answers_outbox.failed == [1]
+	assert db_handler.answers_outbox.delivered == [2]
\ No newline at end of file
@@ -0,0 +1,84 @@
+import time
+import types
+import pytest
+import mysql.connector
+from mysql.connector.errors import PoolError
+from TelegramAnswerBot.errors import DatabaseUnavailableError
+from TelegramAnswerBot.data_handlers.base import DataHandler
+from TelegramAnswerBot.data_handlers.breaker import CircuitBreaker
+
+
+class FailingPool:
+	"""A pool whose every checkout raises the same error."""
+	
+	def __init__(self, error: Exception):
+		self.error = error
+	
+	def get_connection(self):
+		raise self.error
+
+
+def make_data_handler(error: Exception, circuit_breaker: CircuitBreaker) -> DataHandler:
+	return DataHandler(FailingPool(error), degraded_mode=types.SimpleNamespace(circuit_breaker=circuit_breaker))
+
+
+def test_lost_connections_open_the_breaker():
+	circuit_breaker = CircuitBreaker(3, 30)
+	
+	for _ in range(3):
+		circuit_breaker.before_call()
+		circuit_breaker.record_result(False)
+	
+	with pytest.raises(DatabaseUnavailableError):
+		circuit_breaker.before_call()
+
+
+def test_answered_probe_closes_the_breaker_and_notifies():
+	circuit_breaker = CircuitBreaker(1, 0.01)
+	closed = []
+	circuit_breaker.on_close = lambda: closed.append(True)
+	circuit_breaker.record_result(False)
+	time.sleep(0.02)
+	
+	circuit_breaker.before_call()
+	
+	with pytest.raises(DatabaseUnavailableError):
+		circuit_breaker.before_call()
+	
+	circuit_breaker.record_result(True)
+	
+	assert circuit_breaker.is_closed()
+	assert closed == [True]
+
+
+def test_silent_probe_is_replaced_after_reset_timeout():
+	circuit_breaker = CircuitBreaker(1, 0.01)
+	circuit_breaker.record_result(False)
+	time.sleep(0.02)
+	circuit_breaker.before_call()
+	time.sleep(0.02)
+	
+	circuit_breaker.before_call()
+	
+	assert circuit_breaker.state == "half_open"
+
+
+def test_pool_wait_timeout_leaves_the_breaker_closed():
+	circuit_breaker = CircuitBreaker(1, 30)
+	data_handler = make_data_handler(PoolError("Failed getting connection from pool 'test' within 5 seconds"), circuit_breaker)
+	
+	for _ in range(3):
+		with pytest.raises(PoolError):
+			data_handler.get_connection()
+	
+	assert circuit_breaker.is_closed()
+
+
+def test_unreachable_server_opens_the_breaker():
+	circuit_breaker = CircuitBreaker(1, 30)
+	data_handler = make_data_handler(mysql.connector.errors.InterfaceError("Can't connect to MySQL server", errno=2003), circuit_breaker)
+	
+	with pytest.raises(DatabaseUnavailableError):
+		data_handler.get_connection()
+	
+	assert not circuit_breaker.is_closed()
\ No newline at end of file
@@ -0,0 +1,31 @@
+import time
+import types
+import asyncio
+import concurrent.futures
+from TelegramAnswerBot.data_handlers import MySQLDataHandler
+from TelegramAnswerBot.data_handlers.replica import current_user_id
+
+
+def test_run_keeps_the_loop_free_and_the_current_user():
+	db_handler = types.SimpleNamespace(executor=concurrent.futures.ThreadPoolExecutor(2))
+	
+	def slow_query() -> int:
+		time.sleep(0.1)
+		return current_user_id.get()
+	
+	async def main() -> tuple[int, int]:
+		ticks = 0
+		current_user_id.set(42)
+		query = asyncio.create_task(MySQLDataHandler.run(db_handler, slow_query))
+		
+		while not query.done():
+			ticks += 1
+			await asyncio.sleep(0.01)
+		
+		return query.result(), ticks
+	
+	user_id, ticks = asyncio.run(main())
+	db_handler.executor.shutdown()
+	
+	assert user_id == 42
+	assert ticks >= 5
\ No newline at end of file
@@ -0,0 +1,103 @@
+import typing
+import types
+import pytest
+from mysql.connector import errorcode
+from mysql.connector.errors import ProgrammingError
+from TelegramAnswerBot.data_handlers import migrations
+from TelegramAnswerBot.data_handlers.migrations import (
+	Migration,
+	run_migrations
+)
+
+
+class FakeDatabase:
+	"""Keeps the applied versions and the executed statements of a database, with or without the 'schema_version' table."""
+	
+	def __init__(self, versions: typing.Optional[list[int]] = None):
+		self.versions = versions
+		self.statements = []
+		self.commits = 0
+	
+	def get_connection(self):
+		return types.SimpleNamespace(cursor=lambda: FakeCursor(self), commit=self.commit, close=lambda: None)
+	
+	def commit(self):
+		self.commits += 1
+
+
+class FakeCursor:
+	"""Answers the queries of run_migrations and records all other statements."""
+	
+	def __init__(self, database: FakeDatabase):
+		self.database = database
+		self.result = None
+	
+	def execute(self, query: str, params: tuple = ()):
+		self.database.statements.append(query)
+		
+		if "MAX(version)" in query:
+			if self.database.versions is None:
+				raise ProgrammingError(errno=errorcode.ER_NO_SUCH_TABLE)
+			
+			self.result = [(max(self.database.versions, default=None),)]
+		elif "GET_LOCK" in query or "RELEASE_LOCK" in query:
+			self.result = [(1,)]
+		elif query == migrations.SCHEMA_VERSION_TABLE:
+			self.database.versions = self.database.versions or []
+		elif query.startswith("INSERT INTO schema_version"):
+			self.database.versions.append(params[0])
+		elif query == "ADD EXISTING INDEX":
+			raise ProgrammingError(errno=errorcode.ER_DUP_KEYNAME)
+	
+	def fetchone(self) -> tuple:
+		return self.result[0]
+	
+	def fetchall(self) -> list[tuple]:
+		return self.result
+	
+	def close(self):
+		pass
+
+
+@pytest.fixture
+def test_migrations(monkeypatch) -> list[Migration]:
+	test_migrations = [
+		Migration(1, "First", ("CREATE FIRST",)),
+		Migration(2, "Second", ("ADD EXISTING INDEX", "CREATE SECOND")),
+		Migration(3, "Third", ("CREATE THIRD",))
+	]
+	monkeypatch.setattr(migrations, "MIGRATIONS", test_migrations)
+	
+	return test_migrations
+
+
+def get_migration_statements(database: FakeDatabase) -> list[str]:
+	return [statement for statement in database.statements if statement.startswith("CREATE ") and statement != migrations.SCHEMA_VERSION_TABLE]
+
+
+def test_pending_migrations_are_applied_in_order_once(test_migrations):
+	database = FakeDatabase()
+	
+	assert run_migrations(database) == test_migrations
+	assert database.versions == [1, 2, 3]
+	assert get_migration_statements(database) == ["CREATE FIRST", "CREATE SECOND", "CREATE THIRD"]
+	assert database.commits == 3
+	
+	database.statements.clear()
+	
+	assert run_migrations(database) == []
+	assert database.statements == ["SELECT MAX(version) FROM schema_version"]
+
+
+def test_only_migrations_above_the_schema_version_are_applied(test_migrations):
+	database = FakeDatabase([1])
+	
+	assert run_migrations(database) == test_migrations[1:]
+	assert database.versions == [1, 2, 3]
+	assert get_migration_statements(database) == ["CREATE SECOND", "CREATE THIRD"]
+
+
+def test_shipped_migrations_have_ascending_versions():
+	versions = [migration.version for migration in migrations.MIGRATIONS]
+	
+	assert versions == sorted(set(versions))
\ No newline at end of file
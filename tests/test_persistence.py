@@ -0,0 +1,112 @@
+import types
+import asyncio
+from TelegramAnswerBot.persistence import MySQLPersistence
+from TelegramAnswerBot.data_handlers.users import UsersDataHandler
+
+
+class FakeUsersData:
+	"""Records the batches of context data, failing the first `failures` of them."""
+	
+	def __init__(self, failures: int = 0):
+		self.batches = []
+		self.failures = failures
+	
+	def update_users_context_data(self, users_context_data: list):
+		if self.failures:
+			self.failures -= 1
+			raise ConnectionError("lost connection")
+		
+		self.batches.append(dict(users_context_data))
+
+
+class FakeCursor:
+	"""Records the statements and parameters sent through executemany."""
+	
+	def __init__(self, statements: list):
+		self.statements = statements
+	
+	def executemany(self, query: str, params: list):
+		self.statements.append((query, params))
+	
+	def close(self):
+		pass
+
+
+class FakePool:
+	"""A pool handing out connections that record statements and count commits."""
+	
+	def __init__(self):
+		self.statements = []
+		self.commits = 0
+	
+	def get_connection(self):
+		return types.SimpleNamespace(
+				in_transaction=False,
+				cursor=lambda: FakeCursor(self.statements),
+				commit=self.commit,
+				close=lambda: None
+		)
+	
+	def commit(self):
+		self.commits += 1
+
+
+def make_persistence(users_data: FakeUsersData) -> MySQLPersistence:
+	async def run(function, *args):
+		return function(*args)
+	
+	return MySQLPersistence(types.SimpleNamespace(run=run, users_data=users_data), 60)
+
+
+def test_touched_users_are_written_in_one_batch_without_askers():
+	users_data = FakeUsersData()
+	persistence = make_persistence(users_data)
+	
+	async def main():
+		await persistence.update_user_data(1, {"role": "admin", "current_state": ("menu", None), "language": "en"})
+		await persistence.update_user_data(2, {"role": "moderator", "processing": True})
+		await persistence.update_user_data(3, {"role": "user", "current_state": ("ask", None)})
+		await asyncio.gather(*persistence._write_tasks)
+	
+	asyncio.run(main())
+	
+	assert users_data.batches == [
+		{
+			1: {"current_state": ("menu", None), "temp": {}, "processing": False},
+			2: {"current_state": ("", None), "temp": {}, "processing": True}
+		}
+	]
+
+
+def test_failed_write_keeps_users_dirty_until_flush():
+	users_data = FakeUsersData(failures=1)
+	persistence = make_persistence(users_data)
+	
+	async def main():
+		await persistence.update_user_data(1, {"role": "admin", "processing": True})
+		await asyncio.gather(*persistence._write_tasks)
+		await persistence.flush()
+	
+	asyncio.run(main())
+	
+	assert users_data.batches == [{1: {"current_state": ("", None), "temp": {}, "processing": True}}]
+
+
+def test_only_changed_keys_are_sent_and_unchanged_users_skipped():
+	pool = FakePool()
+	users_data = UsersDataHandler(pool, None, None, None, None, 0, 300)
+	users_data.persisted_context_data = {1: {"current_state": ["menu", None], "temp": {}, "processing": False}}
+	
+	users_data.update_users_context_data(
+			[
+				(1, {"current_state": ("menu", None), "temp": {}, "processing": True}),
+				(2, {"current_state": ("menu", None), "temp": {}, "processing": False})
+			]
+	)
+	users_data.update_users_context_data([(1, {"current_state": ("menu", None), "temp": {}, "processing": True})])
+	
+	assert pool.commits == 1
+	assert [params for _, params in pool.statements] == [
+		[("$.processing", "true", 1)],
+		[("$.current_state", '["menu", null]', "$.processing", "false", "$.temp", "{}", 2)]
+	]
\ No newline at end of file
@@ -0,0 +1,98 @@
+import time
+import pytest
+import mysql.connector
+from TelegramAnswerBot.data_handlers import pool
+
+
+class FakeConnection:
+	"""A connection that counts pings and can be broken like by a server restart."""
+	
+	def __init__(self):
+		self.alive = True
+		self.pings = 0
+		self.reconnects = 0
+	
+	def is_connected(self) -> bool:
+		self.pings += 1
+		return self.alive
+	
+	def reconnect(self):
+		self.reconnects += 1
+		self.alive = True
+	
+	def close(self):
+		pass
+	
+	def cursor(self) -> "FakeCursor":
+		return FakeCursor(self)
+
+
+class FakeCursor:
+	"""A cursor whose queries lose the connection while it is broken."""
+	
+	def __init__(self, cnx: FakeConnection):
+		self.cnx = cnx
+	
+	def execute(self, query: str, params: tuple = ()):
+		if not self.cnx.alive:
+			raise mysql.connector.errors.OperationalError("Lost connection to MySQL server during query", errno=2013)
+	
+	def close(self):
+		pass
+
+
+def make_pool(monkeypatch, ping_interval: float) -> pool.ElasticConnectionPool:
+	monkeypatch.setattr(pool.mysql.connector, "connect", lambda **config: FakeConnection())
+	
+	return pool.ElasticConnectionPool("test", 1, 1, 1, 300, ping_interval)
+
+
+def test_busy_connection_is_pinged_every_ping_interval(monkeypatch):
+	connection_pool = make_pool(monkeypatch, 0.05)
+	connection = connection_pool.get_connection()
+	cnx = connection._cnx
+	connection.close()
+	
+	cnx.alive = False
+	deadline = time.monotonic() + 0.2
+	
+	while time.monotonic() < deadline:
+		connection_pool.get_connection().close()
+		time.sleep(0.01)
+	
+	assert cnx.reconnects == 1
+	assert 2 <= cnx.pings <= 5
+
+
+def test_connection_marked_unchecked_is_pinged_on_next_checkout(monkeypatch):
+	connection_pool = make_pool(monkeypatch, 60)
+	connection = connection_pool.get_connection()
+	cnx = connection._cnx
+	cnx.alive = False
+	connection.checked_at = 0
+	connection.close()
+	
+	connection_pool.get_connection().close()
+	
+	assert cnx.reconnects == 1
+	assert connection_pool.get_stats()["replaced"] == 1
+
+
+def test_query_results_are_reported_and_lost_connection_is_pinged(monkeypatch):
+	connection_pool = make_pool(monkeypatch, 60)
+	results = []
+	connection_pool.on_query_result = results.append
+	
+	connection = connection_pool.get_connection()
+	cnx = connection._cnx
+	connection.cursor().execute("SELECT 1")
+	cnx.alive = False
+	
+	with pytest.raises(mysql.connector.errors.OperationalError):
+		connection.cursor().execute("SELECT 1")
+	
+	connection.close()
+	connection_pool.get_connection().close()
+	
+	assert results == [True, False]
+	assert cnx.reconnects == 1
\ No newline at end of file
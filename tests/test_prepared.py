@@ -0,0 +1,42 @@
+from TelegramAnswerBot.data_handlers.pool import PooledConnection
+from TelegramAnswerBot.data_handlers.prepared import (
+	PreparedStatementsRegistry,
+	skip_statement_reset
+)
+
+
+class FakeConnection:
+	"""A raw connection handing out prepared cursors."""
+	
+	def __init__(self, connection_id: int):
+		self.connection_id = connection_id
+		self.cursors = []
+	
+	def cursor(self, prepared: bool = False):
+		self.cursors.append(object())
+		return self.cursors[-1]
+
+
+def test_statement_is_prepared_once_and_reused_without_reset():
+	registry = PreparedStatementsRegistry()
+	raw_connection = FakeConnection(1)
+	
+	first_cursor, first_query = registry.get_cursor(PooledConnection(None, raw_connection, 0), "".join(("SELECT ", "1")))
+	second_cursor, second_query = registry.get_cursor(PooledConnection(None, raw_connection, 0), "SELECT 1")
+	
+	assert first_cursor._cursor is second_cursor._cursor
+	assert first_query is second_query
+	assert raw_connection.cmd_stmt_reset is skip_statement_reset
+	assert registry.get_stats() == {"statements": 1, "prepared": 1, "reused": 1}
+
+
+def test_statements_are_prepared_again_after_reconnect():
+	registry = PreparedStatementsRegistry()
+	raw_connection = FakeConnection(1)
+	first_cursor, _ = registry.get_cursor(PooledConnection(None, raw_connection, 0), "SELECT 1")
+	
+	raw_connection.connection_id = 2
+	second_cursor, _ = registry.get_cursor(PooledConnection(None, raw_connection, 0), "SELECT 1")
+	
+	assert first_cursor._cursor is not second_cursor._cursor
+	assert registry.get_stats() == {"statements": 1, "prepared": 2, "reused": 0}
\ No newline at end of file
@@ -0,0 +1,86 @@
+import typing
+import types
+import asyncio
+from TelegramAnswerBot.questions_buffer import QuestionsBuffer
+
+
+class FakeQuestionsData:
+	"""Records the inserted batches; messages inserted before are reported as not added."""
+	
+	def __init__(self, error: typing.Optional[Exception] = None):
+		self.batches = []
+		self.error = error
+	
+	def add_questions(self, questions: list) -> list[bool]:
+		if self.error is not None:
+			raise self.error
+		
+		stored_messages = {(question.chat_id, question.message_id) for batch in self.batches for question in batch}
+		self.batches.append(questions)
+		
+		return [(question.chat_id, question.message_id) not in stored_messages for question in questions]
+
+
+def make_buffer(questions_data: FakeQuestionsData, max_batch_size: int, max_delay: float) -> QuestionsBuffer:
+	async def run(function, *args):
+		return function(*args)
+	
+	return QuestionsBuffer(types.SimpleNamespace(run=run, questions_data=questions_data), max_batch_size, max_delay)
+
+
+def ask(questions_buffer: QuestionsBuffer, message_id: int):
+	return questions_buffer.add_question(1, 10, message_id, "asker", "First", "Last", f"Question {message_id}")
+
+
+def test_questions_asked_together_are_inserted_in_one_batch():
+	questions_data = FakeQuestionsData()
+	questions_buffer = make_buffer(questions_data, 50, 0.01)
+	
+	async def main() -> tuple[list[bool], list[bool]]:
+		first_results = await asyncio.gather(*(ask(questions_buffer, message_id) for message_id in range(1, 6)))
+		second_results = await asyncio.gather(ask(questions_buffer, 5), ask(questions_buffer, 6))
+		
+		return first_results, second_results
+	
+	first_results, second_results = asyncio.run(main())
+	
+	assert first_results == [True] * 5
+	assert second_results == [False, True]
+	assert [len(batch) for batch in questions_data.batches] == [5, 2]
+	assert questions_buffer.get_stats() == {"batches": 2, "questions": 7, "average_batch_size": 3.5, "largest_batch_size": 5}
+
+
+def test_full_batch_is_inserted_without_waiting_for_max_delay():
+	questions_data = FakeQuestionsData()
+	questions_buffer = make_buffer(questions_data, 2, 60)
+	
+	async def main():
+		await asyncio.wait_for(asyncio.gather(*(ask(questions_buffer, message_id) for message_id in range(1, 5))), 1)
+	
+	asyncio.run(main())
+	
+	assert [len(batch) for batch in questions_data.batches] == [2, 2]
+
+
+def test_stop_inserts_collected_questions():
+	questions_data = FakeQuestionsData()
+	questions_buffer = make_buffer(questions_data, 50, 60)
+	
+	async def main() -> bool:
+		question = asyncio.create_task(ask(questions_buffer, 1))
+		await asyncio.sleep(0)
+		await questions_buffer.stop()
+		
+		return await question
+	
+	assert asyncio.run(main())
+	assert len(questions_data.batches) == 1
+
+
+def test_failed_batch_raises_in_every_handler():
+	questions_buffer = make_buffer(FakeQuestionsData(ConnectionError("lost connection")), 50, 0.01)
+	
+	async def main() -> list:
+		return await asyncio.gather(ask(questions_buffer, 1), ask(questions_buffer, 2), return_exceptions=True)
+	
+	assert [type(result) for result in asyncio.run(main())] == [ConnectionError, ConnectionError]
\ No newline at end of file
@@ -0,0 +1,31 @@
+from TelegramAnswerBot.rate_limiter import RateLimiter
+
+
+def test_globally_limited_user_is_warned_once():
+	rate_limiter = RateLimiter(1, 5, 0.001, 1)
+	
+	assert rate_limiter.acquire(1)
+	assert not rate_limiter.acquire(2)
+	assert rate_limiter.should_warn(2)
+	assert not rate_limiter.acquire(2)
+	assert not rate_limiter.should_warn(2)
+
+
+def test_pre_check_is_not_counted():
+	rate_limiter = RateLimiter(0.001, 1, 1, 10)
+	
+	assert rate_limiter.acquire(1)
+	assert rate_limiter.is_limited(1)
+	assert not rate_limiter.acquire(1)
+	
+	assert rate_limiter.get_stats()["limited_users"] == 1
+
+
+def test_global_warnings_are_forgotten_when_global_bucket_refills():
+	rate_limiter = RateLimiter(1, 5, 1000, 1)
+	rate_limiter._global_bucket[0] = 0
+	rate_limiter.should_warn(2)
+	
+	rate_limiter.forget_full_buckets(rate_limiter._global_bucket[1] + 1)
+	
+	assert rate_limiter.should_warn(2)
\ No newline at end of file
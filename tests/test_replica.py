@@ -0,0 +1,74 @@
+import time
+import contextvars
+from TelegramAnswerBot.data_handlers.base import DataHandler
+from TelegramAnswerBot.data_handlers.replica import (
+	ReplicaRouter,
+	current_user_id
+)
+
+
+def run_as_user(user_id: int, function, *args):
+	def run():
+		current_user_id.set(user_id)
+		return function(*args)
+	
+	return contextvars.copy_context().run(run)
+
+
+def test_reads_stay_on_the_primary_after_a_write_of_the_user():
+	replica_pool = object()
+	router = ReplicaRouter(replica_pool, 0.05)
+	run_as_user(1, router.record_write)
+	
+	assert run_as_user(1, router.get_read_pool) is None
+	assert run_as_user(2, router.get_read_pool) is replica_pool
+	assert router.get_read_pool() is replica_pool
+	
+	time.sleep(0.06)
+	
+	assert run_as_user(1, router.get_read_pool) is replica_pool
+	assert router.get_stats() == {"replica_reads": 3, "primary_reads": 1, "sticky_users": 1}
+
+
+def test_old_writes_are_forgotten_on_the_next_write():
+	router = ReplicaRouter(object(), 0.01)
+	run_as_user(1, router.record_write)
+	time.sleep(0.02)
+	run_as_user(2, router.record_write)
+	
+	assert router.get_stats()["sticky_users"] == 1
+
+
+def test_reads_without_replica_fall_back_to_the_primary():
+	primary_pool = object()
+	router = ReplicaRouter(None, 5)
+	run_as_user(1, router.record_write)
+	
+	assert run_as_user(2, router.get_read_pool) is None
+	assert DataHandler(primary_pool, replica_router=router).get_read_pool() is None
+	assert DataHandler(primary_pool).get_read_pool() is None
+	assert router.get_stats() == {"replica_reads": 0, "primary_reads": 0, "sticky_users": 0}
+
+class FakePool:
+	"""A pool handing out connections that remember it."""
+	
+	def get_connection(self):
+		pool = self
+		
+		class FakeConnection:
+			in_transaction = False
+			
+			def cursor(self):
+				return pool
+		
+		return FakeConnection()
+
+
+def test_read_attributes_come_from_the_primary_for_users_who_just_wrote():
+	primary_pool, replica_pool = FakePool(), FakePool()
+	router = ReplicaRouter(replica_pool, 5)
+	data_handler = DataHandler(primary_pool, replica_router=router)
+	run_as_user(1, router.record_write)
+	
+	assert run_as_user(1, data_handler.get_read_attributes)[1] is primary_pool
+	assert run_as_user(2, data_handler.get_read_attributes)[1] is replica_pool
\ No newline at end of file
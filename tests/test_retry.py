@@ -0,0 +1,91 @@
+import pytest
+import mysql.connector
+from mysql.connector import errorcode
+from TelegramAnswerBot.data_handlers.retry import (
+	RetryPolicy,
+	attempt_connections,
+	retry_transaction
+)
+
+
+class FakeConnection:
+	"""A connection taken by an attempt, recording whether it was rolled back and returned."""
+	
+	def __init__(self, committed: bool = False):
+		self._cnx = object()
+		self.committed = committed
+		self.rolled_back = False
+	
+	def rollback(self):
+		self.rolled_back = True
+	
+	def close(self):
+		self._cnx = None
+
+
+class FlakyHandler:
+	"""A handler whose write fails with the given errors before it succeeds."""
+	
+	def __init__(self, errors: list[Exception], commit_before_error: bool = False):
+		self.retry_policy = RetryPolicy(3, 0, 0)
+		self.errors = errors
+		self.commit_before_error = commit_before_error
+		self.connections = []
+	
+	@retry_transaction
+	def write(self) -> str:
+		connection = FakeConnection(self.commit_before_error)
+		attempt_connections.get().append(connection)
+		self.connections.append(connection)
+		
+		if self.errors:
+			raise self.errors.pop(0)
+		
+		return "written"
+
+
+def make_error(errno: int) -> mysql.connector.Error:
+	return mysql.connector.errors.DatabaseError(errno=errno)
+
+
+def test_deadlock_and_lock_wait_timeout_are_retried():
+	handler = FlakyHandler([make_error(errorcode.ER_LOCK_DEADLOCK), make_error(errorcode.ER_LOCK_WAIT_TIMEOUT)])
+	
+	assert handler.write() == "written"
+	assert [connection.rolled_back for connection in handler.connections] == [True, True, False]
+	assert handler.connections[0]._cnx is None and handler.connections[1]._cnx is None
+	assert handler.retry_policy.get_stats() == {
+		"retries": {"deadlock": 1, "lock_wait_timeout": 1},
+		"methods": {"FlakyHandler.write": 2},
+		"recovered": 1,
+		"exhausted": 0
+	}
+
+
+def test_other_errors_are_not_retried():
+	handler = FlakyHandler([make_error(errorcode.ER_DUP_ENTRY)])
+	
+	with pytest.raises(mysql.connector.Error):
+		handler.write()
+	
+	assert len(handler.connections) == 1
+	assert handler.connections[0].rolled_back
+
+
+def test_attempts_that_committed_are_not_retried():
+	handler = FlakyHandler([make_error(errorcode.ER_LOCK_DEADLOCK)], commit_before_error=True)
+	
+	with pytest.raises(mysql.connector.Error):
+		handler.write()
+	
+	assert len(handler.connections) == 1
+
+
+def test_retries_stop_after_max_attempts():
+	handler = FlakyHandler([make_error(errorcode.ER_LOCK_DEADLOCK)] * 3)
+	
+	with pytest.raises(mysql.connector.Error):
+		handler.write()
+	
+	assert len(handler.connections) == 3
+	assert handler.retry_policy.exhausted_count == 1
\ No newline at end of file
@@ -0,0 +1,51 @@
+import types
+import asyncio
+from TelegramAnswerBot.telegram_handlers.routing import Router
+
+
+async def view_doc(update, context):
+	context.append("view_doc")
+
+
+async def set_language(update, context):
+	context.append("set_language")
+
+
+async def set_language_en(update, context):
+	context.append("set_language_en")
+
+
+async def chose_user_to_add_role(update, context):
+	context.append("chose_user_to_add_role")
+
+
+def make_router() -> Router:
+	return Router({"view_doc": view_doc, "set_language": set_language, "chose_user_to_add_role": chose_user_to_add_role}, {})
+
+
+def test_exact_route_wins_over_prefix():
+	router = Router({"set_language": set_language, "set_language_en": set_language_en}, {})
+	
+	assert router.get_callback_query_route("set_language_en") is set_language_en
+	assert router.get_callback_query_route("set_language_de") is set_language
+
+
+def test_prefix_route_is_found_by_cutting_at_the_last_underscore():
+	router = make_router()
+	
+	assert router.get_callback_query_route("view_doc") is view_doc
+	assert router.get_callback_query_route("set_language_en") is set_language
+	assert router.get_callback_query_route("chose_user_to_add_role_*admin*") is chose_user_to_add_role
+	assert router.get_callback_query_route("view_fag_answer_id12") is None
+	assert router.get_callback_query_route("") is None
+	assert router.get_callback_query_route(None) is None
+
+
+def test_route_callback_query_calls_the_handler_and_ignores_unknown_data():
+	router = make_router()
+	calls = []
+	
+	asyncio.run(router.route_callback_query(types.SimpleNamespace(callback_query=types.SimpleNamespace(data="set_language_uk")), calls))
+	asyncio.run(router.route_callback_query(types.SimpleNamespace(callback_query=types.SimpleNamespace(data="unknown_route")), calls))
+	
+	assert calls == ["set_language"]
\ No newline at end of file
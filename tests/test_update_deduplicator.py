@@ -0,0 +1,34 @@
+import time
+import types
+import asyncio
+import pytest
+from telegram.ext import ApplicationHandlerStop
+from TelegramAnswerBot.update_deduplicator import UpdateDeduplicator
+
+
+def test_redelivered_update_is_dropped_within_the_window():
+	update_deduplicator = UpdateDeduplicator(60)
+	
+	assert not update_deduplicator.is_duplicate(1)
+	assert not update_deduplicator.is_duplicate(2)
+	assert update_deduplicator.is_duplicate(1)
+	assert update_deduplicator.get_stats() == {"duplicates": 1, "remembered_updates": 2}
+
+
+def test_updates_are_forgotten_after_the_window():
+	update_deduplicator = UpdateDeduplicator(0.02)
+	update_deduplicator.is_duplicate(1)
+	time.sleep(0.03)
+	
+	assert not update_deduplicator.is_duplicate(1)
+	assert update_deduplicator.get_stats() == {"duplicates": 0, "remembered_updates": 1}
+
+
+def test_check_update_stops_the_processing_of_duplicates():
+	update_deduplicator = UpdateDeduplicator(60)
+	update = types.SimpleNamespace(update_id=7)
+	
+	asyncio.run(update_deduplicator.check_update(update, None))
+	
+	with pytest.raises(ApplicationHandlerStop):
+		asyncio.run(update_deduplicator.check_update(update, None))
\ No newline at end of file
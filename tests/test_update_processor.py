@@ -0,0 +1,55 @@
+import asyncio
+from telegram import (
+	CallbackQuery,
+	Update,
+	User
+)
+from TelegramAnswerBot.update_processor import PerUserUpdateProcessor
+
+
+def make_update(update_id: int, user_id: int) -> Update:
+	return Update(update_id, callback_query=CallbackQuery(str(update_id), User(user_id, "Test", False), "test", data="start"))
+
+
+def test_flooding_user_does_not_stall_other_users():
+	async def main() -> tuple[list[int], list[int]]:
+		update_processor = PerUserUpdateProcessor(2)
+		release_flooder = asyncio.Event()
+		handled = []
+		
+		async def handle(update_id: int):
+			if update_id < 10:
+				await release_flooder.wait()
+			
+			handled.append(update_id)
+		
+		flood = [asyncio.create_task(update_processor.process_update(make_update(update_id, 1), handle(update_id))) for update_id in range(5)]
+		other_user = asyncio.create_task(update_processor.process_update(make_update(10, 2), handle(10)))
+		
+		await asyncio.wait_for(other_user, 1)
+		handled_before_release = list(handled)
+		release_flooder.set()
+		await asyncio.gather(*flood)
+		
+		return handled_before_release, handled
+	
+	handled_before_release, handled = asyncio.run(main())
+	
+	assert handled_before_release == [10]
+	assert handled == [10, 0, 1, 2, 3, 4]
+
+
+def test_user_is_busy_while_updates_wait():
+	async def main() -> tuple[bool, bool]:
+		update_processor = PerUserUpdateProcessor(4)
+		release = asyncio.Event()
+		
+		task = asyncio.create_task(update_processor.process_update(make_update(1, 1), release.wait()))
+		await asyncio.sleep(0)
+		is_busy = update_processor.is_user_busy(1)
+		release.set()
+		await task
+		
+		return is_busy, update_processor.is_user_busy(1)
+	
+	assert asyncio.run(main()) == (True, False)
\ No newline at end of file
@@ -0,0 +1,70 @@
+import types
+import asyncio
+from TelegramAnswerBot.user_data_evictor import UserDataEvictor
+
+
+class FakePersistence:
+	"""Records the handed over user_data and answers writes with `write_result`."""
+	
+	def __init__(self, write_result: bool = True):
+		self.written_users = []
+		self.write_result = write_result
+	
+	async def update_user_data(self, user_id: int, data: dict):
+		self.written_users.append(user_id)
+	
+	async def write_dirty_users_data(self) -> bool:
+		return self.write_result
+
+
+class FakeApplication:
+	"""An application holding the user_data of some users, of whom the `busy_users` have updates in progress."""
+	
+	def __init__(self, user_ids: list[int], busy_users: set[int], persistence: FakePersistence):
+		self.running = True
+		self.user_data = {user_id: {"role": "admin"} for user_id in user_ids}
+		self.persistence = persistence
+		self.update_processor = types.SimpleNamespace(is_user_busy=busy_users.__contains__)
+	
+	def drop_user_data(self, user_id: int):
+		del self.user_data[user_id]
+
+
+def track_users(evictor: UserDataEvictor, user_ids: list[int]):
+	for user_id in user_ids:
+		asyncio.run(evictor.track_activity(types.SimpleNamespace(effective_user=types.SimpleNamespace(id=user_id)), None))
+
+
+def test_idle_users_are_written_and_evicted_except_busy_ones():
+	evictor = UserDataEvictor(0, 100, 60)
+	persistence = FakePersistence()
+	application = FakeApplication([1, 2, 3], {2}, persistence)
+	track_users(evictor, [1, 2, 3])
+	
+	asyncio.run(evictor.evict_idle_users(application))
+	
+	assert persistence.written_users == [1, 3]
+	assert list(application.user_data) == [2]
+	assert evictor.evicted_users_count == 2
+	assert evictor.get_users_to_evict(FakeApplication([2], set(), persistence)) == [2]
+
+
+def test_least_recently_active_users_above_the_limit_are_evicted():
+	evictor = UserDataEvictor(3600, 2, 60)
+	application = FakeApplication([1, 2, 3, 4], {1}, FakePersistence())
+	track_users(evictor, [1, 2, 3, 4])
+	
+	asyncio.run(evictor.evict_idle_users(application))
+	
+	assert list(application.user_data) == [1, 4]
+
+
+def test_nobody_is_evicted_when_the_write_fails():
+	evictor = UserDataEvictor(0, 100, 60)
+	application = FakeApplication([1, 2], set(), FakePersistence(write_result=False))
+	track_users(evictor, [1, 2])
+	
+	asyncio.run(evictor.evict_idle_users(application))
+	
+	assert list(application.user_data) == [1, 2]
+	assert evictor.evicted_users_count == 0
\ No newline at end of file